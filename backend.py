@@ -32,6 +32,7 @@ import time
 
 # Importar utilidades compartidas
 from utils import format_file_size
+from core.stat_cache import get_stat_cache
 from core.security import (
     sanitize_sql_input,
     validate_search_input,
@@ -824,11 +825,15 @@ class FallbackSearchEngine:
         Crea un SearchResult desde un DirEntry.
 
         PERFORMANCE: Usa entry.stat() que es cached por os.scandir(),
-        evitando llamadas extra al sistema de archivos.
+        evitando llamadas extra al sistema de archivos. El resultado se
+        registra en el stat cache compartido para que preview y duplicados
+        no vuelvan a consultar el mismo archivo.
         """
         try:
             # Use cached stat from DirEntry (no extra syscall)
-            stat_info = entry.stat(follow_symlinks=False)
+            stat_info = get_stat_cache().prime_entry(entry, follow_symlinks=False)
+            if stat_info is None:
+                return None
 
             return SearchResult(
                 path=entry.path,
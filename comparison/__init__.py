@@ -25,6 +25,24 @@ from .sync_engine import (
     format_sync_summary
 )
 
+from .sync_plan import (
+    SyncPlan,
+    SyncEstimate
+)
+
+from .snapshot import (
+    DirectorySnapshot,
+    SnapshotNode,
+    compare_snapshots,
+    find_duplicate_folders
+)
+
+from .delta import (
+    DeltaTransfer,
+    DeltaResult,
+    BlockSignature
+)
+
 __all__ = [
     # Comparator
     "FolderComparator",
@@ -42,5 +60,18 @@ __all__ = [
     "ConflictResolution",
     "SyncOperation",
     "SyncResult",
-    "format_sync_summary"
+    "format_sync_summary",
+    "SyncPlan",
+    "SyncEstimate",
+
+    # Snapshots
+    "DirectorySnapshot",
+    "SnapshotNode",
+    "compare_snapshots",
+    "find_duplicate_folders",
+
+    # Delta transfer
+    "DeltaTransfer",
+    "DeltaResult",
+    "BlockSignature"
 ]
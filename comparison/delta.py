@@ -0,0 +1,454 @@
+"""
+Delta transfer for updating large files (rsync algorithm).
+
+The destination (the basis) is split into fixed-size blocks, each with a
+weak rolling checksum (rsync's, modulo 2^16) and a strong hash (SHA-256). The source is then
+scanned for those blocks:
+- Unchanged runs are confirmed with one strong hash per block: at each
+  position the block following the previous match is tried first
+- After a mismatch, the weak checksum is rolled over every byte offset
+  (vectorized with NumPy) to find blocks shifted by insertions or
+  deletions; weak matches are confirmed with the strong hash
+- Everything else is literal data, read from the source
+
+If every matched block is still at its own offset (files modified in
+place: VM disks, databases, mail archives), the destination is patched in
+place and only the changed ranges are written. Otherwise the new file is
+assembled in a temporary file next to the destination from basis blocks
+and literal data, and then replaces it.
+
+Without NumPy, only blocks at unchanged offsets are matched.
+"""
+
+import hashlib
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Files smaller than this are copied whole (the signature pass would cost
+# about as much as the copy)
+DELTA_MIN_SIZE = 8 * 1024 * 1024
+
+# Block size bounds; between them it grows with the square root of the
+# file size, as in rsync
+MIN_BLOCK_SIZE = 2 * 1024
+MAX_BLOCK_SIZE = 1024 * 1024
+
+# Source bytes read per call, and most byte offsets searched per rolling
+# checksum pass
+READ_SIZE = 8 * 1024 * 1024
+SEARCH_SPAN = 8 * 1024 * 1024
+
+# Bits of the weak checksum indexing the candidate filter table
+_FILTER_BITS = 22
+_FILTER_MASK = (1 << _FILTER_BITS) - 1
+
+
+def _strong_hash(data) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _block_checksums(data, block_size: int) -> List[int]:
+    """Weak checksums of consecutive blocks (the last one may be short)."""
+    values = np.frombuffer(data, dtype=np.uint8)
+    full = len(values) // block_size
+    weights = np.arange(block_size, 0, -1, dtype=np.uint32)
+    checksums = []
+    if full:
+        blocks = values[:full * block_size].reshape(full, block_size).astype(np.uint32)
+        a = blocks.sum(axis=1, dtype=np.uint32)
+        b = (blocks * weights).sum(axis=1, dtype=np.uint32)
+        checksums.extend((((b & 0xFFFF) << 16) | (a & 0xFFFF)).tolist())
+    tail = values[full * block_size:].astype(np.uint32)
+    if len(tail):
+        a = int(tail.sum(dtype=np.uint32))
+        b = int((tail * weights[block_size - len(tail):]).sum(dtype=np.uint32))
+        checksums.append(((b & 0xFFFF) << 16) | (a & 0xFFFF))
+    return checksums
+
+
+@dataclass
+class BlockSignature:
+    """Checksums of the blocks of a basis file."""
+    block_size: int
+    file_size: int
+    weak: List[int] = field(default_factory=list)
+    strong: List[bytes] = field(default_factory=list)
+
+    @property
+    def full_blocks(self) -> int:
+        """Number of blocks of exactly block_size bytes."""
+        return self.file_size // self.block_size
+
+    def block_length(self, index: int) -> int:
+        """Length of a block (the last one may be short)."""
+        return min(self.block_size, self.file_size - index * self.block_size)
+
+
+@dataclass
+class DeltaOp:
+    """
+    A range of the new file.
+
+    Attributes:
+        offset: Offset in the new file (and in the source)
+        length: Length in bytes
+        basis_offset: Offset of the same bytes in the basis, or None for
+            literal data read from the source
+    """
+    offset: int
+    length: int
+    basis_offset: Optional[int] = None
+
+    @property
+    def is_literal(self) -> bool:
+        """Whether the range is read from the source."""
+        return self.basis_offset is None
+
+
+@dataclass
+class DeltaResult:
+    """Outcome of a delta update."""
+    file_size: int = 0
+    literal_bytes: int = 0     # Read from the source and written
+    matched_bytes: int = 0     # Reused from the destination
+    in_place: bool = False     # Patched in place (else rebuilt in a temp file)
+
+
+class _SourceWindow:
+    """Sequential reader keeping a sliding window of the source in memory."""
+
+    def __init__(self, f, file_size: int):
+        self._f = f
+        self.file_size = file_size
+        self.base = 0
+        self.data = b""
+
+    def ensure(self, offset: int, length: int) -> None:
+        """Make [offset, offset + length) (clipped to EOF) available."""
+        end = min(offset + length, self.file_size)
+        if offset >= self.base and end <= self.base + len(self.data):
+            return
+        keep = self.data[offset - self.base:] if offset < self.base + len(self.data) else b""
+        self._f.seek(offset + len(keep))
+        more = self._f.read(max(end - offset - len(keep), READ_SIZE))
+        self.data = keep + more
+        self.base = offset
+
+    def view(self, offset: int, length: int) -> memoryview:
+        start = offset - self.base
+        return memoryview(self.data)[start:start + length]
+
+
+class DeltaTransfer:
+    """
+    Updates a destination file from a source by transferring only the
+    blocks that differ.
+
+    Example:
+        >>> delta = DeltaTransfer()
+        >>> result = delta.update_file('/data/vm.img', '/backup/vm.img')
+        >>> print(f"{result.literal_bytes} of {result.file_size} bytes written")
+    """
+
+    def __init__(self, block_size: Optional[int] = None, in_place: bool = True):
+        """
+        Initialize delta transfer.
+
+        Args:
+            block_size: Fixed block size (None = derived from the file size)
+            in_place: Patch the destination in place when every matched
+                block kept its offset
+        """
+        self.block_size = block_size
+        self.in_place = in_place
+
+    @staticmethod
+    def block_size_for(file_size: int) -> int:
+        """Block size for a basis file: sqrt(size), as a power of two within bounds."""
+        if file_size <= 0:
+            return MIN_BLOCK_SIZE
+        size = 1 << max(0, math.ceil(math.log2(math.sqrt(file_size))))
+        return max(MIN_BLOCK_SIZE, min(MAX_BLOCK_SIZE, size))
+
+    def signature(self, basis_path: Union[str, Path], block_size: Optional[int] = None) -> BlockSignature:
+        """
+        Compute the block checksums of a basis file.
+
+        Args:
+            basis_path: File to be updated
+            block_size: Block size (None = block_size_for(file size))
+
+        Returns:
+            BlockSignature
+        """
+        file_size = os.path.getsize(basis_path)
+        block_size = block_size or self.block_size or self.block_size_for(file_size)
+        signature = BlockSignature(block_size=block_size, file_size=file_size)
+
+        # Whole blocks per read, so weak checksums are computed per batch
+        buffer = memoryview(bytearray(block_size * max(1, READ_SIZE // block_size)))
+        with open(basis_path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                # Short reads only happen at EOF for regular files
+                while n < len(buffer):
+                    more = f.readinto(buffer[n:])
+                    if not more:
+                        break
+                    n += more
+                for start in range(0, n, block_size):
+                    signature.strong.append(_strong_hash(buffer[start:min(start + block_size, n)]))
+                if HAS_NUMPY:
+                    signature.weak.extend(_block_checksums(buffer[:n], block_size))
+        return signature
+
+    def delta(self, source_path: Union[str, Path], signature: BlockSignature) -> List[DeltaOp]:
+        """
+        Describe the source as basis blocks and literal ranges.
+
+        Args:
+            source_path: New version of the file
+            signature: Signature of the basis
+
+        Returns:
+            Contiguous ops covering the whole source
+        """
+        block_size = signature.block_size
+        full_blocks = signature.full_blocks
+
+        # Shifted blocks are searched with the weak checksums (NumPy only)
+        weak_index: Dict[int, List[int]] = {}
+        if HAS_NUMPY and len(signature.weak) >= full_blocks:
+            for index in range(full_blocks):
+                weak_index.setdefault(signature.weak[index], []).append(index)
+        weak_filter = None
+        if weak_index:
+            weak_filter = np.zeros(1 << _FILTER_BITS, dtype=bool)
+            weak_filter[np.fromiter(weak_index, dtype=np.uint32) & _FILTER_MASK] = True
+
+        ops: List[DeltaOp] = []
+        literal_start = 0
+
+        def emit_match(index: int, at: int) -> None:
+            nonlocal literal_start
+            if at > literal_start:
+                ops.append(DeltaOp(literal_start, at - literal_start))
+            length = signature.block_length(index)
+            basis_offset = index * block_size
+            last = ops[-1] if ops else None
+            if (last is not None and not last.is_literal
+                    and last.offset + last.length == at
+                    and last.basis_offset + last.length == basis_offset):
+                last.length += length
+            else:
+                ops.append(DeltaOp(at, length, basis_offset))
+            literal_start = at + length
+
+        with open(source_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            window = _SourceWindow(f, size)
+            pos = 0
+            expected = 0
+
+            while pos + block_size <= size:
+                # Next basis block first: unchanged runs cost one strong hash per block
+                window.ensure(pos, block_size)
+                if (expected < full_blocks
+                        and _strong_hash(window.view(pos, block_size)) == signature.strong[expected]):
+                    emit_match(expected, pos)
+                    pos += block_size
+                    expected += 1
+                    continue
+
+                if weak_filter is None:
+                    # Aligned matching only
+                    pos += block_size
+                    expected += 1
+                    continue
+
+                # Roll the weak checksum over growing spans until a block matches
+                span = block_size
+                found = None
+                while found is None and pos + block_size <= size:
+                    count = min(span, size - block_size - pos + 1)
+                    window.ensure(pos, count + block_size - 1)
+                    found = self._search(window, pos, count, signature, weak_index, weak_filter, expected)
+                    if found is None:
+                        pos += count
+                        span = min(span * 2, SEARCH_SPAN)
+
+                if found is not None:
+                    at, index = found
+                    emit_match(index, at)
+                    pos = at + block_size
+                    expected = index + 1
+
+            # A short last basis block can only match the end of the source
+            tail = size - literal_start
+            last_length = signature.file_size - full_blocks * block_size
+            if last_length and tail >= last_length:
+                at = size - last_length
+                window.ensure(at, last_length)
+                if _strong_hash(window.view(at, last_length)) == signature.strong[-1]:
+                    emit_match(full_blocks, at)
+
+            if literal_start < size:
+                ops.append(DeltaOp(literal_start, size - literal_start))
+
+        return ops
+
+    @staticmethod
+    def _search(
+        window: _SourceWindow,
+        pos: int,
+        count: int,
+        signature: BlockSignature,
+        weak_index: Dict[int, List[int]],
+        weak_filter: "np.ndarray",
+        expected: int
+    ) -> Optional[tuple[int, int]]:
+        """First offset in [pos, pos + count) holding a basis block, as (offset, block index)."""
+        block_size = signature.block_size
+        start = pos - window.base
+        data = np.frombuffer(window.data, dtype=np.uint8, count=count + block_size - 1, offset=start)
+
+        # Weak checksum of every window: a = sum(x), b = sum((L - i) * x_i),
+        # modulo 2^16, from prefix sums of x and of j * x (uint32 wraparound
+        # keeps them exact modulo 2^16)
+        sums = np.zeros(len(data) + 1, dtype=np.uint32)
+        np.cumsum(data, dtype=np.uint32, out=sums[1:])
+        weighted = np.arange(len(data) + 1, dtype=np.uint32)
+        weighted[1:] -= 1
+        weighted[1:] *= data
+        weighted[0] = 0
+        np.cumsum(weighted, dtype=np.uint32, out=weighted)
+
+        a_sum = sums[block_size:block_size + count] - sums[:count]
+        b_sum = np.arange(block_size, block_size + count, dtype=np.uint32)
+        b_sum *= a_sum
+        b_sum -= weighted[block_size:block_size + count]
+        b_sum += weighted[:count]
+        b_sum &= 0xFFFF
+        b_sum <<= 16
+        a_sum &= 0xFFFF
+        b_sum |= a_sum
+        weak = b_sum
+
+        # Table lookup on the low bits, then the exact checksum
+        for offset in np.flatnonzero(weak_filter[weak & _FILTER_MASK]).tolist():
+            candidates = weak_index.get(int(weak[offset]))
+            if not candidates:
+                continue
+            if expected in candidates:
+                candidates = [expected] + [c for c in candidates if c != expected]
+            digest = _strong_hash(window.view(pos + offset, block_size))
+            for index in candidates:
+                if signature.strong[index] == digest:
+                    return pos + offset, index
+        return None
+
+    def patch(
+        self,
+        source_path: Union[str, Path],
+        destination: Union[str, Path],
+        ops: List[DeltaOp],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> DeltaResult:
+        """
+        Apply ops to the destination.
+
+        Args:
+            source_path: Source of the literal data
+            destination: Basis file to update
+            ops: Ops from delta()
+            progress_callback: Optional callback(bytes_transferred, total) over literal bytes
+
+        Returns:
+            DeltaResult
+        """
+        destination = Path(destination)
+        file_size = sum(op.length for op in ops)
+        literal_total = sum(op.length for op in ops if op.is_literal)
+        result = DeltaResult(
+            file_size=file_size,
+            literal_bytes=literal_total,
+            matched_bytes=file_size - literal_total,
+            in_place=self.in_place and all(op.is_literal or op.basis_offset == op.offset for op in ops)
+        )
+
+        transferred = 0
+
+        def copy_range(src, dst, offset: int, length: int, count_progress: bool) -> None:
+            nonlocal transferred
+            src.seek(offset)
+            while length:
+                chunk = src.read(min(READ_SIZE, length))
+                if not chunk:
+                    raise IOError(f"Unexpected end of file: {src.name}")
+                dst.write(chunk)
+                length -= len(chunk)
+                if count_progress:
+                    transferred += len(chunk)
+                    if progress_callback:
+                        progress_callback(transferred, literal_total)
+
+        with open(source_path, 'rb') as src:
+            if result.in_place:
+                with open(destination, 'r+b') as dst:
+                    for op in ops:
+                        if op.is_literal:
+                            dst.seek(op.offset)
+                            copy_range(src, dst, op.offset, op.length, True)
+                    dst.truncate(file_size)
+            else:
+                temp_path = destination.with_name(f".{destination.name}.delta.tmp")
+                try:
+                    with open(destination, 'rb') as basis, open(temp_path, 'wb') as dst:
+                        for op in ops:
+                            if op.is_literal:
+                                copy_range(src, dst, op.offset, op.length, True)
+                            else:
+                                copy_range(basis, dst, op.basis_offset, op.length, False)
+                    os.replace(temp_path, destination)
+                except BaseException:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+
+        if progress_callback and not literal_total:
+            progress_callback(0, 0)
+        return result
+
+    def update_file(
+        self,
+        source: Union[str, Path],
+        destination: Union[str, Path],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> DeltaResult:
+        """
+        Update an existing destination to match the source.
+
+        Args:
+            source: New version of the file
+            destination: Existing, outdated copy
+            progress_callback: Optional callback(bytes_transferred, total)
+
+        Returns:
+            DeltaResult
+        """
+        signature = self.signature(destination)
+        ops = self.delta(source, signature)
+        return self.patch(source, destination, ops, progress_callback)
@@ -5,6 +5,9 @@ Features:
 - Multiple comparison modes (content hash, name only, size+name)
 - Recursive directory traversal
 - Multi-threaded hashing for performance
+- Tiered content comparison: pairs are decided by size (and optionally
+  mtime) first; only equal-size pairs are read, progressively, with
+  hashes reused from and stored in the shared hash cache
 - Filtering by extension, size range, date range
 - Detailed comparison reports
 - Space savings calculation
@@ -22,8 +25,12 @@ from typing import Callable, Dict, List, Optional, Set, Tuple
 # Add parent directory to path for core imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.threading import create_io_executor
+from duplicates.cache import HashCache
 from duplicates.hasher import FileHasher, HashAlgorithm
 
+# Scanned files: relative path -> (absolute path, stat result from the scan)
+ScannedFiles = Dict[str, Tuple[Path, os.stat_result]]
+
 
 class ComparisonMode(Enum):
     """Comparison modes for directory comparison."""
@@ -151,7 +158,10 @@ class FolderComparator:
         min_size: Optional[int] = None,
         max_size: Optional[int] = None,
         modified_after: Optional[datetime] = None,
-        modified_before: Optional[datetime] = None
+        modified_before: Optional[datetime] = None,
+        use_cache: bool = True,
+        cache_path: Optional[str | Path] = None,
+        trust_mtime: bool = False
     ):
         """
         Initialize folder comparator.
@@ -165,6 +175,11 @@ class FolderComparator:
             max_size: Maximum file size in bytes
             modified_after: Only include files modified after this date
             modified_before: Only include files modified before this date
+            use_cache: Reuse and store content hashes in the hash cache
+                (opened per compare() call, closed when it returns)
+            cache_path: Path to cache database (default: ~/.cache/smart_search/hashes.db)
+            trust_mtime: Treat equal-size pairs with identical modification
+                times as the same without reading them (content mode)
         """
         self.mode = mode
         self.hash_algorithm = hash_algorithm
@@ -174,264 +189,283 @@ class FolderComparator:
         self.max_size = max_size
         self.modified_after = modified_after
         self.modified_before = modified_before
+        self.trust_mtime = trust_mtime
 
-        # Initialize hasher for content comparison
+        # Initialize hasher and hash cache for content comparison
+        self.cache: Optional[HashCache] = None
         if self.mode == ComparisonMode.CONTENT_HASH:
             self.hasher = FileHasher(
                 algorithm=hash_algorithm,
                 max_workers=max_workers
             )
+            if use_cache:
+                if cache_path is None:
+                    cache_path = Path.home() / '.cache' / 'smart_search' / 'hashes.db'
+                self.cache = HashCache(cache_path)
 
-    def _should_include_file(self, file_path: Path) -> bool:
+    def _should_include_file(self, file_path: Path, stat: os.stat_result) -> bool:
         """Check if file passes filters."""
         # Extension filter
         if self.extensions and file_path.suffix.lower() not in self.extensions:
             return False
 
-        try:
-            stat = file_path.stat()
-
-            # Size filter
-            if self.min_size is not None and stat.st_size < self.min_size:
-                return False
-            if self.max_size is not None and stat.st_size > self.max_size:
-                return False
-
-            # Date filter
-            modified_time = datetime.fromtimestamp(stat.st_mtime)
-            if self.modified_after and modified_time < self.modified_after:
-                return False
-            if self.modified_before and modified_time > self.modified_before:
-                return False
-
-            return True
+        # Size filter
+        if self.min_size is not None and stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat.st_size > self.max_size:
+            return False
 
-        except (OSError, IOError):
+        # Date filter
+        modified_time = datetime.fromtimestamp(stat.st_mtime)
+        if self.modified_after and modified_time < self.modified_after:
+            return False
+        if self.modified_before and modified_time > self.modified_before:
             return False
 
+        return True
+
     def _scan_directory(
         self,
         directory: Path,
         recursive: bool = True
-    ) -> Dict[str, Path]:
+    ) -> ScannedFiles:
         """
-        Scan directory and return mapping of relative paths to absolute paths.
+        Scan directory and stat every file once.
 
         Args:
             directory: Directory to scan
             recursive: Scan subdirectories
 
         Returns:
-            Dict mapping relative path to absolute path
+            Dict mapping relative path to (absolute path, stat result)
         """
         files = {}
+        pending = [(directory, "")]
 
-        if recursive:
-            pattern = "**/*"
-        else:
-            pattern = "*"
+        while pending:
+            current, prefix = pending.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
 
-        for file_path in directory.glob(pattern):
-            if file_path.is_file() and self._should_include_file(file_path):
-                relative_path = str(file_path.relative_to(directory))
-                files[relative_path] = file_path
+            for entry in entries:
+                relative_path = prefix + entry.name
+                try:
+                    if entry.is_dir():
+                        if recursive and not entry.is_symlink():
+                            pending.append((Path(entry.path), relative_path + os.sep))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                file_path = Path(entry.path)
+                if self._should_include_file(file_path, stat):
+                    files[relative_path] = (file_path, stat)
 
         return files
 
-    def _compute_hashes(
+    @staticmethod
+    def _new_comparison(
+        relative_path: str,
+        status: FileStatus,
+        source: Optional[Tuple[Path, os.stat_result]],
+        target: Optional[Tuple[Path, os.stat_result]]
+    ) -> FileComparison:
+        """Build a FileComparison from the scanned stat results."""
+        comparison = FileComparison(relative_path=relative_path, status=status)
+
+        if source:
+            comparison.source_path, stat = source
+            comparison.source_size = stat.st_size
+            comparison.source_modified = datetime.fromtimestamp(stat.st_mtime)
+
+        if target:
+            comparison.target_path, stat = target
+            comparison.target_size = stat.st_size
+            comparison.target_modified = datetime.fromtimestamp(stat.st_mtime)
+
+        return comparison
+
+    def _content_status(
         self,
-        files: Dict[str, Path],
-        progress_callback: Optional[Callable[[int, int], None]] = None
-    ) -> Dict[str, str]:
+        source: Tuple[Path, os.stat_result],
+        target: Tuple[Path, os.stat_result],
+        cached: Dict[Path, str],
+        new_hashes: List[Tuple[Path, os.stat_result, str]]
+    ) -> Tuple[FileStatus, Optional[str], Optional[str]]:
         """
-        Compute hashes for files.
+        Compare the content of two files of equal size.
 
-        Args:
-            files: Dict of relative_path -> absolute_path
-            progress_callback: Optional callback(completed, total)
+        Cached hashes are used where available. If only one side is cached,
+        the other is hashed; if neither is, both are read in lockstep with
+        growing chunks and the comparison stops at the first difference.
 
         Returns:
-            Dict mapping relative path to hash
+            (status, source hash, target hash); hashes are None for pairs
+            found different before the end of the files
         """
-        hashes = {}
-        file_list = list(files.items())
-        total = len(file_list)
+        (source_path, source_stat), (target_path, target_stat) = source, target
+        source_hash = cached.get(source_path)
+        target_hash = cached.get(target_path)
+
+        if source_hash is None and target_hash is None:
+            identical = self.hasher.find_identical([source_path, target_path])
+            if not identical:
+                return FileStatus.DIFFERENT, None, None
+            source_hash = target_hash = identical[0][0]
+            new_hashes.append((source_path, source_stat, source_hash))
+            new_hashes.append((target_path, target_stat, target_hash))
+        else:
+            if source_hash is None:
+                source_hash = self.hasher.compute_full_hash(source_path)
+                if source_hash:
+                    new_hashes.append((source_path, source_stat, source_hash))
+            if target_hash is None:
+                target_hash = self.hasher.compute_full_hash(target_path)
+                if target_hash:
+                    new_hashes.append((target_path, target_stat, target_hash))
+
+        if source_hash and source_hash == target_hash:
+            return FileStatus.SAME, source_hash, target_hash
+        return FileStatus.DIFFERENT, source_hash, target_hash
+
+    def _compare_by_content(
+        self,
+        source_files: ScannedFiles,
+        target_files: ScannedFiles,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[FileComparison]:
+        """
+        Compare files by content, in tiers.
+
+        Files present on one side only are never read, pairs of different
+        sizes are different, and (with trust_mtime) pairs with identical
+        size and mtime are the same. Only the remaining pairs are compared
+        by content; progress_callback(completed, total) counts those pairs.
+        """
+        all_relative_paths = sorted(set(source_files.keys()) | set(target_files.keys()))
+        results: Dict[str, Tuple[FileStatus, Optional[str], Optional[str]]] = {}
+        candidates = []
+
+        for rel_path in all_relative_paths:
+            source = source_files.get(rel_path)
+            target = target_files.get(rel_path)
+
+            if source and target:
+                source_stat, target_stat = source[1], target[1]
+                if source_stat.st_size != target_stat.st_size:
+                    results[rel_path] = (FileStatus.DIFFERENT, None, None)
+                elif self.trust_mtime and source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+                    results[rel_path] = (FileStatus.SAME, None, None)
+                else:
+                    candidates.append(rel_path)
+            elif source:
+                results[rel_path] = (FileStatus.MISSING_IN_TARGET, None, None)
+            else:
+                results[rel_path] = (FileStatus.EXTRA_IN_TARGET, None, None)
+
+        # Content tier: equal-size pairs only, cached hashes looked up in one batch
+        cached: Dict[Path, str] = {}
+        if candidates and self.cache:
+            items = [source_files[rel] for rel in candidates] + [target_files[rel] for rel in candidates]
+            cached = {
+                path: entry['full_hash']
+                for path, entry in self.cache.get_many(items, algorithm=self.hash_algorithm).items()
+                if entry['full_hash']
+            }
+
+        new_hashes: List[Tuple[Path, os.stat_result, str]] = []
+        total = len(candidates)
         completed = 0
 
         with create_io_executor(max_workers=self.max_workers, thread_name_prefix="HashCompare") as executor:
             future_to_rel = {
-                executor.submit(self.hasher.hash_file, path, quick_hash=False, full_hash=True): rel_path
-                for rel_path, path in file_list
+                executor.submit(
+                    self._content_status, source_files[rel], target_files[rel], cached, new_hashes
+                ): rel
+                for rel in candidates
             }
 
             for future in as_completed(future_to_rel):
-                rel_path = future_to_rel[future]
-                result = future.result()
-
-                if result.success and result.full_hash:
-                    hashes[rel_path] = result.full_hash
+                results[future_to_rel[future]] = future.result()
 
                 completed += 1
                 if progress_callback:
                     progress_callback(completed, total)
 
-        return hashes
+        if new_hashes and self.cache:
+            self.cache.set_many(
+                ((path, stat, None, file_hash) for path, stat, file_hash in new_hashes),
+                self.hash_algorithm
+            )
+            self.cache.flush()
 
-    def _compare_by_content(
-        self,
-        source_files: Dict[str, Path],
-        target_files: Dict[str, Path],
-        progress_callback: Optional[Callable[[int, int], None]] = None
-    ) -> List[FileComparison]:
-        """Compare files by content hash."""
         comparisons = []
-
-        # Progress tracking
-        total_operations = len(source_files) + len(target_files)
-        completed = 0
-
-        def hash_progress(done, total):
-            nonlocal completed
-            completed = done
-            if progress_callback:
-                progress_callback(completed, total_operations)
-
-        # Compute hashes for source files
-        source_hashes = self._compute_hashes(source_files, hash_progress)
-
-        # Compute hashes for target files
-        completed = len(source_files)
-        target_hashes = self._compute_hashes(target_files, hash_progress)
-
-        # Find common files and compare
-        all_relative_paths = set(source_files.keys()) | set(target_files.keys())
-
-        for rel_path in sorted(all_relative_paths):
-            source_path = source_files.get(rel_path)
-            target_path = target_files.get(rel_path)
-
-            comparison = FileComparison(relative_path=rel_path)
-
-            # File in source
-            if source_path:
-                comparison.source_path = source_path
-                comparison.source_size = source_path.stat().st_size
-                comparison.source_modified = datetime.fromtimestamp(source_path.stat().st_mtime)
-                comparison.source_hash = source_hashes.get(rel_path)
-
-            # File in target
-            if target_path:
-                comparison.target_path = target_path
-                comparison.target_size = target_path.stat().st_size
-                comparison.target_modified = datetime.fromtimestamp(target_path.stat().st_mtime)
-                comparison.target_hash = target_hashes.get(rel_path)
-
-            # Determine status
-            if source_path and target_path:
-                # Both exist - compare hashes
-                if comparison.source_hash == comparison.target_hash:
-                    comparison.status = FileStatus.SAME
-                else:
-                    comparison.status = FileStatus.DIFFERENT
-            elif source_path and not target_path:
-                comparison.status = FileStatus.MISSING_IN_TARGET
-            else:  # target_path and not source_path
-                comparison.status = FileStatus.EXTRA_IN_TARGET
-
+        for rel_path in all_relative_paths:
+            status, source_hash, target_hash = results[rel_path]
+            comparison = self._new_comparison(
+                rel_path, status, source_files.get(rel_path), target_files.get(rel_path)
+            )
+            comparison.source_hash = source_hash
+            comparison.target_hash = target_hash
             comparisons.append(comparison)
 
         return comparisons
 
     def _compare_by_name(
         self,
-        source_files: Dict[str, Path],
-        target_files: Dict[str, Path]
+        source_files: ScannedFiles,
+        target_files: ScannedFiles
     ) -> List[FileComparison]:
         """Compare files by name only."""
         comparisons = []
         all_relative_paths = set(source_files.keys()) | set(target_files.keys())
 
         for rel_path in sorted(all_relative_paths):
-            source_path = source_files.get(rel_path)
-            target_path = target_files.get(rel_path)
-
-            comparison = FileComparison(relative_path=rel_path)
-
-            if source_path:
-                comparison.source_path = source_path
-                try:
-                    stat = source_path.stat()
-                    comparison.source_size = stat.st_size
-                    comparison.source_modified = datetime.fromtimestamp(stat.st_mtime)
-                except (OSError, IOError):
-                    pass
-
-            if target_path:
-                comparison.target_path = target_path
-                try:
-                    stat = target_path.stat()
-                    comparison.target_size = stat.st_size
-                    comparison.target_modified = datetime.fromtimestamp(stat.st_mtime)
-                except (OSError, IOError):
-                    pass
+            source = source_files.get(rel_path)
+            target = target_files.get(rel_path)
 
             # Determine status
-            if source_path and target_path:
-                comparison.status = FileStatus.SAME  # Same name = same for this mode
-            elif source_path and not target_path:
-                comparison.status = FileStatus.MISSING_IN_TARGET
+            if source and target:
+                status = FileStatus.SAME  # Same name = same for this mode
+            elif source:
+                status = FileStatus.MISSING_IN_TARGET
             else:
-                comparison.status = FileStatus.EXTRA_IN_TARGET
+                status = FileStatus.EXTRA_IN_TARGET
 
-            comparisons.append(comparison)
+            comparisons.append(self._new_comparison(rel_path, status, source, target))
 
         return comparisons
 
     def _compare_by_size_name(
         self,
-        source_files: Dict[str, Path],
-        target_files: Dict[str, Path]
+        source_files: ScannedFiles,
+        target_files: ScannedFiles
     ) -> List[FileComparison]:
         """Compare files by size and name."""
         comparisons = []
         all_relative_paths = set(source_files.keys()) | set(target_files.keys())
 
         for rel_path in sorted(all_relative_paths):
-            source_path = source_files.get(rel_path)
-            target_path = target_files.get(rel_path)
-
-            comparison = FileComparison(relative_path=rel_path)
-
-            if source_path:
-                comparison.source_path = source_path
-                try:
-                    stat = source_path.stat()
-                    comparison.source_size = stat.st_size
-                    comparison.source_modified = datetime.fromtimestamp(stat.st_mtime)
-                except (OSError, IOError):
-                    pass
-
-            if target_path:
-                comparison.target_path = target_path
-                try:
-                    stat = target_path.stat()
-                    comparison.target_size = stat.st_size
-                    comparison.target_modified = datetime.fromtimestamp(stat.st_mtime)
-                except (OSError, IOError):
-                    pass
+            source = source_files.get(rel_path)
+            target = target_files.get(rel_path)
 
             # Determine status
-            if source_path and target_path:
-                if comparison.source_size == comparison.target_size:
-                    comparison.status = FileStatus.SAME
+            if source and target:
+                if source[1].st_size == target[1].st_size:
+                    status = FileStatus.SAME
                 else:
-                    comparison.status = FileStatus.DIFFERENT
-            elif source_path and not target_path:
-                comparison.status = FileStatus.MISSING_IN_TARGET
+                    status = FileStatus.DIFFERENT
+            elif source:
+                status = FileStatus.MISSING_IN_TARGET
             else:
-                comparison.status = FileStatus.EXTRA_IN_TARGET
+                status = FileStatus.EXTRA_IN_TARGET
 
-            comparisons.append(comparison)
+            comparisons.append(self._new_comparison(rel_path, status, source, target))
 
         return comparisons
 
@@ -517,6 +551,11 @@ class FolderComparator:
         except Exception as e:
             result.error = str(e)
 
+        finally:
+            # Commit and release the cache connection (reopened on next use)
+            if self.cache:
+                self.cache.close()
+
         result.end_time = datetime.now()
         return result
 
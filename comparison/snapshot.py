@@ -0,0 +1,533 @@
+"""
+Directory snapshots (Merkle trees) for fast tree comparison.
+
+A snapshot records every directory of a tree with its files (name, size,
+mtime, and optionally a content hash) and a digest computed bottom-up
+from its children: each file contributes its name, size, and content hash
+(or its mtime when the snapshot has no content hashes), and each
+subdirectory its name and digest. Two directories with equal digests hold
+the same tree, whatever their names.
+
+This makes three things cheap:
+- Comparing two snapshots descends only into subtrees whose digests differ
+- Refreshing a snapshot re-lists only directories whose mtime changed
+  (adding, removing, or renaming entries changes the directory mtime) and
+  re-hashes only files whose size or mtime changed
+- Duplicate folders are directories with equal digests
+
+Snapshots are stored as gzip-compressed JSON (one nested object per
+directory, file entries as [size, mtime_ns, hash] lists), written
+atomically.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.threading import create_io_executor
+from duplicates.hasher import FileHasher, HashAlgorithm
+from .folder_comparator import (
+    ComparisonMode,
+    ComparisonResult,
+    ComparisonStats,
+    FileComparison,
+    FileStatus
+)
+
+SNAPSHOT_VERSION = 1
+
+# Entries modified this close to (or after) the start of the previous scan
+# are re-checked on refresh: with coarse timestamps, a change made just
+# after the scan may carry the same mtime as the recorded entry
+RACY_WINDOW_NS = 2_000_000_000
+
+# File entry: (size, mtime_ns, content hash or None)
+FileEntry = Tuple[int, int, Optional[str]]
+
+
+def _directory_digest(files: Dict[str, FileEntry], dirs: Dict[str, "SnapshotNode"]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for name in sorted(files):
+        size, mtime_ns, content_hash = files[name]
+        identity = content_hash if content_hash is not None else mtime_ns
+        hasher.update(f"f\0{name}\0{size}\0{identity}\n".encode('utf-8', 'surrogateescape'))
+    for name in sorted(dirs):
+        hasher.update(f"d\0{name}\0{dirs[name].digest}\n".encode('utf-8', 'surrogateescape'))
+    return hasher.hexdigest()
+
+
+@dataclass
+class SnapshotNode:
+    """One directory of a snapshot."""
+    mtime_ns: int = 0
+    digest: str = ""
+    files: Dict[str, FileEntry] = field(default_factory=dict)
+    dirs: Dict[str, "SnapshotNode"] = field(default_factory=dict)
+    file_count: int = 0   # Files in this subtree
+    total_size: int = 0   # Bytes in this subtree
+
+    def update_digests(self) -> None:
+        """Recompute digests and totals of this subtree, bottom-up."""
+        for child in self.dirs.values():
+            child.update_digests()
+        self.update_digest()
+
+    def update_digest(self) -> None:
+        """Recompute digest and totals from the children (children first)."""
+        self.digest = _directory_digest(self.files, self.dirs)
+        self.file_count = len(self.files) + sum(d.file_count for d in self.dirs.values())
+        self.total_size = (
+            sum(entry[0] for entry in self.files.values())
+            + sum(d.total_size for d in self.dirs.values())
+        )
+
+    def iter_files(self, prefix: str = "") -> Iterator[Tuple[str, FileEntry]]:
+        """(relative path, entry) of every file in this subtree."""
+        for name, entry in self.files.items():
+            yield prefix + name, entry
+        for name, child in self.dirs.items():
+            yield from child.iter_files(prefix + name + os.sep)
+
+    def iter_dirs(self, prefix: str = "") -> Iterator[Tuple[str, "SnapshotNode"]]:
+        """(relative path, node) of this directory and every directory below it."""
+        yield prefix.rstrip(os.sep), self
+        for name, child in self.dirs.items():
+            yield from child.iter_dirs(prefix + name + os.sep)
+
+    def to_dict(self) -> dict:
+        return {
+            'm': self.mtime_ns,
+            'd': self.digest,
+            'f': {name: list(entry) for name, entry in self.files.items()},
+            's': {name: child.to_dict() for name, child in self.dirs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SnapshotNode":
+        node = cls(
+            mtime_ns=data['m'],
+            files={name: tuple(entry) for name, entry in data['f'].items()},
+            dirs={name: cls.from_dict(child) for name, child in data['s'].items()},
+        )
+        node.update_digest()
+        if node.digest != data['d']:
+            raise ValueError("Snapshot digest mismatch (corrupt snapshot)")
+        return node
+
+
+class DirectorySnapshot:
+    """
+    Merkle-tree snapshot of a directory tree.
+
+    Example:
+        >>> snapshot = DirectorySnapshot.create('/data', hash_content=True)
+        >>> snapshot.save('/backups/data.snapshot')
+        >>> # Later: only changed directories are re-listed
+        >>> snapshot = DirectorySnapshot.load('/backups/data.snapshot')
+        >>> snapshot.refresh()
+        >>> result = compare_snapshots(snapshot, backup_snapshot)
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        hash_content: bool = False,
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize an empty snapshot (use create() or load()).
+
+        Args:
+            root: Directory the snapshot describes
+            hash_content: Record content hashes (otherwise files are
+                identified by size and mtime)
+            algorithm: Content hash algorithm
+            max_workers: Max hashing threads (None = auto-detect)
+        """
+        self.root = Path(root)
+        self.hash_content = hash_content
+        self.algorithm = algorithm
+        self.max_workers = max_workers
+        self.created: Optional[datetime] = None
+        self.scanned_ns = 0  # Start of the last scan (time.time_ns())
+        self.tree = SnapshotNode()
+
+    @classmethod
+    def create(
+        cls,
+        root: str | Path,
+        hash_content: bool = False,
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> "DirectorySnapshot":
+        """
+        Snapshot a directory tree.
+
+        Args:
+            root: Directory to snapshot
+            hash_content: Record content hashes
+            algorithm: Content hash algorithm
+            max_workers: Max hashing threads (None = auto-detect)
+            progress_callback: Optional callback(hashed, total) while hashing
+
+        Returns:
+            DirectorySnapshot
+        """
+        snapshot = cls(root, hash_content, algorithm, max_workers)
+        if not snapshot.root.is_dir():
+            raise ValueError(f"Directory not found: {snapshot.root}")
+        snapshot.refresh(trust_directory_mtime=False, progress_callback=progress_callback)
+        return snapshot
+
+    @property
+    def digest(self) -> str:
+        """Digest of the whole tree."""
+        return self.tree.digest
+
+    def node(self, relative_path: str = "") -> Optional[SnapshotNode]:
+        """Node of a directory by relative path ("" = root)."""
+        node = self.tree
+        for part in Path(relative_path).parts:
+            node = node.dirs.get(part)
+            if node is None:
+                return None
+        return node
+
+    def refresh(
+        self,
+        trust_directory_mtime: bool = True,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Bring the snapshot up to date with the directory tree.
+
+        Directories whose mtime is unchanged keep their recorded entries
+        without being listed. Writing to an existing file in place does
+        not change its directory's mtime, so with trust_directory_mtime
+        such edits are missed (saves through a temporary file and rename
+        are seen); set it to False to stat every file. Either way, files
+        are re-hashed only when their size or mtime changed. Entries
+        modified within RACY_WINDOW_NS of the previous scan are re-checked.
+
+        Args:
+            trust_directory_mtime: Skip directories whose mtime is unchanged
+            progress_callback: Optional callback(hashed, total) while hashing
+
+        Returns:
+            Number of directories that were listed
+        """
+        to_hash: List[Tuple[SnapshotNode, str, Path]] = []
+        listed = 0
+        scan_started_ns = time.time_ns()
+        settled_ns = self.scanned_ns - RACY_WINDOW_NS
+
+        def scan(directory: Path, old: Optional[SnapshotNode]) -> Optional[SnapshotNode]:
+            nonlocal listed
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                return None
+
+            node = SnapshotNode(mtime_ns=mtime_ns)
+            if (trust_directory_mtime and old is not None
+                    and old.mtime_ns == mtime_ns and mtime_ns < settled_ns):
+                # Entries unchanged; subdirectories may still have changed
+                node.files = dict(old.files)
+                subdirs = list(old.dirs)
+            else:
+                listed += 1
+                subdirs = []
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    entries = []
+
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.name)
+                            continue
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+
+                    previous = old.files.get(entry.name) if old else None
+                    if (previous and previous[0] == st.st_size
+                            and previous[1] == st.st_mtime_ns and st.st_mtime_ns < settled_ns):
+                        node.files[entry.name] = previous
+                    else:
+                        node.files[entry.name] = (st.st_size, st.st_mtime_ns, None)
+                        if self.hash_content:
+                            to_hash.append((node, entry.name, Path(entry.path)))
+
+            for name in subdirs:
+                child = scan(directory / name, old.dirs.get(name) if old else None)
+                if child is not None:
+                    node.dirs[name] = child
+            return node
+
+        tree = scan(self.root, self.tree)
+        if tree is None:
+            raise ValueError(f"Directory not found: {self.root}")
+
+        self._hash_files(to_hash, progress_callback)
+
+        tree.update_digests()
+        self.tree = tree
+        self.created = datetime.now()
+        self.scanned_ns = scan_started_ns
+        return listed
+
+    def _hash_files(
+        self,
+        to_hash: List[Tuple[SnapshotNode, str, Path]],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> None:
+        if not to_hash:
+            return
+
+        hasher = FileHasher(algorithm=self.algorithm, max_workers=self.max_workers)
+        total = len(to_hash)
+        completed = 0
+
+        with create_io_executor(max_workers=self.max_workers, thread_name_prefix="SnapshotHash") as executor:
+            futures = {
+                executor.submit(hasher.compute_full_hash, path): (node, name)
+                for node, name, path in to_hash
+            }
+            for future, (node, name) in futures.items():
+                size, mtime_ns, _ = node.files[name]
+                node.files[name] = (size, mtime_ns, future.result())
+
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total)
+
+    def save(self, path: str | Path) -> None:
+        """Write the snapshot (gzip-compressed JSON, atomically)."""
+        path = Path(path)
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'root': str(self.root),
+            'hash_content': self.hash_content,
+            'algorithm': self.algorithm.value,
+            'created': self.created.isoformat() if self.created else None,
+            'scanned_ns': self.scanned_ns,
+            'tree': self.tree.to_dict(),
+        }
+        temp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path, max_workers: Optional[int] = None) -> "DirectorySnapshot":
+        """
+        Read a snapshot written by save().
+
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+            snapshot = cls(
+                data['root'],
+                hash_content=data['hash_content'],
+                algorithm=HashAlgorithm(data['algorithm']),
+                max_workers=max_workers
+            )
+            snapshot.tree = SnapshotNode.from_dict(data['tree'])
+        except (OSError, KeyError, TypeError, EOFError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid snapshot {path}: {e}") from e
+
+        snapshot.scanned_ns = data.get('scanned_ns', 0)
+        if data.get('created'):
+            snapshot.created = datetime.fromisoformat(data['created'])
+        return snapshot
+
+
+def _files_match(source: FileEntry, target: FileEntry) -> bool:
+    if source[0] != target[0]:
+        return False
+    if source[2] is not None and target[2] is not None:
+        return source[2] == target[2]
+    return source[1] == target[1]
+
+
+def compare_snapshots(
+    source: DirectorySnapshot,
+    target: DirectorySnapshot,
+    include_same: bool = False
+) -> ComparisonResult:
+    """
+    Compare two snapshots, descending only into subtrees that differ.
+
+    Files are the same if their content hashes match (when both snapshots
+    have them), otherwise if size and mtime match.
+
+    Args:
+        source: Source snapshot
+        target: Target snapshot
+        include_same: Also list files of identical subtrees (they are always
+            counted in the stats)
+
+    Returns:
+        ComparisonResult (mode CONTENT_HASH when both snapshots have content
+        hashes, otherwise SIZE_NAME)
+    """
+    hashed = source.hash_content and target.hash_content
+    result = ComparisonResult(
+        source_dir=source.root,
+        target_dir=target.root,
+        mode=ComparisonMode.CONTENT_HASH if hashed else ComparisonMode.SIZE_NAME,
+        start_time=datetime.now()
+    )
+    stats = result.stats = ComparisonStats()
+
+    def add(relative_path: str, status: FileStatus,
+            source_entry: Optional[FileEntry], target_entry: Optional[FileEntry]) -> None:
+        comparison = FileComparison(relative_path=relative_path, status=status)
+        if source_entry:
+            comparison.source_path = source.root / relative_path
+            comparison.source_size = source_entry[0]
+            comparison.source_modified = datetime.fromtimestamp(source_entry[1] / 1e9)
+            comparison.source_hash = source_entry[2]
+            stats.total_source_size += source_entry[0]
+        if target_entry:
+            comparison.target_path = target.root / relative_path
+            comparison.target_size = target_entry[0]
+            comparison.target_modified = datetime.fromtimestamp(target_entry[1] / 1e9)
+            comparison.target_hash = target_entry[2]
+            stats.total_target_size += target_entry[0]
+
+        stats.total_files += 1
+        if status == FileStatus.SAME:
+            stats.same_files += 1
+            stats.duplicate_size += comparison.source_size
+        elif status == FileStatus.DIFFERENT:
+            stats.different_files += 1
+        elif status == FileStatus.MISSING_IN_TARGET:
+            stats.missing_in_target += 1
+            stats.missing_size += comparison.source_size
+        else:
+            stats.extra_in_target += 1
+            stats.extra_size += comparison.target_size
+        result.comparisons.append(comparison)
+
+    def descend(source_node: SnapshotNode, target_node: SnapshotNode, prefix: str) -> None:
+        if source_node.digest == target_node.digest:
+            if include_same:
+                for relative_path, entry in source_node.iter_files(prefix):
+                    add(relative_path, FileStatus.SAME, entry, entry)
+            else:
+                stats.total_files += source_node.file_count
+                stats.same_files += source_node.file_count
+                stats.duplicate_size += source_node.total_size
+                stats.total_source_size += source_node.total_size
+                stats.total_target_size += target_node.total_size
+            return
+
+        for name in sorted(source_node.files.keys() | target_node.files.keys()):
+            source_entry = source_node.files.get(name)
+            target_entry = target_node.files.get(name)
+            if source_entry and target_entry:
+                status = FileStatus.SAME if _files_match(source_entry, target_entry) else FileStatus.DIFFERENT
+                if status == FileStatus.DIFFERENT or include_same:
+                    add(prefix + name, status, source_entry, target_entry)
+                else:
+                    stats.total_files += 1
+                    stats.same_files += 1
+                    stats.duplicate_size += source_entry[0]
+                    stats.total_source_size += source_entry[0]
+                    stats.total_target_size += target_entry[0]
+            elif source_entry:
+                add(prefix + name, FileStatus.MISSING_IN_TARGET, source_entry, None)
+            else:
+                add(prefix + name, FileStatus.EXTRA_IN_TARGET, None, target_entry)
+
+        for name in sorted(source_node.dirs.keys() | target_node.dirs.keys()):
+            source_child = source_node.dirs.get(name)
+            target_child = target_node.dirs.get(name)
+            child_prefix = prefix + name + os.sep
+            if source_child and target_child:
+                descend(source_child, target_child, child_prefix)
+            elif source_child:
+                for relative_path, entry in source_child.iter_files(child_prefix):
+                    add(relative_path, FileStatus.MISSING_IN_TARGET, entry, None)
+            else:
+                for relative_path, entry in target_child.iter_files(child_prefix):
+                    add(relative_path, FileStatus.EXTRA_IN_TARGET, None, entry)
+
+    descend(source.tree, target.tree, "")
+    result.comparisons.sort(key=lambda c: c.relative_path)
+    result.end_time = datetime.now()
+    return result
+
+
+def find_duplicate_folders(
+    snapshots: List[DirectorySnapshot],
+    min_size: int = 1
+) -> List[List[Path]]:
+    """
+    Find folders with identical trees, within and across snapshots.
+
+    Only the outermost duplicates are reported: once two folders match,
+    their matching subfolders are not listed again, unless they also
+    match folders elsewhere. Folder names do not matter. Without content hashes, files are identified by
+    size and mtime, so use hashed snapshots for reliable results.
+
+    Args:
+        snapshots: Snapshots to search
+        min_size: Ignore folders holding fewer bytes than this
+
+    Returns:
+        Groups of 2+ folder paths, largest folders first
+    """
+    # Every folder with its parent, counted by digest
+    folders: Dict[str, List[Tuple[Path, Optional[Path], Optional[str]]]] = defaultdict(list)
+    sizes: Dict[str, int] = {}
+    for snapshot in snapshots:
+        stack: List[Tuple[Path, SnapshotNode, Optional[Path], Optional[str]]] = [
+            (snapshot.root, snapshot.tree, None, None)
+        ]
+        while stack:
+            path, node, parent, parent_digest = stack.pop()
+            if node.file_count and node.total_size >= min_size:
+                folders[node.digest].append((path, parent, parent_digest))
+                sizes[node.digest] = node.total_size
+            stack.extend((path / name, child, path, node.digest) for name, child in node.dirs.items())
+
+    groups = []
+    for digest, members in folders.items():
+        if len(members) < 2:
+            continue
+        # Implied by a duplicate parent group: one member in each of
+        # several folders that are themselves duplicates
+        parent_digests = {parent_digest for _, _, parent_digest in members}
+        parents = [parent for _, parent, _ in members]
+        if (len(parent_digests) == 1 and None not in parent_digests
+                and len(folders.get(next(iter(parent_digests)), ())) >= 2
+                and len(set(parents)) == len(parents)):
+            continue
+        groups.append((sizes[digest], sorted(path for path, _, _ in members)))
+
+    groups.sort(key=lambda group: (-group[0], group[1]))
+    return [paths for _, paths in groups]
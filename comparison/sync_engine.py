@@ -9,11 +9,15 @@ Features:
 - Conflict resolution strategies
 - Progress callbacks
 - Operation logging for undo
+- Delta updates of large changed files (only changed blocks are written)
+- Parallel, dependency-ordered execution with per-device concurrency limits
+- Cost estimation (files, bytes, time) for dry runs
 """
 
 import json
 import shutil
 import sys
+import threading
 from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -24,6 +28,9 @@ from typing import Callable, Dict, List, Optional, Tuple
 # Add parent directory to path for core imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.logger import get_logger
+from core.threading import get_optimal_io_workers
+from operations.scheduler import DeviceClass, IOScheduler
+from .delta import DELTA_MIN_SIZE, DeltaTransfer
 from .folder_comparator import (
     FolderComparator,
     ComparisonResult,
@@ -31,6 +38,7 @@ from .folder_comparator import (
     FileStatus,
     ComparisonMode
 )
+from .sync_plan import SyncEstimate, SyncPlan
 
 logger = get_logger(__name__)
 
@@ -83,6 +91,7 @@ class SyncOperation:
     success: bool = False
     error: Optional[str] = None
     timestamp: Optional[datetime] = None
+    bytes_transferred: int = 0  # Bytes written (changed blocks only for delta updates)
 
 
 @dataclass
@@ -96,6 +105,7 @@ class SyncResult:
     end_time: Optional[datetime] = None
     error: Optional[str] = None
     dry_run: bool = False
+    estimate: Optional[SyncEstimate] = None  # Cost of the plan (dry runs)
 
     @property
     def duration(self) -> float:
@@ -123,7 +133,7 @@ class SyncResult:
     def total_bytes_transferred(self) -> int:
         """Total bytes transferred in successful operations."""
         return sum(
-            op.size for op in self.operations
+            op.bytes_transferred for op in self.operations
             if op.success and op.action in [
                 SyncAction.COPY_TO_TARGET,
                 SyncAction.COPY_TO_SOURCE,
@@ -159,7 +169,11 @@ class SyncEngine:
     def __init__(
         self,
         conflict_resolution: ConflictResolution = ConflictResolution.NEWER_WINS,
-        log_file: Optional[Path] = None
+        log_file: Optional[Path] = None,
+        delta_min_size: Optional[int] = DELTA_MIN_SIZE,
+        max_workers: Optional[int] = None,
+        device_limits: Optional[Dict[DeviceClass, int]] = None,
+        cache_path: Optional[Path] = None
     ):
         """
         Initialize sync engine.
@@ -167,8 +181,21 @@ class SyncEngine:
         Args:
             conflict_resolution: Strategy for resolving conflicts
             log_file: Path to operation log file (for undo capability)
+            delta_min_size: Update files of at least this size with a delta
+                transfer instead of a full copy (None = always copy)
+            max_workers: Max operations running at once (None = auto-detect)
+            device_limits: Concurrent operations per device, by device class
+                (missing classes use the operations scheduler defaults)
+            cache_path: Hash cache database for content comparisons
+                (default: the FolderComparator default)
         """
         self.conflict_resolution = conflict_resolution
+        self.delta_min_size = delta_min_size
+        self._delta = DeltaTransfer()
+        self.max_workers = max_workers or get_optimal_io_workers()
+        self.device_limits = device_limits
+        self.cache_path = cache_path
+        self._log_lock = threading.Lock()
         self.log_file = log_file or (
             Path.home() / '.cache' / 'smart_search' / 'sync_operations.jsonl'
         )
@@ -313,12 +340,17 @@ class SyncEngine:
 
         return operations, conflicts
 
-    def _execute_operation(self, operation: SyncOperation) -> None:
+    def _execute_operation(
+        self,
+        operation: SyncOperation,
+        transfer_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> None:
         """
         Execute a single sync operation.
 
         Args:
             operation: Operation to execute
+            transfer_callback: Optional callback(relative_path, bytes_transferred, total)
 
         Raises:
             Exception on operation failure
@@ -330,14 +362,12 @@ class SyncEngine:
             if operation.action == SyncAction.COPY_TO_TARGET:
                 # Copy source to target
                 if operation.target_path:
-                    operation.target_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(operation.source_path, operation.target_path)
+                    self._copy_file(operation, operation.source_path, operation.target_path, transfer_callback)
 
             elif operation.action == SyncAction.COPY_TO_SOURCE:
                 # Copy target to source
                 if operation.source_path:
-                    operation.source_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(operation.target_path, operation.source_path)
+                    self._copy_file(operation, operation.target_path, operation.source_path, transfer_callback)
 
             elif operation.action == SyncAction.DELETE_FROM_TARGET:
                 # Delete from target
@@ -352,14 +382,12 @@ class SyncEngine:
             elif operation.action == SyncAction.UPDATE_TARGET:
                 # Update target with source
                 if operation.target_path:
-                    operation.target_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(operation.source_path, operation.target_path)
+                    self._update_file(operation, operation.source_path, operation.target_path, transfer_callback)
 
             elif operation.action == SyncAction.UPDATE_SOURCE:
                 # Update source with target
                 if operation.source_path:
-                    operation.source_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(operation.target_path, operation.source_path)
+                    self._update_file(operation, operation.target_path, operation.source_path, transfer_callback)
 
             operation.success = True
 
@@ -369,6 +397,48 @@ class SyncEngine:
             logger.error(f"Failed to execute operation: {operation.action.value} - {e}")
             raise
 
+    def _copy_file(
+        self,
+        operation: SyncOperation,
+        src: Path,
+        dst: Path,
+        transfer_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> None:
+        """Copy a whole file, with metadata."""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+        operation.bytes_transferred = dst.stat().st_size
+        if transfer_callback:
+            transfer_callback(operation.relative_path, operation.bytes_transferred, operation.bytes_transferred)
+
+    def _update_file(
+        self,
+        operation: SyncOperation,
+        src: Path,
+        dst: Path,
+        transfer_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> None:
+        """
+        Bring an existing file up to date: large files by delta transfer
+        (only changed blocks are written), others by a full copy.
+        """
+        if (self.delta_min_size is None or not dst.is_file()
+                or min(src.stat().st_size, dst.stat().st_size) < self.delta_min_size):
+            self._copy_file(operation, src, dst, transfer_callback)
+            return
+
+        def progress(transferred: int, total: int) -> None:
+            if transfer_callback:
+                transfer_callback(operation.relative_path, transferred, total)
+
+        result = self._delta.update_file(src, dst, progress)
+        shutil.copystat(src, dst)
+        operation.bytes_transferred = result.literal_bytes
+        logger.debug(
+            f"Delta update {operation.relative_path}: {result.literal_bytes} of "
+            f"{result.file_size} bytes written ({'in place' if result.in_place else 'rebuilt'})"
+        )
+
     def _log_operation(self, operation: SyncOperation, result: SyncResult) -> None:
         """
         Log operation to file for undo capability.
@@ -391,12 +461,40 @@ class SyncEngine:
                 'error': operation.error
             }
 
-            with open(self.log_file, 'a') as f:
+            with self._log_lock, open(self.log_file, 'a') as f:
                 f.write(json.dumps(log_entry) + '\n')
 
         except Exception as e:
             logger.error(f"Failed to log operation: {e}")
 
+    @staticmethod
+    def _write_path(operation: SyncOperation) -> Optional[Path]:
+        """Path an operation writes to (None for deletions)."""
+        if operation.action in (SyncAction.COPY_TO_TARGET, SyncAction.UPDATE_TARGET):
+            return operation.target_path
+        if operation.action in (SyncAction.COPY_TO_SOURCE, SyncAction.UPDATE_SOURCE):
+            return operation.source_path
+        return None
+
+    def plan(self, operations: List[SyncOperation]) -> SyncPlan:
+        """
+        Build the dependency-ordered execution plan of a list of operations.
+
+        Args:
+            operations: Operations in plan order
+
+        Returns:
+            SyncPlan on a scheduler with this engine's device limits
+        """
+        return SyncPlan(
+            operations,
+            write_path=self._write_path,
+            is_deletion=lambda op: op.action in (
+                SyncAction.DELETE_FROM_TARGET, SyncAction.DELETE_FROM_SOURCE
+            ),
+            scheduler=IOScheduler(self.device_limits)
+        )
+
     def sync(
         self,
         source: str | Path,
@@ -408,7 +506,8 @@ class SyncEngine:
         dry_run: bool = False,
         comparison_mode: ComparisonMode = ComparisonMode.CONTENT_HASH,
         recursive: bool = True,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        transfer_callback: Optional[Callable[[str, int, int], None]] = None
     ) -> SyncResult:
         """
         Synchronize two directories.
@@ -420,10 +519,15 @@ class SyncEngine:
             delete_extra: Delete extra files from target
             update_different: Update files that are different
             bidirectional: Enable bidirectional sync
-            dry_run: Preview operations without executing
+            dry_run: Preview operations without executing (and estimate their cost)
             comparison_mode: Mode for comparing files
             recursive: Recursively sync subdirectories
-            progress_callback: Optional callback(completed, total)
+            progress_callback: Optional callback(completed, total) per operation
+            transfer_callback: Optional callback(relative_path, bytes_transferred, total)
+                per copied or updated file
+
+        Operations run in parallel (up to max_workers, and per device up to
+        the device limits), so callbacks are called from worker threads.
 
         Returns:
             SyncResult with operation details
@@ -440,7 +544,7 @@ class SyncEngine:
 
         try:
             # Step 1: Compare directories
-            comparator = FolderComparator(mode=comparison_mode)
+            comparator = FolderComparator(mode=comparison_mode, cache_path=self.cache_path)
             comparison_result = comparator.compare(
                 source=source_dir,
                 target=target_dir,
@@ -463,20 +567,29 @@ class SyncEngine:
             result.operations = operations
             result.conflicts = conflicts
 
-            # Step 3: Execute operations (if not dry run)
-            if not dry_run:
+            # Step 3: Estimate (dry run) or execute the plan
+            plan = self.plan(operations)
+            if dry_run:
+                result.estimate = plan.estimate(self.max_workers)
+            else:
                 total = len(operations)
-                for idx, operation in enumerate(operations):
-                    try:
-                        self._execute_operation(operation)
-                        self._log_operation(operation, result)
-
+                completed = 0
+                progress_lock = threading.Lock()
+
+                def on_complete(operation: SyncOperation) -> None:
+                    nonlocal completed
+                    self._log_operation(operation, result)
+                    with progress_lock:
+                        completed += 1
                         if progress_callback:
-                            progress_callback(idx + 1, total)
+                            progress_callback(completed, total)
 
-                    except Exception as e:
-                        # Continue with remaining operations even if one fails
-                        logger.error(f"Operation failed: {operation.relative_path} - {e}")
+                # Failed operations are logged; the remaining ones still run
+                plan.run(
+                    lambda operation: self._execute_operation(operation, transfer_callback),
+                    self.max_workers,
+                    on_complete
+                )
 
         except Exception as e:
             result.error = str(e)
@@ -565,6 +678,14 @@ def format_sync_summary(result: SyncResult) -> str:
         "=" * 80
     ]
 
+    if result.estimate:
+        estimate = result.estimate
+        lines[-1:-1] = [
+            f"Estimated Files:       {estimate.files} ({estimate.bytes:,} bytes)",
+            f"Estimated Deletions:   {estimate.deletions}",
+            f"Estimated Time:        {estimate.estimated_seconds:.1f}s",
+        ]
+
     # Group operations by type
     if result.operations:
         action_counts = defaultdict(int)
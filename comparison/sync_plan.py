@@ -0,0 +1,330 @@
+"""
+Sync Plan - Dependency-ordered, device-aware execution of sync operations.
+
+The flat operation list built by SyncEngine is turned into a dependency
+graph:
+- destination directories are created before the files in them (and
+  parents before children)
+- operations on the same relative path run in plan order, so both sides
+  of a bidirectional pair never overlap
+- deletions run after every copy and update has finished, so a sync that
+  stops half way has removed nothing it had not already replaced
+
+Ready steps are dispatched through the operations IOScheduler, which caps
+concurrent steps per device (one at a time on a spinning disk, several on
+SSDs), on a bounded pool of worker threads.
+
+Dry runs can estimate the cost of a plan (files, bytes, directories,
+deletions, and time) from assumed throughputs per device class.
+"""
+
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.logger import get_logger
+from core.threading import create_io_executor
+from operations.scheduler import DeviceClass, DeviceInfo, IOScheduler
+
+if TYPE_CHECKING:
+    from .sync_engine import SyncOperation
+
+logger = get_logger(__name__)
+
+# Assumed sustained throughput per device class (bytes/second), for estimates
+ESTIMATED_THROUGHPUT: Dict[DeviceClass, float] = {
+    DeviceClass.HDD: 120 * 1024 * 1024,
+    DeviceClass.SSD: 500 * 1024 * 1024,
+    DeviceClass.NETWORK: 60 * 1024 * 1024,
+    DeviceClass.UNKNOWN: 100 * 1024 * 1024,
+}
+
+# Assumed fixed cost per file operation (seconds: open, create, metadata), for estimates
+ESTIMATED_FILE_OVERHEAD: Dict[DeviceClass, float] = {
+    DeviceClass.HDD: 0.010,
+    DeviceClass.SSD: 0.0005,
+    DeviceClass.NETWORK: 0.020,
+    DeviceClass.UNKNOWN: 0.002,
+}
+
+# Scheduler priorities: directories unblock their files, deletions go last
+_PRIORITY_DIRECTORY = 0
+_PRIORITY_TRANSFER = 1
+_PRIORITY_DELETE = 2
+
+# Seconds a worker waits for a dispatchable step before re-checking for completion
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class SyncEstimate:
+    """Estimated cost of executing a sync plan."""
+    files: int = 0                # Files copied or updated
+    bytes: int = 0                # Bytes copied or updated (delta updates counted in full)
+    directories: int = 0          # Directories to create
+    deletions: int = 0            # Files to delete
+    estimated_seconds: float = 0.0
+    device_seconds: Dict[int, float] = field(default_factory=dict)  # Busy time per device (st_dev)
+
+
+@dataclass
+class _Step:
+    """Node of the plan graph: an operation, a directory to create, or a barrier."""
+    key: str
+    priority: int
+    operation: Optional["SyncOperation"] = None
+    directory: Optional[Path] = None
+    devices: Tuple[DeviceInfo, ...] = ()
+    waiting: int = 0
+    dependents: List["_Step"] = field(default_factory=list)
+
+
+class SyncPlan:
+    """
+    Dependency graph of sync operations.
+
+    Example:
+        >>> plan = SyncPlan(operations, write_path=destination_of, is_deletion=is_delete)
+        >>> print(plan.estimate().estimated_seconds)
+        >>> plan.run(engine_execute, max_workers=8)
+    """
+
+    def __init__(
+        self,
+        operations: List["SyncOperation"],
+        write_path: Callable[["SyncOperation"], Optional[Path]],
+        is_deletion: Callable[["SyncOperation"], bool],
+        scheduler: Optional[IOScheduler] = None
+    ):
+        """
+        Build the plan.
+
+        Args:
+            operations: SyncOperation list, in plan order
+            write_path: Path an operation writes to (None for deletions)
+            is_deletion: Whether an operation deletes a file
+            scheduler: Device-aware scheduler (default: default device limits)
+        """
+        self.operations = operations
+        self.scheduler = scheduler or IOScheduler()
+        self._steps: Dict[str, _Step] = {}
+        self._device_cache: Dict[str, Optional[DeviceInfo]] = {}
+        self._directory_steps: Dict[str, Optional[_Step]] = {}
+
+        last_by_path: Dict[str, _Step] = {}
+        transfers: List[_Step] = []
+        deletions: List[_Step] = []
+
+        for index, operation in enumerate(operations):
+            deleting = is_deletion(operation)
+            step = _Step(
+                key=f"op:{index}",
+                priority=_PRIORITY_DELETE if deleting else _PRIORITY_TRANSFER,
+                operation=operation,
+                devices=self._devices_for(
+                    path.parent for path in (operation.source_path, operation.target_path) if path
+                )
+            )
+            self._steps[step.key] = step
+
+            # Same relative path: keep plan order
+            path_key = os.path.normcase(operation.relative_path)
+            previous = last_by_path.get(path_key)
+            if previous is not None:
+                self._depend(step, previous)
+            last_by_path[path_key] = step
+
+            destination = write_path(operation)
+            if destination is not None:
+                directory_step = self._directory_step(destination.parent)
+                if directory_step is not None:
+                    self._depend(step, directory_step)
+
+            (deletions if deleting else transfers).append(step)
+
+        # Deletions wait for every transfer, through one barrier step
+        if deletions and transfers:
+            barrier = _Step(key="barrier:transfers", priority=_PRIORITY_TRANSFER)
+            self._steps[barrier.key] = barrier
+            for step in transfers:
+                self._depend(barrier, step)
+            for step in deletions:
+                self._depend(step, barrier)
+
+    @property
+    def step_count(self) -> int:
+        """Number of steps (operations, directories, and barriers)."""
+        return len(self._steps)
+
+    def _depend(self, step: _Step, prerequisite: _Step) -> None:
+        prerequisite.dependents.append(step)
+        step.waiting += 1
+
+    def _device_of(self, directory: Path) -> Optional[DeviceInfo]:
+        """Device of a directory, resolved once per directory."""
+        key = str(directory)
+        if key not in self._device_cache:
+            self._device_cache[key] = self.scheduler.device_of(key)
+        return self._device_cache[key]
+
+    def _devices_for(self, directories) -> Tuple[DeviceInfo, ...]:
+        devices = {}
+        for directory in directories:
+            info = self._device_of(directory)
+            if info is not None:
+                devices.setdefault(info.device, info)
+        return tuple(devices.values())
+
+    def _directory_step(self, directory: Path) -> Optional[_Step]:
+        """Step creating a missing directory (and its missing parents), None if it exists."""
+        key = os.path.normcase(str(directory))
+        if key in self._directory_steps:
+            return self._directory_steps[key]
+
+        step = None
+        if not directory.is_dir():
+            step = _Step(
+                key=f"dir:{directory}",
+                priority=_PRIORITY_DIRECTORY,
+                directory=directory,
+                devices=self._devices_for([directory])
+            )
+            self._steps[step.key] = step
+            if directory.parent != directory:
+                parent_step = self._directory_step(directory.parent)
+                if parent_step is not None:
+                    self._depend(step, parent_step)
+
+        self._directory_steps[key] = step
+        return step
+
+    def estimate(self, max_workers: int = 1) -> SyncEstimate:
+        """
+        Estimate the cost of running the plan.
+
+        Every device accumulates the transfer time of the bytes it reads or
+        writes, plus the fixed per-file cost spread over its concurrency
+        limit. Devices work in parallel, so the plan takes as long as its
+        busiest device, or as long as the worker pool needs if that is
+        slower.
+
+        Args:
+            max_workers: Worker threads the plan would run on
+
+        Returns:
+            SyncEstimate
+        """
+        estimate = SyncEstimate()
+        serial_seconds = 0.0
+
+        for step in self._steps.values():
+            size = 0
+            if step.directory is not None:
+                estimate.directories += 1
+            elif step.operation is not None:
+                if step.priority == _PRIORITY_DELETE:
+                    estimate.deletions += 1
+                else:
+                    size = step.operation.size
+                    estimate.files += 1
+                    estimate.bytes += size
+            else:
+                continue
+
+            step_seconds = 0.0
+            for device in step.devices:
+                seconds = (
+                    size / ESTIMATED_THROUGHPUT[device.device_class]
+                    + ESTIMATED_FILE_OVERHEAD[device.device_class]
+                )
+                step_seconds = max(step_seconds, seconds)
+                estimate.device_seconds[device.device] = (
+                    estimate.device_seconds.get(device.device, 0.0)
+                    + size / ESTIMATED_THROUGHPUT[device.device_class]
+                    + ESTIMATED_FILE_OVERHEAD[device.device_class] / self.scheduler.limit_for(device)
+                )
+            serial_seconds += step_seconds
+
+        estimate.estimated_seconds = max(
+            max(estimate.device_seconds.values(), default=0.0),
+            serial_seconds / max(1, max_workers)
+        )
+        return estimate
+
+    def run(
+        self,
+        execute: Callable[["SyncOperation"], None],
+        max_workers: int,
+        on_complete: Optional[Callable[["SyncOperation"], None]] = None
+    ) -> None:
+        """
+        Execute the plan.
+
+        A failed step does not stop the plan: its dependents still run (a
+        copy whose directory could not be created fails on its own).
+
+        Args:
+            execute: Runs one SyncOperation (exceptions are logged)
+            max_workers: Worker threads
+            on_complete: Optional callback(operation) after each operation,
+                called from worker threads
+        """
+        lock = threading.Lock()
+        remaining = len(self._steps)
+        if not remaining:
+            return
+
+        for step in self._steps.values():
+            if not step.waiting:
+                self.scheduler.submit(step.key, step.priority, devices=step.devices)
+
+        def run_step(step: _Step) -> None:
+            if step.directory is not None:
+                try:
+                    step.directory.mkdir(exist_ok=True)
+                except OSError as e:
+                    logger.error(f"Failed to create directory {step.directory}: {e}")
+            elif step.operation is not None:
+                try:
+                    execute(step.operation)
+                except Exception as e:
+                    logger.error(f"Operation failed: {step.operation.relative_path} - {e}")
+                if on_complete:
+                    on_complete(step.operation)
+
+        def worker() -> None:
+            nonlocal remaining
+            while True:
+                with lock:
+                    if not remaining:
+                        return
+                key = self.scheduler.acquire(timeout=_POLL_INTERVAL)
+                if key is None:
+                    continue
+
+                step = self._steps[key]
+                try:
+                    run_step(step)
+                finally:
+                    self.scheduler.release(key)
+
+                ready = []
+                with lock:
+                    remaining -= 1
+                    for dependent in step.dependents:
+                        dependent.waiting -= 1
+                        if not dependent.waiting:
+                            ready.append(dependent)
+                for dependent in ready:
+                    self.scheduler.submit(dependent.key, dependent.priority, devices=dependent.devices)
+
+        workers = max(1, min(max_workers, remaining))
+        with create_io_executor(max_workers=workers, thread_name_prefix="SyncWorker") as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            for future in futures:
+                future.result()
@@ -4,6 +4,7 @@ Tests for folder comparison module
 Run with: python -m pytest comparison/test_comparison.py -v
 """
 
+import os
 import sys
 import tempfile
 from datetime import datetime
@@ -20,7 +21,12 @@ from comparison import (
     FileStatus,
     SyncEngine,
     ConflictResolution,
-    SyncAction
+    SyncAction,
+    SyncOperation,
+    DeltaTransfer,
+    DirectorySnapshot,
+    compare_snapshots,
+    find_duplicate_folders
 )
 
 
@@ -51,14 +57,20 @@ def temp_dirs():
         yield source, target
 
 
+@pytest.fixture
+def hash_cache_path(tmp_path):
+    """Temporary hash cache database, so tests never touch the user's cache."""
+    return tmp_path / 'hashes.db'
+
+
 class TestFolderComparator:
     """Test FolderComparator class."""
 
-    def test_basic_comparison(self, temp_dirs):
+    def test_basic_comparison(self, temp_dirs, hash_cache_path):
         """Test basic directory comparison."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=False)
 
         # Check statistics
@@ -68,11 +80,11 @@ class TestFolderComparator:
         assert result.stats.missing_in_target == 1  # missing.txt
         assert result.stats.extra_in_target == 1  # extra.txt
 
-    def test_recursive_comparison(self, temp_dirs):
+    def test_recursive_comparison(self, temp_dirs, hash_cache_path):
         """Test recursive directory comparison."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=True)
 
         # Should find nested file
@@ -106,14 +118,15 @@ class TestFolderComparator:
         # Both same.txt and different.txt exist in both
         assert result.stats.same_files >= 2
 
-    def test_extension_filter(self, temp_dirs):
+    def test_extension_filter(self, temp_dirs, hash_cache_path):
         """Test extension filtering."""
         source, target = temp_dirs
 
         # Only .txt files
         comparator = FolderComparator(
             mode=ComparisonMode.CONTENT_HASH,
-            extensions=['.txt']
+            extensions=['.txt'],
+            cache_path=hash_cache_path
         )
         result = comparator.compare(source, target, recursive=False)
 
@@ -121,14 +134,15 @@ class TestFolderComparator:
         for comp in result.comparisons:
             assert comp.relative_path.endswith('.txt')
 
-    def test_size_filter(self, temp_dirs):
+    def test_size_filter(self, temp_dirs, hash_cache_path):
         """Test size filtering."""
         source, target = temp_dirs
 
         # Only files >= 10 bytes
         comparator = FolderComparator(
             mode=ComparisonMode.CONTENT_HASH,
-            min_size=10
+            min_size=10,
+            cache_path=hash_cache_path
         )
         result = comparator.compare(source, target, recursive=False)
 
@@ -137,11 +151,11 @@ class TestFolderComparator:
             size = comp.source_size or comp.target_size
             assert size >= 10
 
-    def test_get_missing_files(self, temp_dirs):
+    def test_get_missing_files(self, temp_dirs, hash_cache_path):
         """Test getting missing files."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=False)
 
         missing = result.get_missing_files()
@@ -150,11 +164,11 @@ class TestFolderComparator:
         assert len(missing) == 1
         assert missing[0].relative_path == 'missing.txt'
 
-    def test_get_extra_files(self, temp_dirs):
+    def test_get_extra_files(self, temp_dirs, hash_cache_path):
         """Test getting extra files."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=False)
 
         extra = result.get_extra_files()
@@ -163,11 +177,11 @@ class TestFolderComparator:
         assert len(extra) == 1
         assert extra[0].relative_path == 'extra.txt'
 
-    def test_get_different_files(self, temp_dirs):
+    def test_get_different_files(self, temp_dirs, hash_cache_path):
         """Test getting different files."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=False)
 
         different = result.get_different_files()
@@ -176,25 +190,48 @@ class TestFolderComparator:
         assert len(different) == 1
         assert different[0].relative_path == 'different.txt'
 
-    def test_duration_tracking(self, temp_dirs):
+    def test_duration_tracking(self, temp_dirs, hash_cache_path):
         """Test duration tracking."""
         source, target = temp_dirs
 
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         result = comparator.compare(source, target, recursive=False)
 
         # Should have positive duration
         assert result.duration > 0
 
+    def test_tiered_content_comparison(self, temp_dirs, hash_cache_path):
+        """Test that only equal-size pairs are read, with cached hashes reused."""
+        source, target = temp_dirs
+        (source / 'resized.txt').write_text('short')
+        (target / 'resized.txt').write_text('much longer content')
+
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
+        result = comparator.compare(source, target, recursive=False)
+        by_path = {c.relative_path: c for c in result.comparisons}
+
+        assert by_path['resized.txt'].status == FileStatus.DIFFERENT
+        assert by_path['resized.txt'].source_hash is None
+        assert by_path['missing.txt'].source_hash is None
+        assert by_path['same.txt'].source_hash == by_path['same.txt'].target_hash
+        # The cache connection is released when compare() returns
+        assert comparator.cache._conn is None
+
+        # Identical pair is answered from the cache on the next run
+        hits = comparator.cache.stats.cache_hits
+        result = comparator.compare(source, target, recursive=False)
+        assert result.stats.same_files == 1
+        assert comparator.cache.stats.cache_hits == hits + 2
+
 
 class TestSyncEngine:
     """Test SyncEngine class."""
 
-    def test_sync_preview(self, temp_dirs):
+    def test_sync_preview(self, temp_dirs, hash_cache_path):
         """Test sync preview (dry run)."""
         source, target = temp_dirs
 
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -213,11 +250,11 @@ class TestSyncEngine:
         # Files should still be missing
         assert not (target / 'missing.txt').exists()
 
-    def test_copy_missing(self, temp_dirs):
+    def test_copy_missing(self, temp_dirs, hash_cache_path):
         """Test copying missing files."""
         source, target = temp_dirs
 
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -234,11 +271,11 @@ class TestSyncEngine:
         # Should have successful operations
         assert result.successful_operations > 0
 
-    def test_delete_extra(self, temp_dirs):
+    def test_delete_extra(self, temp_dirs, hash_cache_path):
         """Test deleting extra files."""
         source, target = temp_dirs
 
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -251,14 +288,14 @@ class TestSyncEngine:
         # Should have deleted extra.txt
         assert not (target / 'extra.txt').exists()
 
-    def test_conflict_resolution_newer_wins(self, temp_dirs):
+    def test_conflict_resolution_newer_wins(self, temp_dirs, hash_cache_path):
         """Test newer wins conflict resolution."""
         source, target = temp_dirs
 
         # Make source file newer
         (source / 'different.txt').write_text('newer source')
 
-        engine = SyncEngine(conflict_resolution=ConflictResolution.NEWER_WINS)
+        engine = SyncEngine(conflict_resolution=ConflictResolution.NEWER_WINS, cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -273,11 +310,11 @@ class TestSyncEngine:
         ]
         assert len(update_ops) > 0
 
-    def test_conflict_resolution_source_wins(self, temp_dirs):
+    def test_conflict_resolution_source_wins(self, temp_dirs, hash_cache_path):
         """Test source wins conflict resolution."""
         source, target = temp_dirs
 
-        engine = SyncEngine(conflict_resolution=ConflictResolution.SOURCE_WINS)
+        engine = SyncEngine(conflict_resolution=ConflictResolution.SOURCE_WINS, cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -293,11 +330,11 @@ class TestSyncEngine:
         # Should have operation to update different.txt
         assert any('different.txt' in op.relative_path for op in update_ops)
 
-    def test_operation_logging(self, temp_dirs):
+    def test_operation_logging(self, temp_dirs, hash_cache_path):
         """Test operation logging."""
         source, target = temp_dirs
 
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -317,11 +354,11 @@ class TestSyncEngine:
         assert 'action' in op
         assert 'relative_path' in op
 
-    def test_bytes_transferred(self, temp_dirs):
+    def test_bytes_transferred(self, temp_dirs, hash_cache_path):
         """Test bytes transferred tracking."""
         source, target = temp_dirs
 
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         result = engine.sync(
             source=source,
             target=target,
@@ -332,11 +369,106 @@ class TestSyncEngine:
         # Should have transferred bytes
         assert result.total_bytes_transferred > 0
 
+    def test_parallel_plan_order_and_estimate(self, temp_dirs, hash_cache_path):
+        """Test dependency-ordered parallel execution and dry-run estimates."""
+        source, target = temp_dirs
+        (source / 'a' / 'b').mkdir(parents=True)
+        for i in range(8):
+            (source / 'a' / 'b' / f'file{i}.txt').write_text(f'content {i}')
+
+        engine = SyncEngine(max_workers=4, cache_path=hash_cache_path)
+        preview = engine.sync(source, target, delete_extra=True, update_different=False, dry_run=True)
+        assert preview.estimate.files == 10  # a/b/*, missing.txt, subdir/nested.txt
+        assert preview.estimate.directories == 3  # a, a/b, subdir
+        assert preview.estimate.deletions == 1
+        assert preview.estimate.estimated_seconds > 0
+        assert not (target / 'a').exists()
+
+        order = []
+        plan = engine.plan(preview.operations)
+        plan.run(lambda op: (engine._execute_operation(op), order.append(op.action)), max_workers=4)
+
+        assert (target / 'a' / 'b' / 'file7.txt').read_text() == 'content 7'
+        assert not (target / 'extra.txt').exists()
+        assert order[-1] == SyncAction.DELETE_FROM_TARGET
+        assert all(op.success for op in preview.operations)
+
+    def test_delta_update_writes_changed_blocks_only(self, temp_dirs, hash_cache_path):
+        """Test delta updates of large changed files."""
+        source, target = temp_dirs
+        block = DeltaTransfer().block_size_for(64 * 1024)
+
+        old = bytes(range(256)) * 256
+        new = old[:block] + b'inserted' + old[block:]  # Shifts the tail
+        new = new[:-block] + b'x' * block  # Rewrites the last block
+        (source / 'big.bin').write_bytes(new)
+        (target / 'big.bin').write_bytes(old)
+
+        engine = SyncEngine(delta_min_size=1024, cache_path=hash_cache_path)
+        operation = SyncOperation(
+            action=SyncAction.UPDATE_TARGET,
+            relative_path='big.bin',
+            source_path=source / 'big.bin',
+            target_path=target / 'big.bin',
+            size=len(new)
+        )
+        transfers = []
+        engine._execute_operation(operation, lambda path, done, total: transfers.append(done))
+
+        assert (target / 'big.bin').read_bytes() == new
+        assert operation.success
+        assert 0 < operation.bytes_transferred < len(new) // 4
+        assert transfers[-1] == operation.bytes_transferred
+
+
+class TestDirectorySnapshot:
+    """Test Merkle-tree directory snapshots."""
+
+    def test_snapshot_compare_refresh_and_duplicates(self, temp_dirs):
+        """Test pruned comparison, incremental refresh, persistence, and duplicate folders."""
+        source, target = temp_dirs
+        (target / 'subdir').mkdir()
+        (target / 'subdir' / 'nested.txt').write_text('nested file')
+
+        # Backdate the target so its entries are past the racy-mtime window
+        old = datetime.now().timestamp() - 3600
+        for path in [*target.rglob('*'), target]:
+            os.utime(path, (old, old))
+
+        source_snapshot = DirectorySnapshot.create(source, hash_content=True)
+        target_snapshot = DirectorySnapshot.create(target, hash_content=True)
+
+        result = compare_snapshots(source_snapshot, target_snapshot)
+        statuses = {c.relative_path: c.status for c in result.comparisons}
+        assert statuses == {
+            'different.txt': FileStatus.DIFFERENT,
+            'extra.txt': FileStatus.EXTRA_IN_TARGET,
+            'missing.txt': FileStatus.MISSING_IN_TARGET,
+        }
+        assert result.stats.same_files == 2  # same.txt, subdir/nested.txt (pruned)
+
+        # Round trip, then refresh: unchanged directories are not listed
+        path = source.parent / f'{source.name}.snapshot'
+        try:
+            target_snapshot.save(path)
+            reloaded = DirectorySnapshot.load(path)
+        finally:
+            path.unlink(missing_ok=True)
+        assert reloaded.digest == target_snapshot.digest
+        assert reloaded.refresh() == 0
+
+        (target / 'subdir' / 'added.txt').write_text('new')
+        assert reloaded.refresh() == 1
+        assert reloaded.digest != target_snapshot.digest
+
+        duplicates = find_duplicate_folders([source_snapshot, target_snapshot])
+        assert [set(group) for group in duplicates] == [{source / 'subdir', target / 'subdir'}]
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
 
-    def test_empty_directories(self):
+    def test_empty_directories(self, hash_cache_path):
         """Test comparison of empty directories."""
         with tempfile.TemporaryDirectory() as source_dir, \
              tempfile.TemporaryDirectory() as target_dir:
@@ -344,38 +476,38 @@ class TestEdgeCases:
             source = Path(source_dir)
             target = Path(target_dir)
 
-            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
             result = comparator.compare(source, target)
 
             # Should have no files
             assert result.stats.total_files == 0
 
-    def test_nonexistent_source(self):
+    def test_nonexistent_source(self, hash_cache_path):
         """Test error handling for nonexistent source."""
         with tempfile.TemporaryDirectory() as target_dir:
             target = Path(target_dir)
             source = Path('/nonexistent/path')
 
-            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
             result = comparator.compare(source, target)
 
             # Should have error
             assert result.error is not None
 
-    def test_same_directory(self):
+    def test_same_directory(self, hash_cache_path):
         """Test comparing directory with itself."""
         with tempfile.TemporaryDirectory() as temp_dir:
             directory = Path(temp_dir)
             (directory / 'file.txt').write_text('content')
 
-            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+            comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
             result = comparator.compare(directory, directory)
 
             # All files should be same
             assert result.stats.same_files == result.stats.total_files
 
 
-def test_integration():
+def test_integration(hash_cache_path):
     """Test complete workflow."""
     with tempfile.TemporaryDirectory() as source_dir, \
          tempfile.TemporaryDirectory() as target_dir:
@@ -389,14 +521,14 @@ def test_integration():
         (target / 'file1.txt').write_text('content 1')
 
         # 1. Compare
-        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH)
+        comparator = FolderComparator(mode=ComparisonMode.CONTENT_HASH, cache_path=hash_cache_path)
         comparison_result = comparator.compare(source, target)
 
         assert comparison_result.stats.same_files == 1
         assert comparison_result.stats.missing_in_target == 1
 
         # 2. Preview sync
-        engine = SyncEngine()
+        engine = SyncEngine(cache_path=hash_cache_path)
         sync_preview = engine.sync(
             source=source,
             target=target,
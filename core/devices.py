@@ -0,0 +1,36 @@
+"""
+Block device helpers.
+
+Subsystems that tune their I/O to the storage underneath (read sizes for
+hashing, concurrency limits for file operations) ask here what kind of
+device backs a file.
+"""
+
+import os
+from typing import Optional
+
+
+def is_rotational(device: int) -> Optional[bool]:
+    """
+    Whether a block device is a spinning disk (Linux sysfs).
+
+    Args:
+        device: Device number (st_dev)
+
+    Returns:
+        True for rotational disks, False for solid-state devices, None if
+        unknown (other platforms, network and virtual filesystems)
+    """
+    try:
+        sys_path = os.path.realpath(f"/sys/dev/block/{os.major(device)}:{os.minor(device)}")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+    # Partitions keep the queue attributes in the parent device directory
+    for directory in (sys_path, os.path.dirname(sys_path)):
+        try:
+            with open(os.path.join(directory, "queue", "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
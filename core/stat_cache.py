@@ -0,0 +1,395 @@
+"""
+Process-wide stat cache with short TTL and generation-based invalidation.
+
+Several subsystems (search, filters, preview, duplicates, category views)
+stat the same file within a single user interaction. On network mounts each
+of those calls is a round trip, so they share one short-lived cache here.
+
+Invalidation:
+- Entries expire after a short TTL (default 2 seconds)
+- invalidate()/invalidate_tree() drop entries for paths known to have changed
+- bump_generation() lazily invalidates every entry at once (e.g. from a
+  filesystem watcher or after a bulk file operation)
+"""
+
+import logging
+import os
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass
+class StatCacheStats:
+    """Statistics for stat cache usage."""
+    hits: int = 0
+    misses: int = 0
+    syscalls: int = 0
+    scandir_calls: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Cache hit rate (0.0 to 1.0)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class StatCache:
+    """
+    Thread-safe cache of os.stat() results.
+
+    Failed lookups (missing files, permission errors) are cached as well so
+    repeated probes of a vanished path do not hit the filesystem again until
+    the entry expires.
+
+    Example:
+        >>> cache = get_stat_cache()
+        >>> st = cache.stat('/path/to/file.txt')
+        >>> results = cache.stat_many(['/a/1.txt', '/a/2.txt'])
+    """
+
+    DEFAULT_TTL = 2.0
+    DEFAULT_MAX_ENTRIES = 200_000
+
+    # Minimum number of uncached names in one directory before stat_many
+    # lists the directory instead of stat()ing each name individually
+    SCANDIR_THRESHOLD = 8
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize stat cache.
+
+        Args:
+            ttl: Time-to-live of cached results in seconds (0 disables caching)
+            max_entries: Maximum number of cached paths before LRU eviction
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = StatCacheStats()
+        self._generation = 0
+        # key -> (stat_result or OSError, timestamp, generation)
+        self._entries: "OrderedDict[tuple[str, bool], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Current cache generation."""
+        return self._generation
+
+    def stat(self, path: PathLike, follow_symlinks: bool = True) -> os.stat_result:
+        """
+        Cached equivalent of os.stat().
+
+        Args:
+            path: Path to stat
+            follow_symlinks: Follow symbolic links (False = lstat)
+
+        Returns:
+            os.stat_result
+
+        Raises:
+            OSError: If the path cannot be stat()ed
+        """
+        key = (os.fspath(path), follow_symlinks)
+        result = self._lookup(key)
+
+        if result is None:
+            self.stats.syscalls += 1
+            try:
+                result = os.stat(key[0], follow_symlinks=follow_symlinks)
+            except OSError as e:
+                result = e
+            self._store(key, result)
+
+        if isinstance(result, OSError):
+            raise result
+        return result
+
+    def try_stat(
+        self,
+        path: PathLike,
+        follow_symlinks: bool = True
+    ) -> Optional[os.stat_result]:
+        """
+        Like stat(), but return None instead of raising OSError.
+
+        Args:
+            path: Path to stat
+            follow_symlinks: Follow symbolic links (False = lstat)
+
+        Returns:
+            os.stat_result, or None if the path cannot be stat()ed
+        """
+        try:
+            return self.stat(path, follow_symlinks)
+        except OSError:
+            return None
+
+    def stat_many(
+        self,
+        paths: Iterable[PathLike],
+        follow_symlinks: bool = True
+    ) -> Dict[str, Optional[os.stat_result]]:
+        """
+        Stat many paths at once.
+
+        Uncached paths are grouped by parent directory. Directories with many
+        requested names are listed once with os.scandir(), which lets
+        missing names be skipped without a syscall and, on Windows, returns
+        the stat data with the listing itself.
+
+        Args:
+            paths: Paths to stat
+            follow_symlinks: Follow symbolic links (False = lstat)
+
+        Returns:
+            Dict mapping each path string to its stat_result (None on error)
+        """
+        results: Dict[str, Optional[os.stat_result]] = {}
+        by_dir: Dict[str, list[str]] = defaultdict(list)
+
+        for path in paths:
+            path_str = os.fspath(path)
+            cached = self._lookup((path_str, follow_symlinks))
+            if cached is not None:
+                results[path_str] = None if isinstance(cached, OSError) else cached
+            else:
+                by_dir[os.path.dirname(path_str)].append(path_str)
+
+        for directory, dir_paths in by_dir.items():
+            if len(dir_paths) >= self.SCANDIR_THRESHOLD:
+                results.update(self._stat_directory(directory, dir_paths, follow_symlinks))
+            else:
+                for path_str in dir_paths:
+                    results[path_str] = self.try_stat(path_str, follow_symlinks)
+
+        return results
+
+    def _stat_directory(
+        self,
+        directory: str,
+        dir_paths: list[str],
+        follow_symlinks: bool
+    ) -> Dict[str, Optional[os.stat_result]]:
+        """Stat the requested names in one directory via os.scandir()."""
+        wanted = {os.path.basename(p): p for p in dir_paths}
+        results: Dict[str, Optional[os.stat_result]] = {}
+
+        try:
+            self.stats.scandir_calls += 1
+            with os.scandir(directory or os.curdir) as entries:
+                for entry in entries:
+                    path_str = wanted.pop(entry.name, None)
+                    if path_str is None:
+                        continue
+
+                    try:
+                        st = entry.stat(follow_symlinks=follow_symlinks)
+                        self.stats.syscalls += 1
+                        self._store((path_str, follow_symlinks), st)
+                        results[path_str] = st
+                    except OSError as e:
+                        self._store((path_str, follow_symlinks), e)
+                        results[path_str] = None
+
+        except OSError as e:
+            logger.debug(f"scandir failed for {directory}: {e}")
+            for path_str in wanted.values():
+                results[path_str] = self.try_stat(path_str, follow_symlinks)
+            return results
+
+        # Names not present in the listing do not exist
+        for path_str in wanted.values():
+            self._store(
+                (path_str, follow_symlinks),
+                FileNotFoundError(2, "No such file or directory", path_str)
+            )
+            results[path_str] = None
+
+        return results
+
+    def prime(
+        self,
+        path: PathLike,
+        st: os.stat_result,
+        follow_symlinks: bool = True
+    ) -> None:
+        """
+        Store an externally obtained stat result (e.g. from a DirEntry).
+
+        Args:
+            path: Path the result belongs to
+            st: Stat result
+            follow_symlinks: Whether the result followed symlinks
+        """
+        self._store((os.fspath(path), follow_symlinks), st)
+
+    def prime_entry(self, entry: os.DirEntry, follow_symlinks: bool = True) -> Optional[os.stat_result]:
+        """
+        Stat a DirEntry and store the result in the cache.
+
+        Args:
+            entry: Directory entry from os.scandir()
+            follow_symlinks: Follow symbolic links
+
+        Returns:
+            os.stat_result, or None on error
+        """
+        key = (entry.path, follow_symlinks)
+        cached = self._lookup(key)
+        if cached is not None:
+            return None if isinstance(cached, OSError) else cached
+
+        try:
+            st = entry.stat(follow_symlinks=follow_symlinks)
+            self.stats.syscalls += 1
+        except OSError as e:
+            self._store(key, e)
+            return None
+
+        self._store(key, st)
+        if not follow_symlinks and not entry.is_symlink():
+            # lstat and stat agree for non-links; serve both lookups
+            self._store((entry.path, True), st)
+        return st
+
+    def invalidate(self, path: PathLike) -> None:
+        """
+        Drop cached results for a single path.
+
+        Args:
+            path: Path that changed
+        """
+        path_str = os.fspath(path)
+        with self._lock:
+            for follow in (True, False):
+                if self._entries.pop((path_str, follow), None) is not None:
+                    self.stats.invalidations += 1
+
+    def invalidate_tree(self, root: PathLike) -> None:
+        """
+        Drop cached results for a directory and everything below it.
+
+        Args:
+            root: Directory that changed
+        """
+        root_str = os.fspath(root).rstrip(os.sep) or os.sep
+        prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] == root_str or key[0].startswith(prefix)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidations += len(stale)
+
+    def bump_generation(self) -> int:
+        """
+        Invalidate every cached entry.
+
+        Entries from older generations are treated as misses and replaced
+        lazily, so this is O(1).
+
+        Returns:
+            The new generation number
+        """
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = StatCacheStats()
+
+    def _lookup(self, key: tuple[str, bool]):
+        """Return a fresh cached result (stat_result or OSError), or None."""
+        if self.ttl <= 0:
+            self.stats.misses += 1
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, timestamp, generation = entry
+                if (generation == self._generation
+                        and time.monotonic() - timestamp <= self.ttl):
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return result
+                del self._entries[key]
+
+            self.stats.misses += 1
+            return None
+
+    def _store(self, key: tuple[str, bool], result) -> None:
+        """Store a stat result or OSError."""
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (result, time.monotonic(), self._generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def __len__(self) -> int:
+        """Number of cached entries (including expired ones not yet purged)."""
+        return len(self._entries)
+
+
+def is_regular_file(st: Optional[os.stat_result]) -> bool:
+    """Check if a stat result describes a regular file."""
+    return st is not None and stat_module.S_ISREG(st.st_mode)
+
+
+def is_directory(st: Optional[os.stat_result]) -> bool:
+    """Check if a stat result describes a directory."""
+    return st is not None and stat_module.S_ISDIR(st.st_mode)
+
+
+# Global stat cache instance
+_stat_cache = StatCache()
+
+
+def get_stat_cache() -> StatCache:
+    """
+    Get the process-wide stat cache.
+
+    Returns:
+        Shared StatCache instance
+    """
+    return _stat_cache
+
+
+def cached_stat(path: PathLike, follow_symlinks: bool = True) -> os.stat_result:
+    """
+    Stat a path through the process-wide cache (convenience function).
+
+    Args:
+        path: Path to stat
+        follow_symlinks: Follow symbolic links
+
+    Returns:
+        os.stat_result
+
+    Raises:
+        OSError: If the path cannot be stat()ed
+    """
+    return _stat_cache.stat(path, follow_symlinks)
@@ -21,9 +21,14 @@ Example Usage:
 """
 
 from .scanner import DuplicateScanner, ScanProgress, ScanStats
-from .hasher import FileHasher, HashAlgorithm, HashResult
+from .hasher import ChunkList, ContentDefinedChunker, FileHasher, HashAlgorithm, HashResult
 from .cache import HashCache, CacheStats
-from .groups import DuplicateGroup, DuplicateGroupManager, SelectionStrategy
+from .checkpoint import ScanCheckpoint
+from .index import DuplicateIndex, IndexUpdate
+from .groups import DuplicateGroup, DuplicateGroupManager, HardlinkSet, SelectionStrategy
+from .similar_images import MultiIndexHash, PerceptualHash, cluster_similar, image_hash
+from .similar_text import cluster_similar_text, text_signature
+from .dedupe import DedupeAnalyzer, DedupeReport, SharedChunks
 from .actions import (
     DuplicateAction,
     ActionResult,
@@ -44,16 +49,41 @@ __all__ = [
     'FileHasher',
     'HashAlgorithm',
     'HashResult',
+    'ChunkList',
+    'ContentDefinedChunker',
 
     # Cache
     'HashCache',
     'CacheStats',
 
+    # Checkpoints
+    'ScanCheckpoint',
+
+    # Incremental index
+    'DuplicateIndex',
+    'IndexUpdate',
+
     # Groups
     'DuplicateGroup',
     'DuplicateGroupManager',
+    'HardlinkSet',
     'SelectionStrategy',
 
+    # Similar images
+    'PerceptualHash',
+    'MultiIndexHash',
+    'cluster_similar',
+    'image_hash',
+
+    # Similar text
+    'cluster_similar_text',
+    'text_signature',
+
+    # Dedupe analysis
+    'DedupeAnalyzer',
+    'DedupeReport',
+    'SharedChunks',
+
     # Actions
     'DuplicateAction',
     'ActionResult',
@@ -15,6 +15,7 @@ import json
 import logging
 import os
 import shutil
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -22,6 +23,10 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Union
 
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.stat_cache import get_stat_cache
+
 try:
     from send2trash import send2trash
     HAS_SEND2TRASH = True
@@ -192,6 +197,13 @@ class DuplicateAction(ABC):
 
     def _log_result(self, result: ActionResult) -> None:
         """Log action result if logger is configured."""
+        if result.success:
+            # Drop stale stat results for the paths this action touched
+            stat_cache = get_stat_cache()
+            stat_cache.invalidate(result.source_path)
+            if result.target_path:
+                stat_cache.invalidate(result.target_path)
+
         if self.audit_logger:
             self.audit_logger.log_action(result)
 
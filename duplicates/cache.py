@@ -8,14 +8,19 @@ Features:
 - LRU eviction policy to manage cache size
 - Thread-safe operations
 - Statistics tracking
+- Batch lookups and writes on one long-lived WAL-mode connection
+- Write-behind queue with group commit; access statistics updated lazily
+- Similarity signatures (MinHash, perceptual hashes) cached next to the
+  hashes, keyed by file path and signature kind
 """
 
+import os
 import sqlite3
 import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
 from .hasher import HashAlgorithm
 
@@ -52,6 +57,11 @@ class HashCache:
     file path, size, and modification time. Entries are automatically invalidated
     when files are modified.
 
+    All access goes through one long-lived connection in WAL mode. Writes and
+    access-time updates are queued in memory and committed together (when
+    WRITE_BATCH_SIZE entries are pending, FLUSH_INTERVAL seconds after the
+    first queued write, before reads, and on close()).
+
     Schema:
         - file_path: Normalized absolute path
         - file_size: File size in bytes
@@ -62,6 +72,10 @@ class HashCache:
         - last_accessed: Timestamp for LRU eviction
         - access_count: Number of times accessed
 
+    Similarity signatures live in a second table (signature_cache) keyed by
+    (file_path, kind), validated by size and mtime the same way, and go
+    through the same write-behind queue.
+
     Example:
         >>> with HashCache('~/.cache/smart_search/hashes.db') as cache:
         ...     cache.set_hash('/path/to/file.txt', quick_hash='abc123', full_hash='def456')
@@ -73,6 +87,44 @@ class HashCache:
     DEFAULT_MAX_SIZE = 100000  # Maximum number of cached files
     DEFAULT_EVICTION_SIZE = 10000  # Number of entries to evict when full
 
+    # Host parameters per SELECT ... IN (...) (SQLite's default limit is 999)
+    SQL_BATCH_SIZE = 900
+
+    # Write-behind settings
+    WRITE_BATCH_SIZE = 1000  # Pending writes that trigger an immediate commit
+    FLUSH_INTERVAL = 1.0     # Seconds before queued writes are committed
+
+    # Insert, or update in place keeping hashes not supplied for the same
+    # file version (a size/mtime change discards both old hashes)
+    _UPSERT_SQL = """
+        INSERT INTO hash_cache
+        (file_path, file_size, mtime, quick_hash, full_hash,
+         algorithm, last_accessed, access_count, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+        ON CONFLICT(file_path) DO UPDATE SET
+            quick_hash = CASE
+                WHEN file_size = excluded.file_size AND mtime = excluded.mtime
+                     AND algorithm = excluded.algorithm
+                THEN COALESCE(excluded.quick_hash, quick_hash)
+                ELSE excluded.quick_hash END,
+            full_hash = CASE
+                WHEN file_size = excluded.file_size AND mtime = excluded.mtime
+                     AND algorithm = excluded.algorithm
+                THEN COALESCE(excluded.full_hash, full_hash)
+                ELSE excluded.full_hash END,
+            file_size = excluded.file_size,
+            mtime = excluded.mtime,
+            algorithm = excluded.algorithm,
+            last_accessed = excluded.last_accessed,
+            access_count = access_count + 1
+    """
+
+    _SIGNATURE_UPSERT_SQL = """
+        INSERT OR REPLACE INTO signature_cache
+        (file_path, kind, file_size, mtime, signature, last_accessed)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(
         self,
         db_path: Union[str, Path],
@@ -90,9 +142,23 @@ class HashCache:
         self.db_path = Path(db_path)
         self.max_size = max_size
         self.eviction_size = eviction_size
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self.stats = CacheStats()
 
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Write-behind state: upsert rows keyed by normalized path, and
+        # access times of cache hits not yet written
+        self._pending: dict[str, tuple] = {}
+        self._touched: dict[str, float] = {}
+        self._pending_signatures: dict[tuple[str, str], tuple] = {}
+        self._touched_signatures: dict[tuple[str, str], float] = {}
+        self._writes_since_count = 0
+        self._signature_writes = 0
+        self._flush_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
         # Create database directory if needed
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -109,68 +175,191 @@ class HashCache:
         return False
 
     def close(self):
-        """Close any open database connections."""
-        # SQLite connections are created per-operation, so nothing to close
-        # But we ensure any pending operations are complete
-        pass
+        """Commit queued writes and close the database connection."""
+        with self._lock:
+            self._closed = True
+            self._flush_event.set()
+            try:
+                self.flush()
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the long-lived connection (reopened after close())."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+            self._closed = False
+        return self._conn
 
     def _init_db(self) -> None:
         """Initialize the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS hash_cache (
-                    file_path TEXT PRIMARY KEY,
-                    file_size INTEGER NOT NULL,
-                    mtime REAL NOT NULL,
-                    quick_hash TEXT,
-                    full_hash TEXT,
-                    algorithm TEXT NOT NULL,
-                    last_accessed REAL NOT NULL,
-                    access_count INTEGER DEFAULT 1,
-                    created_at REAL NOT NULL
-                )
-            """)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS hash_cache (
+                        file_path TEXT PRIMARY KEY,
+                        file_size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        quick_hash TEXT,
+                        full_hash TEXT,
+                        algorithm TEXT NOT NULL,
+                        last_accessed REAL NOT NULL,
+                        access_count INTEGER DEFAULT 1,
+                        created_at REAL NOT NULL
+                    )
+                """)
+
+                # Create indexes for performance
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_last_accessed
+                    ON hash_cache(last_accessed)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_file_size
+                    ON hash_cache(file_size)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_quick_hash
+                    ON hash_cache(quick_hash)
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_full_hash
+                    ON hash_cache(full_hash)
+                """)
+
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS signature_cache (
+                        file_path TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        file_size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        signature BLOB NOT NULL,
+                        last_accessed REAL NOT NULL,
+                        PRIMARY KEY (file_path, kind)
+                    )
+                """)
 
-            # Create indexes for performance
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_last_accessed
-                ON hash_cache(last_accessed)
-            """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_signature_accessed
+                    ON signature_cache(last_accessed)
+                """)
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_file_size
-                ON hash_cache(file_size)
-            """)
+            # Update initial stats
+            self._update_stats()
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_quick_hash
-                ON hash_cache(quick_hash)
-            """)
+    def _normalize_path(self, file_path: Union[str, Path]) -> str:
+        """Normalize file path for consistent cache keys (no filesystem access)."""
+        return os.path.abspath(os.fspath(file_path))
 
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_full_hash
-                ON hash_cache(full_hash)
-            """)
+    def _update_stats(self) -> None:
+        """Update the entry count (committed entries only)."""
+        cursor = self._connection().execute("SELECT COUNT(*) FROM hash_cache")
+        self.stats.total_entries = cursor.fetchone()[0]
+        self._writes_since_count = 0
+
+    def _has_queued(self) -> bool:
+        return bool(
+            self._pending or self._touched
+            or self._pending_signatures or self._touched_signatures
+        )
 
-            conn.commit()
+    def flush(self) -> None:
+        """
+        Commit queued writes and access statistics in one transaction.
 
-        # Update initial stats
-        self._update_stats()
+        The queues are kept if the transaction fails (locked database, full
+        disk), so the next flush retries them.
+        """
+        with self._lock:
+            if not self._has_queued():
+                return
 
-    def _normalize_path(self, file_path: Union[str, Path]) -> str:
-        """Normalize file path for consistent cache keys."""
-        return str(Path(file_path).resolve())
+            rows = list(self._pending.values())
+            touched = [(now, key) for key, now in self._touched.items()]
+            signatures = list(self._pending_signatures.values())
+            touched_signatures = [
+                (now, path, kind) for (path, kind), now in self._touched_signatures.items()
+            ]
 
-    def _update_stats(self) -> None:
-        """Update cache statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM hash_cache")
-            self.stats.total_entries = cursor.fetchone()[0]
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(self._UPSERT_SQL, rows)
+                    conn.executemany(
+                        """
+                        UPDATE hash_cache
+                        SET last_accessed = ?, access_count = access_count + 1
+                        WHERE file_path = ?
+                        """,
+                        touched
+                    )
+                    conn.executemany(self._SIGNATURE_UPSERT_SQL, signatures)
+                    conn.executemany(
+                        """
+                        UPDATE signature_cache SET last_accessed = ?
+                        WHERE file_path = ? AND kind = ?
+                        """,
+                        touched_signatures
+                    )
+            except sqlite3.Error:
+                return
+
+            # Writers queue under the lock, so the queues are what was committed
+            self._pending = {}
+            self._touched = {}
+            self._pending_signatures = {}
+            self._touched_signatures = {}
+
+            # Only count entries when the upper bound could exceed max_size
+            self._writes_since_count += len(rows)
+            if self.stats.total_entries + self._writes_since_count >= self.max_size:
+                self._update_stats()
+                self._check_and_evict()
+
+            self._signature_writes += len(signatures)
+            if self._signature_writes >= self.eviction_size:
+                self._signature_writes = 0
+                self._evict_signatures()
+
+    def _schedule_flush(self) -> None:
+        """Commit now if enough writes are queued, otherwise soon."""
+        if len(self._pending) + len(self._pending_signatures) >= self.WRITE_BATCH_SIZE:
+            self.flush()
+            return
+
+        if self._flusher is None:
+            self._flush_event.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="HashCacheFlusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Background group commit of queued writes."""
+        while True:
+            stop = self._flush_event.wait(self.FLUSH_INTERVAL)
+            with self._lock:
+                if stop or self._closed or not self._has_queued():
+                    # Cleared under the lock so writers start a new flusher
+                    self._flusher = None
+                    return
+                self.flush()
 
     def get_hash(
         self,
         file_path: Union[str, Path],
-        validate_mtime: bool = True
+        validate_mtime: bool = True,
+        stat_result: Optional[os.stat_result] = None
     ) -> Optional[dict]:
         """
         Get cached hash for a file.
@@ -178,142 +367,255 @@ class HashCache:
         Args:
             file_path: Path to the file
             validate_mtime: Check if file has been modified
+            stat_result: Stat result the caller already holds (avoids a stat call)
 
         Returns:
             Dict with hash data, or None if not cached or invalid
         """
-        with self._lock:
-            try:
-                path = Path(file_path)
-                normalized_path = self._normalize_path(path)
-
-                # Get file stats
-                stat = path.stat()
-                current_size = stat.st_size
-                current_mtime = stat.st_mtime
-
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute(
-                        """
-                        SELECT * FROM hash_cache
-                        WHERE file_path = ?
-                        """,
-                        (normalized_path,)
-                    )
-                    row = cursor.fetchone()
-
-                    if not row:
-                        self.stats.cache_misses += 1
-                        return None
-
-                    # Validate cache entry
-                    if validate_mtime:
-                        if row['file_size'] != current_size or row['mtime'] != current_mtime:
-                            # File has been modified, invalidate cache
-                            self._invalidate(normalized_path, conn)
-                            self.stats.cache_misses += 1
-                            self.stats.invalidations += 1
-                            return None
-
-                    # Update access statistics
-                    now = datetime.now().timestamp()
-                    conn.execute(
-                        """
-                        UPDATE hash_cache
-                        SET last_accessed = ?, access_count = access_count + 1
-                        WHERE file_path = ?
-                        """,
-                        (now, normalized_path)
-                    )
-                    conn.commit()
-
-                    self.stats.cache_hits += 1
-
-                    return {
-                        'file_path': row['file_path'],
-                        'file_size': row['file_size'],
-                        'mtime': row['mtime'],
-                        'quick_hash': row['quick_hash'],
-                        'full_hash': row['full_hash'],
-                        'algorithm': row['algorithm'],
-                    }
+        try:
+            stat = stat_result or Path(file_path).stat()
+        except OSError:
+            self.stats.cache_misses += 1
+            return None
 
-            except Exception:
-                self.stats.cache_misses += 1
-                return None
+        return self.get_many([(file_path, stat)], validate_mtime).get(file_path)
 
     def set_hash(
         self,
         file_path: Union[str, Path],
         quick_hash: Optional[str] = None,
         full_hash: Optional[str] = None,
-        algorithm: HashAlgorithm = HashAlgorithm.SHA256
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256,
+        stat_result: Optional[os.stat_result] = None
     ) -> bool:
         """
         Store hash in cache.
 
+        A hash passed as None keeps the value already cached for the same
+        file version.
+
         Args:
             file_path: Path to the file
             quick_hash: Quick hash value
             full_hash: Full hash value
             algorithm: Hash algorithm used
+            stat_result: Stat result taken before hashing (avoids a stat call)
+
+        Returns:
+            True if queued successfully
+        """
+        try:
+            stat = stat_result or Path(file_path).stat()
+        except OSError:
+            return False
+
+        return self.set_many([(file_path, stat, quick_hash, full_hash)], algorithm) == 1
+
+    def get_many(
+        self,
+        items: Iterable[tuple[Union[str, Path], os.stat_result]],
+        validate_mtime: bool = True,
+        algorithm: Optional[HashAlgorithm] = None
+    ) -> dict[Union[str, Path], dict]:
+        """
+        Get cached hashes for many files.
+
+        Args:
+            items: (file_path, stat_result) pairs
+            validate_mtime: Skip entries whose size or mtime changed
+            algorithm: Only return entries hashed with this algorithm
 
         Returns:
-            True if stored successfully
+            Dict mapping each cached input path (as given) to its hash data
         """
+        keyed = {self._normalize_path(path): (path, st) for path, st in items}
+        if not keyed:
+            return {}
+
+        results: dict[Union[str, Path], dict] = {}
+        stale = 0
+        now = datetime.now().timestamp()
+
         with self._lock:
             try:
-                path = Path(file_path)
-                normalized_path = self._normalize_path(path)
+                # Queued writes for these files must be visible to this read
+                if self._pending and not self._pending.keys().isdisjoint(keyed):
+                    self.flush()
+
+                conn = self._connection()
+                keys = list(keyed)
+                rows = []
+                for start in range(0, len(keys), self.SQL_BATCH_SIZE):
+                    batch = keys[start:start + self.SQL_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(conn.execute(
+                        f"SELECT * FROM hash_cache WHERE file_path IN ({placeholders})",
+                        batch
+                    ))
+            except sqlite3.Error:
+                self.stats.cache_misses += len(keyed)
+                return {}
+
+            for row in rows:
+                path, st = keyed[row['file_path']]
+                if validate_mtime and (
+                    row['file_size'] != st.st_size or row['mtime'] != st.st_mtime
+                ):
+                    # Stale rows are overwritten when the new hash is stored
+                    stale += 1
+                    continue
+                if algorithm is not None and row['algorithm'] != algorithm.value:
+                    continue
+                results[path] = {
+                    'file_path': row['file_path'],
+                    'file_size': row['file_size'],
+                    'mtime': row['mtime'],
+                    'quick_hash': row['quick_hash'],
+                    'full_hash': row['full_hash'],
+                    'algorithm': row['algorithm'],
+                }
+                self._touched[row['file_path']] = now
+
+            self.stats.cache_hits += len(results)
+            self.stats.cache_misses += len(keyed) - len(results)
+            self.stats.invalidations += stale
+            if self._touched:
+                self._schedule_flush()
+
+        return results
+
+    def set_many(
+        self,
+        entries: Iterable[tuple[Union[str, Path], os.stat_result, Optional[str], Optional[str]]],
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256
+    ) -> int:
+        """
+        Queue hashes for many files (committed by the write-behind flush).
 
-                # Get file stats
-                stat = path.stat()
-                file_size = stat.st_size
-                mtime = stat.st_mtime
-                now = datetime.now().timestamp()
+        A hash passed as None keeps the value already cached for the same
+        file version, so quick and full hashes can be stored separately.
 
-                # Check if we need to evict entries
-                self._check_and_evict()
+        Args:
+            entries: (file_path, stat_result, quick_hash, full_hash) tuples
+            algorithm: Hash algorithm used
 
-                with sqlite3.connect(self.db_path) as conn:
-                    # Insert or replace cache entry
-                    conn.execute(
-                        """
-                        INSERT OR REPLACE INTO hash_cache
-                        (file_path, file_size, mtime, quick_hash, full_hash,
-                         algorithm, last_accessed, access_count, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
-                        """,
-                        (
-                            normalized_path,
-                            file_size,
-                            mtime,
-                            quick_hash,
-                            full_hash,
-                            algorithm.value,
-                            now,
-                            now
-                        )
-                    )
-                    conn.commit()
+        Returns:
+            Number of entries queued
+        """
+        now = datetime.now().timestamp()
+        count = 0
 
-                self._update_stats()
-                return True
+        with self._lock:
+            for path, st, quick_hash, full_hash in entries:
+                key = self._normalize_path(path)
+                queued = self._pending.get(key)
+                if (queued is not None and queued[1] == st.st_size
+                        and queued[2] == st.st_mtime and queued[5] == algorithm.value):
+                    # Same file version queued twice: merge like the upsert
+                    quick_hash = quick_hash or queued[3]
+                    full_hash = full_hash or queued[4]
+                self._pending[key] = (
+                    key, st.st_size, st.st_mtime, quick_hash, full_hash,
+                    algorithm.value, now, now
+                )
+                count += 1
 
-            except Exception:
-                return False
+            if count:
+                self._schedule_flush()
+
+        return count
+
+    def get_signatures(
+        self,
+        items: Iterable[tuple[Union[str, Path], os.stat_result]],
+        kind: str
+    ) -> dict[Union[str, Path], bytes]:
+        """
+        Get cached similarity signatures for many files.
+
+        Args:
+            items: (file_path, stat_result) pairs
+            kind: Signature kind (includes its parameters, e.g. 'minhash-128-5')
 
-    def _invalidate(self, file_path: str, conn: sqlite3.Connection) -> None:
+        Returns:
+            Dict mapping each input path (as given) with a valid signature to it
+        """
+        keyed = {self._normalize_path(path): (path, st) for path, st in items}
+        if not keyed:
+            return {}
+
+        results: dict[Union[str, Path], bytes] = {}
+        now = datetime.now().timestamp()
+
+        with self._lock:
+            try:
+                if self._pending_signatures and any(
+                    (key, kind) in self._pending_signatures for key in keyed
+                ):
+                    self.flush()
+
+                conn = self._connection()
+                keys = list(keyed)
+                rows = []
+                for start in range(0, len(keys), self.SQL_BATCH_SIZE):
+                    batch = keys[start:start + self.SQL_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(conn.execute(
+                        f"""
+                        SELECT file_path, file_size, mtime, signature FROM signature_cache
+                        WHERE kind = ? AND file_path IN ({placeholders})
+                        """,
+                        [kind, *batch]
+                    ))
+            except sqlite3.Error:
+                self.stats.cache_misses += len(keyed)
+                return {}
+
+            for row in rows:
+                path, st = keyed[row['file_path']]
+                if row['file_size'] != st.st_size or row['mtime'] != st.st_mtime:
+                    self.stats.invalidations += 1
+                    continue
+                results[path] = row['signature']
+                self._touched_signatures[(row['file_path'], kind)] = now
+
+            self.stats.cache_hits += len(results)
+            self.stats.cache_misses += len(keyed) - len(results)
+            if self._touched_signatures:
+                self._schedule_flush()
+
+        return results
+
+    def set_signatures(
+        self,
+        entries: Iterable[tuple[Union[str, Path], os.stat_result, bytes]],
+        kind: str
+    ) -> int:
         """
-        Invalidate a cache entry.
+        Queue similarity signatures for many files.
 
         Args:
-            file_path: Normalized file path
-            conn: Database connection
+            entries: (file_path, stat_result, signature) tuples
+            kind: Signature kind
+
+        Returns:
+            Number of entries queued
         """
-        conn.execute("DELETE FROM hash_cache WHERE file_path = ?", (file_path,))
-        conn.commit()
+        now = datetime.now().timestamp()
+        count = 0
+
+        with self._lock:
+            for path, st, signature in entries:
+                key = self._normalize_path(path)
+                self._pending_signatures[(key, kind)] = (
+                    key, kind, st.st_size, st.st_mtime, signature, now
+                )
+                count += 1
+
+            if count:
+                self._schedule_flush()
+
+        return count
 
     def invalidate(self, file_path: Union[str, Path]) -> bool:
         """
@@ -328,12 +630,24 @@ class HashCache:
         with self._lock:
             try:
                 normalized_path = self._normalize_path(file_path)
-                with sqlite3.connect(self.db_path) as conn:
-                    self._invalidate(normalized_path, conn)
+                self._pending.pop(normalized_path, None)
+                self._touched.pop(normalized_path, None)
+                for queue in (self._pending_signatures, self._touched_signatures):
+                    for key in [key for key in queue if key[0] == normalized_path]:
+                        del queue[key]
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "DELETE FROM hash_cache WHERE file_path = ?",
+                        (normalized_path,)
+                    )
+                    conn.execute(
+                        "DELETE FROM signature_cache WHERE file_path = ?",
+                        (normalized_path,)
+                    )
                 self.stats.invalidations += 1
-                self._update_stats()
                 return True
-            except Exception:
+            except sqlite3.Error:
                 return False
 
     def _check_and_evict(self) -> None:
@@ -344,9 +658,10 @@ class HashCache:
     def _evict_lru(self) -> None:
         """Evict least recently used entries."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._connection()
+            with conn:
                 # Delete oldest entries based on last_accessed
-                conn.execute(
+                cursor = conn.execute(
                     """
                     DELETE FROM hash_cache
                     WHERE file_path IN (
@@ -357,13 +672,35 @@ class HashCache:
                     """,
                     (self.eviction_size,)
                 )
-                evicted = conn.total_changes
-                conn.commit()
 
-            self.stats.evictions += evicted
+            self.stats.evictions += cursor.rowcount
             self._update_stats()
 
-        except Exception:
+        except sqlite3.Error:
+            pass
+
+    def _evict_signatures(self) -> None:
+        """Evict least recently used signatures beyond max_size."""
+        try:
+            conn = self._connection()
+            count = conn.execute("SELECT COUNT(*) FROM signature_cache").fetchone()[0]
+            if count < self.max_size:
+                return
+            with conn:
+                cursor = conn.execute(
+                    """
+                    DELETE FROM signature_cache
+                    WHERE rowid IN (
+                        SELECT rowid FROM signature_cache
+                        ORDER BY last_accessed ASC
+                        LIMIT ?
+                    )
+                    """,
+                    (count - self.max_size + self.eviction_size,)
+                )
+            self.stats.evictions += cursor.rowcount
+
+        except sqlite3.Error:
             pass
 
     def clear(self) -> bool:
@@ -375,14 +712,19 @@ class HashCache:
         """
         with self._lock:
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                self._pending = {}
+                self._touched = {}
+                self._pending_signatures = {}
+                self._touched_signatures = {}
+                conn = self._connection()
+                with conn:
                     conn.execute("DELETE FROM hash_cache")
-                    conn.commit()
+                    conn.execute("DELETE FROM signature_cache")
 
                 self.stats = CacheStats()
                 return True
 
-            except Exception:
+            except sqlite3.Error:
                 return False
 
     def vacuum(self) -> bool:
@@ -394,11 +736,10 @@ class HashCache:
         """
         with self._lock:
             try:
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute("VACUUM")
-                    conn.commit()
+                self.flush()
+                self._connection().execute("VACUUM")
                 return True
-            except Exception:
+            except sqlite3.Error:
                 return False
 
     def get_duplicates_by_hash(
@@ -418,21 +759,26 @@ class HashCache:
         """
         with self._lock:
             try:
+                self.flush()
                 column = 'quick_hash' if hash_type == 'quick' else 'full_hash'
 
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        f"SELECT file_path FROM hash_cache WHERE {column} = ?",
-                        (hash_value,)
-                    )
-                    return [row[0] for row in cursor.fetchall()]
+                cursor = self._connection().execute(
+                    f"SELECT file_path FROM hash_cache WHERE {column} = ?",
+                    (hash_value,)
+                )
+                return [row[0] for row in cursor.fetchall()]
 
-            except Exception:
+            except sqlite3.Error:
                 return []
 
     def get_stats(self) -> CacheStats:
         """Get current cache statistics."""
-        self._update_stats()
+        with self._lock:
+            try:
+                self.flush()
+                self._update_stats()
+            except sqlite3.Error:
+                pass
         return self.stats
 
     def optimize(self) -> bool:
@@ -447,30 +793,35 @@ class HashCache:
         """
         with self._lock:
             try:
-                removed = 0
-                with sqlite3.connect(self.db_path) as conn:
-                    # Get all file paths
-                    cursor = conn.execute("SELECT file_path FROM hash_cache")
-                    paths = [row[0] for row in cursor.fetchall()]
-
-                    # Remove entries for non-existent files
-                    for path in paths:
-                        if not Path(path).exists():
-                            conn.execute(
-                                "DELETE FROM hash_cache WHERE file_path = ?",
-                                (path,)
-                            )
-                            removed += 1
-
-                    conn.commit()
+                self.flush()
+                conn = self._connection()
+
+                # Get all file paths
+                cursor = conn.execute(
+                    "SELECT file_path FROM hash_cache "
+                    "UNION SELECT file_path FROM signature_cache"
+                )
+                paths = [row[0] for row in cursor.fetchall()]
+
+                # Remove entries for non-existent files
+                missing = [(path,) for path in paths if not os.path.exists(path)]
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM hash_cache WHERE file_path = ?",
+                        missing
+                    )
+                    conn.executemany(
+                        "DELETE FROM signature_cache WHERE file_path = ?",
+                        missing
+                    )
 
                 # Vacuum database
                 self.vacuum()
 
-                self.stats.invalidations += removed
+                self.stats.invalidations += len(missing)
                 self._update_stats()
 
                 return True
 
-            except Exception:
+            except sqlite3.Error:
                 return False
@@ -0,0 +1,266 @@
+"""
+Scan checkpoints for resumable duplicate scans.
+
+A checkpoint is a small SQLite database holding the state of one scan:
+- A key identifying the scan (roots and options); a checkpoint written by
+  a different scan is discarded instead of resumed
+- The collected file list with the stat fields later passes need, so a
+  resumed scan skips the directory walk
+- Quick and full hashes computed so far, so a resumed scan only reads the
+  files that were not finished (this also works with the hash cache
+  disabled; with the cache enabled, both are consulted)
+
+Writes are queued and committed every SAVE_INTERVAL seconds, on
+checkpoint(), and on close(). A checkpoint is used from the scanning
+thread only.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Union
+
+
+class FileStat(NamedTuple):
+    """Stat fields of a file recorded in a checkpoint (duck-types os.stat_result)."""
+    st_size: int
+    st_mtime: float
+    st_dev: int
+    st_ino: int
+    st_nlink: int
+
+
+class ScanCheckpoint:
+    """
+    Persistent phase state of a duplicate scan.
+
+    Example:
+        >>> checkpoint = ScanCheckpoint('~/.cache/smart_search/scan.ckpt')
+        >>> if checkpoint.open(ScanCheckpoint.scan_key(roots, options)):
+        ...     files = checkpoint.load_files()
+        >>> checkpoint.add_digest('quick_hash', path, digest)
+        >>> checkpoint.complete()  # Scan finished: remove the checkpoint
+    """
+
+    # Seconds between commits of queued digests
+    SAVE_INTERVAL = 30.0
+
+    # Rows per executemany() batch when saving the file list
+    WRITE_BATCH_SIZE = 10000
+
+    # Phases recorded in the checkpoint
+    PHASE_COLLECTED = "collected"
+
+    def __init__(self, path: Union[str, Path], save_interval: float = SAVE_INTERVAL):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Checkpoint database file
+            save_interval: Seconds between commits of queued digests
+        """
+        self.path = Path(path).expanduser()
+        self.save_interval = save_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: list[tuple[str, str, str]] = []
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def scan_key(roots: Iterable[Union[str, Path]], **options) -> str:
+        """
+        Key identifying a scan by its roots and options.
+
+        Args:
+            roots: Scan roots
+            **options: Options that change the scan result (JSON-serializable)
+
+        Returns:
+            Hex digest of the scan parameters
+        """
+        data = json.dumps(
+            {"roots": [os.path.abspath(root) for root in roots], "options": options},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    @property
+    def phase(self) -> Optional[str]:
+        """Last phase recorded, or None for a new checkpoint."""
+        return self._get_meta("phase")
+
+    def open(self, key: str) -> bool:
+        """
+        Open the checkpoint for a scan.
+
+        Args:
+            key: Scan key from scan_key()
+
+        Returns:
+            True if a checkpoint of the same scan exists and can be resumed;
+            otherwise a fresh checkpoint is started
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            conn = self._connection()
+            resumable = self._get_meta("key") == key and self.phase is not None
+        except sqlite3.DatabaseError:
+            # Unreadable (e.g. truncated by a crash): start over
+            self._discard()
+            conn = self._connection()
+            resumable = False
+
+        if not resumable:
+            with conn:
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM digests")
+                conn.execute("DELETE FROM meta")
+                conn.execute("INSERT INTO meta (key, value) VALUES ('key', ?)", (key,))
+        return resumable
+
+    def save_files(self, files: Iterable[tuple[Path, os.stat_result]]) -> None:
+        """
+        Record the collected file list and mark discovery as finished.
+
+        Args:
+            files: (path, stat result) of every collected file
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM files")
+            batch = []
+            for path, st in files:
+                # Device and inode numbers are stored as text: Windows file
+                # IDs can exceed SQLite's 64-bit integers
+                batch.append((
+                    os.fspath(path), st.st_size, st.st_mtime,
+                    str(st.st_dev), str(st.st_ino), st.st_nlink
+                ))
+                if len(batch) >= self.WRITE_BATCH_SIZE:
+                    conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    batch = []
+            conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", batch)
+            self._set_meta(conn, "phase", self.PHASE_COLLECTED)
+
+    def load_files(self) -> dict[Path, FileStat]:
+        """
+        Load the collected file list.
+
+        Returns:
+            Recorded stat fields by path, in collection order
+        """
+        cursor = self._connection().execute(
+            "SELECT path, size, mtime, dev, ino, nlink FROM files ORDER BY rowid"
+        )
+        return {
+            Path(path): FileStat(size, mtime, int(dev), int(ino), nlink)
+            for path, size, mtime, dev, ino, nlink in cursor
+        }
+
+    def add_digest(self, field: str, path: Path, digest: str) -> None:
+        """
+        Queue a computed hash; committed every save_interval seconds.
+
+        Args:
+            field: 'quick_hash' or 'full_hash'
+            path: Hashed file
+            digest: Hex digest
+        """
+        self._pending.append((os.fspath(path), field, digest))
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.checkpoint()
+
+    def load_digests(self, field: str) -> dict[Path, str]:
+        """
+        Load hashes recorded for a field.
+
+        Args:
+            field: 'quick_hash' or 'full_hash'
+
+        Returns:
+            Digest by path
+        """
+        self.checkpoint()
+        cursor = self._connection().execute(
+            "SELECT path, digest FROM digests WHERE field = ?", (field,)
+        )
+        return {Path(path): digest for path, digest in cursor}
+
+    def discard_digests(self, paths: Iterable[Path]) -> None:
+        """Forget the hashes of files that changed since they were recorded."""
+        self.checkpoint()
+        conn = self._connection()
+        with conn:
+            conn.executemany("DELETE FROM digests WHERE path = ?", [(os.fspath(p),) for p in paths])
+
+    def checkpoint(self) -> None:
+        """Commit queued digests now."""
+        self._last_save = time.monotonic()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        conn = self._connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO digests VALUES (?, ?, ?)", rows)
+
+    def close(self) -> None:
+        """Commit queued digests and close the database."""
+        if self._conn is not None:
+            try:
+                self.checkpoint()
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def complete(self) -> None:
+        """The scan finished: delete the checkpoint."""
+        self._pending = []
+        self._discard()
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.remove(f"{self.path}{suffix}")
+            except OSError:
+                pass
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        dev TEXT NOT NULL,
+                        ino TEXT NOT NULL,
+                        nlink INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS digests (
+                        path TEXT NOT NULL,
+                        field TEXT NOT NULL,
+                        digest TEXT NOT NULL,
+                        PRIMARY KEY (path, field)
+                    )
+                """)
+            self._conn = conn
+        return self._conn
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
@@ -0,0 +1,276 @@
+"""
+Block-level deduplication analysis with content-defined chunks.
+
+Estimates how much space chunk-level deduplication would reclaim across
+files that are mostly, but not entirely, identical (VM images, archives,
+database dumps), and which file pairs share the most data.
+
+Features:
+- Files are chunked in parallel (FastCDC-style chunker from hasher.py)
+- Chunk lists are array-backed (12 bytes per chunk)
+- Set-wide and per-file unique bytes computed with NumPy sorts
+- Shared bytes per file pair, aggregated per distinct set of files
+  sharing a chunk (so chunks shared by many files cost one entry); chunks
+  shared by very many files (zero blocks, boilerplate) are summarized
+  instead of being expanded into every pair
+"""
+
+import os
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+from .hasher import HAS_NUMPY, ChunkList, ContentDefinedChunker
+from .pipeline import HashPipeline
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+@dataclass
+class SharedChunks:
+    """Data shared by two files."""
+    file_a: Path
+    file_b: Path
+    shared_bytes: int
+    unique_bytes_a: int  # Deduplicated size of file_a
+    unique_bytes_b: int
+
+    @property
+    def similarity(self) -> float:
+        """Shared bytes over the bytes of both files (Jaccard by bytes)."""
+        union = self.unique_bytes_a + self.unique_bytes_b - self.shared_bytes
+        return self.shared_bytes / union if union else 1.0
+
+    @property
+    def containment(self) -> float:
+        """Shared bytes over the smaller file."""
+        smaller = min(self.unique_bytes_a, self.unique_bytes_b)
+        return self.shared_bytes / smaller if smaller else 1.0
+
+    def __repr__(self) -> str:
+        return (
+            f"SharedChunks({self.file_a.name} <-> {self.file_b.name}, "
+            f"shared={self.shared_bytes} bytes, similarity={self.similarity:.1%})"
+        )
+
+
+@dataclass
+class DedupeReport:
+    """Deduplication estimate for a set of files."""
+    file_count: int = 0
+    chunk_count: int = 0
+    unique_chunks: int = 0
+    total_bytes: int = 0
+    unique_bytes: int = 0
+    widely_shared_bytes: int = 0  # Bytes of chunks shared by too many files to list pairs
+    pairs: list[SharedChunks] = field(default_factory=list)
+    errors: list[Path] = field(default_factory=list)
+
+    @property
+    def reclaimable_bytes(self) -> int:
+        """Space block-level deduplication would reclaim."""
+        return self.total_bytes - self.unique_bytes
+
+    @property
+    def dedupe_ratio(self) -> float:
+        """Logical size over deduplicated size (1.0 = nothing shared)."""
+        return self.total_bytes / self.unique_bytes if self.unique_bytes else 1.0
+
+    @property
+    def shared_ratio(self) -> float:
+        """Fraction of all bytes that are duplicate chunks."""
+        return self.reclaimable_bytes / self.total_bytes if self.total_bytes else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"DedupeReport(files={self.file_count}, total={self.total_bytes} bytes, "
+            f"unique={self.unique_bytes} bytes, ratio={self.dedupe_ratio:.2f}x)"
+        )
+
+
+class DedupeAnalyzer:
+    """
+    Estimates block-level deduplication savings.
+
+    Example:
+        >>> analyzer = DedupeAnalyzer()
+        >>> report = analyzer.analyze(['/vm/a.img', '/vm/b.img'])
+        >>> print(f"{report.reclaimable_bytes} bytes reclaimable")
+        >>> for pair in report.pairs[:10]:
+        ...     print(pair)
+    """
+
+    # Pairs reported by default (most shared bytes first)
+    DEFAULT_MAX_PAIRS = 1000
+
+    # Chunks shared by more files than this are not expanded into pairs
+    # (n files make n * (n - 1) / 2 pairs)
+    DEFAULT_MAX_FANOUT = 64
+
+    def __init__(
+        self,
+        chunker: Optional[ContentDefinedChunker] = None,
+        max_workers: Optional[int] = None,
+        per_device_limit: int = HashPipeline.DEFAULT_PER_DEVICE_LIMIT
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            chunker: Content-defined chunker (default: 8 KB average chunks)
+            max_workers: Worker threads for chunking (None = auto-detect)
+            per_device_limit: Maximum concurrent reads per device
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        self.chunker = chunker or ContentDefinedChunker()
+        self.pipeline = HashPipeline(max_workers=max_workers, per_device_limit=per_device_limit)
+
+    def chunk_files(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> tuple[list[ChunkList], list[Path]]:
+        """
+        Chunk files in parallel.
+
+        Args:
+            file_paths: Files to chunk
+            progress_callback: Optional callback(completed, total)
+
+        Returns:
+            (chunk lists in input order, paths that could not be read)
+        """
+        items = []
+        errors = []
+        for index, file_path in enumerate(file_paths):
+            path = Path(file_path)
+            try:
+                items.append((index, path, os.stat(path).st_dev))
+            except OSError:
+                errors.append(path)
+
+        def work(item):
+            try:
+                return self.chunker.chunk_file(item[1])
+            except OSError:
+                return None
+
+        results = {}
+        for completed, (item, chunks) in enumerate(
+            self.pipeline.run(items, device_of=lambda item: item[2], work=work), 1
+        ):
+            if chunks is None:
+                errors.append(item[1])
+            else:
+                results[item[0]] = chunks
+            if progress_callback:
+                progress_callback(completed, len(items))
+
+        return [results[index] for index in sorted(results)], errors
+
+    def analyze(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_fanout: int = DEFAULT_MAX_FANOUT
+    ) -> DedupeReport:
+        """
+        Chunk files and estimate deduplication savings.
+
+        Args:
+            file_paths: Files to analyze
+            max_pairs: Maximum number of file pairs reported
+            progress_callback: Optional callback(completed, total) while chunking
+            max_fanout: Largest number of files sharing a chunk whose pairs
+                are counted
+
+        Returns:
+            DedupeReport
+        """
+        chunk_lists, errors = self.chunk_files(file_paths, progress_callback)
+        report = self.analyze_chunks(chunk_lists, max_pairs, max_fanout)
+        report.errors = errors
+        return report
+
+    @staticmethod
+    def analyze_chunks(
+        chunk_lists: list[ChunkList],
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+        max_fanout: int = DEFAULT_MAX_FANOUT
+    ) -> DedupeReport:
+        """
+        Estimate deduplication savings from chunk lists.
+
+        Set-wide totals always include every chunk. Chunks shared by more
+        than max_fanout files are left out of the pair statistics and
+        summed in widely_shared_bytes instead.
+
+        Args:
+            chunk_lists: Chunk lists of the files
+            max_pairs: Maximum number of file pairs reported
+            max_fanout: Largest number of files sharing a chunk whose pairs
+                are counted
+
+        Returns:
+            DedupeReport
+        """
+        report = DedupeReport(file_count=len(chunk_lists))
+        if not chunk_lists:
+            return report
+
+        digests = np.concatenate([np.frombuffer(c.digests, dtype=np.uint64) for c in chunk_lists])
+        sizes = np.concatenate([np.frombuffer(c.sizes, dtype=np.uint32) for c in chunk_lists])
+        files = np.repeat(
+            np.arange(len(chunk_lists), dtype=np.int64),
+            [c.chunk_count for c in chunk_lists]
+        )
+        report.chunk_count = len(digests)
+        report.total_bytes = int(sizes.sum(dtype=np.int64))
+        if not len(digests):
+            return report
+
+        # Sort by (digest, file); keep each chunk once per file
+        order = np.lexsort((files, digests))
+        digests, sizes, files = digests[order], sizes[order], files[order]
+        first_in_file = np.ones(len(digests), dtype=bool)
+        first_in_file[1:] = (digests[1:] != digests[:-1]) | (files[1:] != files[:-1])
+        digests, sizes, files = digests[first_in_file], sizes[first_in_file], files[first_in_file]
+
+        file_unique = np.bincount(files, weights=sizes, minlength=len(chunk_lists)).astype(np.int64)
+
+        starts = np.flatnonzero(np.concatenate(([True], digests[1:] != digests[:-1])))
+        report.unique_chunks = len(starts)
+        report.unique_bytes = int(sizes[starts].sum(dtype=np.int64))
+
+        # Bytes per distinct set of files sharing a chunk
+        counts = np.diff(np.append(starts, len(digests)))
+        wide = counts > max_fanout
+        report.widely_shared_bytes = int(sizes[starts[wide]].sum(dtype=np.int64))
+        listed = (counts > 1) & ~wide
+        shared_by: dict[tuple, int] = {}
+        for start, count in zip(starts[listed].tolist(), counts[listed].tolist()):
+            key = tuple(files[start:start + count].tolist())
+            shared_by[key] = shared_by.get(key, 0) + int(sizes[start])
+
+        shared_pairs: dict[tuple[int, int], int] = {}
+        for key, shared in shared_by.items():
+            for pair in combinations(key, 2):
+                shared_pairs[pair] = shared_pairs.get(pair, 0) + shared
+
+        top = sorted(shared_pairs.items(), key=lambda entry: entry[1], reverse=True)[:max_pairs]
+        report.pairs = [
+            SharedChunks(
+                file_a=chunk_lists[a].file_path,
+                file_b=chunk_lists[b].file_path,
+                shared_bytes=shared,
+                unique_bytes_a=int(file_unique[a]),
+                unique_bytes_b=int(file_unique[b])
+            )
+            for (a, b), shared in top
+        ]
+        return report
@@ -3,7 +3,8 @@ Duplicate group management module.
 
 Features:
 - Group duplicates by hash
-- Calculate wasted space
+- Calculate wasted space (hardlinked paths share storage and count once)
+- Report hardlink sets separately from duplicates
 - Selection strategies (oldest, newest, folder priority)
 - Group statistics and analysis
 """
@@ -12,7 +13,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import Callable, Hashable, Optional, Union
+
+# Identity of a file's storage: (st_dev, st_ino)
+InodeKey = tuple[int, int]
 
 
 class SelectionStrategy(Enum):
@@ -32,6 +36,13 @@ class FileInfo:
     size: int
     mtime: float
     selected_for_deletion: bool = False
+    inode: Optional[InodeKey] = None  # (st_dev, st_ino) if known
+    link_count: int = 1               # st_nlink: paths sharing the inode
+
+    @property
+    def storage_key(self) -> Hashable:
+        """Key identifying the file's storage (paths with equal keys are hardlinks)."""
+        return self.inode if self.inode is not None else self.path
 
     @property
     def mtime_datetime(self) -> datetime:
@@ -51,7 +62,8 @@ class DuplicateGroup:
     Attributes:
         hash_value: The hash identifying this group
         files: List of FileInfo objects
-        hash_type: Type of hash ('quick' or 'full')
+        hash_type: Type of hash ('quick', 'full', or a perceptual hash
+            such as 'phash' for groups of similar images)
     """
     hash_value: str
     files: list[FileInfo] = field(default_factory=list)
@@ -62,6 +74,11 @@ class DuplicateGroup:
         """Number of files in the group."""
         return len(self.files)
 
+    @property
+    def inode_count(self) -> int:
+        """Number of distinct stored copies (hardlinked paths count once)."""
+        return len({f.storage_key for f in self.files})
+
     @property
     def total_size(self) -> int:
         """Total size of all files in the group."""
@@ -72,11 +89,14 @@ class DuplicateGroup:
         """
         Wasted space from duplicates.
 
-        This is (n-1) * size, as we only need to keep one copy.
+        This is the size of all distinct stored copies except the largest,
+        as we only need to keep one copy: (n-1) * size for identical files.
+        Hardlinks of the same inode share their storage.
         """
         if not self.files:
             return 0
-        return (len(self.files) - 1) * self.files[0].size
+        sizes = {f.storage_key: f.size for f in self.files}
+        return sum(sizes.values()) - max(sizes.values())
 
     @property
     def selected_for_deletion(self) -> list[FileInfo]:
@@ -90,10 +110,29 @@ class DuplicateGroup:
 
     @property
     def recoverable_space(self) -> int:
-        """Space that would be recovered by deleting selected files."""
-        return sum(f.size for f in self.selected_for_deletion)
+        """
+        Space that would be recovered by deleting selected files.
+
+        An inode is only freed once all of its links are deleted, so
+        hardlinks count once and only when every link is selected.
+        """
+        selected: dict[Hashable, list[FileInfo]] = {}
+        for f in self.selected_for_deletion:
+            selected.setdefault(f.storage_key, []).append(f)
+
+        return sum(
+            links[0].size for links in selected.values()
+            if len(links) >= links[0].link_count
+        )
 
-    def add_file(self, file_path: Union[str, Path], size: int, mtime: float) -> None:
+    def add_file(
+        self,
+        file_path: Union[str, Path],
+        size: int,
+        mtime: float,
+        inode: Optional[InodeKey] = None,
+        link_count: int = 1
+    ) -> None:
         """
         Add a file to the duplicate group.
 
@@ -101,11 +140,15 @@ class DuplicateGroup:
             file_path: Path to the file
             size: File size in bytes
             mtime: Modification time (timestamp)
+            inode: (st_dev, st_ino) of the file, if known
+            link_count: Number of hardlinks to the inode (st_nlink)
         """
         file_info = FileInfo(
             path=Path(file_path),
             size=size,
-            mtime=mtime
+            mtime=mtime,
+            inode=inode,
+            link_count=link_count
         )
         self.files.append(file_info)
 
@@ -161,6 +204,15 @@ class DuplicateGroup:
                 # Fallback to keep oldest
                 self._select_keep_oldest()
 
+        self._keep_hardlinks_of_kept()
+
+    def _keep_hardlinks_of_kept(self) -> None:
+        """Unselect hardlinks of kept files; deleting them frees no space."""
+        kept = {f.storage_key for f in self.selected_for_keeping}
+        for file in self.files:
+            if file.storage_key in kept:
+                file.selected_for_deletion = False
+
     def _select_keep_oldest(self) -> None:
         """Mark all files except the oldest for deletion."""
         oldest = min(self.files, key=lambda f: f.mtime)
@@ -252,6 +304,7 @@ class DuplicateGroup:
         return {
             'hash': self.hash_value[:16] + '...',
             'file_count': self.file_count,
+            'inode_count': self.inode_count,
             'total_size': self.total_size,
             'wasted_space': self.wasted_space,
             'selected_for_deletion': len(self.selected_for_deletion),
@@ -268,6 +321,42 @@ class DuplicateGroup:
         )
 
 
+@dataclass
+class HardlinkSet:
+    """
+    Paths that are hardlinks of one inode.
+
+    Hardlinks share their storage, so deleting some of them frees nothing;
+    they are reported separately from duplicate groups.
+
+    Attributes:
+        inode: (st_dev, st_ino) shared by the paths
+        size: File size in bytes
+        paths: Scanned paths of the inode
+        link_count: st_nlink (may exceed len(paths) if links lie outside the scan)
+    """
+    inode: InodeKey
+    size: int
+    paths: list[Path] = field(default_factory=list)
+    link_count: int = 0
+
+    @property
+    def path_count(self) -> int:
+        """Number of scanned paths."""
+        return len(self.paths)
+
+    @property
+    def saved_space(self) -> int:
+        """Space saved by sharing one inode instead of storing copies."""
+        return (len(self.paths) - 1) * self.size
+
+    def __repr__(self) -> str:
+        return (
+            f"HardlinkSet(inode={self.inode[1]}, paths={self.path_count}, "
+            f"size={self.size} bytes)"
+        )
+
+
 class DuplicateGroupManager:
     """
     Manager for organizing and analyzing duplicate groups.
@@ -277,23 +366,29 @@ class DuplicateGroupManager:
     - Apply selection strategies to all groups
     - Calculate total statistics
     - Filter and sort groups
+    - Track hardlink sets found during the scan
     """
 
     def __init__(self):
         """Initialize duplicate group manager."""
         self.groups: list[DuplicateGroup] = []
+        self.hardlink_sets: list[HardlinkSet] = []
 
     def add_group(self, group: DuplicateGroup) -> None:
         """Add a duplicate group."""
         self.groups.append(group)
 
+    def add_hardlink_set(self, hardlink_set: HardlinkSet) -> None:
+        """Add a set of hardlinked paths."""
+        self.hardlink_sets.append(hardlink_set)
+
     def create_group(self, hash_value: str, hash_type: str = "full") -> DuplicateGroup:
         """
         Create and add a new duplicate group.
 
         Args:
             hash_value: Hash identifying the group
-            hash_type: Type of hash ('quick' or 'full')
+            hash_type: Type of hash ('quick', 'full', 'phash' or 'dhash')
 
         Returns:
             The created group
@@ -333,6 +428,9 @@ class DuplicateGroupManager:
             'average_duplicates_per_group': total_files / len(self.groups) if self.groups else 0,
             'largest_group': max(self.groups, key=lambda g: g.file_count) if self.groups else None,
             'most_wasteful_group': max(self.groups, key=lambda g: g.wasted_space) if self.groups else None,
+            'hardlink_sets': len(self.hardlink_sets),
+            'hardlinked_files': sum(h.path_count for h in self.hardlink_sets),
+            'hardlink_saved_space': sum(h.saved_space for h in self.hardlink_sets),
         }
 
     def filter_by_size(self, min_size: int = 0, max_size: Optional[int] = None) -> list[DuplicateGroup]:
@@ -436,10 +534,21 @@ class DuplicateGroupManager:
                         'mtime': f.mtime,
                         'mtime_readable': f.mtime_datetime.isoformat(),
                         'selected_for_deletion': f.selected_for_deletion,
+                        'inode': list(f.inode) if f.inode is not None else None,
                     }
                     for f in group.files
                 ]
 
             report['groups'].append(group_data)
 
+        report['hardlink_sets'] = [
+            {
+                'inode': list(h.inode),
+                'size': h.size,
+                'link_count': h.link_count,
+                'paths': [str(p) for p in h.paths],
+            }
+            for h in self.hardlink_sets
+        ]
+
         return report
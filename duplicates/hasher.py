@@ -7,19 +7,28 @@ Supports:
 - Chunked reading for large files
 - Multi-threaded hashing with auto-detected optimal workers
 - Progress callbacks
+- Progressive lockstep comparison of candidate sets
+- Content-defined chunking (FastCDC-style gear hashing, NumPy-vectorized)
+- Zero-copy reads: readinto() into reused per-thread buffers sized per
+  device, mmap for large files, and page cache advice (posix_fadvise) so
+  hashing large data sets does not evict the working set
 """
 
 import hashlib
+import mmap
 import os
 import sys
+import threading
+from array import array
 from concurrent.futures import as_completed
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import BinaryIO, Callable, Iterator, Optional, Union
 
 # Add parent directory to path for core imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.devices import is_rotational
 from core.threading import create_cpu_executor
 
 try:
@@ -34,6 +43,12 @@ try:
 except ImportError:
     HAS_BLAKE3 = False
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 class HashAlgorithm(Enum):
     """Supported hash algorithms."""
@@ -65,6 +80,260 @@ class HashResult:
         return f"HashResult(path={self.file_path}, quick={self.quick_hash[:8]}..., full={self.full_hash[:8] if self.full_hash else 'None'}...)"
 
 
+# Largest per-file chunk for progressive (lockstep) comparison
+PROGRESSIVE_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Bytes held by one round of progressive comparison, shared by the files of
+# a set (larger sets read smaller chunks), and the smallest per-file chunk
+PROGRESSIVE_MEMORY_BUDGET = 16 * 1024 * 1024
+PROGRESSIVE_MIN_CHUNK_SIZE = 64 * 1024
+
+# Read block sizes for full hashes: solid-state and unknown devices, and
+# rotational disks (larger reads amortize seeks between concurrent readers)
+DEFAULT_IO_BLOCK_SIZE = 1024 * 1024
+ROTATIONAL_IO_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Files at least this large are hashed through mmap (when enabled)
+MMAP_THRESHOLD = 64 * 1024 * 1024
+MMAP_WINDOW = 8 * 1024 * 1024
+
+# Files at least this large have their pages dropped from the page cache as
+# they are hashed; smaller files are cheap to keep and may be in use
+FADVISE_DROP_THRESHOLD = 8 * 1024 * 1024
+FADVISE_DROP_INTERVAL = 64 * 1024 * 1024
+
+
+def _fadvise(fd: int, offset: int, length: int, advice: str) -> None:
+    """posix_fadvise() where available (Linux); a no-op elsewhere."""
+    value = getattr(os, advice, None)
+    if value is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, value)
+    except OSError:
+        pass
+
+
+def _readinto_full(f: BinaryIO, view: memoryview) -> int:
+    """Fill view from f, retrying short reads; returns bytes read."""
+    total = 0
+    while total < len(view):
+        n = f.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+@dataclass
+class ChunkList:
+    """
+    Content-defined chunks of a file.
+
+    Digests and sizes are kept in typed arrays (12 bytes per chunk), so the
+    chunk lists of multi-terabyte data sets fit in memory.
+
+    Attributes:
+        file_path: Chunked file
+        digests: 64-bit chunk digests (array 'Q')
+        sizes: Chunk sizes in bytes (array 'I')
+    """
+    file_path: Path
+    digests: array = field(default_factory=lambda: array('Q'))
+    sizes: array = field(default_factory=lambda: array('I'))
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks."""
+        return len(self.digests)
+
+    @property
+    def total_size(self) -> int:
+        """Sum of chunk sizes (the file size)."""
+        return sum(self.sizes)
+
+    def __repr__(self) -> str:
+        return f"ChunkList({self.file_path}, chunks={self.chunk_count})"
+
+
+class ContentDefinedChunker:
+    """
+    FastCDC-style content-defined chunker.
+
+    Chunk boundaries depend only on the bytes around them, so an insertion
+    or deletion only changes the chunks it touches and identical regions of
+    different files produce identical chunks.
+
+    The gear hash of FastCDC, h = (h << 1) + GEAR[byte], only depends on the
+    last 32 bytes for 32-bit h: h_i = sum(GEAR[b_(i-k)] << k, k < 32). That
+    sum is computed for a whole buffer at once with five shifted NumPy
+    additions (window doubling). Boundaries use normalized chunking: a
+    stricter mask before the normal size and a looser one after it.
+
+    Example:
+        >>> chunker = ContentDefinedChunker(avg_size=8192)
+        >>> chunks = chunker.chunk_file('/path/to/disk.img')
+        >>> print(chunks.chunk_count)
+    """
+
+    DEFAULT_AVG_SIZE = 8192
+    READ_BLOCK_SIZE = 4 * 1024 * 1024
+    NORMALIZATION = 2
+
+    # Gear hash window in bytes (bits of h)
+    WINDOW = 32
+
+    def __init__(
+        self,
+        avg_size: int = DEFAULT_AVG_SIZE,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            avg_size: Target average chunk size (power of two)
+            min_size: Minimum chunk size (default: avg_size // 4)
+            max_size: Maximum chunk size (default: avg_size * 8)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the sizes are inconsistent
+        """
+        if not HAS_NUMPY:
+            raise ImportError("numpy not available. Install with: pip install numpy")
+
+        bits = avg_size.bit_length() - 1
+        self.avg_size = avg_size
+        self.min_size = min_size if min_size is not None else avg_size // 4
+        self.max_size = max_size if max_size is not None else avg_size * 8
+        if avg_size != 1 << bits or not (
+            self.WINDOW <= self.min_size < avg_size < self.max_size
+        ):
+            raise ValueError(
+                "avg_size must be a power of two and "
+                f"{self.WINDOW} <= min_size < avg_size < max_size"
+            )
+
+        # Masks over the top bits, which depend on the whole window
+        def top_bits(count: int) -> int:
+            count = max(1, min(count, self.WINDOW))
+            return ((1 << count) - 1) << (self.WINDOW - count)
+
+        self._mask_strict = np.uint32(top_bits(bits + self.NORMALIZATION))
+        self._mask_loose = np.uint32(top_bits(bits - self.NORMALIZATION))
+        self._gear = np.random.default_rng(0x6EA2).integers(
+            0, 1 << 32, size=256, dtype=np.uint64
+        ).astype(np.uint32)
+
+    def _gear_hashes(self, data: memoryview) -> "np.ndarray":
+        """Gear hash at every position of data."""
+        h = self._gear[np.frombuffer(data, dtype=np.uint8)]
+        shift = 1
+        while shift < self.WINDOW:
+            h[shift:] += h[:-shift] << np.uint32(shift)
+            shift *= 2
+        return h
+
+    def cut_points(self, data: Union[bytes, bytearray, memoryview], final: bool = True) -> list[int]:
+        """
+        Find chunk boundaries in a buffer that starts at a chunk boundary.
+
+        Args:
+            data: Buffer
+            final: True if the buffer ends the stream; otherwise the tail
+                after the last returned boundary is left undecided
+
+        Returns:
+            End offsets of the chunks found, in increasing order
+        """
+        n = len(data)
+        if n == 0:
+            return []
+
+        h = self._gear_hashes(memoryview(data))
+        strict = np.flatnonzero((h & self._mask_strict) == 0)
+        loose = np.flatnonzero((h & self._mask_loose) == 0)
+        normal = self.avg_size
+
+        cuts = []
+        pos = 0
+        while pos < n:
+            low, middle, high = pos + self.min_size, pos + normal, pos + self.max_size
+
+            i = int(np.searchsorted(strict, low))
+            if i < len(strict) and strict[i] < min(middle, n):
+                end = int(strict[i]) + 1
+            elif middle > n:
+                if not final:
+                    break
+                end = n
+            else:
+                j = int(np.searchsorted(loose, middle))
+                if j < len(loose) and loose[j] < min(high, n):
+                    end = int(loose[j]) + 1
+                elif high > n:
+                    if not final:
+                        break
+                    end = n
+                else:
+                    end = high
+
+            cuts.append(end)
+            pos = end
+
+        return cuts
+
+    def chunks(self, stream: BinaryIO) -> Iterator[memoryview]:
+        """
+        Split a binary stream into content-defined chunks.
+
+        Yields:
+            Chunk data (views are only valid until the next chunk is requested)
+        """
+        pending = b""
+        while True:
+            block = stream.read(self.READ_BLOCK_SIZE)
+            final = not block
+            buffer = pending + block if pending else block
+            if not buffer:
+                return
+
+            view = memoryview(buffer)
+            start = 0
+            for end in self.cut_points(view, final=final):
+                yield view[start:end]
+                start = end
+            pending = bytes(view[start:])
+            if final:
+                return
+
+    def chunk_file(self, file_path: Union[str, Path]) -> ChunkList:
+        """
+        Chunk a file and digest every chunk.
+
+        Chunk digests are 64-bit BLAKE2b digests: compact, and collisions are
+        negligible for size estimates even across billions of chunks.
+
+        Args:
+            file_path: File to chunk
+
+        Returns:
+            ChunkList of the file
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        result = ChunkList(file_path=Path(file_path))
+        with open(file_path, 'rb') as f:
+            for chunk in self.chunks(f):
+                digest = hashlib.blake2b(chunk, digest_size=8).digest()
+                result.digests.append(int.from_bytes(digest, 'little'))
+                result.sizes.append(len(chunk))
+        return result
+
+
 class FileHasher:
     """
     High-performance file hasher with multiple algorithms and optimization.
@@ -84,25 +353,44 @@ class FileHasher:
 
     # Default chunk sizes
     QUICK_HASH_CHUNK_SIZE = 8192  # 8KB for quick hash
-    DEFAULT_CHUNK_SIZE = 65536     # 64KB for full hash
+    DEFAULT_CHUNK_SIZE = 65536     # 64KB for progressive comparison and bytewise compares
+
+    # Read block size per st_dev, shared by all hashers
+    _device_block_sizes: dict[int, int] = {}
 
     def __init__(
         self,
         algorithm: HashAlgorithm = HashAlgorithm.SHA256,
-        chunk_size: int = DEFAULT_CHUNK_SIZE,
-        max_workers: Optional[int] = None
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        io_block_size: Optional[int] = None,
+        use_mmap: Optional[bool] = None,
+        drop_page_cache: bool = True
     ):
         """
         Initialize the file hasher.
 
         Args:
             algorithm: Hash algorithm to use
-            chunk_size: Size of chunks for reading files (bytes)
+            chunk_size: Size of chunks for reading files (bytes): the first
+                round of progressive comparison and, unless io_block_size
+                is given, full hashes (None = DEFAULT_CHUNK_SIZE for
+                progressive rounds, full hash reads tuned per device)
             max_workers: Maximum number of worker threads (None = auto-detect optimal)
+            io_block_size: Read size for full hashes (None = chunk_size if
+                given, else tuned per device)
+            use_mmap: Hash files of MMAP_THRESHOLD bytes or more through mmap
+                (None = on Windows only: on POSIX, a file truncated while
+                mapped raises SIGBUS instead of an I/O error)
+            drop_page_cache: Drop pages of large hashed files from the page cache
         """
         self.algorithm = algorithm
-        self.chunk_size = chunk_size
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
         self.max_workers = max_workers  # None = auto-detect in batch operations
+        self.io_block_size = io_block_size or chunk_size
+        self.use_mmap = (os.name == 'nt') if use_mmap is None else use_mmap
+        self.drop_page_cache = drop_page_cache
+        self._local = threading.local()
         self._validate_algorithm()
 
     def _validate_algorithm(self) -> None:
@@ -128,11 +416,42 @@ class FileHasher:
         else:
             raise ValueError(f"Unsupported algorithm: {self.algorithm}")
 
+    def _buffer(self, size: int) -> memoryview:
+        """Reusable read buffer of the calling thread."""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        view = buffers.get(size)
+        if view is None:
+            view = buffers[size] = memoryview(bytearray(size))
+        return view
+
+    def io_block_size_for(self, st: os.stat_result) -> int:
+        """
+        Read size for hashing a file on the device of st.
+
+        Args:
+            st: Stat result of the file
+
+        Returns:
+            Block size in bytes
+        """
+        if self.io_block_size:
+            return self.io_block_size
+
+        size = self._device_block_sizes.get(st.st_dev)
+        if size is None:
+            size = ROTATIONAL_IO_BLOCK_SIZE if is_rotational(st.st_dev) else DEFAULT_IO_BLOCK_SIZE
+            size = max(size, getattr(st, 'st_blksize', 0) or 0)
+            self._device_block_sizes[st.st_dev] = size
+        return size
+
     def compute_quick_hash(self, file_path: Union[str, Path]) -> Optional[str]:
         """
         Compute quick hash of first and last chunks.
 
         This is much faster than full hash and eliminates most non-duplicates.
+        Both chunks are read into a reused buffer.
 
         Args:
             file_path: Path to the file
@@ -140,30 +459,23 @@ class FileHasher:
         Returns:
             Hex digest of the quick hash, or None on error
         """
+        chunk = self.QUICK_HASH_CHUNK_SIZE
         try:
-            path = Path(file_path)
-            size = path.stat().st_size
-
-            # For small files, use full content
-            if size <= self.QUICK_HASH_CHUNK_SIZE * 2:
-                with open(path, 'rb') as f:
-                    data = f.read()
+            with open(file_path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                view = self._buffer(chunk * 2)
                 hasher = self._create_hasher()
-                hasher.update(data)
-                return hasher.hexdigest()
 
-            # For larger files, hash first and last chunks
-            hasher = self._create_hasher()
+                # For small files, use full content
+                if size <= chunk * 2:
+                    hasher.update(view[:_readinto_full(f, view[:size])])
+                    return hasher.hexdigest()
 
-            with open(path, 'rb') as f:
-                # First chunk
-                first_chunk = f.read(self.QUICK_HASH_CHUNK_SIZE)
-                hasher.update(first_chunk)
-
-                # Last chunk
-                f.seek(-self.QUICK_HASH_CHUNK_SIZE, os.SEEK_END)
-                last_chunk = f.read(self.QUICK_HASH_CHUNK_SIZE)
-                hasher.update(last_chunk)
+                # For larger files, hash first and last chunks
+                first = _readinto_full(f, view[:chunk])
+                f.seek(-chunk, os.SEEK_END)
+                last = _readinto_full(f, view[first:first + chunk])
+                hasher.update(view[:first + last])
 
             return hasher.hexdigest()
 
@@ -178,7 +490,10 @@ class FileHasher:
         """
         Compute full hash of entire file.
 
-        Uses chunked reading for memory efficiency.
+        Reads with readinto() into a reused buffer sized for the file's
+        device (or through mmap for large files when use_mmap is set), with
+        sequential read-ahead advice and, for large files, dropping the
+        hashed pages from the page cache.
 
         Args:
             file_path: Path to the file
@@ -188,27 +503,73 @@ class FileHasher:
             Hex digest of the full hash, or None on error
         """
         try:
-            path = Path(file_path)
-            size = path.stat().st_size
-            hasher = self._create_hasher()
-            bytes_read = 0
+            with open(file_path, 'rb', buffering=0) as f:
+                st = os.fstat(f.fileno())
+                hasher = self._create_hasher()
+                if self.use_mmap and st.st_size >= MMAP_THRESHOLD:
+                    self._hash_mapped(f, st.st_size, hasher, progress_callback)
+                else:
+                    self._hash_stream(f, st, hasher, progress_callback)
 
-            with open(path, 'rb') as f:
-                while True:
-                    chunk = f.read(self.chunk_size)
-                    if not chunk:
-                        break
+            return hasher.hexdigest()
 
-                    hasher.update(chunk)
-                    bytes_read += len(chunk)
+        except (OSError, IOError, ValueError) as e:
+            return None
 
+    def _hash_stream(
+        self,
+        f: BinaryIO,
+        st: os.stat_result,
+        hasher,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> None:
+        """Hash an open file with readinto() into a reused buffer."""
+        fd = f.fileno()
+        drop = self.drop_page_cache and st.st_size >= FADVISE_DROP_THRESHOLD
+        _fadvise(fd, 0, 0, 'POSIX_FADV_SEQUENTIAL')
+
+        view = self._buffer(self.io_block_size_for(st))
+        bytes_read = dropped = 0
+        while True:
+            n = f.readinto(view)
+            if not n:
+                break
+
+            hasher.update(view[:n])
+            bytes_read += n
+
+            if progress_callback:
+                progress_callback(bytes_read, st.st_size)
+
+            if drop and bytes_read - dropped >= FADVISE_DROP_INTERVAL:
+                _fadvise(fd, dropped, bytes_read - dropped, 'POSIX_FADV_DONTNEED')
+                dropped = bytes_read
+
+        if drop:
+            _fadvise(fd, 0, 0, 'POSIX_FADV_DONTNEED')
+
+    def _hash_mapped(
+        self,
+        f: BinaryIO,
+        size: int,
+        hasher,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> None:
+        """Hash an open file through a read-only memory map."""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(mapped), MMAP_WINDOW):
+                    hasher.update(view[offset:offset + MMAP_WINDOW])
                     if progress_callback:
-                        progress_callback(bytes_read, size)
+                        progress_callback(min(offset + MMAP_WINDOW, len(mapped)), size)
+            finally:
+                view.release()
 
-            return hasher.hexdigest()
-
-        except (OSError, IOError) as e:
-            return None
+            if self.drop_page_cache and hasattr(mmap, 'MADV_DONTNEED'):
+                mapped.madvise(mmap.MADV_DONTNEED)
 
     def hash_file(
         self,
@@ -291,6 +652,118 @@ class FileHasher:
 
         return results
 
+    def compute_chunks(
+        self,
+        file_path: Union[str, Path],
+        chunker: Optional[ContentDefinedChunker] = None
+    ) -> Optional[ChunkList]:
+        """
+        Compute content-defined chunk digests of a file.
+
+        Args:
+            file_path: Path to the file
+            chunker: Chunker to use (default: 8 KB average chunks)
+
+        Returns:
+            ChunkList, or None on error
+        """
+        try:
+            return (chunker or ContentDefinedChunker()).chunk_file(file_path)
+        except OSError:
+            return None
+
+    def find_identical(
+        self,
+        file_paths: list[Union[str, Path]],
+        max_chunk_size: int = PROGRESSIVE_MAX_CHUNK_SIZE,
+        bytes_callback: Optional[Callable[[int], None]] = None,
+        memory_budget: int = PROGRESSIVE_MEMORY_BUDGET
+    ) -> list[tuple[str, list[Path]]]:
+        """
+        Split same-size files into sets of identical content.
+
+        All files are read in lockstep, chunk by chunk (chunks grow from
+        chunk_size up to max_chunk_size). A set is split as soon as its
+        chunks differ, and a file is no longer read once it is unique, so
+        large files that differ early are never read completely. The
+        chunks of one round share memory_budget, so a set of n files reads
+        at most memory_budget / n bytes per file (but at least
+        PROGRESSIVE_MIN_CHUNK_SIZE).
+
+        Each set of still-identical files shares one running hash, so the
+        returned hash equals compute_full_hash() of every member.
+
+        Args:
+            file_paths: Files of equal size
+            max_chunk_size: Largest chunk read per file and round
+            bytes_callback: Optional callback(bytes_read) after each round
+            memory_budget: Largest total of the chunks held in one round
+
+        Returns:
+            List of (full_hash, paths) for every set of 2+ identical files
+        """
+        results = []
+        handles = []
+
+        try:
+            members = []
+            for file_path in file_paths:
+                try:
+                    handle = open(file_path, 'rb')
+                except OSError:
+                    continue
+                handles.append(handle)
+                members.append((Path(file_path), handle))
+
+            stack = [(members, self._create_hasher(), self.chunk_size)]
+            while stack:
+                group, hasher, chunk_size = stack.pop()
+                if len(group) < 2:
+                    continue
+
+                # Read the next chunk of every member, within the budget
+                read_size = min(chunk_size, max(PROGRESSIVE_MIN_CHUNK_SIZE, memory_budget // len(group)))
+                chunks = []
+                for path, handle in group:
+                    try:
+                        chunks.append(((path, handle), handle.read(read_size)))
+                    except OSError:
+                        continue
+
+                if bytes_callback:
+                    bytes_callback(sum(len(chunk) for _, chunk in chunks))
+
+                # Partition members by chunk content (usually one variant)
+                variants: list[tuple[bytes, list]] = []
+                for member, chunk in chunks:
+                    for data, same in variants:
+                        if data == chunk:
+                            same.append(member)
+                            break
+                    else:
+                        variants.append((chunk, [member]))
+
+                next_size = min(chunk_size * 2, max_chunk_size)
+                for data, same in variants:
+                    if len(same) < 2:
+                        same[0][1].close()
+                        continue
+
+                    part_hasher = hasher if len(variants) == 1 else hasher.copy()
+                    if not data:
+                        # End of file reached together: identical content
+                        results.append((part_hasher.hexdigest(), [path for path, _ in same]))
+                        continue
+
+                    part_hasher.update(data)
+                    stack.append((same, part_hasher, next_size))
+
+        finally:
+            for handle in handles:
+                handle.close()
+
+        return results
+
     @staticmethod
     def compare_files_bytewise(
         file1: Union[str, Path],
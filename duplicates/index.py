@@ -0,0 +1,474 @@
+"""
+Persistent duplicate index updated from filesystem change sets.
+
+A full scan re-walks and re-stats every file. The index instead keeps the
+duplicate state of a set of roots in SQLite (every file's size, inode and,
+where needed, quick and full hash) and applies change sets from a tree
+diff or a filesystem watcher:
+- Changed paths are re-stat()ed; files whose size and mtime are unchanged
+  are skipped (watchers report spurious events)
+- Deleted paths (and everything below deleted directories) are dropped
+- Other paths sharing an inode with a changed or deleted path (hardlinks)
+  are re-stat()ed and lose their hashes: they changed too, unreported
+- Only the size buckets touched by a change are re-examined, and only
+  files in those buckets that lack a quick or full hash are read
+
+Files are hashed only once they have a same-size (then same quick hash)
+partner on another inode, exactly like the scanner's passes; paths sharing
+an inode are hashed once, and are reported as hardlink sets rather than as
+duplicates of each other. An update therefore costs work proportional to
+the change, not to the indexed data set.
+"""
+
+import os
+import sqlite3
+import stat as stat_module
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from .groups import DuplicateGroupManager, HardlinkSet
+from .hasher import FileHasher, HashAlgorithm
+from .pipeline import HashPipeline
+
+# SQL expression for the storage a row occupies: its inode, or the path
+# itself where the filesystem reports no inode numbers
+_STORAGE_KEY = "CASE WHEN ino = '0' THEN 'path:' || path ELSE dev || ':' || ino END"
+
+
+@dataclass
+class IndexUpdate:
+    """Result of applying a change set to a DuplicateIndex."""
+    files_added: int = 0
+    files_modified: int = 0
+    files_removed: int = 0
+    files_hashed: int = 0   # Quick and full hash computations
+    sizes_checked: int = 0  # Size buckets re-examined
+
+    def __repr__(self) -> str:
+        return (
+            f"IndexUpdate(added={self.files_added}, modified={self.files_modified}, "
+            f"removed={self.files_removed}, hashed={self.files_hashed} files)"
+        )
+
+
+class DuplicateIndex:
+    """
+    Persistent duplicate state kept current from change sets.
+
+    Example:
+        >>> index = DuplicateIndex('~/.cache/smart_search/duplicates.db')
+        >>> index.rebuild(['/archive'])  # Once: walks and hashes like a scan
+        >>> index.apply_changes(changed=['/archive/new.iso'], deleted=['/archive/old.iso'])
+        >>> manager = index.get_groups()
+    """
+
+    # Host parameters per SELECT ... IN (...) (SQLite's default limit is 999)
+    SQL_BATCH_SIZE = 900
+
+    # Rows per executemany() batch
+    WRITE_BATCH_SIZE = 5000
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256,
+        min_file_size: int = 0,
+        max_file_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        per_device_limit: int = HashPipeline.DEFAULT_PER_DEVICE_LIMIT
+    ):
+        """
+        Initialize index.
+
+        Args:
+            db_path: Index database file
+            algorithm: Hash algorithm (the index is cleared if it changes)
+            min_file_size: Minimum file size to index (bytes)
+            max_file_size: Maximum file size to index (bytes, None for no limit)
+            max_workers: Worker threads for hashing (None = auto-detect)
+            per_device_limit: Maximum concurrent reads per device
+        """
+        self.db_path = Path(db_path).expanduser()
+        self.algorithm = algorithm
+        self.min_file_size = min_file_size
+        self.max_file_size = max_file_size
+        self.hasher = FileHasher(algorithm=algorithm, max_workers=max_workers)
+        self.pipeline = HashPipeline(max_workers=max_workers, per_device_limit=per_device_limit)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def _init_db(self) -> None:
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    dev TEXT NOT NULL,
+                    ino TEXT NOT NULL,
+                    nlink INTEGER NOT NULL,
+                    quick_hash TEXT,
+                    full_hash TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files(size)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_full_hash ON files(full_hash)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_inode ON files(dev, ino)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'algorithm'").fetchone()
+            if row is None or row[0] != self.algorithm.value:
+                self._conn.execute("DELETE FROM files")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('algorithm', ?)",
+                    (self.algorithm.value,)
+                )
+
+    @property
+    def file_count(self) -> int:
+        """Number of indexed files."""
+        return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def rebuild(
+        self,
+        roots: Iterable[Union[str, Path]],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> IndexUpdate:
+        """
+        Clear the index and index roots from scratch.
+
+        Args:
+            roots: Directories or files to index
+            progress_callback: Optional callback(hashed, total) while hashing
+
+        Returns:
+            IndexUpdate
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM files")
+        return self.apply_changes(changed=roots, progress_callback=progress_callback)
+
+    def apply_changes(
+        self,
+        changed: Iterable[Union[str, Path]] = (),
+        deleted: Iterable[Union[str, Path]] = (),
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> IndexUpdate:
+        """
+        Apply a change set.
+
+        Args:
+            changed: Created or modified paths; directories are walked
+            deleted: Removed paths; rows below deleted directories go too
+            progress_callback: Optional callback(hashed, total) while hashing
+
+        Returns:
+            IndexUpdate
+        """
+        changed = list(changed)
+        update = IndexUpdate()
+        sizes: set[int] = set()
+        inodes: set[tuple[str, str]] = set()
+
+        with self._conn:
+            for path in deleted:
+                sizes.update(self._remove(os.path.abspath(path), update, inodes))
+
+            rows = []
+            seen = set()
+            for path, st in self._walk(changed):
+                seen.add(path)
+                old = self._conn.execute(
+                    "SELECT size, mtime, dev, ino FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if old is not None and old[:2] == (st.st_size, st.st_mtime):
+                    continue
+
+                if old is None:
+                    update.files_added += 1
+                else:
+                    update.files_modified += 1
+                    sizes.add(old[0])
+                    inodes.add((old[2], old[3]))
+                sizes.add(st.st_size)
+                inodes.add((str(st.st_dev), str(st.st_ino)))
+                rows.append((
+                    path, st.st_size, st.st_mtime,
+                    str(st.st_dev), str(st.st_ino), st.st_nlink
+                ))
+                if len(rows) >= self.WRITE_BATCH_SIZE:
+                    self._insert(rows)
+                    rows = []
+            self._insert(rows)
+
+            for path in self._stale(changed, seen):
+                sizes.update(self._remove(path, update, inodes))
+
+            sizes.update(self._reset_links(inodes, seen, update))
+
+        update.sizes_checked = len(sizes)
+        self._refresh(sizes, update, progress_callback)
+        return update
+
+    def get_groups(self) -> DuplicateGroupManager:
+        """
+        Build the duplicate groups from the index.
+
+        Returns:
+            DuplicateGroupManager with one group per full hash shared by
+            two or more inodes, and one hardlink set per inode with two or
+            more indexed paths
+        """
+        manager = DuplicateGroupManager()
+        cursor = self._conn.execute(f"""
+            SELECT full_hash, path, size, mtime, dev, ino, nlink FROM files
+            WHERE full_hash IN (
+                SELECT full_hash FROM files WHERE full_hash IS NOT NULL
+                GROUP BY full_hash HAVING COUNT(DISTINCT {_STORAGE_KEY}) > 1
+            )
+            ORDER BY full_hash, path
+        """)
+
+        group = None
+        for full_hash, path, size, mtime, dev, ino, nlink in cursor:
+            if group is None or group.hash_value != full_hash:
+                group = manager.create_group(full_hash, hash_type="full")
+            inode = (int(dev), int(ino)) if int(ino) else None
+            group.add_file(Path(path), size, mtime, inode=inode, link_count=nlink)
+
+        cursor = self._conn.execute("""
+            SELECT dev, ino, size, nlink, path FROM files
+            WHERE ino != '0' AND (dev, ino) IN (
+                SELECT dev, ino FROM files WHERE ino != '0'
+                GROUP BY dev, ino HAVING COUNT(*) > 1
+            )
+            ORDER BY dev, ino, path
+        """)
+        hardlink_set = None
+        for dev, ino, size, nlink, path in cursor:
+            inode = (int(dev), int(ino))
+            if hardlink_set is None or hardlink_set.inode != inode:
+                hardlink_set = HardlinkSet(inode=inode, size=size, link_count=nlink)
+                manager.add_hardlink_set(hardlink_set)
+            hardlink_set.paths.append(Path(path))
+        return manager
+
+    def _walk(self, paths: Iterable[Union[str, Path]]) -> Iterator[tuple[str, os.stat_result]]:
+        """Yield (absolute path, stat) of included regular files at or below paths."""
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            if stat_module.S_ISDIR(st.st_mode):
+                for root, _, filenames in os.walk(path):
+                    for filename in filenames:
+                        file_path = os.path.join(root, filename)
+                        try:
+                            file_st = os.stat(file_path)
+                        except OSError:
+                            continue
+                        if self._include(file_st):
+                            yield file_path, file_st
+            elif self._include(st):
+                yield path, st
+
+    def _include(self, st: os.stat_result) -> bool:
+        if not stat_module.S_ISREG(st.st_mode) or st.st_size < self.min_file_size:
+            return False
+        return self.max_file_size is None or st.st_size <= self.max_file_size
+
+    def _stale(self, paths: Iterable[Union[str, Path]], seen: set[str]) -> list[str]:
+        """
+        Changed paths whose index rows must go: paths that vanished before
+        the stat() or are no longer included, and files below changed
+        directories that were not found by the walk.
+        """
+        stale = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if not os.path.isdir(path):
+                if path not in seen:
+                    stale.append(path)
+                continue
+            below = path.rstrip(os.sep) + os.sep
+            cursor = self._conn.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(below), below)
+            )
+            stale.extend(row[0] for row in cursor if row[0] not in seen)
+        return stale
+
+    def _insert(self, rows: list[tuple]) -> None:
+        # A new file version starts without hashes
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (path, size, mtime, dev, ino, nlink) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _remove(self, path: str, update: IndexUpdate, inodes: set[tuple[str, str]]) -> set[int]:
+        """
+        Drop a path and every path below it; returns the affected sizes and
+        adds the inodes of the dropped rows to inodes.
+        """
+        below = path.rstrip(os.sep) + os.sep
+        rows = self._conn.execute(
+            "SELECT size, dev, ino FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+            (path, len(below), below)
+        ).fetchall()
+        if rows:
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+                (path, len(below), below)
+            )
+            update.files_removed += len(rows)
+            inodes.update((dev, ino) for _, dev, ino in rows)
+        return {size for size, _, _ in rows}
+
+    def _reset_links(
+        self,
+        inodes: set[tuple[str, str]],
+        seen: set[str],
+        update: IndexUpdate
+    ) -> set[int]:
+        """
+        Re-stat the other indexed paths of changed or deleted inodes.
+
+        A hardlink shares its content with the reported path, so its row is
+        replaced from a fresh stat() without hashes (or dropped if the path
+        is gone). Returns the affected sizes.
+        """
+        sizes = set()
+        rows = []
+        for dev, ino in inodes:
+            if not int(ino):
+                continue
+            for path, size, mtime in self._conn.execute(
+                "SELECT path, size, mtime FROM files WHERE dev = ? AND ino = ?", (dev, ino)
+            ).fetchall():
+                if path in seen:
+                    continue
+                seen.add(path)
+                sizes.add(size)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    st = None
+                if st is None or not self._include(st):
+                    self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    update.files_removed += 1
+                    continue
+
+                if (st.st_size, st.st_mtime) != (size, mtime):
+                    update.files_modified += 1
+                sizes.add(st.st_size)
+                rows.append((
+                    path, st.st_size, st.st_mtime,
+                    str(st.st_dev), str(st.st_ino), st.st_nlink
+                ))
+        self._insert(rows)
+        return sizes
+
+    def _refresh(
+        self,
+        sizes: set[int],
+        update: IndexUpdate,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> None:
+        """Hash what the touched size buckets need (quick, then full hashes)."""
+        if not sizes:
+            return
+
+        ordered = sorted(sizes)
+        quick_small = self.hasher.QUICK_HASH_CHUNK_SIZE * 2
+
+        # Quick hashes for files with a same-size partner on another inode
+        pending = self._select(ordered, f"""
+            SELECT path, size, dev, ino FROM files
+            WHERE quick_hash IS NULL AND size IN ({{}})
+              AND size IN (SELECT size FROM files WHERE size IN ({{}})
+                           GROUP BY size HAVING COUNT(DISTINCT {_STORAGE_KEY}) > 1)
+        """)
+        digests = self._hash(pending, self.hasher.compute_quick_hash, update, progress_callback)
+
+        # A quick hash of a small file covers its whole content
+        self._update_hashes(
+            "UPDATE files SET quick_hash = ?, full_hash = CASE WHEN size <= ? THEN ? END "
+            "WHERE path = ?",
+            [(digest, quick_small, digest, path) for path, digest in digests]
+        )
+
+        # Full hashes for files with a same-size, same-quick-hash partner
+        # on another inode
+        pending = self._select(ordered, f"""
+            SELECT path, size, dev, ino FROM files
+            WHERE full_hash IS NULL AND size IN ({{}})
+              AND (size, quick_hash) IN (
+                  SELECT size, quick_hash FROM files
+                  WHERE size IN ({{}}) AND quick_hash IS NOT NULL
+                  GROUP BY size, quick_hash HAVING COUNT(DISTINCT {_STORAGE_KEY}) > 1)
+        """)
+        digests = self._hash(pending, self.hasher.compute_full_hash, update, progress_callback)
+        self._update_hashes(
+            "UPDATE files SET full_hash = ? WHERE path = ?",
+            [(digest, path) for path, digest in digests]
+        )
+
+    def _select(self, sizes: list[int], sql: str) -> list[tuple]:
+        rows = []
+        for start in range(0, len(sizes), self.SQL_BATCH_SIZE // 2):
+            batch = sizes[start:start + self.SQL_BATCH_SIZE // 2]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(self._conn.execute(sql.format(placeholders, placeholders), batch + batch))
+        return rows
+
+    def _update_hashes(self, sql: str, rows: list[tuple]) -> None:
+        with self._conn:
+            for start in range(0, len(rows), self.WRITE_BATCH_SIZE):
+                self._conn.executemany(sql, rows[start:start + self.WRITE_BATCH_SIZE])
+
+    def _hash(
+        self,
+        rows: list[tuple],
+        compute: Callable[[str], Optional[str]],
+        update: IndexUpdate,
+        progress_callback: Optional[Callable[[int, int], None]]
+    ) -> list[tuple[str, str]]:
+        """Hash one path per inode on the pipeline; returns (path, digest) pairs."""
+        by_inode: dict[object, list[tuple]] = {}
+        for row in rows:
+            path, _, dev, ino = row
+            by_inode.setdefault((dev, ino) if int(ino) else path, []).append(row)
+
+        representatives = [links[0] for links in by_inode.values()]
+        digests = []
+        for completed, (row, digest) in enumerate(self.pipeline.run(
+            representatives,
+            device_of=lambda row: row[2],
+            work=lambda row: compute(row[0])
+        ), 1):
+            if digest:
+                update.files_hashed += 1
+                key = (row[2], row[3]) if int(row[3]) else row[0]
+                digests.extend((link[0], digest) for link in by_inode[key])
+            if progress_callback:
+                progress_callback(completed, len(representatives))
+        return digests
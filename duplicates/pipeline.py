@@ -0,0 +1,137 @@
+"""
+Bounded producer/consumer pipeline for hashing many files.
+
+Features:
+- Work items are pulled lazily from an iterable (bounded look-ahead)
+- Per-device concurrency limits: each st_dev gets its own queue and at most
+  per_device_limit reads in flight, so one slow disk or network share
+  cannot occupy every worker while other devices sit idle
+- Results stream back to the calling thread as soon as they complete
+- Cancellation stops submission and drops queued work
+"""
+
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Callable, Deque, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.threading import create_mixed_executor, get_optimal_mixed_workers
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class HashPipeline(Generic[T, R]):
+    """
+    Runs a work function over items on a thread pool with bounded queues.
+
+    Example:
+        >>> pipeline = HashPipeline(per_device_limit=4)
+        >>> for path, digest in pipeline.run(paths, device_of, hasher.compute_quick_hash):
+        ...     groups[digest].append(path)
+    """
+
+    # Default number of concurrent reads per device
+    DEFAULT_PER_DEVICE_LIMIT = 4
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        per_device_limit: int = DEFAULT_PER_DEVICE_LIMIT,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            max_workers: Worker threads (None = auto-detect)
+            per_device_limit: Maximum in-flight items per device
+            max_pending: Maximum items buffered ahead of the workers
+                (default: 4x the number of workers)
+        """
+        self.max_workers = max_workers or get_optimal_mixed_workers()
+        self.per_device_limit = max(1, per_device_limit)
+        self.max_pending = max_pending or self.max_workers * 4
+
+    def run(
+        self,
+        items: Iterable[T],
+        device_of: Callable[[T], int],
+        work: Callable[[T], R],
+        cancelled: Callable[[], bool] = lambda: False
+    ) -> Iterator[Tuple[T, R]]:
+        """
+        Process items and yield (item, result) pairs in completion order.
+
+        Args:
+            items: Work items (consumed lazily)
+            device_of: Function returning the device id of an item
+            work: Function run on a worker thread for each item
+            cancelled: Polled between completions; True stops the pipeline
+
+        Yields:
+            (item, result) tuples as workers finish
+        """
+        source = iter(items)
+        exhausted = False
+        buffered = 0
+        queues: "OrderedDict[int, Deque[T]]" = OrderedDict()
+        in_flight: Dict[int, int] = {}
+        futures: Dict[Future, Tuple[T, int]] = {}
+
+        with create_mixed_executor(
+            max_workers=self.max_workers,
+            thread_name_prefix="HashPipeline"
+        ) as executor:
+            try:
+                while True:
+                    if cancelled():
+                        break
+
+                    # Refill the look-ahead buffer
+                    while not exhausted and buffered < self.max_pending:
+                        try:
+                            item = next(source)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        queues.setdefault(device_of(item), deque()).append(item)
+                        buffered += 1
+
+                    # Submit round-robin across devices with spare capacity
+                    submitted = True
+                    while submitted and len(futures) < self.max_workers:
+                        submitted = False
+                        for device in list(queues):
+                            if len(futures) >= self.max_workers:
+                                break
+                            if in_flight.get(device, 0) >= self.per_device_limit:
+                                continue
+                            item = queues[device].popleft()
+                            if not queues[device]:
+                                del queues[device]
+                            else:
+                                queues.move_to_end(device)
+                            buffered -= 1
+                            in_flight[device] = in_flight.get(device, 0) + 1
+                            futures[executor.submit(work, item)] = (item, device)
+                            submitted = True
+
+                    if not futures:
+                        if exhausted and not queues:
+                            break
+                        continue
+
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        item, device = futures.pop(future)
+                        in_flight[device] -= 1
+                        yield item, future.result()
+
+            finally:
+                # Cancelled or consumer stopped early: drop queued work
+                for future in futures:
+                    future.cancel()
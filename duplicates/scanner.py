@@ -9,17 +9,57 @@ Features:
 - Optional hash caching for performance
 - Comprehensive statistics and reporting
 - Auto-detected optimal worker threads
+- Pipelined hashing: quick/full hash passes stream through a bounded
+  worker pool with per-device concurrency limits
+- Hardlink awareness: each inode is hashed once and hardlink sets are
+  reported separately
+- Similar-images mode: perceptual hashes find resized, recompressed or
+  re-exported copies of photos
+- Similar-text mode: MinHash/LSH finds edited copies of documents
+- Similarity signatures are cached next to the hashes, so rescans only
+  sign new or changed files
+- Resumable scans: the collected file list and finished hashes are saved
+  to a checkpoint, and an interrupted scan resumes from it
 """
 
 import os
+import stat as stat_module
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import Callable, Hashable, Iterable, Iterator, Optional, Union
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.stat_cache import get_stat_cache
 
 from .cache import HashCache
-from .groups import DuplicateGroup, DuplicateGroupManager
+from .checkpoint import ScanCheckpoint
+from .groups import DuplicateGroup, DuplicateGroupManager, HardlinkSet, InodeKey
 from .hasher import FileHasher, HashAlgorithm
+from .pipeline import HashPipeline
+from .similar_images import (
+    DEFAULT_THRESHOLD,
+    IMAGE_EXTENSIONS,
+    PerceptualHash,
+    cluster_similar,
+    image_hash,
+)
+from .similar_text import (
+    DEFAULT_SIMILARITY,
+    TEXT_EXTENSIONS,
+    cluster_similar_text,
+    signature_kind,
+    text_signature,
+)
+
+
+class ComparisonMode(Enum):
+    """How candidates that survive the quick hash pass are confirmed."""
+    FULL_HASH = "full_hash"      # Hash every candidate completely
+    PROGRESSIVE = "progressive"  # Read candidate sets in lockstep, split on first difference
 
 
 @dataclass
@@ -80,6 +120,9 @@ class ScanStats:
     scan_duration: float = 0.0
     cache_hits: int = 0
     cache_misses: int = 0
+    bytes_read: int = 0         # Bytes actually read while confirming duplicates
+    hardlinked_files: int = 0   # Paths skipped because they share an inode
+    hardlink_sets: int = 0
 
     def __repr__(self) -> str:
         return (
@@ -89,17 +132,27 @@ class ScanStats:
         )
 
 
+def _inode_of(st: Optional[os.stat_result]) -> Optional[InodeKey]:
+    """(st_dev, st_ino) of a stat result, or None if the inode is unknown."""
+    if st is None or not st.st_ino:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
 class DuplicateScanner:
     """
     Multi-pass duplicate file scanner.
 
     The scanner uses a three-pass approach:
-    1. Size grouping: Fast elimination of unique file sizes
+    1. Size grouping: Fast elimination of unique file sizes; paths sharing
+       an inode (hardlinks, bind mounts) are collapsed so each inode is
+       hashed once
     2. Quick hashing: Hash first/last 8KB to eliminate most non-duplicates
     3. Full hashing: Complete file hash for definitive duplicate detection
 
     Features:
-    - Parallel processing with thread pool
+    - Parallel hashing pipeline with per-device concurrency limits
+    - Batched hash cache lookups and writes
     - Progress callbacks for UI integration
     - Cancellation support
     - Optional hash caching
@@ -113,6 +166,14 @@ class DuplicateScanner:
         >>> print(f"Found {len(groups)} duplicate groups")
     """
 
+    # Files per hash cache lookup/write batch
+    CACHE_BATCH_SIZE = 500
+
+    # Progressive comparison: smaller files are simply hashed, and larger
+    # candidate sets are hashed too (one open file per member)
+    PROGRESSIVE_MIN_SIZE = 1024 * 1024
+    PROGRESSIVE_MAX_GROUP = 64
+
     def __init__(
         self,
         algorithm: HashAlgorithm = HashAlgorithm.SHA256,
@@ -120,7 +181,9 @@ class DuplicateScanner:
         cache_path: Optional[Union[str, Path]] = None,
         max_workers: Optional[int] = None,
         min_file_size: int = 0,
-        max_file_size: Optional[int] = None
+        max_file_size: Optional[int] = None,
+        per_device_limit: int = HashPipeline.DEFAULT_PER_DEVICE_LIMIT,
+        comparison_mode: ComparisonMode = ComparisonMode.FULL_HASH
     ):
         """
         Initialize duplicate scanner.
@@ -132,16 +195,25 @@ class DuplicateScanner:
             max_workers: Maximum number of worker threads (None = auto-detect optimal)
             min_file_size: Minimum file size to scan (bytes)
             max_file_size: Maximum file size to scan (bytes, None for no limit)
+            per_device_limit: Maximum concurrent reads per device
+            comparison_mode: How quick-hash candidates are confirmed
         """
         self.algorithm = algorithm
         self.use_cache = use_cache
         self.max_workers = max_workers
         self.min_file_size = min_file_size
         self.max_file_size = max_file_size
+        self.comparison_mode = comparison_mode
 
         # Initialize hasher with auto-detected workers
         self.hasher = FileHasher(algorithm=algorithm, max_workers=max_workers)
 
+        # Quick and full hash passes run on a bounded, per-device pipeline
+        self.pipeline = HashPipeline(
+            max_workers=max_workers,
+            per_device_limit=per_device_limit
+        )
+
         # Initialize cache
         self.cache: Optional[HashCache] = None
         if use_cache:
@@ -149,6 +221,19 @@ class DuplicateScanner:
                 cache_path = Path.home() / '.cache' / 'smart_search' / 'hashes.db'
             self.cache = HashCache(cache_path)
 
+        # Shared stat cache; stats gathered during discovery are reused by
+        # every later pass instead of stat()ing each file again
+        self._stat_cache = get_stat_cache()
+        self._file_stats: dict[Path, os.stat_result] = {}
+
+        # Hardlinks: representative path -> other paths of the same inode
+        self._links: dict[Path, list[Path]] = {}
+        self._hardlink_sets: list[HardlinkSet] = []
+
+        # Checkpoint of the running scan, and hashes restored from it
+        self._checkpoint: Optional[ScanCheckpoint] = None
+        self._resumed: dict[str, dict[Path, str]] = {}
+
         # Cancellation flag
         self._cancelled = False
 
@@ -164,38 +249,97 @@ class DuplicateScanner:
         paths: list[Union[str, Path]],
         recursive: bool = True,
         follow_symlinks: bool = False,
-        progress_callback: Optional[Callable[[ScanProgress], None]] = None
+        progress_callback: Optional[Callable[[ScanProgress], None]] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None
     ) -> DuplicateGroupManager:
         """
         Scan paths for duplicate files.
 
+        With checkpoint_path, the collected file list and finished hashes
+        are saved to a checkpoint while scanning. If the scan is cancelled
+        or the process dies, calling scan() again with the same paths,
+        options and checkpoint_path skips discovery and every finished hash
+        (candidates are re-stat()ed, and changed files are hashed again).
+        The checkpoint is deleted when the scan completes.
+
         Args:
             paths: List of directories or files to scan
             recursive: Recursively scan subdirectories
             follow_symlinks: Follow symbolic links
             progress_callback: Optional callback for progress updates
+            checkpoint_path: Checkpoint file to save to and resume from
 
         Returns:
             DuplicateGroupManager with found duplicates
         """
-        import time
-        start_time = time.time()
-
         self._cancelled = False
         self.stats = ScanStats()
+        self._file_stats = {}
+        self._links = {}
+        self._hardlink_sets = []
+        self._resumed = {}
+
+        resumed_files = None
+        if checkpoint_path is not None:
+            self._checkpoint = ScanCheckpoint(checkpoint_path)
+            key = ScanCheckpoint.scan_key(
+                paths,
+                recursive=recursive,
+                follow_symlinks=follow_symlinks,
+                min_file_size=self.min_file_size,
+                max_file_size=self.max_file_size,
+                algorithm=self.algorithm.value
+            )
+            if self._checkpoint.open(key):
+                resumed_files = self._checkpoint.load_files()
+                self._resumed = {
+                    field: self._checkpoint.load_digests(field)
+                    for field in ('quick_hash', 'full_hash')
+                }
+
+        try:
+            return self._scan(paths, recursive, follow_symlinks, progress_callback, resumed_files)
+        finally:
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+                self._checkpoint = None
+            self._resumed = {}
+
+    def _scan(
+        self,
+        paths: list[Union[str, Path]],
+        recursive: bool,
+        follow_symlinks: bool,
+        progress_callback: Optional[Callable[[ScanProgress], None]],
+        resumed_files: Optional[dict[Path, os.stat_result]]
+    ) -> DuplicateGroupManager:
+        """Run the scan passes (see scan())."""
+        import time
+        start_time = time.time()
 
         # Initialize progress
         progress = ScanProgress()
 
-        # Collect all files
-        progress.current_phase = "Discovering files..."
-        if progress_callback:
-            progress_callback(progress)
+        if resumed_files is not None:
+            progress.current_phase = "Resuming from checkpoint..."
+            if progress_callback:
+                progress_callback(progress)
 
-        files = self._collect_files(paths, recursive, follow_symlinks)
+            self._file_stats = dict(resumed_files)
+            files = list(resumed_files)
+        else:
+            # Collect all files
+            progress.current_phase = "Discovering files..."
+            if progress_callback:
+                progress_callback(progress)
 
-        if self._cancelled:
-            return DuplicateGroupManager()
+            files = self._collect_files(paths, recursive, follow_symlinks)
+
+            if self._cancelled:
+                return DuplicateGroupManager()
+
+            if self._checkpoint:
+                self._checkpoint.save_files((path, self._file_stats[path]) for path in files)
 
         # Pass 1: Group by size
         progress.current_pass = 1
@@ -205,6 +349,8 @@ class DuplicateScanner:
             progress_callback(progress)
 
         size_groups = self._group_by_size(files, progress, progress_callback)
+        if resumed_files is not None:
+            size_groups = self._revalidate_resumed(size_groups)
 
         if self._cancelled:
             return DuplicateGroupManager()
@@ -229,6 +375,8 @@ class DuplicateScanner:
             progress_callback(progress)
 
         duplicate_groups = self._full_hash_pass(quick_hash_groups, progress, progress_callback)
+        for hardlink_set in self._hardlink_sets:
+            duplicate_groups.add_hardlink_set(hardlink_set)
 
         # Finalize statistics
         self.stats.scan_duration = time.time() - start_time
@@ -237,12 +385,16 @@ class DuplicateScanner:
         self.stats.duplicate_files = sum(g.file_count for g in duplicate_groups.groups)
         self.stats.wasted_space = sum(g.wasted_space for g in duplicate_groups.groups)
         self.stats.unique_files = len(files) - self.stats.duplicate_files
+        self.stats.hardlink_sets = len(self._hardlink_sets)
 
         if self.cache:
             cache_stats = self.cache.get_stats()
             self.stats.cache_hits = cache_stats.cache_hits
             self.stats.cache_misses = cache_stats.cache_misses
 
+        if self._checkpoint and not self._cancelled:
+            self._checkpoint.complete()
+
         # Final progress update
         progress.current_file = progress.total_files
         progress.current_phase = "Scan complete"
@@ -251,64 +403,327 @@ class DuplicateScanner:
 
         return duplicate_groups
 
+    def scan_similar_images(
+        self,
+        paths: list[Union[str, Path]],
+        threshold: int = DEFAULT_THRESHOLD,
+        algorithm: PerceptualHash = PerceptualHash.PHASH,
+        recursive: bool = True,
+        follow_symlinks: bool = False,
+        progress_callback: Optional[Callable[[ScanProgress], None]] = None
+    ) -> DuplicateGroupManager:
+        """
+        Scan paths for visually similar images.
+
+        Images are hashed with a perceptual hash on the worker pipeline and
+        clustered by Hamming distance; each cluster becomes a group whose
+        hash_type is the algorithm name ('phash' or 'dhash').
+
+        Args:
+            paths: List of directories or files to scan
+            threshold: Maximum Hamming distance (of 64 bits) between similar images
+            algorithm: Perceptual hash algorithm
+            recursive: Recursively scan subdirectories
+            follow_symlinks: Follow symbolic links
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            DuplicateGroupManager with groups of similar images
+
+        Raises:
+            RuntimeError: If Pillow or NumPy is not installed
+        """
+        def compute(path: Path) -> Optional[bytes]:
+            hash_value = image_hash(path, algorithm)
+            return None if hash_value is None else hash_value.to_bytes(8, "big")
+
+        def cluster(signatures):
+            return cluster_similar(
+                ((int.from_bytes(signature, "big"), item) for signature, item in signatures),
+                threshold
+            )
+
+        return self._scan_similar(
+            paths, IMAGE_EXTENSIONS, algorithm.value, compute, cluster,
+            recursive, follow_symlinks, progress_callback, noun="image"
+        )
+
+    def scan_similar_text(
+        self,
+        paths: list[Union[str, Path]],
+        threshold: float = DEFAULT_SIMILARITY,
+        extensions: Optional[Iterable[str]] = None,
+        recursive: bool = True,
+        follow_symlinks: bool = False,
+        progress_callback: Optional[Callable[[ScanProgress], None]] = None
+    ) -> DuplicateGroupManager:
+        """
+        Scan paths for near-duplicate text files (edited copies, logs with
+        changed headers).
+
+        MinHash signatures of word shingles are bucketed with LSH and
+        candidate pairs verified by estimated Jaccard similarity; each
+        cluster becomes a group with hash_type 'minhash'.
+
+        Args:
+            paths: List of directories or files to scan
+            threshold: Minimum estimated Jaccard similarity (0-1)
+            extensions: File extensions to compare (default: TEXT_EXTENSIONS)
+            recursive: Recursively scan subdirectories
+            follow_symlinks: Follow symbolic links
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            DuplicateGroupManager with groups of similar documents
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        wanted = TEXT_EXTENSIONS if extensions is None else frozenset(
+            ext.lower() if ext.startswith('.') else f".{ext.lower()}" for ext in extensions
+        )
+        return self._scan_similar(
+            paths, wanted, signature_kind(), text_signature,
+            lambda signatures: cluster_similar_text(signatures, threshold),
+            recursive, follow_symlinks, progress_callback, noun="document"
+        )
+
+    def _scan_similar(
+        self,
+        paths: list[Union[str, Path]],
+        extensions: frozenset,
+        kind: str,
+        compute: Callable[[Path], Optional[bytes]],
+        cluster: Callable[[list[tuple[bytes, tuple]]], list[list[tuple]]],
+        recursive: bool,
+        follow_symlinks: bool,
+        progress_callback: Optional[Callable[[ScanProgress], None]],
+        noun: str
+    ) -> DuplicateGroupManager:
+        """
+        Shared similarity scan: discover, sign (through the signature
+        cache), cluster, and build groups with hash_type set to the
+        signature kind family.
+        """
+        import time
+        start_time = time.time()
+
+        self._cancelled = False
+        self.stats = ScanStats()
+        self._file_stats = {}
+        self._links = {}
+        self._hardlink_sets = []
+
+        progress = ScanProgress()
+        progress.current_phase = f"Discovering {noun}s..."
+        if progress_callback:
+            progress_callback(progress)
+
+        files = [
+            path for path in self._collect_files(paths, recursive, follow_symlinks)
+            if path.suffix.lower() in extensions
+        ]
+        if self._cancelled:
+            return DuplicateGroupManager()
+
+        # Sign each inode once
+        by_size = defaultdict(list)
+        for path in files:
+            st = self._get_file_stat(path)
+            if st is not None:
+                by_size[st.st_size].append(path)
+
+        items = []
+        for size, size_paths in by_size.items():
+            if len(size_paths) > 1:
+                size_paths = self._collapse_hardlinks(size, size_paths)
+            for path in size_paths:
+                items.append((path, size, self._get_file_stat(path)))
+
+        progress.current_pass = 2
+        progress.total_files = len(items)
+        progress.current_phase = f"Computing {noun} signatures..."
+        if progress_callback:
+            progress_callback(progress)
+
+        signatures = list(self._signature_stage(items, kind, compute, progress, progress_callback))
+        # Commit new signatures now rather than on the write-behind timer
+        if self.cache:
+            self.cache.flush()
+        if self._cancelled:
+            return DuplicateGroupManager()
+
+        progress.current_pass = 3
+        progress.current_phase = f"Clustering similar {noun}s..."
+        if progress_callback:
+            progress_callback(progress)
+
+        manager = DuplicateGroupManager()
+        signature_of = {item[0]: signature for signature, item in signatures}
+        hash_type = kind.split('-', 1)[0]
+        for members in cluster(signatures):
+            # Largest file first
+            members.sort(key=lambda item: item[1], reverse=True)
+            group = manager.create_group(signature_of[members[0][0]][:8].hex(), hash_type=hash_type)
+            for path, size, st in members:
+                for member in [path, *self._links.get(path, ())]:
+                    member_st = self._get_file_stat(member) or st
+                    group.add_file(
+                        member, size, member_st.st_mtime,
+                        inode=_inode_of(member_st),
+                        link_count=member_st.st_nlink
+                    )
+
+        for hardlink_set in self._hardlink_sets:
+            manager.add_hardlink_set(hardlink_set)
+
+        self.stats.scan_duration = time.time() - start_time
+        self.stats.total_files_scanned = len(files)
+        self.stats.duplicate_groups = len(manager.groups)
+        self.stats.duplicate_files = sum(g.file_count for g in manager.groups)
+        self.stats.wasted_space = sum(g.wasted_space for g in manager.groups)
+        self.stats.unique_files = len(files) - self.stats.duplicate_files
+        self.stats.hardlink_sets = len(self._hardlink_sets)
+
+        progress.current_file = progress.total_files
+        progress.current_phase = "Scan complete"
+        if progress_callback:
+            progress_callback(progress)
+
+        return manager
+
+    def _signature_stage(
+        self,
+        items: list[tuple[Path, int, os.stat_result]],
+        kind: str,
+        compute: Callable[[Path], Optional[bytes]],
+        progress: ScanProgress,
+        progress_callback: Optional[Callable[[ScanProgress], None]]
+    ) -> Iterator[tuple[bytes, tuple[Path, int, os.stat_result]]]:
+        """
+        Get similarity signatures from the cache or compute them on the
+        pipeline (the analogue of _hash_stage for signatures).
+
+        Yields:
+            (signature, item) for every file with a signature
+        """
+        misses = []
+        for start in range(0, len(items), self.CACHE_BATCH_SIZE):
+            if self._cancelled:
+                return
+            batch = items[start:start + self.CACHE_BATCH_SIZE]
+            cached = {}
+            if self.cache:
+                cached = self.cache.get_signatures(
+                    [(path, st) for path, _, st in batch], kind
+                )
+            for item in batch:
+                signature = cached.get(item[0])
+                if signature is None:
+                    misses.append(item)
+                    continue
+                yield signature, item
+                self._advance(progress, None, 1)
+
+        pending_writes = []
+        for item, signature in self.pipeline.run(
+            misses,
+            device_of=lambda item: item[2].st_dev,
+            work=lambda item: compute(item[0]),
+            cancelled=lambda: self._cancelled
+        ):
+            path, size, st = item
+            if signature is not None:
+                if self.cache:
+                    pending_writes.append((path, st, signature))
+                    if len(pending_writes) >= self.CACHE_BATCH_SIZE:
+                        self.cache.set_signatures(pending_writes, kind)
+                        pending_writes = []
+                yield signature, item
+            self.stats.total_bytes_scanned += size
+            self._advance(progress, progress_callback, 1)
+
+        if pending_writes:
+            self.cache.set_signatures(pending_writes, kind)
+
     def _collect_files(
         self,
         paths: list[Union[str, Path]],
         recursive: bool,
         follow_symlinks: bool
     ) -> list[Path]:
-        """Collect all files from the given paths."""
+        """
+        Collect all files from the given paths.
+
+        Each directory's files are stat()ed in bulk through the shared stat
+        cache, and the results are kept in self._file_stats for later passes.
+        """
         files = []
 
         for path_str in paths:
             path = Path(path_str)
+            st = self._stat_cache.try_stat(path)
 
-            if not path.exists():
+            if st is None:
                 continue
 
-            if path.is_file():
-                if self._should_include_file(path):
+            if stat_module.S_ISREG(st.st_mode):
+                if self._should_include_file(path, st):
                     files.append(path)
 
-            elif path.is_dir():
+            elif stat_module.S_ISDIR(st.st_mode):
                 if recursive:
                     for root, dirs, filenames in os.walk(path, followlinks=follow_symlinks):
-                        for filename in filenames:
-                            file_path = Path(root) / filename
-
-                            if self._cancelled:
-                                return files
-
-                            if self._should_include_file(file_path):
-                                files.append(file_path)
+                        if self._cancelled:
+                            return files
+                        files.extend(self._include_from_directory(
+                            [Path(root) / filename for filename in filenames]
+                        ))
                 else:
-                    for item in path.iterdir():
-                        if item.is_file() and self._should_include_file(item):
-                            files.append(item)
+                    files.extend(self._include_from_directory(list(path.iterdir())))
 
         return files
 
-    def _should_include_file(self, path: Path) -> bool:
-        """Check if file should be included in scan."""
-        try:
-            stat = path.stat()
-
-            # Check if it's a regular file
-            if not path.is_file():
-                return False
+    def _include_from_directory(self, candidates: list[Path]) -> list[Path]:
+        """Bulk-stat candidates from one directory and keep the included ones."""
+        stats = self._stat_cache.stat_many(candidates)
+        return [
+            candidate for candidate in candidates
+            if self._should_include_file(candidate, stats.get(str(candidate)))
+        ]
 
-            # Check size constraints
-            if stat.st_size < self.min_file_size:
+    def _should_include_file(
+        self,
+        path: Path,
+        st: Optional[os.stat_result] = None
+    ) -> bool:
+        """Check if file should be included in scan."""
+        if st is None:
+            st = self._stat_cache.try_stat(path)
+            if st is None:
                 return False
 
-            if self.max_file_size is not None and stat.st_size > self.max_file_size:
-                return False
+        # Check if it's a regular file
+        if not stat_module.S_ISREG(st.st_mode):
+            return False
 
-            return True
+        # Check size constraints
+        if st.st_size < self.min_file_size:
+            return False
 
-        except (OSError, IOError):
+        if self.max_file_size is not None and st.st_size > self.max_file_size:
             return False
 
+        self._file_stats[path] = st
+        return True
+
+    def _get_file_stat(self, path: Path) -> Optional[os.stat_result]:
+        """Get the stat result recorded for a file during discovery."""
+        st = self._file_stats.get(path)
+        if st is None:
+            st = self._stat_cache.try_stat(path)
+        return st
+
     def _group_by_size(
         self,
         files: list[Path],
@@ -322,126 +737,358 @@ class DuplicateScanner:
             if self._cancelled:
                 break
 
+            st = self._get_file_stat(file_path)
+            if st is None:
+                continue
+
+            size_groups[st.st_size].append(file_path)
+
+            progress.current_file = i + 1
+            if progress_callback and i % 100 == 0:
+                progress_callback(progress)
+
+        # Filter out unique sizes (no duplicates possible), then hardlinks:
+        # paths of one inode always have equal sizes
+        candidates = {}
+        for size, paths in size_groups.items():
+            if len(paths) > 1:
+                paths = self._collapse_hardlinks(size, paths)
+                if len(paths) > 1:
+                    candidates[size] = paths
+        return candidates
+
+    def _collapse_hardlinks(self, size: int, paths: list[Path]) -> list[Path]:
+        """
+        Keep one representative path per inode.
+
+        The other paths of each inode are recorded in self._links (they join
+        the representative's duplicate group) and as a HardlinkSet.
+        Paths listed twice (overlapping scan roots) are dropped.
+        """
+        by_inode: dict[Hashable, list[Path]] = {}
+        for path in paths:
+            by_inode.setdefault(self._storage_key(path), []).append(path)
+
+        representatives = []
+        for key, links in by_inode.items():
+            links = list({os.path.abspath(link): link for link in links}.values())
+            representative = links[0]
+            representatives.append(representative)
+
+            if len(links) > 1:
+                self._links[representative] = links[1:]
+                self.stats.hardlinked_files += len(links) - 1
+                self._hardlink_sets.append(HardlinkSet(
+                    inode=key,
+                    size=size,
+                    paths=links,
+                    link_count=self._get_file_stat(representative).st_nlink
+                ))
+
+        return representatives
+
+    def _revalidate_resumed(self, size_groups: dict[int, list[Path]]) -> dict[int, list[Path]]:
+        """
+        Re-stat the candidates of a resumed scan.
+
+        Files that changed since the checkpoint lose their recorded hashes;
+        files that vanished or changed size leave this scan.
+        """
+        changed = []
+        candidates = {}
+        for size, paths in size_groups.items():
+            current = []
+            for path in paths:
+                st = self._stat_cache.try_stat(path)
+                if st is None or st.st_size != size:
+                    changed.append(path)
+                    continue
+                if st.st_mtime != self._file_stats[path].st_mtime:
+                    changed.append(path)
+                self._file_stats[path] = st
+                current.append(path)
+            if len(current) > 1:
+                candidates[size] = current
+
+        for digests in self._resumed.values():
+            for path in changed:
+                digests.pop(path, None)
+        if changed and self._checkpoint:
+            self._checkpoint.discard_digests(changed)
+        return candidates
+
+    def _storage_key(self, path: Path) -> Hashable:
+        """(st_dev, st_ino) of a file, or the path if the inode is unknown."""
+        st = self._get_file_stat(path)
+        if st is not None and not st.st_ino:
+            # Directory listings on Windows carry no file index; stat the
+            # file itself (this only happens for size-group candidates)
             try:
-                size = file_path.stat().st_size
-                size_groups[size].append(file_path)
+                st = os.stat(path)
+                self._file_stats[path] = st
+            except OSError:
+                pass
+
+        inode = _inode_of(st)
+        return inode if inode is not None else os.path.abspath(path)
 
-                progress.current_file = i + 1
-                if progress_callback and i % 100 == 0:
+    def _hash_stage(
+        self,
+        items: list[tuple[Path, int, os.stat_result]],
+        cache_field: str,
+        compute: Callable[[Path], Optional[str]],
+        progress: ScanProgress,
+        progress_callback: Optional[Callable[[ScanProgress], None]],
+        report_every: int
+    ) -> Iterator[tuple[Path, int, os.stat_result, str]]:
+        """
+        Hash items through the cache and the worker pipeline.
+
+        Hashes restored from a checkpoint and cache lookups (in batches)
+        come first; misses are hashed by the pipeline and stream back in
+        completion order, while their cache writes are flushed in batches
+        and recorded in the checkpoint.
+
+        Yields:
+            (path, size, stat_result, digest) for every successfully hashed item
+        """
+        progress.total_files = len(items)
+        processed = 0
+        misses = []
+        resumed = self._resumed.get(cache_field, {})
+
+        for start in range(0, len(items), self.CACHE_BATCH_SIZE):
+            if self._cancelled:
+                return
+            batch = []
+            for item in items[start:start + self.CACHE_BATCH_SIZE]:
+                digest = resumed.get(item[0])
+                if digest is None:
+                    batch.append(item)
+                    continue
+
+                yield (*item, digest)
+                processed += 1
+                progress.current_file = processed
+                if progress_callback and processed % report_every == 0:
                     progress_callback(progress)
 
-            except (OSError, IOError):
-                continue
+            cached = {}
+            if self.cache:
+                cached = self.cache.get_many(
+                    [(path, st) for path, _, st in batch],
+                    algorithm=self.algorithm
+                )
+
+            for item in batch:
+                entry = cached.get(item[0])
+                digest = entry[cache_field] if entry else None
+                if digest is None:
+                    misses.append(item)
+                    continue
+
+                yield (*item, digest)
+                processed += 1
+                progress.current_file = processed
+                if progress_callback and processed % report_every == 0:
+                    progress_callback(progress)
 
-        # Filter out unique sizes (no duplicates possible)
-        return {size: paths for size, paths in size_groups.items() if len(paths) > 1}
+        pending_writes = []
+        for item, digest in self.pipeline.run(
+            misses,
+            device_of=lambda item: item[2].st_dev,
+            work=lambda item: compute(item[0]),
+            cancelled=lambda: self._cancelled
+        ):
+            path, size, st = item
+            if digest:
+                if self._checkpoint:
+                    self._checkpoint.add_digest(cache_field, path, digest)
+                if self.cache:
+                    pending_writes.append(
+                        (path, st, digest, None) if cache_field == 'quick_hash'
+                        else (path, st, None, digest)
+                    )
+                    if len(pending_writes) >= self.CACHE_BATCH_SIZE:
+                        self.cache.set_many(pending_writes, algorithm=self.algorithm)
+                        pending_writes = []
+                yield path, size, st, digest
+
+            processed += 1
+            progress.current_file = processed
+            if progress_callback and processed % report_every == 0:
+                progress_callback(progress)
+
+        if pending_writes:
+            self.cache.set_many(pending_writes, algorithm=self.algorithm)
 
     def _quick_hash_pass(
         self,
         size_groups: dict[int, list[Path]],
         progress: ScanProgress,
         progress_callback: Optional[Callable[[ScanProgress], None]]
-    ) -> dict[str, list[tuple[Path, int, float]]]:
+    ) -> dict[tuple[int, str], list[tuple[Path, int, float]]]:
         """Compute quick hashes for files (Pass 2)."""
-        quick_hash_groups = defaultdict(list)
-        total_files = sum(len(paths) for paths in size_groups.values())
-        progress.total_files = total_files
-        processed = 0
-
+        items = []
         for size, paths in size_groups.items():
-            if self._cancelled:
-                break
-
             for path in paths:
-                if self._cancelled:
-                    break
+                st = self._get_file_stat(path)
+                if st is not None:
+                    items.append((path, size, st))
 
-                # Check cache first
-                quick_hash = None
-                if self.cache:
-                    cached = self.cache.get_hash(path, validate_mtime=True)
-                    if cached and cached['quick_hash']:
-                        quick_hash = cached['quick_hash']
-
-                # Compute if not cached
-                if quick_hash is None:
-                    quick_hash = self.hasher.compute_quick_hash(path)
-                    if quick_hash and self.cache:
-                        self.cache.set_hash(
-                            path,
-                            quick_hash=quick_hash,
-                            algorithm=self.algorithm
-                        )
-
-                if quick_hash:
-                    stat = path.stat()
-                    quick_hash_groups[quick_hash].append((path, size, stat.st_mtime))
-
-                processed += 1
-                progress.current_file = processed
-                if progress_callback and processed % 50 == 0:
-                    progress_callback(progress)
+        # Keyed by (size, quick hash): equal head/tail chunks of files with
+        # different sizes are not candidates
+        quick_hash_groups = defaultdict(list)
+        for path, size, st, quick_hash in self._hash_stage(
+            items, 'quick_hash', self.hasher.compute_quick_hash,
+            progress, progress_callback, report_every=50
+        ):
+            quick_hash_groups[(size, quick_hash)].append((path, size, st.st_mtime))
 
         # Filter out unique quick hashes
-        return {hash_val: paths for hash_val, paths in quick_hash_groups.items() if len(paths) > 1}
+        return {key: paths for key, paths in quick_hash_groups.items() if len(paths) > 1}
 
     def _full_hash_pass(
         self,
-        quick_hash_groups: dict[str, list[tuple[Path, int, float]]],
+        quick_hash_groups: dict[tuple[int, str], list[tuple[Path, int, float]]],
         progress: ScanProgress,
         progress_callback: Optional[Callable[[ScanProgress], None]]
     ) -> DuplicateGroupManager:
-        """Compute full hashes for potential duplicates (Pass 3)."""
+        """Confirm duplicates by full hash or progressive comparison (Pass 3)."""
         manager = DuplicateGroupManager()
         full_hash_groups = defaultdict(list)
-        total_files = sum(len(paths) for paths in quick_hash_groups.values())
-        progress.total_files = total_files
-        processed = 0
-
-        for quick_hash, file_infos in quick_hash_groups.items():
-            if self._cancelled:
-                break
-
-            for path, size, mtime in file_infos:
-                if self._cancelled:
-                    break
-
-                # Check cache first
-                full_hash = None
-                if self.cache:
-                    cached = self.cache.get_hash(path, validate_mtime=True)
-                    if cached and cached['full_hash']:
-                        full_hash = cached['full_hash']
-
-                # Compute if not cached
-                if full_hash is None:
-                    full_hash = self.hasher.compute_full_hash(path)
-                    if full_hash and self.cache:
-                        # Update cache with full hash
-                        self.cache.set_hash(
-                            path,
-                            full_hash=full_hash,
-                            algorithm=self.algorithm
-                        )
-
-                if full_hash:
-                    full_hash_groups[full_hash].append((path, size, mtime))
-                    self.stats.total_bytes_scanned += size
-
-                processed += 1
-                progress.current_file = processed
-                if progress_callback and processed % 25 == 0:
-                    progress_callback(progress)
 
-        # Create duplicate groups
+        hash_items = []
+        progressive_groups = []
+        for (size, _), file_infos in quick_hash_groups.items():
+            members = []
+            for path, _, _ in file_infos:
+                st = self._get_file_stat(path)
+                if st is not None:
+                    members.append((path, size, st))
+
+            if (self.comparison_mode == ComparisonMode.PROGRESSIVE
+                    and size >= self.PROGRESSIVE_MIN_SIZE
+                    and len(members) <= self.PROGRESSIVE_MAX_GROUP):
+                progressive_groups.append(members)
+            else:
+                hash_items.extend(members)
+
+        # Largest files first so long reads overlap instead of finishing last
+        hash_items.sort(key=lambda item: item[1], reverse=True)
+
+        for path, size, st, full_hash in self._hash_stage(
+            hash_items, 'full_hash', self.hasher.compute_full_hash,
+            progress, progress_callback, report_every=25
+        ):
+            full_hash_groups[full_hash].append((path, size, st.st_mtime))
+            self.stats.total_bytes_scanned += size
+
+        if progressive_groups:
+            progress.total_files = len(hash_items) + sum(len(g) for g in progressive_groups)
+            progress.current_phase = "Comparing candidate files..."
+            for full_hash, members in self._progressive_stage(
+                progressive_groups, progress, progress_callback
+            ):
+                for path, size, st in members:
+                    full_hash_groups[full_hash].append((path, size, st.st_mtime))
+
+        # Create duplicate groups; file_infos holds one path per inode, and
+        # the other hardlinks of each inode join the group as well
         for full_hash, file_infos in full_hash_groups.items():
             if len(file_infos) > 1:
                 group = manager.create_group(full_hash, hash_type="full")
                 for path, size, mtime in file_infos:
-                    group.add_file(path, size, mtime)
+                    for member in [path, *self._links.get(path, ())]:
+                        st = self._get_file_stat(member)
+                        group.add_file(
+                            member, size, st.st_mtime if st else mtime,
+                            inode=_inode_of(st),
+                            link_count=st.st_nlink if st else 1
+                        )
 
         return manager
 
+    def _progressive_stage(
+        self,
+        groups: list[list[tuple[Path, int, os.stat_result]]],
+        progress: ScanProgress,
+        progress_callback: Optional[Callable[[ScanProgress], None]]
+    ) -> Iterator[tuple[str, list[tuple[Path, int, os.stat_result]]]]:
+        """
+        Confirm candidate groups by lockstep chunk comparison.
+
+        Groups whose members all have a cached full hash are resolved from
+        the cache; the others are read in lockstep on the pipeline. Only
+        members that end up in an identical set get a (cached) full hash.
+
+        Yields:
+            (full_hash, members) for every set of identical files
+        """
+        cached = {}
+        if self.cache:
+            cached = self.cache.get_many(
+                [(path, st) for group in groups for path, _, st in group],
+                algorithm=self.algorithm
+            )
+
+        resumed = self._resumed.get('full_hash', {})
+        pending = []
+        for group in groups:
+            hashes = [
+                resumed.get(path) or cached.get(path, {}).get('full_hash')
+                for path, _, _ in group
+            ]
+            if all(hashes):
+                by_hash = defaultdict(list)
+                for member, full_hash in zip(group, hashes):
+                    by_hash[full_hash].append(member)
+                for full_hash, members in by_hash.items():
+                    yield full_hash, members
+                self._advance(progress, progress_callback, len(group))
+            else:
+                pending.append(group)
+
+        def compare(group):
+            read = [0]
+            by_path = {path: (path, size, st) for path, size, st in group}
+            identical = self.hasher.find_identical(
+                list(by_path),
+                bytes_callback=lambda n: read.__setitem__(0, read[0] + n)
+            )
+            return [(h, [by_path[p] for p in paths]) for h, paths in identical], read[0]
+
+        writes = []
+        for group, (identical, bytes_read) in self.pipeline.run(
+            pending,
+            device_of=lambda group: group[0][2].st_dev,
+            work=compare,
+            cancelled=lambda: self._cancelled
+        ):
+            self.stats.bytes_read += bytes_read
+            self.stats.total_bytes_scanned += bytes_read
+            for full_hash, members in identical:
+                writes.extend((path, st, None, full_hash) for path, _, st in members)
+                if self._checkpoint:
+                    for path, _, _ in members:
+                        self._checkpoint.add_digest('full_hash', path, full_hash)
+                yield full_hash, members
+            self._advance(progress, progress_callback, len(group))
+
+        if self.cache and writes:
+            self.cache.set_many(writes, algorithm=self.algorithm)
+
+    @staticmethod
+    def _advance(
+        progress: ScanProgress,
+        progress_callback: Optional[Callable[[ScanProgress], None]],
+        files: int
+    ) -> None:
+        """Count finished files and report progress."""
+        progress.current_file += files
+        if progress_callback:
+            progress_callback(progress)
+
     def get_stats(self) -> ScanStats:
         """Get statistics from the last scan."""
         return self.stats
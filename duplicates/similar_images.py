@@ -0,0 +1,392 @@
+"""
+Perceptual hashing and near-duplicate clustering for images.
+
+Features:
+- dHash (gradient) and pHash (DCT) 64-bit perceptual hashes
+- Fast decoding: JPEGs are decoded at 1/2, 1/4 or 1/8 scale through
+  Pillow's draft mode, since the hashes only need a 32x32 thumbnail
+- NumPy-vectorized DCT (matrix form, works on batches of thumbnails)
+- Multi-index hashing: each hash is split into four 16-bit chunks; two
+  hashes within Hamming distance t agree within t // 4 bits on at least one
+  chunk, so near neighbours are found through a few bucket lookups
+  instead of comparing every pair of images. MultiIndexHash answers single
+  queries; similar_pairs() runs the same lookups for all hashes at once as
+  NumPy array operations
+
+Pillow and NumPy are optional dependencies; hashing raises RuntimeError
+when they are missing.
+"""
+
+import logging
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Generic, Hashable, Iterable, Optional, TypeVar, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Hashable)
+
+# Extensions treated as images by the similar-images scan
+IMAGE_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.jpe', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp',
+})
+
+# Hash geometry: 64-bit hashes from an 8x8 bit grid
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+# pHash input: 32x32 thumbnail, low-frequency 8x8 block of its DCT
+PHASH_IMAGE_SIZE = 32
+
+# Default maximum Hamming distance for two images to count as similar
+DEFAULT_THRESHOLD = 10
+
+# Multi-index hashing layout
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+# Candidate pairs expanded per NumPy batch in similar_pairs()
+MAX_BATCH_PAIRS = 4_000_000
+
+
+class PerceptualHash(Enum):
+    """Perceptual hash algorithms."""
+    DHASH = "dhash"  # Horizontal gradient signs (fast, robust to rescaling)
+    PHASH = "phash"  # DCT low frequencies (robust to recompression and tone changes)
+
+
+def _require_dependencies() -> None:
+    if not PIL_AVAILABLE or not NUMPY_AVAILABLE:
+        raise RuntimeError(
+            "Pillow and NumPy are required for image similarity. "
+            "Install with: pip install Pillow numpy"
+        )
+
+
+def load_grayscale(path: Union[str, Path], size: tuple[int, int]) -> "np.ndarray":
+    """
+    Decode an image into a small grayscale array.
+
+    Args:
+        path: Image file
+        size: (width, height) of the result
+
+    Returns:
+        float32 array of shape (height, width)
+
+    Raises:
+        OSError: If the image cannot be decoded
+    """
+    _require_dependencies()
+    with Image.open(path) as img:
+        # Let the JPEG decoder scale down by up to 8x while decoding; the
+        # result stays at least as large as the requested size
+        img.draft("L", (size[0] * 2, size[1] * 2))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("L").resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return np.asarray(img, dtype=np.float32)
+
+
+def _bits_to_ints(bits: "np.ndarray") -> list[int]:
+    """Pack (..., 64) boolean arrays into Python ints."""
+    packed = np.packbits(bits.reshape(-1, HASH_BITS), axis=-1)
+    return [int.from_bytes(row.tobytes(), "big") for row in packed]
+
+
+def dhash_pixels(pixels: "np.ndarray") -> list[int]:
+    """
+    Compute dHashes from (..., 8, 9) grayscale thumbnails.
+
+    Each bit records whether a pixel is brighter than its right neighbour.
+    """
+    return _bits_to_ints(pixels[..., 1:] > pixels[..., :-1])
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> "np.ndarray":
+    """Orthonormal DCT-II matrix."""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * x + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+def phash_pixels(pixels: "np.ndarray") -> list[int]:
+    """
+    Compute pHashes from (..., 32, 32) grayscale thumbnails.
+
+    The 2-D DCT is C @ X @ C.T for the whole batch at once; each bit records
+    whether a low-frequency coefficient is above the block's median
+    (excluding the DC term, which only reflects overall brightness).
+    """
+    dct = _dct_matrix(pixels.shape[-1])
+    coeffs = (dct @ pixels @ dct.T)[..., :HASH_SIZE, :HASH_SIZE]
+    flat = coeffs.reshape(-1, HASH_BITS)
+    median = np.median(flat[:, 1:], axis=1, keepdims=True)
+    return _bits_to_ints(flat > median)
+
+
+def image_hash(
+    path: Union[str, Path],
+    algorithm: PerceptualHash = PerceptualHash.PHASH
+) -> Optional[int]:
+    """
+    Compute the perceptual hash of an image file.
+
+    Args:
+        path: Image file
+        algorithm: Hash algorithm
+
+    Returns:
+        64-bit hash, or None if the file cannot be decoded
+
+    Raises:
+        RuntimeError: If Pillow or NumPy is not installed
+    """
+    _require_dependencies()
+    try:
+        if algorithm == PerceptualHash.DHASH:
+            return dhash_pixels(load_grayscale(path, (HASH_SIZE + 1, HASH_SIZE)))[0]
+        return phash_pixels(load_grayscale(path, (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE)))[0]
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.debug("Cannot hash image %s: %s", path, e)
+        return None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class MultiIndexHash(Generic[T]):
+    """
+    Hamming-distance index over 64-bit hashes (multi-index hashing).
+
+    Example:
+        >>> index = MultiIndexHash(threshold=10)
+        >>> index.add(0x8f3c..., 'a.jpg')
+        >>> index.search(0x8f3d...)
+        [(1, 'a.jpg')]
+    """
+
+    CHUNKS = CHUNKS
+    CHUNK_BITS = CHUNK_BITS
+    CHUNK_MASK = CHUNK_MASK
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD):
+        """
+        Initialize index.
+
+        Args:
+            threshold: Maximum Hamming distance returned by search()
+
+        Raises:
+            ValueError: If threshold is outside 0..HASH_BITS
+        """
+        if not 0 <= threshold <= HASH_BITS:
+            raise ValueError(f"threshold must be between 0 and {HASH_BITS}")
+        self.threshold = threshold
+        self._masks = _chunk_masks(self.CHUNK_BITS, threshold // self.CHUNKS)
+        self._tables: list[dict[int, list[int]]] = [{} for _ in range(self.CHUNKS)]
+        self._hashes: list[int] = []
+        self._items: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _chunks(self, hash_value: int) -> Iterable[tuple[int, int]]:
+        for i in range(self.CHUNKS):
+            yield i, (hash_value >> (i * self.CHUNK_BITS)) & self.CHUNK_MASK
+
+    def add(self, hash_value: int, item: T) -> None:
+        """Add a hash with its item."""
+        index = len(self._hashes)
+        self._hashes.append(hash_value)
+        self._items.append(item)
+        for i, chunk in self._chunks(hash_value):
+            self._tables[i].setdefault(chunk, []).append(index)
+
+    def search(self, hash_value: int) -> list[tuple[int, T]]:
+        """
+        Find indexed items within the threshold.
+
+        Args:
+            hash_value: Query hash
+
+        Returns:
+            List of (distance, item) sorted by distance
+        """
+        candidates = set()
+        for i, chunk in self._chunks(hash_value):
+            table = self._tables[i]
+            for mask in self._masks:
+                bucket = table.get(chunk ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+
+        results = []
+        for index in candidates:
+            distance = hamming_distance(hash_value, self._hashes[index])
+            if distance <= self.threshold:
+                results.append((distance, self._items[index]))
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+@lru_cache(maxsize=16)
+def _chunk_masks(bits: int, radius: int) -> tuple[int, ...]:
+    """All chunk XOR masks with at most radius bits set, fewest bits first."""
+    masks = [m for m in range(1 << bits) if bin(m).count("1") <= radius]
+    masks.sort(key=lambda m: bin(m).count("1"))
+    return tuple(masks)
+
+
+def _popcount64(values: "np.ndarray") -> "np.ndarray":
+    """Set bits per element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def similar_pairs(hashes: Iterable[int], threshold: int = DEFAULT_THRESHOLD) -> "np.ndarray":
+    """
+    Find all pairs of hashes within a Hamming distance.
+
+    For each chunk and each chunk mask within the per-chunk radius, every
+    hash is joined with the bucket of (chunk ^ mask) through a sorted chunk
+    array; candidate pairs are expanded and verified in bulk.
+
+    Args:
+        hashes: 64-bit hashes (duplicates are matched like any other pair)
+        threshold: Maximum Hamming distance
+
+    Returns:
+        int64 array of shape (k, 2) with index pairs i < j, each pair once
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+        ValueError: If threshold is outside 0..HASH_BITS
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for image similarity. Install with: pip install numpy")
+    if not 0 <= threshold <= HASH_BITS:
+        raise ValueError(f"threshold must be between 0 and {HASH_BITS}")
+
+    values = np.fromiter(hashes, dtype=np.uint64)
+    n = len(values)
+    masks = _chunk_masks(CHUNK_BITS, threshold // CHUNKS)
+    found = []
+
+    for i in range(CHUNKS):
+        chunks = ((values >> np.uint64(i * CHUNK_BITS)) & np.uint64(CHUNK_MASK)).astype(np.int64)
+        order = np.argsort(chunks, kind="stable")
+        counts = np.bincount(chunks, minlength=1 << CHUNK_BITS)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        for mask in masks:
+            targets = chunks ^ mask
+            lengths = counts[targets]
+            ends = np.cumsum(lengths)
+
+            # Expand the ragged (query, bucket member) ranges in batches
+            start = 0
+            while start < n:
+                base = ends[start - 1] if start else 0
+                stop = max(int(np.searchsorted(ends, base + MAX_BATCH_PAIRS, side="right")), start + 1)
+                batch_lengths = lengths[start:stop]
+                total = int(batch_lengths.sum())
+                if total:
+                    queries = np.repeat(np.arange(start, stop), batch_lengths)
+                    first = np.repeat(offsets[targets[start:stop]], batch_lengths)
+                    within = np.arange(total) - np.repeat(np.cumsum(batch_lengths) - batch_lengths, batch_lengths)
+                    members = order[first + within]
+
+                    keep = members > queries
+                    queries, members = queries[keep], members[keep]
+                    close = _popcount64(values[queries] ^ values[members]) <= threshold
+                    found.append(queries[close] * n + members[close])
+                start = stop
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    # A pair can be found through several chunks
+    codes = np.unique(np.concatenate(found))
+    return np.stack((codes // n, codes % n), axis=1)
+
+
+def cluster_similar(
+    hashes: Iterable[tuple[int, T]],
+    threshold: int = DEFAULT_THRESHOLD
+) -> list[list[T]]:
+    """
+    Group items whose hashes are within threshold of each other.
+
+    Clusters are connected components: two items land in one cluster if a
+    chain of pairwise matches links them. Identical hashes are matched once.
+
+    Args:
+        hashes: (hash, item) pairs
+        threshold: Maximum Hamming distance for a match
+
+    Returns:
+        Clusters with at least two items
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    by_hash: dict[int, list[T]] = {}
+    for hash_value, item in hashes:
+        by_hash.setdefault(hash_value, []).append(item)
+
+    keys = list(by_hash)
+    return [
+        [item for index in cluster for item in by_hash[keys[index]]]
+        for cluster in connected_clusters(len(keys), similar_pairs(keys, threshold).tolist())
+        if sum(len(by_hash[keys[index]]) for index in cluster) > 1
+    ]
+
+
+def connected_clusters(count: int, pairs: Iterable[tuple[int, int]]) -> list[list[int]]:
+    """
+    Connected components of a match graph (union-find).
+
+    Args:
+        count: Number of nodes (0..count-1)
+        pairs: Matching node pairs
+
+    Returns:
+        Components as lists of node indices, including single nodes
+    """
+    parent = list(range(count))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_i] = root_j
+
+    components: dict[int, list[int]] = {}
+    for i in range(count):
+        components.setdefault(find(i), []).append(i)
+    return list(components.values())
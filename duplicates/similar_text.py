@@ -0,0 +1,258 @@
+"""
+MinHash / LSH near-duplicate detection for text files.
+
+Features:
+- Word shingles (runs of SHINGLE_SIZE words) of lowercased text, hashed
+  with stable CRC32-based rolling hashes (signatures can be cached)
+- MinHash signatures computed with NumPy: one (permutations x shingles)
+  matrix of universal hashes per block of shingles, reduced with min()
+- Locality-sensitive hashing: signatures are cut into bands; documents
+  sharing any band bucket become candidate pairs
+- Candidates are verified by estimated Jaccard similarity (the fraction of
+  equal signature positions) before clustering
+
+NumPy is an optional dependency; signature computation raises RuntimeError
+when it is missing.
+"""
+
+import logging
+import re
+import zlib
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Hashable, Iterable, Optional, TypeVar, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .similar_images import connected_clusters
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Hashable)
+
+# Extensions treated as text by the similar-text scan
+TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.rst', '.log', '.csv', '.tsv', '.json', '.xml', '.yaml',
+    '.yml', '.ini', '.cfg', '.conf', '.html', '.htm', '.tex', '.srt', '.sql',
+    '.py', '.js', '.ts', '.java', '.c', '.h', '.cpp', '.cs', '.go', '.rs',
+})
+
+# Signature parameters (part of the cache kind, so changing them
+# invalidates cached signatures)
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+SIGNATURE_SEED = 0x5EED
+
+# Only the start of very large files is compared
+MAX_TEXT_BYTES = 8 * 1024 * 1024
+
+# Default minimum estimated Jaccard similarity
+DEFAULT_SIMILARITY = 0.8
+
+# Universal hashing modulo the largest 32-bit prime keeps a * x + b in uint64
+_PRIME = np.uint64(4294967291) if NUMPY_AVAILABLE else 4294967291
+_SHINGLE_BLOCK = 4096
+_WORD_RE = re.compile(r"\w+")
+
+
+def signature_kind(num_perm: int = NUM_PERMUTATIONS, shingle_size: int = SHINGLE_SIZE) -> str:
+    """Cache kind for signatures computed with these parameters."""
+    return f"minhash-{num_perm}-{shingle_size}-{SIGNATURE_SEED:x}"
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for text similarity. Install with: pip install numpy")
+
+
+@lru_cache(maxsize=4)
+def _permutations(num_perm: int) -> tuple["np.ndarray", "np.ndarray"]:
+    """Fixed (a, b) coefficients of the universal hash functions."""
+    rng = np.random.default_rng(SIGNATURE_SEED)
+    a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def shingle_hashes(text: str, shingle_size: int = SHINGLE_SIZE) -> "np.ndarray":
+    """
+    Hash the word shingles of a text.
+
+    Args:
+        text: Document text
+        shingle_size: Words per shingle
+
+    Returns:
+        Sorted unique uint64 shingle hashes below the hashing prime
+    """
+    _require_numpy()
+    vocabulary: dict[str, int] = {}
+    ids = [vocabulary.setdefault(word, len(vocabulary)) for word in _WORD_RE.findall(text.lower())]
+    if not ids:
+        return np.empty(0, dtype=np.uint64)
+
+    word_hashes = np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in vocabulary),
+        dtype=np.uint64, count=len(vocabulary)
+    )[np.asarray(ids)]
+
+    # Polynomial rolling hash over each window of shingle_size words
+    # (uint64 arithmetic wraps around)
+    width = min(shingle_size, len(word_hashes))
+    count = len(word_hashes) - width + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        combined = combined * np.uint64(1000003) + word_hashes[offset:offset + count]
+
+    folded = (combined >> np.uint64(32)) ^ (combined & np.uint64(0xFFFFFFFF))
+    return np.unique(folded % _PRIME)
+
+
+def minhash(shingles: "np.ndarray", num_perm: int = NUM_PERMUTATIONS) -> Optional["np.ndarray"]:
+    """
+    Compute the MinHash signature of a shingle set.
+
+    Args:
+        shingles: Shingle hashes from shingle_hashes()
+        num_perm: Signature length
+
+    Returns:
+        uint32 signature, or None for an empty set
+    """
+    _require_numpy()
+    if len(shingles) == 0:
+        return None
+
+    a, b = _permutations(num_perm)
+    signature = np.full(num_perm, _PRIME, dtype=np.uint64)
+    for start in range(0, len(shingles), _SHINGLE_BLOCK):
+        block = shingles[None, start:start + _SHINGLE_BLOCK]
+        np.minimum(signature, ((a * block + b) % _PRIME).min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def text_signature(
+    path: Union[str, Path],
+    num_perm: int = NUM_PERMUTATIONS,
+    shingle_size: int = SHINGLE_SIZE
+) -> Optional[bytes]:
+    """
+    Compute the MinHash signature of a text file.
+
+    Args:
+        path: Text file (decoded as UTF-8, undecodable bytes replaced)
+        num_perm: Signature length
+        shingle_size: Words per shingle
+
+    Returns:
+        Signature as little-endian uint32 bytes, or None if the file cannot
+        be read or contains no words
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    _require_numpy()
+    try:
+        with open(path, 'rb') as f:
+            text = f.read(MAX_TEXT_BYTES).decode("utf-8", errors="replace")
+    except OSError as e:
+        logger.debug("Cannot read %s: %s", path, e)
+        return None
+
+    signature = minhash(shingle_hashes(text, shingle_size), num_perm)
+    return None if signature is None else signature.astype("<u4").tobytes()
+
+
+@lru_cache(maxsize=32)
+def lsh_parameters(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Choose (bands, rows) for an LSH similarity threshold.
+
+    Minimizes the sum of the false-positive and false-negative areas of the
+    banding S-curve 1 - (1 - s^rows)^bands around the threshold. False
+    positives are only verification work, so false negatives weigh double.
+    """
+    grid = np.linspace(0.0, 1.0, 201)
+    best, best_cost = (1, num_perm), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        probability = 1.0 - (1.0 - grid ** rows) ** bands
+        below = grid < threshold
+        cost = probability[below].mean() * threshold + 2 * (1 - probability[~below]).mean() * (1 - threshold)
+        if cost < best_cost:
+            best, best_cost = (bands, rows), cost
+    return best
+
+
+def similar_signature_pairs(
+    signatures: "np.ndarray",
+    threshold: float = DEFAULT_SIMILARITY
+) -> list[tuple[int, int]]:
+    """
+    Find pairs of signatures with estimated Jaccard similarity >= threshold.
+
+    Args:
+        signatures: (n, num_perm) uint32 array
+        threshold: Minimum estimated similarity
+
+    Returns:
+        Index pairs (i, j) with i < j
+    """
+    _require_numpy()
+    n, num_perm = signatures.shape
+    bands, rows = lsh_parameters(num_perm, threshold)
+    weights = np.uint64(0x9E3779B97F4A7C15) ** np.arange(rows, dtype=np.uint64)
+
+    candidates = set()
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * weights).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) > 1:
+                candidates.update(combinations(sorted(bucket.tolist()), 2))
+
+    if not candidates:
+        return []
+
+    pairs = np.array(sorted(candidates), dtype=np.int64)
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    return [tuple(pair) for pair in pairs[similarity >= threshold].tolist()]
+
+
+def cluster_similar_text(
+    signatures: Iterable[tuple[bytes, T]],
+    threshold: float = DEFAULT_SIMILARITY
+) -> list[list[T]]:
+    """
+    Group items whose signatures are estimated at least threshold similar.
+
+    Args:
+        signatures: (signature bytes, item) pairs
+        threshold: Minimum estimated Jaccard similarity
+
+    Returns:
+        Clusters with at least two items (connected components of matches)
+    """
+    _require_numpy()
+    by_signature: dict[bytes, list[T]] = {}
+    for signature, item in signatures:
+        by_signature.setdefault(signature, []).append(item)
+
+    keys = list(by_signature)
+    if not keys:
+        return []
+
+    matrix = np.frombuffer(b"".join(keys), dtype="<u4").reshape(len(keys), -1)
+    return [
+        [item for index in cluster for item in by_signature[keys[index]]]
+        for cluster in connected_clusters(len(keys), similar_signature_pairs(matrix, threshold))
+        if sum(len(by_signature[keys[index]]) for index in cluster) > 1
+    ]
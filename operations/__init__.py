@@ -11,6 +11,8 @@ from .mover import FileMover
 from .verifier import FileVerifier
 from .conflicts import ConflictResolver, ConflictAction
 from .progress import ProgressTracker, OperationProgress
+from .scheduler import IOScheduler, DeviceClass
+from .throttle import BandwidthThrottle
 from .batch_renamer import BatchRenamer, RenamePattern, CaseMode, CollisionMode
 from .rename_patterns import PatternLibrary, SavedPattern
 from .rename_history import RenameHistory
@@ -24,6 +26,9 @@ __all__ = [
     "ConflictAction",
     "ProgressTracker",
     "OperationProgress",
+    "IOScheduler",
+    "DeviceClass",
+    "BandwidthThrottle",
     "BatchRenamer",
     "RenamePattern",
     "CaseMode",
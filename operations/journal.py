@@ -0,0 +1,242 @@
+"""
+Copy journals for resumable large-file copies.
+
+While a large file is copied, a journal sits next to the destination
+(<destination>.copyjournal). Its first line identifies the source (path,
+size, modification time) and the block size; each further line records a
+completed block (offset, length, hash of its bytes). Blocks copied inside
+the kernel never pass through userspace, so they are recorded without a
+hash ('-'). A block is recorded only after it was flushed to the
+destination, so every recorded offset is durable. Lines are appended, so
+a crash leaves at most a partial last line, which is ignored.
+
+To resume, the source must be unchanged and the destination must hold the
+recorded bytes. The last recorded block is checked against the
+destination (earlier blocks too if it does not match): re-hashed, or
+compared with the source if it was recorded without a hash. The copy
+continues after the last block that matches.
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Tuple
+
+# Suffix of the journal next to the destination
+JOURNAL_SUFFIX = ".copyjournal"
+
+# Bytes per journaled block (and between destination flushes)
+JOURNAL_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Files smaller than this are copied without a journal (a restart is cheap)
+JOURNAL_MIN_SIZE = 256 * 1024 * 1024
+
+JOURNAL_VERSION = 1
+
+# Digest field of blocks recorded without a hash (compared with the source)
+UNHASHED = "-"
+
+# Buffer size when re-reading recorded blocks
+_READ_SIZE = 1024 * 1024
+
+
+def _block_hasher():
+    return hashlib.sha256()
+
+
+class CopyJournal:
+    """
+    Journal of the verified progress of one file copy.
+
+    Example:
+        >>> journal = CopyJournal(source, destination)
+        >>> offset = journal.load()  # 0 if nothing can be resumed
+        >>> if not offset:
+        ...     journal.start()
+        >>> journal.record(offset, length, digest)  # After fsync of the block
+        >>> journal.record(offset, length)  # Kernel-side copy: no digest
+        >>> journal.remove()  # Copy finished
+    """
+
+    def __init__(self, source: str, destination: str, block_size: int = JOURNAL_BLOCK_SIZE):
+        """
+        Initialize journal.
+
+        Args:
+            source: Source file path
+            destination: Destination file path
+            block_size: Bytes per journaled block (a resumed journal keeps
+                the block size it was started with)
+        """
+        self.source = os.path.abspath(source)
+        self.destination = destination
+        self.path = self.journal_path(destination)
+        self.block_size = block_size
+        self.blocks: List[Tuple[int, int, str]] = []
+
+    @staticmethod
+    def journal_path(destination: str) -> str:
+        """Journal file of a destination."""
+        return destination + JOURNAL_SUFFIX
+
+    @staticmethod
+    def new_block_hasher():
+        """Incremental hasher for the bytes of one block."""
+        return _block_hasher()
+
+    @classmethod
+    def discard(cls, destination: str) -> None:
+        """Delete the journal of a destination, if any."""
+        try:
+            os.remove(cls.journal_path(destination))
+        except OSError:
+            pass
+
+    @classmethod
+    def resumable_bytes(cls, source: str, destination: str) -> int:
+        """
+        Bytes a copy would resume from, per the journal (not re-verified).
+
+        Returns:
+            Recorded offset, or 0 if there is no usable journal
+        """
+        journal = cls(source, destination)
+        blocks = journal._read()
+        return blocks[-1][0] + blocks[-1][1] if blocks else 0
+
+    @property
+    def offset(self) -> int:
+        """End of the last recorded block."""
+        return self.blocks[-1][0] + self.blocks[-1][1] if self.blocks else 0
+
+    def load(self) -> int:
+        """
+        Load the journal and verify the destination against it.
+
+        Returns:
+            Offset to resume from (0 if there is no usable journal); the
+            journal is trimmed to the verified blocks
+        """
+        blocks = self._read()
+        if not blocks:
+            return 0
+
+        try:
+            if os.path.getsize(self.destination) < blocks[-1][0] + blocks[-1][1]:
+                return 0
+            with open(self.destination, 'rb', buffering=0) as f, \
+                    open(self.source, 'rb', buffering=0) as source_file:
+                while blocks and not self._block_matches(f, source_file, *blocks[-1]):
+                    blocks.pop()
+        except OSError:
+            return 0
+
+        if len(blocks) != len(self.blocks):
+            self.blocks = blocks
+            self._write_all()
+        return self.offset
+
+    def start(self) -> None:
+        """Start a new journal for a copy from offset 0."""
+        self.blocks = []
+        self._write_all()
+
+    def record(self, offset: int, length: int, digest: str = UNHASHED) -> None:
+        """
+        Record a completed block; the block must already be flushed to the
+        destination.
+
+        Args:
+            offset: Block offset
+            length: Block length
+            digest: Hex digest from new_block_hasher() over the block bytes,
+                or UNHASHED to verify the block against the source on resume
+        """
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(f"{offset} {length} {digest}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.blocks.append((offset, length, digest))
+
+    def remove(self) -> None:
+        """Delete the journal (copy finished or abandoned)."""
+        self.blocks = []
+        self.discard(self.destination)
+
+    def _header(self) -> dict:
+        st = os.stat(self.source)
+        return {
+            'version': JOURNAL_VERSION,
+            'source': self.source,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'block_size': self.block_size,
+        }
+
+    def _read(self) -> List[Tuple[int, int, str]]:
+        """Recorded blocks, or [] if the journal is missing or stale."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+            header = json.loads(lines[0])
+            expected = self._header()
+        except (OSError, ValueError, IndexError):
+            return []
+
+        if any(header.get(key) != value for key, value in expected.items() if key != 'block_size'):
+            return []
+        self.block_size = header.get('block_size', self.block_size)
+
+        # Complete lines only (the last one may have been cut by a crash);
+        # blocks must be contiguous from offset 0
+        blocks = []
+        for line in lines[1:-1]:
+            try:
+                offset, length, digest = line.split()
+                offset, length = int(offset), int(length)
+            except ValueError:
+                break
+            if offset != (blocks[-1][0] + blocks[-1][1] if blocks else 0):
+                break
+            blocks.append((offset, length, digest))
+        self.blocks = blocks
+        return list(blocks)
+
+    def _write_all(self) -> None:
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._header()) + "\n")
+            for offset, length, digest in self.blocks:
+                f.write(f"{offset} {length} {digest}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _block_matches(f, source_file, offset: int, length: int, digest: str) -> bool:
+        if digest == UNHASHED:
+            return CopyJournal._block_equals(f, source_file, offset, length)
+        hasher = _block_hasher()
+        buffer = memoryview(bytearray(min(_READ_SIZE, length)))
+        f.seek(offset)
+        remaining = length
+        while remaining:
+            n = f.readinto(buffer[:min(len(buffer), remaining)])
+            if not n:
+                return False
+            hasher.update(buffer[:n])
+            remaining -= n
+        return hasher.hexdigest() == digest
+
+    @staticmethod
+    def _block_equals(f, source_file, offset: int, length: int) -> bool:
+        f.seek(offset)
+        source_file.seek(offset)
+        remaining = length
+        while remaining:
+            size = min(_READ_SIZE, remaining)
+            data = f.read(size)
+            if not data or data != source_file.read(size):
+                return False
+            remaining -= len(data)
+        return True
@@ -1,6 +1,16 @@
 """
 Operations manager with queue system for file operations.
 Manages multiple concurrent operations with pause/resume/cancel capabilities.
+
+Queued operations are dispatched by a device-aware scheduler: each device
+class (HDD, SSD, network) has its own concurrency cap, so operations on a
+busy spinning disk wait their turn while other devices keep working.
+Copy and move operations interrupted by a restart are queued again from the
+saved history and resume from their copy journals.
+
+Transfers can be throttled per operation (by priority), per device and
+globally, and can back off adaptively while foreground I/O is slow; all
+limits apply live to running operations.
 """
 
 import uuid
@@ -8,7 +18,6 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Callable
 from datetime import datetime
-from queue import Queue, PriorityQueue
 from threading import Thread, Lock, Event
 import json
 from pathlib import Path
@@ -18,6 +27,9 @@ from .mover import FileMover
 from .verifier import FileVerifier, HashAlgorithm
 from .conflicts import ConflictResolver, ConflictAction, ConflictResolution
 from .progress import ProgressTracker, OperationProgress
+from .scheduler import IOScheduler, DeviceClass
+from .journal import CopyJournal
+from .throttle import BandwidthThrottle
 
 
 class OperationType(Enum):
@@ -108,7 +120,11 @@ class OperationsManager:
         self,
         max_concurrent_operations: int = 2,
         history_file: Optional[str] = None,
-        auto_save_history: bool = True
+        auto_save_history: bool = True,
+        device_limits: Optional[Dict[DeviceClass, int]] = None,
+        bandwidth_limit: Optional[float] = None,
+        priority_bandwidth: Optional[Dict[OperationPriority, Optional[float]]] = None,
+        adaptive_throttling: bool = False
     ):
         """
         Initialize operations manager.
@@ -117,6 +133,13 @@ class OperationsManager:
             max_concurrent_operations: Maximum concurrent operations
             history_file: Path to save operation history
             auto_save_history: Automatically save history after each operation
+            device_limits: Concurrent operations per device, by device class
+                (default: HDD=1, SSD=4, network=2)
+            bandwidth_limit: Bytes per second across all operations (None = unlimited)
+            priority_bandwidth: Bytes per second per operation, by priority
+            adaptive_throttling: Back off background operations while
+                foreground I/O latency is high (as reported through
+                report_foreground_latency())
         """
         self.max_concurrent_operations = max_concurrent_operations
         self.history_file = history_file
@@ -124,9 +147,17 @@ class OperationsManager:
 
         # Operation tracking
         self._operations: Dict[str, FileOperation] = {}
-        self._operation_queue: PriorityQueue = PriorityQueue()
+        self._scheduler = IOScheduler(device_limits)
+        self._throttle = BandwidthThrottle(
+            global_rate=bandwidth_limit,
+            priority_rates={
+                priority.value: rate for priority, rate in (priority_bandwidth or {}).items()
+            },
+            adaptive=adaptive_throttling
+        )
         self._active_operations: Dict[str, Thread] = {}
         self._lock = Lock()
+        self._history_lock = Lock()
 
         # Progress tracking
         self._progress_tracker = ProgressTracker()
@@ -160,18 +191,17 @@ class OperationsManager:
     def _worker_loop(self) -> None:
         """Worker thread main loop."""
         while not self._shutdown_event.is_set():
-            try:
-                # Get next operation from queue (with timeout)
-                priority, operation_id = self._operation_queue.get(timeout=1.0)
+            # Next operation whose devices have a free slot (with timeout)
+            operation_id = self._scheduler.acquire(timeout=1.0)
+            if operation_id is None:
+                continue
 
+            try:
                 with self._lock:
-                    if operation_id not in self._operations:
-                        continue
-
-                    operation = self._operations[operation_id]
+                    operation = self._operations.get(operation_id)
 
-                    # Skip if already processed
-                    if operation.status != OperationStatus.QUEUED:
+                    # Skip if removed or already processed
+                    if operation is None or operation.status != OperationStatus.QUEUED:
                         continue
 
                     # Mark as in progress
@@ -181,13 +211,13 @@ class OperationsManager:
                 # Execute operation
                 self._execute_operation(operation)
 
-                # Mark queue task as done
-                self._operation_queue.task_done()
-
             except Exception:
-                # Timeout or other error - continue
+                # Error outside the operation itself - continue
                 continue
 
+            finally:
+                self._scheduler.release(operation_id)
+
     def _execute_operation(self, operation: FileOperation) -> None:
         """
         Execute a file operation.
@@ -195,6 +225,11 @@ class OperationsManager:
         Args:
             operation: Operation to execute
         """
+        self._throttle.begin(
+            operation.operation_id,
+            operation.priority.value,
+            self._scheduler.devices_for(operation.operation_id)
+        )
         try:
             # Start progress tracking
             file_sizes = []
@@ -238,6 +273,8 @@ class OperationsManager:
                 operation.completed_at = datetime.now()
 
         finally:
+            self._throttle.end(operation.operation_id)
+
             # Save history if enabled
             if self.auto_save_history and self.history_file:
                 self.save_history()
@@ -252,11 +289,13 @@ class OperationsManager:
                 file_path,
                 copied
             )
+            self._throttle.transfer(operation.operation_id, file_path, copied, total)
 
         results = self._copier.copy_files_batch(
             file_pairs,
             progress_callback,
-            operation.preserve_metadata
+            operation.preserve_metadata,
+            max_parallel=self._scheduler.concurrency_for(operation.operation_id)
         )
 
         # Update operation stats
@@ -281,6 +320,7 @@ class OperationsManager:
                 file_path,
                 copied
             )
+            self._throttle.transfer(operation.operation_id, file_path, copied, total)
 
         results = self._mover.move_files_batch(file_pairs, progress_callback)
 
@@ -333,6 +373,20 @@ class OperationsManager:
                 operation.error
             )
 
+    def _enqueue(self, operation: FileOperation) -> None:
+        """Register a new operation and hand it to the scheduler."""
+        with self._lock:
+            self._operations[operation.operation_id] = operation
+        self._scheduler.submit(
+            operation.operation_id,
+            operation.priority.value,
+            operation.source_paths + operation.dest_paths
+        )
+
+        # Saved right away so the operation survives a restart
+        if self.auto_save_history and self.history_file:
+            self.save_history()
+
     def queue_copy(
         self,
         source_paths: List[str],
@@ -362,10 +416,7 @@ class OperationsManager:
             total_files=len(source_paths)
         )
 
-        with self._lock:
-            self._operations[operation_id] = operation
-            self._operation_queue.put((priority.value, operation_id))
-
+        self._enqueue(operation)
         return operation_id
 
     def queue_move(
@@ -395,10 +446,7 @@ class OperationsManager:
             total_files=len(source_paths)
         )
 
-        with self._lock:
-            self._operations[operation_id] = operation
-            self._operation_queue.put((priority.value, operation_id))
-
+        self._enqueue(operation)
         return operation_id
 
     def queue_verify(
@@ -424,10 +472,7 @@ class OperationsManager:
             total_files=len(source_paths)
         )
 
-        with self._lock:
-            self._operations[operation_id] = operation
-            self._operation_queue.put((priority.value, operation_id))
-
+        self._enqueue(operation)
         return operation_id
 
     def pause_operation(self, operation_id: str) -> bool:
@@ -460,9 +505,62 @@ class OperationsManager:
                 if operation.status in (OperationStatus.QUEUED, OperationStatus.IN_PROGRESS):
                     operation.status = OperationStatus.CANCELLED
                     operation.completed_at = datetime.now()
+                    self._scheduler.discard(operation_id)
                     return True
         return False
 
+    def set_device_limit(self, device_class: DeviceClass, limit: int) -> None:
+        """Change the concurrent operations allowed per device of a class."""
+        self._scheduler.set_limit(device_class, limit)
+
+    def set_bandwidth_limit(self, bytes_per_second: Optional[float], path: Optional[str] = None) -> None:
+        """
+        Change a bandwidth limit; applies to running operations at once.
+
+        Args:
+            bytes_per_second: New limit (None = unlimited)
+            path: Limit the device holding this path instead of all operations
+        """
+        if path is None:
+            self._throttle.set_global_rate(bytes_per_second)
+            return
+        info = self._scheduler.device_of(path)
+        if info is not None:
+            self._throttle.set_device_rate(info.device, bytes_per_second)
+
+    def set_priority_bandwidth(self, priority: OperationPriority, bytes_per_second: Optional[float]) -> None:
+        """Change the per-operation bandwidth limit of a priority (None = unlimited)."""
+        self._throttle.set_priority_rate(priority.value, bytes_per_second)
+
+    def set_operation_bandwidth(self, operation_id: str, bytes_per_second: Optional[float]) -> bool:
+        """
+        Change the bandwidth limit of a running operation.
+
+        Returns:
+            True if the operation is running
+        """
+        return self._throttle.set_operation_rate(operation_id, bytes_per_second)
+
+    def set_adaptive_throttling(self, enabled: bool, target_latency: Optional[float] = None) -> None:
+        """
+        Turn adaptive throttling on or off.
+
+        Args:
+            enabled: Back off background operations while foreground I/O is slow
+            target_latency: Foreground latency to stay under, in seconds
+        """
+        self._throttle.set_adaptive(enabled, target_latency)
+
+    def report_foreground_latency(self, seconds: float) -> None:
+        """
+        Report the latency of a foreground I/O (e.g. a search or preview)
+        to adaptive throttling.
+
+        These reports are what adaptive throttling reacts to: device-wide
+        latency would include the throttled copies' own I/O.
+        """
+        self._throttle.observe_latency(seconds)
+
     def get_operation(self, operation_id: str) -> Optional[FileOperation]:
         """Get operation by ID."""
         with self._lock:
@@ -516,11 +614,22 @@ class OperationsManager:
                 'saved_at': datetime.now().isoformat()
             }
 
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(history_data, f, indent=2)
+        # Atomic replace: a crash while saving keeps the previous history
+        temp_file = Path(self.history_file).with_suffix(".tmp")
+        with self._history_lock:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(history_data, f, indent=2)
+            temp_file.replace(self.history_file)
 
     def load_history(self) -> None:
-        """Load operation history from file."""
+        """
+        Load operation history from file.
+
+        Finished operations are loaded as they were saved. Copy and move
+        operations that were queued or running when the history was saved
+        (the application stopped) are queued again; large files resume from
+        their copy journals. Other interrupted operations are marked failed.
+        """
         if not self.history_file or not Path(self.history_file).exists():
             return
 
@@ -528,39 +637,78 @@ class OperationsManager:
             with open(self.history_file, 'r', encoding='utf-8') as f:
                 history_data = json.load(f)
 
-            # Only load completed/failed operations (not active ones)
             for op_data in history_data.get('operations', []):
                 status = OperationStatus(op_data['status'])
+                operation = FileOperation(
+                    operation_id=op_data['operation_id'],
+                    operation_type=OperationType(op_data['operation_type']),
+                    source_paths=op_data['source_paths'],
+                    dest_paths=op_data['dest_paths'],
+                    status=status,
+                    priority=OperationPriority(op_data['priority']),
+                    created_at=datetime.fromisoformat(op_data['created_at']),
+                    started_at=datetime.fromisoformat(op_data['started_at']) if op_data.get('started_at') else None,
+                    completed_at=datetime.fromisoformat(op_data['completed_at']) if op_data.get('completed_at') else None,
+                    error=op_data.get('error'),
+                    verify=op_data.get('verify', False),
+                    preserve_metadata=op_data.get('preserve_metadata', True),
+                    conflict_action=ConflictAction(op_data.get('conflict_action', 'ask')),
+                    total_size=op_data.get('total_size', 0),
+                    processed_size=op_data.get('processed_size', 0),
+                    total_files=op_data.get('total_files', 0),
+                    processed_files=op_data.get('processed_files', 0),
+                    failed_files=op_data.get('failed_files', 0),
+                )
+
                 if status in (OperationStatus.COMPLETED, OperationStatus.FAILED, OperationStatus.CANCELLED):
-                    operation = FileOperation(
-                        operation_id=op_data['operation_id'],
-                        operation_type=OperationType(op_data['operation_type']),
-                        source_paths=op_data['source_paths'],
-                        dest_paths=op_data['dest_paths'],
-                        status=status,
-                        priority=OperationPriority(op_data['priority']),
-                        created_at=datetime.fromisoformat(op_data['created_at']),
-                        started_at=datetime.fromisoformat(op_data['started_at']) if op_data.get('started_at') else None,
-                        completed_at=datetime.fromisoformat(op_data['completed_at']) if op_data.get('completed_at') else None,
-                        error=op_data.get('error'),
-                        verify=op_data.get('verify', False),
-                        preserve_metadata=op_data.get('preserve_metadata', True),
-                        conflict_action=ConflictAction(op_data.get('conflict_action', 'ask')),
-                        total_size=op_data.get('total_size', 0),
-                        processed_size=op_data.get('processed_size', 0),
-                        total_files=op_data.get('total_files', 0),
-                        processed_files=op_data.get('processed_files', 0),
-                        failed_files=op_data.get('failed_files', 0),
-                    )
                     with self._lock:
                         self._operations[operation.operation_id] = operation
+                    continue
+
+                # Interrupted operation
+                with self._lock:
+                    if operation.operation_id in self._operations:
+                        continue
+                    self._operations[operation.operation_id] = operation
+
+                if operation.operation_type in (OperationType.COPY, OperationType.MOVE):
+                    self._requeue_interrupted(operation)
+                else:
+                    with self._lock:
+                        operation.status = OperationStatus.FAILED
+                        operation.error = "Interrupted"
+                        operation.completed_at = datetime.now()
 
         except Exception as e:
             print(f"Error loading history: {e}")
 
+    def _requeue_interrupted(self, operation: FileOperation) -> None:
+        """Queue an interrupted copy/move again; progress restarts from its journals."""
+        resumable = 0
+        for source, dest in zip(operation.source_paths, operation.dest_paths):
+            try:
+                resumable += CopyJournal.resumable_bytes(source, dest)
+            except OSError:
+                pass
+
+        with self._lock:
+            operation.status = OperationStatus.QUEUED
+            operation.started_at = None
+            operation.completed_at = None
+            operation.error = None
+            operation.processed_size = resumable
+            operation.processed_files = 0
+            operation.failed_files = 0
+        self._scheduler.submit(
+            operation.operation_id,
+            operation.priority.value,
+            operation.source_paths + operation.dest_paths
+        )
+
     def shutdown(self, wait: bool = True) -> None:
         """Shutdown the manager."""
         self._shutdown_event.set()
+        self._throttle.close()
 
         if wait:
             # Wait for workers to finish
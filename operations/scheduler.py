@@ -0,0 +1,358 @@
+"""
+Device-aware scheduling of file operations.
+
+Each operation is mapped to the devices backing its sources and
+destinations (st_dev), and each device class gets its own concurrency cap:
+one operation at a time on a spinning disk (concurrent streams make the
+heads seek between them), several on SSDs, a few on network shares.
+Queued operations are dispatched by priority to whichever devices are
+free, so a copy between two SSDs does not wait behind a backlog on an HDD.
+
+Device classes are detected on Linux from /proc/self/mountinfo (network
+filesystems) and /sys/block (rotational flag), and on Windows from the
+drive type (network drives and UNC paths). Anything else is UNKNOWN.
+"""
+
+import bisect
+import os
+import platform
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.devices import is_rotational
+
+# Filesystem types served over the network (Linux mountinfo names)
+NETWORK_FILESYSTEMS = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "9p", "ceph",
+    "glusterfs", "lustre", "fuse.sshfs", "fuse.rclone", "davfs", "fuse.davfs2",
+})
+
+# GetDriveTypeW() result for network drives
+DRIVE_REMOTE = 4
+
+
+class DeviceClass(Enum):
+    """Kinds of storage devices, by how they tolerate concurrent I/O."""
+    HDD = "hdd"
+    SSD = "ssd"
+    NETWORK = "network"
+    UNKNOWN = "unknown"
+
+
+# Concurrent operations allowed per device of each class
+DEFAULT_DEVICE_LIMITS: Dict[DeviceClass, int] = {
+    DeviceClass.HDD: 1,
+    DeviceClass.SSD: 4,
+    DeviceClass.NETWORK: 2,
+    DeviceClass.UNKNOWN: 2,
+}
+
+
+@dataclass(frozen=True)
+class DeviceInfo:
+    """Device backing a path."""
+    device: int
+    device_class: DeviceClass
+
+
+def _mounted_filesystems() -> Dict[Tuple[int, int], str]:
+    """Filesystem type by (major, minor) device number (Linux)."""
+    filesystems = {}
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                try:
+                    separator = fields.index("-")
+                    major, minor = fields[2].split(":")
+                    filesystems[(int(major), int(minor))] = fields[separator + 1]
+                except (ValueError, IndexError):
+                    continue
+    except OSError:
+        pass
+    return filesystems
+
+
+def _is_remote_drive(path: str) -> bool:
+    """Whether a path is on a network drive or UNC share (Windows)."""
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if drive.startswith(("\\\\", "//")):
+        return True
+    try:
+        import ctypes
+        return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+    except (ImportError, AttributeError, OSError):
+        return False
+
+
+@dataclass
+class _Entry:
+    key: str
+    priority: int
+    sequence: int
+    devices: Tuple[DeviceInfo, ...]
+
+
+def _dispatch_order(entry: _Entry) -> Tuple[int, int]:
+    return entry.priority, entry.sequence
+
+
+def _device_key(devices: Tuple[DeviceInfo, ...]) -> Tuple[int, ...]:
+    return tuple(sorted(device.device for device in devices))
+
+
+class IOScheduler:
+    """
+    Priority queue of operations with per-device concurrency limits.
+
+    Operations are submitted with the paths they read and write; acquire()
+    returns the highest-priority operation whose devices all have a free
+    slot (FIFO within a priority). Devices that block a waiting operation
+    are reserved for it, so lower-priority work cannot starve it, while
+    operations on other devices keep flowing.
+
+    Example:
+        >>> scheduler = IOScheduler({DeviceClass.SSD: 8})
+        >>> scheduler.submit(op_id, priority=2, paths=sources + dests)
+        >>> key = scheduler.acquire(timeout=1.0)
+        >>> try:
+        ...     run(key)
+        ... finally:
+        ...     scheduler.release(key)
+    """
+
+    def __init__(self, device_limits: Optional[Dict[DeviceClass, int]] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            device_limits: Concurrent operations per device, by device class
+                (missing classes use DEFAULT_DEVICE_LIMITS)
+        """
+        self.device_limits = dict(DEFAULT_DEVICE_LIMITS)
+        if device_limits:
+            self.device_limits.update(device_limits)
+
+        self._condition = threading.Condition()
+        # Queued entries grouped by device set, each group sorted by
+        # (priority, sequence): only group heads can be dispatched next
+        self._pending: Dict[Tuple[int, ...], List[_Entry]] = {}
+        self._pending_by_key: Dict[str, _Entry] = {}
+        self._running: Dict[str, _Entry] = {}
+        self._in_flight: Dict[int, int] = {}
+        self._sequence = count()
+
+        self._classes: Dict[int, DeviceClass] = {}
+        self._filesystems: Optional[Dict[Tuple[int, int], str]] = None
+        self._is_windows = platform.system() == "Windows"
+
+    def device_of(self, path: str) -> Optional[DeviceInfo]:
+        """
+        Device backing a path.
+
+        Paths that do not exist yet (destinations) resolve to the device of
+        their nearest existing parent directory.
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            DeviceInfo, or None if no part of the path exists
+        """
+        current = os.path.abspath(path)
+        while True:
+            try:
+                device = os.stat(current).st_dev
+                break
+            except OSError:
+                parent = os.path.dirname(current)
+                if parent == current:
+                    return None
+                current = parent
+
+        device_class = self._classes.get(device)
+        if device_class is None:
+            device_class = self._classify(device, current)
+            self._classes[device] = device_class
+        return DeviceInfo(device, device_class)
+
+    def devices_of(self, paths: Iterable[str]) -> Tuple[DeviceInfo, ...]:
+        """
+        Distinct devices backing a set of paths.
+
+        Paths are resolved through their parent directories, once per
+        distinct directory, so queueing thousands of files from one folder
+        costs a single stat.
+        """
+        directories = {os.path.dirname(os.path.abspath(path)) for path in paths}
+        devices = {}
+        for directory in directories:
+            info = self.device_of(directory)
+            if info is not None:
+                devices.setdefault(info.device, info)
+        return tuple(devices.values())
+
+    def limit_for(self, device: DeviceInfo) -> int:
+        """Concurrent operations allowed on a device."""
+        return max(1, self.device_limits.get(device.device_class, 1))
+
+    def set_limit(self, device_class: DeviceClass, limit: int) -> None:
+        """Change the concurrency limit of a device class (applies to the next dispatch)."""
+        with self._condition:
+            self.device_limits[device_class] = max(1, limit)
+            self._condition.notify_all()
+
+    def submit(
+        self,
+        key: str,
+        priority: int,
+        paths: Iterable[str] = (),
+        devices: Optional[Tuple[DeviceInfo, ...]] = None
+    ) -> None:
+        """
+        Queue an operation.
+
+        Args:
+            key: Operation ID
+            priority: Lower values are dispatched first
+            paths: Sources and destinations of the operation
+            devices: Devices already resolved by the caller (paths are ignored)
+        """
+        if devices is None:
+            devices = self.devices_of(paths)
+        with self._condition:
+            entry = _Entry(key, priority, next(self._sequence), devices)
+            group = self._pending.setdefault(_device_key(devices), [])
+            bisect.insort(group, entry, key=_dispatch_order)
+            self._pending_by_key[key] = entry
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Take the next operation that can run now, waiting for one.
+
+        Args:
+            timeout: Seconds to wait (None = wait forever)
+
+        Returns:
+            Operation ID (its device slots stay taken until release()), or
+            None if nothing could be dispatched before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                entry = self._next_runnable()
+                if entry is not None:
+                    self._unqueue(entry)
+                    self._running[entry.key] = entry
+                    for device in entry.devices:
+                        self._in_flight[device.device] = self._in_flight.get(device.device, 0) + 1
+                    return entry.key
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def release(self, key: str) -> None:
+        """Free the device slots of a finished operation."""
+        with self._condition:
+            entry = self._running.pop(key, None)
+            if entry is None:
+                return
+            for device in entry.devices:
+                self._in_flight[device.device] -= 1
+                if not self._in_flight[device.device]:
+                    del self._in_flight[device.device]
+            self._condition.notify_all()
+
+    def discard(self, key: str) -> bool:
+        """
+        Remove a queued operation.
+
+        Returns:
+            True if the operation was still queued
+        """
+        with self._condition:
+            entry = self._pending_by_key.get(key)
+            if entry is None:
+                return False
+            self._unqueue(entry)
+            self._condition.notify_all()
+            return True
+
+    def concurrency_for(self, key: str) -> int:
+        """
+        Parallel file transfers suited to an operation: the limit of the
+        most constrained device it touches (1 when an HDD is involved).
+        """
+        with self._condition:
+            entry = self._running.get(key)
+            if entry is None:
+                entry = self._pending_by_key.get(key)
+            if entry is None or not entry.devices:
+                return self.device_limits.get(DeviceClass.UNKNOWN, 1)
+            return min(self.limit_for(device) for device in entry.devices)
+
+    def devices_for(self, key: str) -> Tuple[int, ...]:
+        """Device ids of a queued or running operation."""
+        with self._condition:
+            entry = self._running.get(key) or self._pending_by_key.get(key)
+            return tuple(device.device for device in entry.devices) if entry else ()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued operations."""
+        with self._condition:
+            return len(self._pending_by_key)
+
+    def _unqueue(self, entry: _Entry) -> None:
+        device_key = _device_key(entry.devices)
+        group = self._pending[device_key]
+        group.remove(entry)
+        if not group:
+            del self._pending[device_key]
+        del self._pending_by_key[entry.key]
+
+    def _next_runnable(self) -> Optional[_Entry]:
+        # Entries behind a group head share its devices, so they are
+        # blocked whenever the head is
+        reserved = set()
+        heads = sorted((group[0] for group in self._pending.values()), key=_dispatch_order)
+        for entry in heads:
+            full = {
+                device.device for device in entry.devices
+                if self._in_flight.get(device.device, 0) >= self.limit_for(device)
+            }
+            if not full and not any(device.device in reserved for device in entry.devices):
+                return entry
+            # Hold the saturated devices for this operation; its free
+            # devices stay available to lower-priority work
+            reserved |= full
+        return None
+
+    def _classify(self, device: int, path: str) -> DeviceClass:
+        if self._is_windows:
+            return DeviceClass.NETWORK if _is_remote_drive(path) else DeviceClass.UNKNOWN
+
+        if self._filesystems is None:
+            self._filesystems = _mounted_filesystems()
+        try:
+            fstype = self._filesystems.get((os.major(device), os.minor(device)))
+        except (AttributeError, ValueError):
+            fstype = None
+        if fstype in NETWORK_FILESYSTEMS:
+            return DeviceClass.NETWORK
+
+        rotational = is_rotational(device)
+        if rotational is None:
+            return DeviceClass.UNKNOWN
+        return DeviceClass.HDD if rotational else DeviceClass.SSD
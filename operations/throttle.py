@@ -0,0 +1,378 @@
+"""
+Bandwidth throttling for file operations.
+
+Transfers are metered through token buckets at three levels: per
+operation (by default from the operation's priority), per device, and
+globally. A transfer waits until every bucket it draws from is out of
+debt, so the slowest applicable limit wins. Critical operations draw from
+the shared buckets without waiting on them.
+
+Adaptive mode backs background operations off while foreground I/O
+latency is above a target: a backoff factor (1.0 = full speed) is halved
+on every slow sample and recovers gradually. Operations then run only a
+fraction of the time (duty cycling), which scales their throughput
+without needing to know the device's speed; lower priorities back off
+harder and critical operations not at all. Latency samples come from
+foreground code reporting its own I/O latencies (device-level counters
+cannot tell foreground reads from the throttled copies' own reads); when
+no samples arrive, the factor recovers step by step.
+
+All limits can be changed while transfers are running; waiting transfers
+pick up the new limits immediately.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# Backoff exponent per priority (OperationPriority values): an operation
+# runs factor ** weight of the time while adaptive mode backs off
+PRIORITY_BACKOFF_WEIGHTS: Dict[int, float] = {
+    0: 0.0,  # CRITICAL
+    1: 0.5,  # HIGH
+    2: 1.0,  # NORMAL
+    3: 2.0,  # LOW
+}
+
+# Foreground latency above which adaptive mode backs off (seconds)
+DEFAULT_TARGET_LATENCY = 0.05
+
+# Seconds of traffic a bucket may burst (bucket capacity = rate * burst)
+DEFAULT_BURST_SECONDS = 1.0
+
+# Longest single wait; waits are re-evaluated at least this often
+_MAX_WAIT = 0.25
+
+
+class TokenBucket:
+    """
+    Token bucket metering bytes per second.
+
+    Transfers take their bytes after the fact and the bucket may go into
+    debt; delay() is the time until the debt is paid off.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Bytes per second (None = unlimited)
+            burst: Bucket capacity in bytes (default: one second of traffic)
+        """
+        self._rate: Optional[float] = None
+        self._burst = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_rate(rate, burst)
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Bytes per second, None if unlimited."""
+        return self._rate
+
+    def set_rate(self, rate: Optional[float], burst: Optional[float] = None) -> None:
+        """Change the rate (None or <= 0 = unlimited); existing debt is kept."""
+        self._refill()
+        self._rate = rate if rate and rate > 0 else None
+        if self._rate is None:
+            self._burst = 0.0
+            self._tokens = 0.0
+            return
+        self._burst = burst if burst is not None else self._rate * DEFAULT_BURST_SECONDS
+        self._tokens = min(self._tokens, self._burst)
+
+    def take(self, amount: int) -> None:
+        """Take transferred bytes from the bucket."""
+        self._refill()
+        if self._rate is not None:
+            self._tokens -= amount
+
+    def delay(self) -> float:
+        """Seconds until the bucket is out of debt."""
+        self._refill()
+        if self._rate is None or self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self._rate is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class AdaptiveBackoff:
+    """
+    Backoff factor driven by foreground I/O latency (AIMD).
+
+    Every latency sample above the target halves the factor (down to
+    min_factor); every sample at or below it adds `increase` (up to 1.0),
+    and so does every `recovery_interval` without any sample, so
+    background work returns to full speed once foreground I/O stops.
+    """
+
+    def __init__(
+        self,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        min_factor: float = 0.05,
+        decrease: float = 0.5,
+        increase: float = 0.1,
+        recovery_interval: float = 1.0
+    ):
+        """
+        Initialize backoff.
+
+        Args:
+            target_latency: Foreground latency to stay under (seconds)
+            min_factor: Lowest factor (background work never stops entirely)
+            decrease: Multiplier applied on a slow sample
+            increase: Amount added on a fast sample or a quiet interval
+            recovery_interval: Seconds without samples that count as a fast one
+        """
+        self.target_latency = target_latency
+        self.min_factor = min_factor
+        self.decrease = decrease
+        self.increase = increase
+        self.recovery_interval = recovery_interval
+        self._factor = 1.0
+        self._last_sample = time.monotonic()
+
+    @property
+    def factor(self) -> float:
+        """Current factor, including recovery since the last sample."""
+        quiet = int((time.monotonic() - self._last_sample) / self.recovery_interval)
+        return min(1.0, self._factor + quiet * self.increase)
+
+    def observe(self, latency: float) -> float:
+        """
+        Record a foreground latency sample.
+
+        Returns:
+            New backoff factor
+        """
+        factor = self.factor
+        if latency > self.target_latency:
+            self._factor = max(self.min_factor, factor * self.decrease)
+        else:
+            self._factor = min(1.0, factor + self.increase)
+        self._last_sample = time.monotonic()
+        return self._factor
+
+    def reset(self) -> None:
+        """Return to full speed."""
+        self._factor = 1.0
+        self._last_sample = time.monotonic()
+
+
+class _Transfer:
+    """Throttling state of one running operation."""
+
+    def __init__(self, priority: int, devices: tuple[int, ...], bucket: TokenBucket):
+        self.priority = priority
+        self.devices = devices
+        self.bucket = bucket
+        self.streams: Dict[str, tuple[int, float]] = {}
+
+
+class BandwidthThrottle:
+    """
+    Token-bucket rate limits per operation, per device and globally.
+
+    Example:
+        >>> throttle = BandwidthThrottle(global_rate=200 * 1024 * 1024)
+        >>> throttle.begin(op_id, priority=3, devices=[st_dev])
+        >>> throttle.transfer(op_id, dest, bytes_copied)  # From progress callbacks
+        >>> throttle.set_global_rate(None)  # Lift the limit live
+        >>> throttle.end(op_id)
+    """
+
+    def __init__(
+        self,
+        global_rate: Optional[float] = None,
+        device_rate: Optional[float] = None,
+        priority_rates: Optional[Dict[int, Optional[float]]] = None,
+        adaptive: bool = False,
+        target_latency: float = DEFAULT_TARGET_LATENCY
+    ):
+        """
+        Initialize throttle.
+
+        Args:
+            global_rate: Bytes per second across all operations (None = unlimited)
+            device_rate: Default bytes per second per device (None = unlimited)
+            priority_rates: Bytes per second per operation, by priority value
+                (missing priorities are unlimited)
+            adaptive: Back off while foreground latency is above target
+            target_latency: Foreground latency target for adaptive mode (seconds)
+        """
+        self.device_rate = device_rate
+        self.priority_rates: Dict[int, Optional[float]] = dict(priority_rates or {})
+        self.adaptive = adaptive
+        self.backoff = AdaptiveBackoff(target_latency)
+
+        self._condition = threading.Condition()
+        self._global = TokenBucket(global_rate)
+        self._devices: Dict[int, TokenBucket] = {}
+        self._device_overrides: Dict[int, Optional[float]] = {}
+        self._transfers: Dict[str, _Transfer] = {}
+
+    # ------------------------------------------------------------------
+    # Operations
+
+    def begin(self, key: str, priority: int, devices: Iterable[int] = ()) -> None:
+        """
+        Register a running operation.
+
+        Args:
+            key: Operation ID
+            priority: OperationPriority value
+            devices: Devices the operation reads or writes
+        """
+        with self._condition:
+            devices = tuple(devices)
+            for device in devices:
+                if device not in self._devices:
+                    rate = self._device_overrides.get(device, self.device_rate)
+                    self._devices[device] = TokenBucket(rate)
+            bucket = TokenBucket(self.priority_rates.get(priority))
+            self._transfers[key] = _Transfer(priority, devices, bucket)
+
+    def end(self, key: str) -> None:
+        """Unregister an operation; its waiting transfers return at once."""
+        with self._condition:
+            self._transfers.pop(key, None)
+            self._condition.notify_all()
+
+    def transfer(self, key: str, stream: str, copied: int, total: Optional[int] = None) -> None:
+        """
+        Account progress of one file of an operation, waiting as the
+        limits require.
+
+        Args:
+            key: Operation ID
+            stream: File being transferred (e.g. the destination path)
+            copied: Bytes of the file transferred so far
+            total: File size (the stream is forgotten once complete)
+        """
+        with self._condition:
+            state = self._transfers.get(key)
+            if state is None:
+                return
+
+            now = time.monotonic()
+            last_copied, last_time = state.streams.get(stream, (0, None))
+            amount = copied - last_copied if copied >= last_copied else copied
+            if amount <= 0:
+                return
+
+            buckets = [state.bucket, *(self._devices[device] for device in state.devices), self._global]
+            for bucket in buckets:
+                bucket.take(amount)
+            if PRIORITY_BACKOFF_WEIGHTS.get(state.priority, 1.0) == 0:
+                buckets = [state.bucket]  # Critical: counted, not delayed, by shared limits
+
+            # Duty cycle: after `elapsed` seconds of transfer, pause long
+            # enough that the operation runs `share` of the time
+            elapsed = now - last_time if last_time is not None else 0.0
+            started = now
+            while key in self._transfers:
+                share = self._share(state.priority)
+                duty_wait = started + elapsed * (1.0 / share - 1.0) - time.monotonic()
+                wait = max(duty_wait, *(bucket.delay() for bucket in buckets))
+                if wait <= 0:
+                    break
+                self._condition.wait(min(wait, _MAX_WAIT))
+
+            if total is not None and copied >= total:
+                state.streams.pop(stream, None)
+            else:
+                state.streams[stream] = (copied, time.monotonic())
+
+    # ------------------------------------------------------------------
+    # Live limits
+
+    def set_global_rate(self, rate: Optional[float]) -> None:
+        """Change the global limit (bytes per second, None = unlimited)."""
+        with self._condition:
+            self._global.set_rate(rate)
+            self._condition.notify_all()
+
+    def set_device_rate(self, device: Optional[int], rate: Optional[float]) -> None:
+        """
+        Change a device limit.
+
+        Args:
+            device: st_dev of the device, or None to change the default of
+                every device without its own limit
+            rate: Bytes per second (None = unlimited)
+        """
+        with self._condition:
+            if device is None:
+                self.device_rate = rate
+                for dev, bucket in self._devices.items():
+                    if dev not in self._device_overrides:
+                        bucket.set_rate(rate)
+            else:
+                self._device_overrides[device] = rate
+                if device in self._devices:
+                    self._devices[device].set_rate(rate)
+            self._condition.notify_all()
+
+    def set_operation_rate(self, key: str, rate: Optional[float]) -> bool:
+        """
+        Change the limit of a running operation.
+
+        Returns:
+            True if the operation is running
+        """
+        with self._condition:
+            state = self._transfers.get(key)
+            if state is None:
+                return False
+            state.bucket.set_rate(rate)
+            self._condition.notify_all()
+            return True
+
+    def set_priority_rate(self, priority: int, rate: Optional[float]) -> None:
+        """Change the per-operation limit of a priority, including running operations."""
+        with self._condition:
+            self.priority_rates[priority] = rate
+            for state in self._transfers.values():
+                if state.priority == priority:
+                    state.bucket.set_rate(rate)
+            self._condition.notify_all()
+
+    def set_adaptive(self, enabled: bool, target_latency: Optional[float] = None) -> None:
+        """Turn adaptive backoff on or off, optionally changing its target."""
+        with self._condition:
+            self.adaptive = enabled
+            if target_latency is not None:
+                self.backoff.target_latency = target_latency
+            if not enabled:
+                self.backoff.reset()
+            self._condition.notify_all()
+
+    def observe_latency(self, latency: float) -> None:
+        """Feed a foreground I/O latency sample (seconds) to adaptive mode."""
+        with self._condition:
+            if self.adaptive:
+                self.backoff.observe(latency)
+                self._condition.notify_all()
+
+    @property
+    def backoff_factor(self) -> float:
+        """Current adaptive backoff factor (1.0 = full speed)."""
+        return self.backoff.factor if self.adaptive else 1.0
+
+    def close(self) -> None:
+        """Release every waiting transfer and stop throttling."""
+        with self._condition:
+            self._transfers.clear()
+            self._condition.notify_all()
+
+    def _share(self, priority: int) -> float:
+        if not self.adaptive:
+            return 1.0
+        weight = PRIORITY_BACKOFF_WEIGHTS.get(priority, 1.0)
+        return max(self.backoff.min_factor, self.backoff.factor ** weight)
@@ -1,6 +1,10 @@
 """
 File verification system using multiple hash algorithms.
 Supports parallel verification and checksum file generation with auto-detected optimal workers.
+
+Copies whose source digest was computed while copying only need the
+destination re-read (verify_hash); on Linux it is flushed and dropped from
+the page cache first, so the check reads what reached the disk.
 """
 
 import hashlib
@@ -28,6 +32,19 @@ class HashAlgorithm(Enum):
     XXHASH64 = "xxhash64"
 
 
+class _Crc32Hasher:
+    """Incremental CRC32 with the hashlib update()/hexdigest() interface."""
+
+    def __init__(self):
+        self._crc = 0
+
+    def update(self, data) -> None:
+        self._crc = zlib.crc32(data, self._crc)
+
+    def hexdigest(self) -> str:
+        return f"{self._crc & 0xFFFFFFFF:08x}"
+
+
 class FileVerifier:
     """
     High-performance file verification using hash algorithms.
@@ -79,6 +96,26 @@ class FileVerifier:
         else:
             return self._calculate_hashlib(file_path)
 
+    def create_hasher(self):
+        """
+        Create an incremental hasher for the configured algorithm.
+
+        Returns:
+            Object with update(data) and hexdigest(), producing the same
+            digests as calculate_hash()
+        """
+        if self.algorithm == HashAlgorithm.CRC32:
+            return _Crc32Hasher()
+        elif self.algorithm == HashAlgorithm.XXHASH64 and self._xxhash_available:
+            return self._xxhash.xxh64()
+        elif self.algorithm == HashAlgorithm.MD5:
+            return hashlib.md5()
+        elif self.algorithm == HashAlgorithm.SHA256:
+            return hashlib.sha256()
+        elif self.algorithm == HashAlgorithm.SHA512:
+            return hashlib.sha512()
+        raise ValueError(f"Unsupported algorithm: {self.algorithm}")
+
     def _calculate_crc32(self, file_path: str) -> str:
         """Calculate CRC32 checksum."""
         crc = 0
@@ -156,6 +193,62 @@ class FileVerifier:
         except Exception as e:
             return False, f"Verification error: {str(e)}"
 
+    def verify_hash(
+        self,
+        file_path: str,
+        expected_hash: str,
+        expected_size: Optional[int] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a file against a known digest, reading it from disk.
+
+        On Linux the file is flushed (fsync) and its pages are dropped from
+        the page cache before and after reading, so a freshly written copy
+        is read back from the device instead of from the cache, and
+        verification does not evict other cached data.
+
+        Args:
+            file_path: File to verify (e.g. a copy destination)
+            expected_hash: Digest from create_hasher() / calculate_hash()
+            expected_size: Expected size in bytes (checked first)
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        try:
+            size = os.path.getsize(file_path)
+            if expected_size is not None and size != expected_size:
+                return False, f"Size mismatch: {expected_size} vs {size}"
+
+            drop_cache = hasattr(os, 'posix_fadvise')
+            hasher = self.create_hasher()
+            buffer = memoryview(bytearray(max(1, min(self.buffer_size, size))))
+
+            with open(file_path, 'rb', buffering=0) as f:
+                fd = f.fileno()
+                if drop_cache:
+                    os.fsync(fd)  # Dirty pages cannot be dropped
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    hasher.update(buffer[:n])
+
+                if drop_cache:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+            actual_hash = hasher.hexdigest()
+            if actual_hash != expected_hash:
+                return False, f"Hash mismatch: {expected_hash} vs {actual_hash}"
+
+            return True, None
+
+        except Exception as e:
+            return False, f"Verification error: {str(e)}"
+
     def verify_batch(
         self,
         file_pairs: List[Tuple[str, str]],
@@ -19,6 +19,7 @@ import threading
 # Add parent directory to path for core imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.threading import create_mixed_executor, ManagedThreadPoolExecutor
+from core.stat_cache import get_stat_cache
 
 from .text_preview import TextPreviewer
 from .image_preview import ImagePreviewer
@@ -103,7 +104,7 @@ class PreviewManager:
         Returns:
             Dictionary containing preview data
         """
-        if not os.path.exists(file_path):
+        if get_stat_cache().try_stat(file_path) is None:
             return {'error': 'File not found'}
 
         # Generate cache key
@@ -207,7 +208,8 @@ class PreviewManager:
         Generate cache key for file.
 
         Uses file path and modification time to invalidate cache
-        when file changes.
+        when file changes. The mtime comes from the shared stat cache,
+        so the existence check in get_preview() already paid for it.
 
         Args:
             file_path: Path to file
@@ -216,7 +218,7 @@ class PreviewManager:
             Cache key string
         """
         try:
-            mtime = os.path.getmtime(file_path)
+            mtime = get_stat_cache().stat(file_path).st_mtime
             key_data = f"{file_path}:{mtime}"
             return hashlib.md5(key_data.encode()).hexdigest()
         except Exception:
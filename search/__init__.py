@@ -16,6 +16,8 @@ from .filters import (
     FilterChain,
 )
 from .history import SearchHistory
+from .sharded_index import IndexShard, ShardedIndex, ShardState
+from .query_compiler import QueryCompiler, QueryPlan
 from .everything_sdk import EverythingSDK, EverythingSDKError, EverythingError
 
 __all__ = [
@@ -34,6 +36,12 @@ __all__ = [
     "FilterChain",
     # History
     "SearchHistory",
+    # Native index
+    "ShardedIndex",
+    "IndexShard",
+    "ShardState",
+    "QueryCompiler",
+    "QueryPlan",
     # Everything SDK
     "EverythingSDK",
     "EverythingSDKError",
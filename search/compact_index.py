@@ -0,0 +1,740 @@
+"""
+Compact in-memory file table for the native index.
+
+Full path strings dominate the memory of a file catalog, so entries are
+stored as (parent directory id, name id) pairs:
+
+- A directory table maps each directory id to (parent id, name id)
+- Unique names are sorted and front-coded in small blocks (each name stores
+  only the suffix that differs from its predecessor)
+- Per-entry metadata lives in typed arrays instead of Python objects
+
+Full paths are rebuilt lazily, only for records whose path is actually read
+(displayed, exported or filtered by path).
+"""
+
+import bisect
+import os
+import stat as stat_module
+import threading
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Seconds between the Windows FILETIME epoch (1601) and the Unix epoch
+FILETIME_EPOCH_OFFSET = 11644473600
+
+# Directory id of the shard's mount point
+ROOT_DIR_ID = 0
+
+
+def unix_to_filetime(timestamp: float) -> int:
+    """Convert a Unix timestamp to Windows FILETIME (100ns intervals since 1601)."""
+    return int((timestamp + FILETIME_EPOCH_OFFSET) * 10_000_000)
+
+
+def _encode_name(name: str) -> bytes:
+    """Encode a filename losslessly (undecodable bytes survive round trips)."""
+    return name.encode("utf-8", "surrogateescape")
+
+
+def _decode_name(data: bytes) -> str:
+    """Decode a filename encoded with _encode_name()."""
+    return data.decode("utf-8", "surrogateescape")
+
+
+class FrontCodedNames:
+    """
+    Sorted, front-coded string table.
+
+    Names are sorted by their encoded bytes and split into blocks of
+    BLOCK_SIZE. The first name of each block is kept verbatim (for binary
+    search); every other name is stored as
+    (shared prefix length: 1 byte, suffix length: 2 bytes, suffix bytes).
+    A name's id is its position in sorted order.
+    """
+
+    BLOCK_SIZE = 16
+
+    def __init__(self, sorted_names: List[bytes]):
+        """
+        Build the table.
+
+        Args:
+            sorted_names: Unique encoded names in ascending byte order
+        """
+        self._count = len(sorted_names)
+        self._heads: List[bytes] = []
+        self._blocks: List[bytes] = []
+
+        for start in range(0, self._count, self.BLOCK_SIZE):
+            block_names = sorted_names[start:start + self.BLOCK_SIZE]
+            self._heads.append(block_names[0])
+            self._blocks.append(self._encode_block(block_names))
+
+    @staticmethod
+    def _encode_block(names: List[bytes]) -> bytes:
+        """Front-code one block of names."""
+        out = bytearray()
+        prev = b""
+        for name in names:
+            lcp = 0
+            limit = min(len(prev), len(name), 255)
+            while lcp < limit and prev[lcp] == name[lcp]:
+                lcp += 1
+            suffix = name[lcp:]
+            out.append(lcp)
+            out += len(suffix).to_bytes(2, "little")
+            out += suffix
+            prev = name
+        return bytes(out)
+
+    @staticmethod
+    def _decode_block(block: bytes) -> List[bytes]:
+        """Decode one front-coded block."""
+        names = []
+        prev = b""
+        pos = 0
+        end = len(block)
+        while pos < end:
+            lcp = block[pos]
+            length = block[pos + 1] | (block[pos + 2] << 8)
+            pos += 3
+            prev = prev[:lcp] + block[pos:pos + length]
+            pos += length
+            names.append(prev)
+        return names
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, name_id: int) -> str:
+        """
+        Get a name by id.
+
+        Args:
+            name_id: Position in sorted order
+
+        Returns:
+            The decoded name
+        """
+        if not 0 <= name_id < self._count:
+            raise IndexError(name_id)
+        block_index, offset = divmod(name_id, self.BLOCK_SIZE)
+        return _decode_name(self._decode_block(self._blocks[block_index])[offset])
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Find the id of a name.
+
+        Args:
+            name: Name to look up
+
+        Returns:
+            Name id, or None if the name is not in the table
+        """
+        encoded = _encode_name(name)
+        block_index = bisect.bisect_right(self._heads, encoded) - 1
+        if block_index < 0:
+            return None
+        names = self._decode_block(self._blocks[block_index])
+        offset = bisect.bisect_left(names, encoded)
+        if offset < len(names) and names[offset] == encoded:
+            return block_index * self.BLOCK_SIZE + offset
+        return None
+
+    def decode_all(self) -> List[str]:
+        """Decode every name in id order (transient, for full scans)."""
+        names: List[str] = []
+        for block in self._blocks:
+            names.extend(_decode_name(n) for n in self._decode_block(block))
+        return names
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the encoded blocks and heads."""
+        return sum(len(b) for b in self._blocks) + sum(len(h) for h in self._heads)
+
+
+class IndexRecord:
+    """
+    Single file or folder in the native index.
+
+    Records are created on demand while a shard is queried. The full path is
+    rebuilt from the directory table the first time it is read. Records also
+    expose the attributes of search.filters.SearchResult so filter chains can
+    run on them directly.
+    """
+
+    __slots__ = (
+        "name", "size", "mtime", "ctime", "atime", "is_dir",
+        "_table", "_parent_id", "_path",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        mtime: float,
+        ctime: float,
+        atime: float,
+        is_dir: bool,
+        table: Optional["CompactFileTable"] = None,
+        parent_id: int = ROOT_DIR_ID,
+        path: Optional[str] = None,
+    ):
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.ctime = ctime
+        self.atime = atime
+        self.is_dir = is_dir
+        self._table = table
+        self._parent_id = parent_id
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        """Full path (reconstructed lazily)."""
+        if self._path is None:
+            self._path = os.path.join(self._table.dir_path(self._parent_id), self.name)
+        return self._path
+
+    # SearchResult protocol (search.filters)
+
+    @property
+    def full_path(self) -> str:
+        return self.path
+
+    @property
+    def extension(self) -> str:
+        return "" if self.is_dir else os.path.splitext(self.name)[1].lstrip(".")
+
+    @property
+    def is_folder(self) -> bool:
+        return self.is_dir
+
+    @property
+    def date_modified(self) -> int:
+        return unix_to_filetime(self.mtime)
+
+    @property
+    def date_created(self) -> int:
+        return unix_to_filetime(self.ctime)
+
+    @property
+    def date_accessed(self) -> int:
+        return unix_to_filetime(self.atime)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IndexRecord):
+            return NotImplemented
+        return self.path == other.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        kind = "dir" if self.is_dir else f"{self.size} bytes"
+        return f"IndexRecord({self.name!r}, {kind})"
+
+
+class CompactFileTable:
+    """
+    Immutable compact table of indexed entries.
+
+    Use CompactFileTableBuilder to create one.
+    """
+
+    DIR_PATH_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        root_path: str,
+        names: FrontCodedNames,
+        dir_parents: array,
+        dir_name_ids: array,
+        parent_ids: array,
+        name_ids: array,
+        sizes: array,
+        mtimes: array,
+        ctimes: array,
+        atimes: array,
+        flags: array,
+    ):
+        self.root_path = root_path
+        self.names = names
+        self._dir_parents = dir_parents
+        self._dir_name_ids = dir_name_ids
+        self._parent_ids = parent_ids
+        self._name_ids = name_ids
+        self._sizes = sizes
+        self._mtimes = mtimes
+        self._ctimes = ctimes
+        self._atimes = atimes
+        self._flags = flags
+        self.dir_path = lru_cache(maxsize=self.DIR_PATH_CACHE_SIZE)(self._dir_path)
+        self.indexes = TableIndexes(self)
+
+    def __len__(self) -> int:
+        return len(self._name_ids)
+
+    @property
+    def directory_count(self) -> int:
+        """Number of directories in the directory table (including the root)."""
+        return len(self._dir_parents)
+
+    def _dir_path(self, dir_id: int) -> str:
+        """Rebuild a directory's full path from the directory table."""
+        if dir_id == ROOT_DIR_ID:
+            return self.root_path
+        parts = []
+        while dir_id != ROOT_DIR_ID:
+            parts.append(self.names.get(self._dir_name_ids[dir_id]))
+            dir_id = self._dir_parents[dir_id]
+        return os.path.join(self.root_path, *reversed(parts))
+
+    def record(self, index: int, names: Optional[List[str]] = None) -> IndexRecord:
+        """
+        Materialize one entry as an IndexRecord.
+
+        Args:
+            index: Entry position
+            names: Optional pre-decoded name list (from names.decode_all())
+
+        Returns:
+            IndexRecord with a lazily reconstructed path
+        """
+        name_id = self._name_ids[index]
+        return IndexRecord(
+            name=names[name_id] if names is not None else self.names.get(name_id),
+            size=self._sizes[index],
+            mtime=self._mtimes[index],
+            ctime=self._ctimes[index],
+            atime=self._atimes[index],
+            is_dir=bool(self._flags[index]),
+            table=self,
+            parent_id=self._parent_ids[index],
+        )
+
+    def iter_records(self) -> Iterator[IndexRecord]:
+        """Iterate over all entries (names are decoded once per scan)."""
+        names = self.names.decode_all()
+        for index in range(len(self)):
+            yield self.record(index, names)
+
+    def records_at(self, indices: Iterable[int]) -> Iterator[IndexRecord]:
+        """Materialize selected entries (names decoded per record)."""
+        for index in indices:
+            yield self.record(index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the table."""
+        arrays = (
+            self._dir_parents, self._dir_name_ids, self._parent_ids,
+            self._name_ids, self._sizes, self._mtimes, self._ctimes,
+            self._atimes, self._flags,
+        )
+        return self.names.nbytes + sum(a.itemsize * len(a) for a in arrays)
+
+
+def _extension_key(name: str) -> str:
+    """Lowercase extension as exposed by IndexRecord.extension for files."""
+    return os.path.splitext(name)[1].lstrip(".").lower()
+
+
+def name_trigrams(text: str) -> set:
+    """Distinct 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TableIndexes:
+    """
+    Secondary indexes over a CompactFileTable.
+
+    Each index is built on first use and kept for the lifetime of the table
+    snapshot (tables are immutable, so indexes never need maintenance):
+
+    - trigram: lowercase name trigram -> sorted name ids
+    - extension: lowercase extension -> file entry indices
+    - size: file entry indices ordered by size
+    - time: entry indices ordered by mtime/ctime/atime
+    """
+
+    TIME_FIELDS = ("mtime", "ctime", "atime")
+
+    def __init__(self, table: "CompactFileTable"):
+        self._table = table
+        self._lock = threading.Lock()
+        self._trigrams: Optional[Dict[str, array]] = None
+        self._name_offsets: Optional[array] = None
+        self._name_entries: Optional[array] = None
+        self._extensions: Optional[Dict[str, array]] = None
+        self._size_order: Optional[array] = None
+        self._sorted_sizes: Optional[array] = None
+        self._folders: Optional[array] = None
+        self._time_orders: Dict[str, tuple] = {}
+
+    @property
+    def built(self) -> List[str]:
+        """Names of the indexes built so far."""
+        kinds = []
+        if self._trigrams is not None:
+            kinds.append("trigram")
+        if self._name_entries is not None:
+            kinds.append("names")
+        if self._extensions is not None:
+            kinds.append("extension")
+        if self._size_order is not None:
+            kinds.append("size")
+        kinds.extend(f"time:{f}" for f in self._time_orders)
+        return kinds
+
+    # Trigram index on unique names
+
+    def _ensure_trigrams(self) -> None:
+        if self._trigrams is not None:
+            return
+        with self._lock:
+            if self._trigrams is not None:
+                return
+
+            postings: Dict[str, list] = {}
+            for name_id, name in enumerate(self._table.names.decode_all()):
+                for gram in name_trigrams(name.lower()):
+                    ids = postings.get(gram)
+                    if ids is None:
+                        postings[gram] = [name_id]
+                    else:
+                        ids.append(name_id)
+
+            self._trigrams = {gram: array("i", ids) for gram, ids in postings.items()}
+
+    def _ensure_name_entries(self) -> None:
+        """Build the CSR mapping name id -> entry indices (counting sort)."""
+        if self._name_entries is not None:
+            return
+        with self._lock:
+            if self._name_entries is not None:
+                return
+
+            table = self._table
+            offsets = array("i", [0]) * (len(table.names) + 1)
+            for name_id in table._name_ids:
+                offsets[name_id + 1] += 1
+            for i in range(1, len(offsets)):
+                offsets[i] += offsets[i - 1]
+            fill = offsets[:-1]
+            entries = array("i", [0]) * len(table)
+            for index, name_id in enumerate(table._name_ids):
+                entries[fill[name_id]] = index
+                fill[name_id] += 1
+
+            self._name_offsets = offsets
+            self._name_entries = entries
+
+    def trigram_estimate(self, fragment: str) -> int:
+        """
+        Upper bound on names containing fragment (length >= 3).
+
+        Returns:
+            Length of the shortest posting list among the fragment's trigrams
+        """
+        self._ensure_trigrams()
+        grams = name_trigrams(fragment.lower())
+        return min((len(self._trigrams.get(g, ())) for g in grams), default=0)
+
+    def names_containing(self, fragments: List[str]) -> List[int]:
+        """
+        Name ids whose lowercase name contains every fragment.
+
+        Posting lists are intersected shortest first; survivors are verified
+        against the actual name, so the result is exact.
+
+        Args:
+            fragments: Lowercase substrings, each at least 3 characters long
+
+        Returns:
+            Sorted name ids
+        """
+        self._ensure_trigrams()
+        grams = set()
+        for fragment in fragments:
+            grams |= name_trigrams(fragment)
+
+        lists = sorted((self._trigrams.get(g, array("i")) for g in grams), key=len)
+        if not lists or not lists[0]:
+            return []
+
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+
+        names = self._table.names
+        return sorted(
+            name_id for name_id in candidates
+            if all(f in names.get(name_id).lower() for f in fragments)
+        )
+
+    def entries_for_names(self, name_ids: Iterable[int]) -> Iterator[int]:
+        """Entry indices of all entries carrying the given name ids."""
+        self._ensure_name_entries()
+        offsets, entries = self._name_offsets, self._name_entries
+        for name_id in name_ids:
+            yield from entries[offsets[name_id]:offsets[name_id + 1]]
+
+    def name_entry_count(self, name_ids: Iterable[int]) -> int:
+        """Number of entries carrying the given name ids."""
+        self._ensure_name_entries()
+        offsets = self._name_offsets
+        return sum(offsets[i + 1] - offsets[i] for i in name_ids)
+
+    def average_entries_per_name(self) -> float:
+        """Average number of entries sharing one unique name."""
+        return len(self._table) / len(self._table.names) if len(self._table.names) else 0.0
+
+    # Extension index
+
+    def _ensure_extensions(self) -> None:
+        if self._extensions is not None:
+            return
+        with self._lock:
+            if self._extensions is not None:
+                return
+
+            table = self._table
+            ext_by_name = [_extension_key(n) for n in table.names.decode_all()]
+            postings: Dict[str, array] = {}
+            for index, (name_id, flag) in enumerate(zip(table._name_ids, table._flags)):
+                if flag:
+                    continue
+                ext = ext_by_name[name_id]
+                ids = postings.get(ext)
+                if ids is None:
+                    postings[ext] = ids = array("i")
+                ids.append(index)
+            self._extensions = postings
+
+    def extension_count(self, extensions: Iterable[str]) -> int:
+        """Number of files with any of the given lowercase extensions."""
+        self._ensure_extensions()
+        return sum(len(self._extensions.get(ext, ())) for ext in set(extensions))
+
+    def entries_with_extensions(self, extensions: Iterable[str]) -> Iterator[int]:
+        """File entry indices with any of the given lowercase extensions."""
+        self._ensure_extensions()
+        for ext in set(extensions):
+            yield from self._extensions.get(ext, ())
+
+    # Size index
+
+    def _ensure_sizes(self) -> None:
+        if self._size_order is not None:
+            return
+        with self._lock:
+            if self._size_order is not None:
+                return
+
+            table = self._table
+            files = [i for i, flag in enumerate(table._flags) if not flag]
+            sizes = table._sizes
+            files.sort(key=sizes.__getitem__)
+            self._sorted_sizes = array("q", (sizes[i] for i in files))
+            self._folders = array("i", (i for i, flag in enumerate(table._flags) if flag))
+            self._size_order = array("i", files)
+
+    def _size_bounds(self, low: Optional[int], high: Optional[int]) -> tuple:
+        sizes = self._sorted_sizes
+        start = 0 if low is None else bisect.bisect_left(sizes, low)
+        end = len(sizes) if high is None else bisect.bisect_right(sizes, high)
+        return start, max(start, end)
+
+    def size_count(self, low: Optional[int], high: Optional[int]) -> int:
+        """Number of files with low <= size <= high (None = unbounded)."""
+        self._ensure_sizes()
+        start, end = self._size_bounds(low, high)
+        return end - start
+
+    def files_in_size_range(self, low: Optional[int], high: Optional[int]) -> array:
+        """File entry indices with low <= size <= high (None = unbounded)."""
+        self._ensure_sizes()
+        start, end = self._size_bounds(low, high)
+        return self._size_order[start:end]
+
+    @property
+    def folders(self) -> array:
+        """Entry indices of all folders."""
+        self._ensure_sizes()
+        return self._folders
+
+    # Time indexes
+
+    def _ensure_times(self, field: str) -> tuple:
+        order = self._time_orders.get(field)
+        if order is not None:
+            return order
+        with self._lock:
+            order = self._time_orders.get(field)
+            if order is None:
+                values = getattr(self._table, f"_{field}s")
+                indices = sorted(range(len(values)), key=values.__getitem__)
+                order = (array("i", indices), array("d", (values[i] for i in indices)))
+                self._time_orders[field] = order
+            return order
+
+    def _time_bounds(self, field: str, low: Optional[float], high: Optional[float]) -> tuple:
+        indices, values = self._ensure_times(field)
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = len(values) if high is None else bisect.bisect_right(values, high)
+        return indices, start, max(start, end)
+
+    def time_count(self, field: str, low: Optional[float], high: Optional[float]) -> int:
+        """Number of entries with low <= field <= high (None = unbounded)."""
+        _, start, end = self._time_bounds(field, low, high)
+        return end - start
+
+    def entries_in_time_range(
+        self, field: str, low: Optional[float], high: Optional[float]
+    ) -> array:
+        """Entry indices with low <= field <= high (field: mtime, ctime, atime)."""
+        indices, start, end = self._time_bounds(field, low, high)
+        return indices[start:end]
+
+
+class CompactFileTableBuilder:
+    """
+    Accumulates entries during a filesystem walk and builds a CompactFileTable.
+
+    Example:
+        >>> builder = CompactFileTableBuilder('/data')
+        >>> docs = builder.add(ROOT_DIR_ID, 'docs', 0, 0.0, 0.0, 0.0, is_dir=True)
+        >>> builder.add(docs, 'report.pdf', 1024, 0.0, 0.0, 0.0, is_dir=False)
+        >>> table = builder.build()
+    """
+
+    def __init__(self, root_path: str):
+        """
+        Initialize builder.
+
+        Args:
+            root_path: Path of the root directory (directory id 0)
+        """
+        self.root_path = root_path
+        self._name_to_temp_id: dict[bytes, int] = {}
+        self._dir_parents = array("i", [ROOT_DIR_ID])
+        self._dir_name_ids = array("i", [0])  # Root name is never read
+        self._parent_ids = array("i")
+        self._name_ids = array("i")
+        self._sizes = array("q")
+        self._mtimes = array("d")
+        self._ctimes = array("d")
+        self._atimes = array("d")
+        self._flags = array("B")
+
+    def _intern(self, name: str) -> int:
+        """Assign a temporary id to a name (remapped to sorted order in build())."""
+        encoded = _encode_name(name)
+        temp_id = self._name_to_temp_id.get(encoded)
+        if temp_id is None:
+            temp_id = len(self._name_to_temp_id)
+            self._name_to_temp_id[encoded] = temp_id
+        return temp_id
+
+    def add(
+        self,
+        parent_id: int,
+        name: str,
+        size: int,
+        mtime: float,
+        ctime: float,
+        atime: float,
+        is_dir: bool,
+    ) -> int:
+        """
+        Add an entry.
+
+        Args:
+            parent_id: Directory id of the containing directory
+            name: Entry name
+            size: Size in bytes (0 for directories)
+            mtime: Modification time
+            ctime: Creation/change time
+            atime: Access time
+            is_dir: True for directories
+
+        Returns:
+            The new directory id for directories, -1 for files
+        """
+        name_id = self._intern(name)
+        self._parent_ids.append(parent_id)
+        self._name_ids.append(name_id)
+        self._sizes.append(size)
+        self._mtimes.append(mtime)
+        self._ctimes.append(ctime)
+        self._atimes.append(atime)
+        self._flags.append(1 if is_dir else 0)
+
+        if not is_dir:
+            return -1
+
+        self._dir_parents.append(parent_id)
+        self._dir_name_ids.append(name_id)
+        return len(self._dir_parents) - 1
+
+    def add_stat(self, parent_id: int, name: str, st: os.stat_result) -> int:
+        """
+        Add an entry from a stat result.
+
+        Args:
+            parent_id: Directory id of the containing directory
+            name: Entry name
+            st: Stat result for the entry
+
+        Returns:
+            The new directory id for directories, -1 for files
+        """
+        is_dir = stat_module.S_ISDIR(st.st_mode)
+        return self.add(
+            parent_id, name, 0 if is_dir else st.st_size,
+            st.st_mtime, st.st_ctime, st.st_atime, is_dir,
+        )
+
+    def build(self) -> CompactFileTable:
+        """
+        Sort and front-code names and produce the immutable table.
+
+        Returns:
+            CompactFileTable
+        """
+        sorted_names = sorted(self._name_to_temp_id)
+        remap = array("i", [0]) * len(sorted_names)
+        for final_id, encoded in enumerate(sorted_names):
+            remap[self._name_to_temp_id[encoded]] = final_id
+        self._name_to_temp_id = {}
+
+        names = FrontCodedNames(sorted_names)
+        name_ids = array("i", (remap[i] for i in self._name_ids))
+        dir_name_ids = array("i", [0])
+        dir_name_ids.extend(remap[i] for i in self._dir_name_ids[1:])
+
+        return CompactFileTable(
+            root_path=self.root_path,
+            names=names,
+            dir_parents=self._dir_parents,
+            dir_name_ids=dir_name_ids,
+            parent_ids=self._parent_ids,
+            name_ids=name_ids,
+            sizes=self._sizes,
+            mtimes=self._mtimes,
+            ctimes=self._ctimes,
+            atimes=self._atimes,
+            flags=self._flags,
+        )
+
+
+def empty_table(root_path: str) -> CompactFileTable:
+    """Create an empty table for a shard that has not been built yet."""
+    return CompactFileTableBuilder(root_path).build()
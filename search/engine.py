@@ -6,6 +6,7 @@ with auto-detected optimal workers.
 """
 
 import os
+import re
 import sys
 import threading
 import time
@@ -28,6 +29,9 @@ from .everything_sdk import EverythingSDKError, EverythingSDK, EverythingSort
 from .filters import FilterChain, create_filter_chain_from_query
 from .query_parser import ParsedQuery, QueryParser
 from .mime_filter import MimeFilter, parse_mime_query
+from .compact_index import IndexRecord
+from .query_compiler import QueryCompiler
+from .sharded_index import ShardedIndex
 
 
 @dataclass
@@ -58,6 +62,7 @@ class SearchEngine:
 
     Features:
     - Primary: Everything SDK for instant search
+    - Native: sharded per-mount-point index (no Windows backend needed)
     - Fallback: Windows Search API
     - Advanced filtering (size, date, content, etc.)
     - Threading for async operations
@@ -69,6 +74,7 @@ class SearchEngine:
         self,
         everything_dll_path: Optional[str] = None,
         max_workers: Optional[int] = None,
+        index: Optional[ShardedIndex] = None,
     ):
         """
         Initialize search engine with auto-detected optimal workers.
@@ -76,6 +82,7 @@ class SearchEngine:
         Args:
             everything_dll_path: Optional path to Everything DLL
             max_workers: Maximum number of worker threads (None = auto-detect for mixed workload)
+            index: Optional native sharded index used when Everything is unavailable
         """
         self.query_parser = QueryParser()
         self.max_workers = max_workers
@@ -98,13 +105,26 @@ class SearchEngine:
         # Check Windows Search availability
         self.windows_search_available = WINDOWS_SEARCH_AVAILABLE
 
+        # Native sharded index
+        self.index = index
+        self.query_compiler = QueryCompiler()
+
         # Initialize MIME filter
         self.mime_filter = MimeFilter()
 
     @property
     def is_available(self) -> bool:
         """Check if any search backend is available."""
-        return self.use_everything or self.windows_search_available
+        return (
+            self.use_everything
+            or self.use_index
+            or self.windows_search_available
+        )
+
+    @property
+    def use_index(self) -> bool:
+        """Check if the native index can answer queries."""
+        return self.index is not None and self.index.has_online_shards
 
     def search(
         self,
@@ -142,15 +162,22 @@ class SearchEngine:
         parsed_query = self.query_parser.parse(query)
 
         # Search using available backend
+        filters_applied = False
         if self.use_everything:
             results = self._search_everything(
                 parsed_query, max_results, sort_by, ascending
             )
+        elif self.use_index:
+            # Filters run inside the shard queries, before per-shard limits
+            results = self._search_index(
+                parsed_query, max_results, sort_by, ascending
+            )
+            filters_applied = True
         else:
             results = self._search_windows(parsed_query, max_results)
 
         # Apply additional filters
-        if parsed_query.has_filters():
+        if parsed_query.has_filters() and not filters_applied:
             filter_chain = create_filter_chain_from_query(parsed_query)
             if len(filter_chain) > 0:
                 results = self._apply_filters(
@@ -290,6 +317,42 @@ class SearchEngine:
 
         return results
 
+    def _search_index(
+        self,
+        parsed_query: ParsedQuery,
+        max_results: int,
+        sort_by: str,
+        ascending: bool,
+    ) -> List[SearchResult]:
+        """Search the native sharded index (all shards in parallel)."""
+        try:
+            plan = self.query_compiler.compile(parsed_query, self._cancel_flag)
+        except re.error:
+            return []
+
+        results = []
+        for record in self.index.iter_search(plan, sort_by, ascending, max_results):
+            if self._cancel_flag.is_set():
+                break
+            results.append(self._record_to_result(record))
+
+        return results
+
+    @staticmethod
+    def _record_to_result(record: IndexRecord) -> SearchResult:
+        """Convert a native index record to a SearchResult."""
+        return SearchResult(
+            filename=record.name,
+            path=os.path.dirname(record.path),
+            full_path=record.path,
+            extension=record.extension,
+            size=record.size,
+            date_created=record.date_created,
+            date_modified=record.date_modified,
+            date_accessed=record.date_accessed,
+            is_folder=record.is_dir,
+        )
+
     def _search_windows(
         self, parsed_query: ParsedQuery, max_results: int
     ) -> List[SearchResult]:
@@ -520,6 +583,8 @@ class SearchEngine:
         """Shutdown search engine and clean up resources."""
         self.cancel()
         self._executor.shutdown(wait=True)
+        if self.index is not None:
+            self.index.shutdown()
         if self.everything_sdk:
             self.everything_sdk.cleanup()
 
@@ -0,0 +1,579 @@
+"""
+Query compiler for the native index.
+
+Compiles a ParsedQuery (the same Everything-style syntax used for the
+Everything SDK and Windows Search backends: keywords, ext:, size:, dm:,
+path:, ...) into a QueryPlan for the native index:
+
+- Candidate access paths: trigram (name keywords), extension, size and date
+  secondary indexes, regex literal factors (see search.regex_index), a
+  regex scan over unique names, or a full scan
+- Residual predicates for every condition the chosen access path does not
+  answer exactly
+
+The access path is chosen per shard table from cost estimates (posting list
+lengths and exact range counts), so a small ext:iso result set drives one
+shard while a selective keyword drives another.
+"""
+
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .compact_index import CompactFileTable, IndexRecord, TableIndexes
+from .filters import ContentFilter, DateFilterImpl, SizeFilterImpl
+from .query_parser import DateFilter, DatePreset, ParsedQuery, SizeOperator
+from .regex_index import Requirement, extract_requirement
+
+# Condition names shared by access paths and residual predicates
+KEYWORDS = "keywords"
+EXTENSIONS = "extensions"
+SIZE = "size"
+DATES = "dates"
+REGEX = "regex"
+
+# Shortest keyword the trigram index can answer
+MIN_TRIGRAM_KEYWORD = 3
+
+DATE_FIELDS = {"modified": "mtime", "created": "ctime", "accessed": "atime"}
+
+# Costs relative to checking one record during a sequential scan
+POSTING_COST = 0.25        # Intersecting one trigram posting entry
+NAME_CHECK_COST = 1.0      # Verifying one candidate name
+RANDOM_ACCESS_COST = 2.5   # Materializing one record out of scan order
+NAME_SCAN_COST = 0.4       # Running a regex over one unique name
+
+# Assumed fraction of names matched by a regex with no usable literals
+REGEX_SELECTIVITY = 0.05
+
+TimeRange = Tuple[Optional[float], Optional[float]]
+
+
+class AccessPath:
+    """Way of producing candidate entries from a table."""
+
+    kind = "scan"
+
+    # Conditions whose residual check becomes unnecessary with this path
+    covers: frozenset = frozenset()
+
+    def estimate(self, table: CompactFileTable) -> float:
+        """Estimated cost of producing and checking the candidates."""
+        return float(len(table))
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        """Candidate records (a superset of the matches for its conditions)."""
+        return table.iter_records()
+
+    def describe(self) -> str:
+        return self.kind
+
+
+class FullScan(AccessPath):
+    """Check every entry of the table."""
+
+
+class TrigramLookup(AccessPath):
+    """Name ids containing all keywords, via the trigram index."""
+
+    kind = "trigram"
+    covers = frozenset({KEYWORDS})
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+
+    def estimate(self, table: CompactFileTable) -> float:
+        indexes = table.indexes
+        postings = min(indexes.trigram_estimate(kw) for kw in self.keywords)
+        rows = postings * indexes.average_entries_per_name()
+        return postings * (POSTING_COST + NAME_CHECK_COST) + rows * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        indexes = table.indexes
+        name_ids = indexes.names_containing(self.keywords)
+        return table.records_at(indexes.entries_for_names(name_ids))
+
+    def describe(self) -> str:
+        return f"trigram({', '.join(self.keywords)})"
+
+
+class ExtensionLookup(AccessPath):
+    """Files with one of the requested extensions."""
+
+    kind = "extension"
+    covers = frozenset({EXTENSIONS})
+
+    def __init__(self, extensions: List[str]):
+        self.extensions = extensions
+
+    def estimate(self, table: CompactFileTable) -> float:
+        return table.indexes.extension_count(self.extensions) * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        return table.records_at(table.indexes.entries_with_extensions(self.extensions))
+
+    def describe(self) -> str:
+        return f"extension({', '.join(self.extensions)})"
+
+
+class SizeRangeLookup(AccessPath):
+    """Files in a size range, plus all folders (folders pass size filters)."""
+
+    kind = "size"
+    covers = frozenset({SIZE})
+
+    def __init__(self, low: Optional[int], high: Optional[int]):
+        self.low = low
+        self.high = high
+
+    def estimate(self, table: CompactFileTable) -> float:
+        indexes = table.indexes
+        rows = indexes.size_count(self.low, self.high) + len(indexes.folders)
+        return rows * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        indexes = table.indexes
+        files = indexes.files_in_size_range(self.low, self.high)
+        yield from table.records_at(files)
+        yield from table.records_at(indexes.folders)
+
+    def describe(self) -> str:
+        return f"size({self.low}..{self.high})"
+
+
+class TimeRangeLookup(AccessPath):
+    """Entries whose timestamp lies in a range (superset of the date filters)."""
+
+    kind = "date"
+
+    def __init__(self, time_field: str, low: Optional[float], high: Optional[float]):
+        self.time_field = time_field
+        self.low = low
+        self.high = high
+
+    def estimate(self, table: CompactFileTable) -> float:
+        rows = table.indexes.time_count(self.time_field, self.low, self.high)
+        return rows * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        indexes = table.indexes
+        return table.records_at(
+            indexes.entries_in_time_range(self.time_field, self.low, self.high)
+        )
+
+    def describe(self) -> str:
+        return f"date:{self.time_field}({self.low}..{self.high})"
+
+
+def _requirement_estimate(indexes: TableIndexes, requirement: Requirement) -> int:
+    """Upper bound on names satisfying a literal requirement."""
+    if isinstance(requirement, str):
+        return indexes.trigram_estimate(requirement)
+    kind, parts = requirement
+    estimates = [_requirement_estimate(indexes, p) for p in parts]
+    return min(estimates) if kind == "and" else sum(estimates)
+
+
+def _requirement_name_ids(indexes: TableIndexes, requirement: Requirement) -> set:
+    """Name ids satisfying a literal requirement (exact substring semantics)."""
+    if isinstance(requirement, str):
+        return set(indexes.names_containing([requirement]))
+
+    kind, parts = requirement
+    if kind == "or":
+        result = set()
+        for part in parts:
+            result |= _requirement_name_ids(indexes, part)
+        return result
+
+    # AND: plain literals share one posting intersection, nested ORs follow
+    # from the most selective down
+    literals = [p for p in parts if isinstance(p, str)]
+    result = set(indexes.names_containing(literals)) if literals else None
+    for part in sorted(
+        (p for p in parts if not isinstance(p, str)),
+        key=lambda p: _requirement_estimate(indexes, p),
+    ):
+        if result is not None and not result:
+            break
+        ids = _requirement_name_ids(indexes, part)
+        result = ids if result is None else result & ids
+    return result or set()
+
+
+class RegexLiteralLookup(AccessPath):
+    """
+    Names containing the regex's required literals, via the trigram index.
+
+    The compiled regex then runs once per surviving unique name.
+    """
+
+    kind = "regex-index"
+    covers = frozenset({REGEX})
+
+    def __init__(self, regex: re.Pattern, requirement: Requirement):
+        self.regex = regex
+        self.requirement = requirement
+
+    def estimate(self, table: CompactFileTable) -> float:
+        indexes = table.indexes
+        postings = _requirement_estimate(indexes, self.requirement)
+        rows = postings * indexes.average_entries_per_name()
+        return postings * (POSTING_COST + NAME_CHECK_COST) + rows * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        indexes = table.indexes
+        names = table.names
+        search = self.regex.search
+        survivors = [
+            name_id
+            for name_id in sorted(_requirement_name_ids(indexes, self.requirement))
+            if search(names.get(name_id))
+        ]
+        return table.records_at(indexes.entries_for_names(survivors))
+
+    def describe(self) -> str:
+        return f"regex-index({self.requirement!r})"
+
+
+class RegexNameScan(AccessPath):
+    """
+    Run the regex once per unique name (no records are built for misses).
+
+    Fallback when the pattern has no usable literals.
+    """
+
+    kind = "regex-scan"
+    covers = frozenset({REGEX})
+
+    def __init__(self, regex: re.Pattern):
+        self.regex = regex
+
+    def estimate(self, table: CompactFileTable) -> float:
+        unique = len(table.names)
+        rows = len(table) * REGEX_SELECTIVITY
+        return unique * NAME_SCAN_COST + rows * RANDOM_ACCESS_COST
+
+    def candidates(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        search = self.regex.search
+        matched = [
+            name_id for name_id, name in enumerate(table.names.decode_all())
+            if search(name)
+        ]
+        return table.records_at(table.indexes.entries_for_names(matched))
+
+    def describe(self) -> str:
+        return "regex-scan"
+
+
+@dataclass
+class ResidualPredicate:
+    """Condition checked on each candidate record."""
+
+    condition: str
+    check: Callable[[IndexRecord], bool]
+
+
+@dataclass
+class QueryPlan:
+    """
+    Compiled native index query.
+
+    Attributes:
+        access_paths: Candidate access paths (a full scan is always included)
+        residuals: Residual predicates, tagged with the condition they check
+        cancel_event: Optional event that stops execution early
+    """
+
+    access_paths: List[AccessPath] = field(default_factory=list)
+    residuals: List[ResidualPredicate] = field(default_factory=list)
+    cancel_event: Optional[threading.Event] = None
+
+    # Check cancel_event every this many candidates
+    CANCEL_CHECK_INTERVAL = 4096
+
+    def choose(self, table: CompactFileTable) -> AccessPath:
+        """
+        Pick the cheapest access path for a table.
+
+        Args:
+            table: Shard table the plan will run against
+
+        Returns:
+            Access path with the lowest estimated cost
+        """
+        best = self.access_paths[0]
+        best_cost = best.estimate(table)
+        for path in self.access_paths[1:]:
+            cost = path.estimate(table)
+            if cost < best_cost:
+                best, best_cost = path, cost
+        return best
+
+    def explain(self, table: CompactFileTable) -> str:
+        """Describe the chosen access path and all estimates."""
+        chosen = self.choose(table)
+        estimates = ", ".join(
+            f"{p.describe()}={p.estimate(table):.0f}" for p in self.access_paths
+        )
+        residual = ", ".join(
+            r.condition for r in self.residuals if r.condition not in chosen.covers
+        )
+        return f"{chosen.describe()} [{estimates}] residual: {residual or 'none'}"
+
+    def run(self, table: CompactFileTable) -> Iterator[IndexRecord]:
+        """
+        Execute the plan against a table.
+
+        Args:
+            table: Shard table
+
+        Yields:
+            Matching records (unordered)
+        """
+        path = self.choose(table)
+        checks = [r.check for r in self.residuals if r.condition not in path.covers]
+        cancel_event = self.cancel_event
+
+        for count, record in enumerate(path.candidates(table)):
+            if cancel_event is not None and count % self.CANCEL_CHECK_INTERVAL == 0:
+                if cancel_event.is_set():
+                    return
+            if all(check(record) for check in checks):
+                yield record
+
+    def __call__(self, record: IndexRecord) -> bool:
+        """Evaluate every condition on a record (predicate compatibility)."""
+        return all(r.check(record) for r in self.residuals)
+
+
+class QueryCompiler:
+    """
+    Compiles parsed queries into native index plans.
+
+    Example:
+        >>> compiler = QueryCompiler()
+        >>> plan = compiler.compile(QueryParser().parse('report ext:pdf size:>1mb'))
+        >>> records = list(plan.run(table))
+    """
+
+    def compile(
+        self,
+        parsed: ParsedQuery,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> QueryPlan:
+        """
+        Compile a parsed query.
+
+        Args:
+            parsed: Parsed query
+            cancel_event: Optional event that stops execution early
+
+        Returns:
+            QueryPlan
+
+        Raises:
+            re.error: If the regex pattern is invalid
+        """
+        plan = QueryPlan(access_paths=[FullScan()], cancel_event=cancel_event)
+
+        keywords = [kw.lower() for kw in parsed.keywords if kw]
+        if keywords:
+            plan.residuals.append(ResidualPredicate(KEYWORDS, _name_contains_all(keywords)))
+            if all(len(kw) >= MIN_TRIGRAM_KEYWORD for kw in keywords):
+                plan.access_paths.append(TrigramLookup(keywords))
+
+        if parsed.extensions:
+            extensions = sorted({ext.lower().lstrip(".") for ext in parsed.extensions})
+            plan.residuals.append(ResidualPredicate(EXTENSIONS, _has_extension(set(extensions))))
+            plan.access_paths.append(ExtensionLookup(extensions))
+
+        if parsed.size_filters:
+            size_filter = SizeFilterImpl(parsed.size_filters)
+            plan.residuals.append(ResidualPredicate(SIZE, size_filter.matches))
+            low, high = size_range(parsed.size_filters)
+            plan.access_paths.append(SizeRangeLookup(low, high))
+
+        if parsed.date_filters:
+            date_filter = DateFilterImpl(parsed.date_filters)
+            plan.residuals.append(ResidualPredicate(DATES, date_filter.matches))
+            for name, time_field in DATE_FIELDS.items():
+                filters = [f for f in parsed.date_filters if f.field == name]
+                if filters:
+                    low, high = time_range(filters)
+                    plan.access_paths.append(TimeRangeLookup(time_field, low, high))
+
+        if parsed.exclude_patterns:
+            excludes = [p.lower() for p in parsed.exclude_patterns]
+            plan.residuals.append(
+                ResidualPredicate("exclude", lambda r: not any(ex in r.name.lower() for ex in excludes))
+            )
+
+        if parsed.regex_pattern:
+            regex = re.compile(parsed.regex_pattern, re.IGNORECASE)
+            plan.residuals.append(
+                ResidualPredicate(REGEX, lambda r: regex.search(r.name) is not None)
+            )
+            requirement = extract_requirement(parsed.regex_pattern, re.IGNORECASE)
+            if requirement is not None:
+                plan.access_paths.append(RegexLiteralLookup(regex, requirement))
+            plan.access_paths.append(RegexNameScan(regex))
+
+        if parsed.path_filters:
+            fragments = [_normalize_path(p.path) for p in parsed.path_filters]
+            plan.residuals.append(
+                ResidualPredicate(
+                    "path",
+                    lambda r: any(f in _normalize_path(r.path) for f in fragments),
+                )
+            )
+
+        # Content reads file data, so it always runs last
+        if parsed.content_keywords:
+            plan.residuals.append(
+                ResidualPredicate("content", ContentFilter(parsed.content_keywords).matches)
+            )
+
+        return plan
+
+
+def _name_contains_all(keywords: List[str]) -> Callable[[IndexRecord], bool]:
+    def check(record: IndexRecord) -> bool:
+        name = record.name.lower()
+        return all(kw in name for kw in keywords)
+    return check
+
+
+def _has_extension(extensions: set) -> Callable[[IndexRecord], bool]:
+    def check(record: IndexRecord) -> bool:
+        return not record.is_dir and record.extension.lower() in extensions
+    return check
+
+
+def _normalize_path(path: str) -> str:
+    """Lowercase a path and use the native separator (path:a/b == path:a\\b)."""
+    return path.lower().replace("\\", os.sep).replace("/", os.sep)
+
+
+def size_range(size_filters) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Inclusive file size range satisfying all size filters.
+
+    Uses the same comparisons as SizeFilterImpl (including its 1% tolerance
+    for equality).
+
+    Returns:
+        (low, high), None meaning unbounded
+    """
+    low: Optional[int] = None
+    high: Optional[int] = None
+
+    def raise_low(value):
+        nonlocal low
+        low = value if low is None else max(low, value)
+
+    def lower_high(value):
+        nonlocal high
+        high = value if high is None else min(high, value)
+
+    for spec in size_filters:
+        if spec.operator == SizeOperator.GREATER:
+            raise_low(spec.value + 1)
+        elif spec.operator == SizeOperator.GREATER_EQUAL:
+            raise_low(spec.value)
+        elif spec.operator == SizeOperator.LESS:
+            lower_high(spec.value - 1)
+        elif spec.operator == SizeOperator.LESS_EQUAL:
+            lower_high(spec.value)
+        elif spec.operator == SizeOperator.EQUAL:
+            tolerance = max(spec.value * 0.01, 1)
+            raise_low(math.ceil(spec.value - tolerance))
+            lower_high(math.floor(spec.value + tolerance))
+
+    return low, high
+
+
+def _preset_range(preset: DatePreset, now: datetime) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Half-open datetime range of a date preset (matches DateFilterImpl)."""
+    today = datetime(now.year, now.month, now.day)
+    week_start = today - timedelta(days=today.weekday())
+    month_start = datetime(today.year, today.month, 1)
+    last_month_start = (
+        datetime(today.year - 1, 12, 1) if today.month == 1
+        else datetime(today.year, today.month - 1, 1)
+    )
+    year_start = datetime(today.year, 1, 1)
+
+    return {
+        DatePreset.TODAY: (today, today + timedelta(days=1)),
+        DatePreset.YESTERDAY: (today - timedelta(days=1), today),
+        DatePreset.THIS_WEEK: (week_start, None),
+        DatePreset.LAST_WEEK: (week_start - timedelta(days=7), week_start),
+        DatePreset.THIS_MONTH: (month_start, None),
+        DatePreset.LAST_MONTH: (last_month_start, month_start),
+        DatePreset.THIS_YEAR: (year_start, None),
+        DatePreset.LAST_YEAR: (datetime(today.year - 1, 1, 1), year_start),
+    }.get(preset, (None, None))
+
+
+def _date_filter_range(
+    spec: DateFilter, now: datetime
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Datetime range covering one date filter."""
+    if spec.preset:
+        return _preset_range(spec.preset, now)
+
+    target = spec.date
+    if target is None and spec.year and spec.day:
+        target = datetime(spec.year, spec.month, spec.day)
+
+    if target is not None:
+        op = spec.operator
+        if op in (SizeOperator.GREATER, SizeOperator.GREATER_EQUAL):
+            return target, None
+        if op in (SizeOperator.LESS, SizeOperator.LESS_EQUAL):
+            return None, target
+        return target, target + timedelta(days=1)
+
+    if spec.year and spec.month:
+        start = datetime(spec.year, spec.month, 1)
+        end = datetime(spec.year + (spec.month == 12), spec.month % 12 + 1, 1)
+        return start, end
+
+    if spec.year:
+        return datetime(spec.year, 1, 1), datetime(spec.year + 1, 1, 1)
+
+    return None, None
+
+
+def time_range(date_filters: List[DateFilter], now: Optional[datetime] = None) -> TimeRange:
+    """
+    Inclusive Unix timestamp range covering all date filters on one field.
+
+    The range is a superset (padded by one second at each end to absorb
+    FILETIME rounding); DateFilterImpl remains the exact residual check.
+
+    Returns:
+        (low, high), None meaning unbounded
+    """
+    now = now or datetime.now()
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    for spec in date_filters:
+        try:
+            start, end = _date_filter_range(spec, now)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        if start is not None:
+            value = start.timestamp() - 1
+            low = value if low is None else max(low, value)
+        if end is not None:
+            value = end.timestamp() + 1
+            high = value if high is None else min(high, value)
+
+    return low, high
@@ -7,6 +7,7 @@ Supports:
 - File type filters (ext:pdf, type:image)
 - Size filters (size:>10mb, size:<1gb)
 - Date filters (modified:today, modified:thisweek, created:2024)
+  with Everything aliases (dm:today, dc:2024, da:lastweek)
 - Path filters (path:documents, folder:downloads)
 - Content search (content:keyword)
 """
@@ -136,6 +137,19 @@ class QueryParser:
         "font": ["ttf", "otf", "woff", "woff2"],
     }
 
+    # Everything date field aliases
+    DATE_FIELD_ALIASES = {
+        "modified": "modified",
+        "dm": "modified",
+        "datemodified": "modified",
+        "created": "created",
+        "dc": "created",
+        "datecreated": "created",
+        "accessed": "accessed",
+        "da": "accessed",
+        "dateaccessed": "accessed",
+    }
+
     # Size unit multipliers (to bytes)
     SIZE_UNITS = {
         "b": 1,
@@ -217,7 +231,10 @@ class QueryParser:
     def _process_filter(self, parsed: ParsedQuery, filter_type: str, value: str):
         """Process individual filter and add to parsed query."""
         if filter_type in ("ext", "extension"):
-            parsed.extensions.add(value.lstrip(".").lower())
+            # Everything accepts several extensions separated by ;
+            for ext in value.split(";"):
+                if ext.strip():
+                    parsed.extensions.add(ext.strip().lstrip(".").lower())
 
         elif filter_type == "type":
             value_lower = value.lower()
@@ -233,8 +250,10 @@ class QueryParser:
             if size_filter:
                 parsed.size_filters.append(size_filter)
 
-        elif filter_type in ("modified", "created", "accessed"):
-            date_filter = self._parse_date_filter(filter_type, value)
+        elif filter_type in self.DATE_FIELD_ALIASES:
+            date_filter = self._parse_date_filter(
+                self.DATE_FIELD_ALIASES[filter_type], value
+            )
             if date_filter:
                 parsed.date_filters.append(date_filter)
 
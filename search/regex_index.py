@@ -0,0 +1,277 @@
+"""
+Literal-factor extraction for indexed regex search.
+
+A regex like ``(foo|bar)_v\\d+\\.log`` can only match names that contain
+"foo_v" or "bar_v", and also ".log". extract_requirement() walks the parsed
+pattern and builds that requirement as an AND/OR tree of lowercase literals:
+
+- Adjacent literals and small character classes are expanded into exact
+  string sets (``ab[cd]`` -> {"abc", "abd"}) up to MAX_EXACT_STRINGS
+- Alternations become OR nodes, concatenations AND nodes
+- Anything unbounded (``.*``, ``\\d+``, negated classes, backreferences)
+  contributes no requirement
+
+The requirement is evaluated against the trigram postings of the native
+index (or checked with plain substring tests), and the compiled regex only
+runs on the survivors.
+
+Names are matched by their lower() form, so the few characters whose
+case-insensitive regex match differs from lower() (e.g. U+017F, U+212A) can
+be missed by the prefilter.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple, Union
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+# Requirement tree: a literal string, ("and", parts), ("or", parts), or None
+# for "no requirement" (anything may match)
+Requirement = Union[None, str, Tuple[str, tuple]]
+
+# Shortest literal worth requiring (the trigram index needs 3 characters)
+MIN_LITERAL_LENGTH = 3
+
+# Limits for exact string set expansion
+MAX_EXACT_STRINGS = 16
+MAX_CLASS_CHARS = 8
+
+_REPEATS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+}
+
+
+@dataclass(frozen=True)
+class _Info:
+    """Analysis of a subpattern: exact string set, or a requirement."""
+
+    exact: Optional[FrozenSet[str]] = None
+    match: Requirement = None
+
+    def requirement(self) -> Requirement:
+        """Requirement implied by this subpattern."""
+        if self.exact is None:
+            return self.match
+        return _or(tuple(self.exact))
+
+
+_ANY = _Info()
+_EMPTY = _Info(exact=frozenset({""}))
+
+
+def _and(parts) -> Requirement:
+    flat = []
+    for part in parts:
+        if part is None:
+            continue
+        if isinstance(part, tuple) and part[0] == "and":
+            flat.extend(part[1])
+        elif part not in flat:
+            flat.append(part)
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else ("and", tuple(flat))
+
+
+def _or(parts) -> Requirement:
+    flat = []
+    for part in parts:
+        if part is None or (isinstance(part, str) and len(part) < MIN_LITERAL_LENGTH):
+            # One unconstrained alternative makes the whole OR unconstrained
+            return None
+        if isinstance(part, tuple) and part[0] == "or":
+            flat.extend(part[1])
+        elif part not in flat:
+            flat.append(part)
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else ("or", tuple(flat))
+
+
+def _class_chars(items) -> Optional[FrozenSet[str]]:
+    """Characters of a small, non-negated character class."""
+    chars = set()
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            chars.add(chr(av).lower())
+        elif op == sre_constants.RANGE and av[1] - av[0] < MAX_CLASS_CHARS:
+            chars.update(chr(c).lower() for c in range(av[0], av[1] + 1))
+        else:
+            return None
+        if len(chars) > MAX_CLASS_CHARS:
+            return None
+    return frozenset(chars)
+
+
+def _analyze_sequence(items) -> _Info:
+    """Concatenate nodes, keeping runs of exact strings together."""
+    requirements = []
+    run = _EMPTY
+    flushed = False
+
+    for op, av in items:
+        node = _analyze_node(op, av)
+        if node.exact is not None:
+            if len(run.exact) * len(node.exact) <= MAX_EXACT_STRINGS:
+                run = _Info(exact=frozenset(a + b for a in run.exact for b in node.exact))
+            else:
+                requirements.append(run.requirement())
+                run, flushed = node, True
+        else:
+            requirements.extend((run.requirement(), node.match))
+            run, flushed = _EMPTY, True
+
+    if not flushed:
+        return run
+    requirements.append(run.requirement())
+    return _Info(match=_and(requirements))
+
+
+def _analyze_node(op, av) -> _Info:
+    if op == sre_constants.LITERAL:
+        return _Info(exact=frozenset({chr(av).lower()}))
+
+    if op == sre_constants.IN:
+        chars = _class_chars(av)
+        return _ANY if chars is None else _Info(exact=chars)
+
+    if op == sre_constants.AT:
+        return _EMPTY  # Anchors are zero-width
+
+    if op == sre_constants.SUBPATTERN:
+        return _analyze_sequence(av[-1])
+
+    if op == getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _analyze_sequence(av)
+
+    if op == sre_constants.BRANCH:
+        branches = [_analyze_sequence(b) for b in av[1]]
+        if all(b.exact is not None for b in branches):
+            union = frozenset().union(*(b.exact for b in branches))
+            if len(union) <= MAX_EXACT_STRINGS:
+                return _Info(exact=union)
+        return _Info(match=_or(tuple(b.requirement() for b in branches)))
+
+    if op in _REPEATS:
+        low, high, body = av
+        if low == 0:
+            return _ANY
+        inner = _analyze_sequence(body)
+        if high == 1:
+            return inner
+        # Repeated at least once: the body's requirement still holds
+        return _Info(match=inner.requirement())
+
+    return _ANY
+
+
+def extract_requirement(pattern: str, flags: int = 0) -> Requirement:
+    """
+    Extract the literal requirement of a regex.
+
+    Args:
+        pattern: Regular expression
+        flags: re flags the pattern is compiled with
+
+    Returns:
+        Requirement tree of lowercase literals, or None if the pattern
+        constrains no literal of at least MIN_LITERAL_LENGTH characters
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    if flags & re.VERBOSE:
+        return None  # Whitespace handling differs; do not second-guess it
+    parsed = sre_parse.parse(pattern, flags)
+    return _analyze_sequence(list(parsed)).requirement()
+
+
+def requirement_matches(requirement: Requirement, text: str) -> bool:
+    """
+    Check a requirement with substring tests.
+
+    Args:
+        requirement: Requirement tree from extract_requirement()
+        text: Lowercase text
+
+    Returns:
+        False if text cannot match the regex the requirement came from
+    """
+    if requirement is None:
+        return True
+    if isinstance(requirement, str):
+        return requirement in text
+    kind, parts = requirement
+    if kind == "and":
+        return all(requirement_matches(p, text) for p in parts)
+    return any(requirement_matches(p, text) for p in parts)
+
+
+def requirement_literals(requirement: Requirement) -> list:
+    """All literals mentioned by a requirement (for display and debugging)."""
+    if requirement is None:
+        return []
+    if isinstance(requirement, str):
+        return [requirement]
+    return [lit for part in requirement[1] for lit in requirement_literals(part)]
+
+
+class NameRegex:
+    """
+    Case-insensitive filename regex with a literal prefilter.
+
+    Example:
+        >>> regex = NameRegex(r'report_\\d{4}\\.pdf')
+        >>> regex.search('Report_2024.PDF')
+        True
+    """
+
+    def __init__(self, pattern: str, flags: int = re.IGNORECASE):
+        """
+        Compile a pattern.
+
+        Args:
+            pattern: Regular expression
+            flags: re flags (case-insensitive by default)
+
+        Raises:
+            re.error: If the pattern is invalid
+        """
+        self.pattern = pattern
+        self.regex = re.compile(pattern, flags)
+        self.requirement = extract_requirement(pattern, flags)
+
+    def search(self, name: str) -> bool:
+        """Check whether the regex matches anywhere in name."""
+        if self.requirement is not None and not requirement_matches(
+            self.requirement, name.lower()
+        ):
+            return False
+        return self.regex.search(name) is not None
+
+
+@lru_cache(maxsize=256)
+def compile_name_regex(pattern: str, flags: int = re.IGNORECASE) -> NameRegex:
+    """
+    Get a cached NameRegex.
+
+    Args:
+        pattern: Regular expression
+        flags: re flags
+
+    Returns:
+        NameRegex
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    return NameRegex(pattern, flags)
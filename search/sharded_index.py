@@ -0,0 +1,613 @@
+"""
+Native filename index sharded per mount point.
+
+Each mounted volume (local disk, NFS share, external drive) gets its own
+IndexShard, so a slow, unmounted or rebuilding volume only affects its own
+results. ShardedIndex queries all online shards in parallel and merges their
+sorted results with a streaming k-way merge. Every shard has its own query
+worker, separate from the build pool, and a shard whose previous query is
+still running (a hung network mount) is not queried again until it
+returns, so a stuck volume never delays the others.
+"""
+
+import heapq
+import logging
+import os
+import stat as stat_module
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+# Add parent directory to path for core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.threading import ManagedThreadPoolExecutor, create_io_executor
+
+from .compact_index import (
+    ROOT_DIR_ID,
+    CompactFileTable,
+    CompactFileTableBuilder,
+    IndexRecord,
+    empty_table,
+)
+from .query_compiler import QueryPlan
+
+logger = logging.getLogger(__name__)
+
+# A record predicate or a compiled plan (see search.query_compiler)
+QuerySpec = Union[Callable[[IndexRecord], bool], QueryPlan]
+
+# Pseudo filesystems never worth indexing when reading /proc/mounts
+PSEUDO_FILESYSTEMS = {
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "cgroup", "cgroup2",
+    "pstore", "securityfs", "debugfs", "tracefs", "configfs", "fusectl",
+    "mqueue", "hugetlbfs", "autofs", "binfmt_misc", "overlay", "squashfs",
+    "bpf", "nsfs", "ramfs", "rpc_pipefs", "selinuxfs",
+}
+
+
+# Sort keys for the sort_by values accepted by SearchEngine.search()
+SORT_KEYS: Dict[str, Callable[[IndexRecord], object]] = {
+    "name": lambda r: r.name.lower(),
+    "path": lambda r: r.path.lower(),
+    "size": lambda r: r.size,
+    "modified": lambda r: r.mtime,
+    "created": lambda r: r.ctime,
+    "accessed": lambda r: r.atime,
+}
+
+
+class ShardState(Enum):
+    """Lifecycle state of an index shard."""
+
+    OFFLINE = "offline"      # Never built, or volume not mounted
+    BUILDING = "building"    # First build in progress (no data yet)
+    ONLINE = "online"        # Queryable (possibly rebuilding in background)
+    ERROR = "error"          # Last build failed and no data is available
+
+
+class IndexShard:
+    """
+    In-memory filename index for a single mount point.
+
+    Entries are kept in a CompactFileTable (directory table plus front-coded
+    names), so full paths are only materialized for records that are read.
+    Rebuilds happen off to the side and are swapped in atomically, so queries
+    keep being answered from the previous snapshot while a rebuild runs.
+    """
+
+    def __init__(self, mount_point: str, excluded_paths: Optional[List[str]] = None):
+        """
+        Initialize index shard.
+
+        Args:
+            mount_point: Root directory of the volume
+            excluded_paths: Sub-paths to skip (typically other shards' mount points)
+        """
+        self.mount_point = os.path.abspath(mount_point)
+        self.excluded_paths = set(excluded_paths or [])
+        self.state = ShardState.OFFLINE
+        self.last_built: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._table: CompactFileTable = empty_table(self.mount_point)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def entry_count(self) -> int:
+        """Number of indexed entries."""
+        return len(self._table)
+
+    @property
+    def memory_usage(self) -> int:
+        """Approximate bytes used by the shard's table."""
+        return self._table.nbytes
+
+    @property
+    def is_queryable(self) -> bool:
+        """Check if the shard has data to answer queries."""
+        return self.state == ShardState.ONLINE
+
+    def is_mounted(self) -> bool:
+        """Check that the mount point is still reachable."""
+        try:
+            return stat_module.S_ISDIR(os.stat(self.mount_point).st_mode)
+        except OSError:
+            return False
+
+    def build(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        (Re)build the shard from the filesystem.
+
+        Args:
+            cancel_event: Optional event that aborts the build when set
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return False  # A build is already running
+
+        try:
+            if self.state != ShardState.ONLINE:
+                self.state = ShardState.BUILDING
+
+            if not self.is_mounted():
+                self.state = ShardState.OFFLINE
+                return False
+
+            table = self._walk(cancel_event)
+            if table is None:
+                # Cancelled: keep serving the previous snapshot, if any
+                if self.state == ShardState.BUILDING:
+                    self.state = ShardState.OFFLINE
+                return False
+
+            self._install(table)
+            self.last_built = time.time()
+            self.last_error = None
+            self.state = ShardState.ONLINE
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to build index shard {self.mount_point}: {e}")
+            self.last_error = str(e)
+            if self.state != ShardState.ONLINE:
+                self.state = ShardState.ERROR
+            return False
+
+        finally:
+            self._build_lock.release()
+
+    def _walk(self, cancel_event: Optional[threading.Event]) -> Optional[CompactFileTable]:
+        """Walk the volume without crossing into other filesystems."""
+        builder = CompactFileTableBuilder(self.mount_point)
+        root_dev = os.stat(self.mount_point).st_dev
+        dirs_to_process = [(self.mount_point, ROOT_DIR_ID)]
+
+        while dirs_to_process:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+
+            current_dir, dir_id = dirs_to_process.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+
+                        child_id = builder.add_stat(dir_id, entry.name, st)
+
+                        if (child_id >= 0 and st.st_dev == root_dev
+                                and entry.path not in self.excluded_paths):
+                            dirs_to_process.append((entry.path, child_id))
+
+            except OSError as e:
+                logger.debug(f"Cannot index {current_dir}: {e}")
+
+        return builder.build()
+
+    def _install(self, table: CompactFileTable) -> None:
+        """Swap in a freshly built snapshot."""
+        with self._lock:
+            self._table = table
+
+    def mark_offline(self) -> None:
+        """Take the shard offline and drop its data."""
+        with self._lock:
+            self._table = empty_table(self.mount_point)
+        self.state = ShardState.OFFLINE
+
+    def query(
+        self,
+        predicate: QuerySpec,
+        sort_by: str = "name",
+        ascending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[IndexRecord]:
+        """
+        Query the shard.
+
+        Args:
+            predicate: Record predicate, or a QueryPlan to use secondary indexes
+            sort_by: Sort field (name, path, size, modified, created, accessed)
+            ascending: Sort in ascending order
+            limit: Maximum number of records to return
+
+        Returns:
+            Matching records, sorted by sort_by
+        """
+        with self._lock:
+            table = self._table
+
+        if isinstance(predicate, QueryPlan):
+            matches = list(predicate.run(table))
+        else:
+            matches = [r for r in table.iter_records() if predicate(r)]
+        key = SORT_KEYS.get(sort_by, SORT_KEYS["name"])
+
+        if limit is not None and limit < len(matches):
+            select = heapq.nsmallest if ascending else heapq.nlargest
+            return select(limit, matches, key=key)
+
+        matches.sort(key=key, reverse=not ascending)
+        return matches
+
+    def __repr__(self) -> str:
+        return (
+            f"IndexShard({self.mount_point}, state={self.state.value}, "
+            f"entries={self.entry_count})"
+        )
+
+
+@dataclass
+class ShardQueryReport:
+    """Outcome of the last fan-out query."""
+
+    answered: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def is_complete(self) -> bool:
+        """True if every shard contributed results."""
+        return not (self.timed_out or self.failed or self.skipped)
+
+
+def discover_mount_points() -> List[str]:
+    """
+    Discover mounted volumes worth indexing.
+
+    Returns:
+        List of mount point paths
+    """
+    try:
+        import psutil
+        mount_points = [p.mountpoint for p in psutil.disk_partitions(all=False)]
+        if mount_points:
+            return sorted(set(mount_points))
+    except Exception:
+        pass
+
+    mount_points = []
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] not in PSEUDO_FILESYSTEMS:
+                    # /proc/mounts escapes spaces as \040
+                    mount_points.append(parts[1].replace("\\040", " "))
+    except OSError:
+        pass
+
+    return sorted(set(mount_points)) or [os.path.abspath(os.sep)]
+
+
+class ShardedIndex:
+    """
+    Collection of per-mount-point index shards with parallel query fan-out.
+
+    Example:
+        >>> index = ShardedIndex(['/', '/mnt/nas'])
+        >>> index.build_all()
+        >>> records = index.search(lambda r: 'report' in r.name.lower(), max_results=100)
+    """
+
+    DEFAULT_SHARD_TIMEOUT = 5.0  # Seconds a single shard may take per query
+
+    def __init__(
+        self,
+        mount_points: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        shard_timeout: float = DEFAULT_SHARD_TIMEOUT,
+    ):
+        """
+        Initialize sharded index.
+
+        Args:
+            mount_points: Volumes to index (None = discover mounted volumes)
+            max_workers: Maximum worker threads for builds (None =
+                auto-detect); queries get one worker per shard
+            shard_timeout: Seconds to wait for each shard before skipping it
+        """
+        self.shard_timeout = shard_timeout
+        self.last_report = ShardQueryReport()
+        self._shards: Dict[str, IndexShard] = {}
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._build_executor = create_io_executor(
+            max_workers=max_workers,
+            thread_name_prefix="IndexShardBuild"
+        )
+        # One query worker per shard, and its running query (if any)
+        self._query_executors: Dict[str, ManagedThreadPoolExecutor] = {}
+        self._in_flight: Dict[str, Future] = {}
+
+        for mount_point in mount_points or discover_mount_points():
+            self.add_shard(mount_point)
+
+    @property
+    def shards(self) -> List[IndexShard]:
+        """All shards, ordered by mount point."""
+        with self._lock:
+            return [self._shards[k] for k in sorted(self._shards)]
+
+    @property
+    def has_online_shards(self) -> bool:
+        """Check if at least one shard can answer queries."""
+        return any(shard.is_queryable for shard in self.shards)
+
+    @property
+    def entry_count(self) -> int:
+        """Total number of indexed entries across shards."""
+        return sum(shard.entry_count for shard in self.shards)
+
+    def add_shard(self, mount_point: str) -> IndexShard:
+        """
+        Add a shard for a mount point.
+
+        Nested mount points are excluded from their parent's walk so every
+        path belongs to exactly one shard.
+
+        Args:
+            mount_point: Root directory of the volume
+
+        Returns:
+            The new (or existing) shard
+        """
+        mount_point = os.path.abspath(mount_point)
+        with self._lock:
+            if mount_point in self._shards:
+                return self._shards[mount_point]
+
+            shard = IndexShard(mount_point)
+            self._shards[mount_point] = shard
+            self._query_executors[mount_point] = create_io_executor(
+                max_workers=1,
+                thread_name_prefix="IndexShardQuery"
+            )
+
+            for other_mount, other in self._shards.items():
+                if other_mount == mount_point:
+                    continue
+                if self._is_under(mount_point, other_mount):
+                    other.excluded_paths.add(mount_point)
+                elif self._is_under(other_mount, mount_point):
+                    shard.excluded_paths.add(other_mount)
+
+            return shard
+
+    def remove_shard(self, mount_point: str) -> bool:
+        """
+        Remove a shard (e.g. when a volume is unmounted for good).
+
+        Args:
+            mount_point: Root directory of the volume
+
+        Returns:
+            True if a shard was removed
+        """
+        mount_point = os.path.abspath(mount_point)
+        with self._lock:
+            shard = self._shards.pop(mount_point, None)
+            if shard is None:
+                return False
+            for other in self._shards.values():
+                other.excluded_paths.discard(mount_point)
+            executor = self._query_executors.pop(mount_point)
+            self._in_flight.pop(mount_point, None)
+        executor.shutdown(wait=False)
+        shard.mark_offline()
+        return True
+
+    def get_shard(self, mount_point: str) -> Optional[IndexShard]:
+        """Get the shard for an exact mount point."""
+        with self._lock:
+            return self._shards.get(os.path.abspath(mount_point))
+
+    def shard_for_path(self, path: str) -> Optional[IndexShard]:
+        """
+        Find the shard responsible for a path (longest matching mount point).
+
+        Args:
+            path: Any path
+
+        Returns:
+            The owning shard, or None
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            candidates = [m for m in self._shards if self._is_under(path, m)]
+            if not candidates:
+                return None
+            return self._shards[max(candidates, key=len)]
+
+    @staticmethod
+    def _is_under(path: str, root: str) -> bool:
+        """Check if path equals root or lies below it."""
+        if path == root:
+            return True
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        return path.startswith(prefix)
+
+    def build_all(self, wait: bool = True) -> None:
+        """
+        Build every shard in parallel.
+
+        Args:
+            wait: Block until all builds finish
+        """
+        self._cancel_event.clear()
+        futures = [
+            self._build_executor.submit(shard.build, self._cancel_event)
+            for shard in self.shards
+        ]
+        if wait:
+            for future in futures:
+                future.result()
+
+    def rebuild_shard(self, mount_point: str, wait: bool = False) -> bool:
+        """
+        Rebuild a single shard without blocking queries on the others.
+
+        Args:
+            mount_point: Root directory of the volume
+            wait: Block until the rebuild finishes
+
+        Returns:
+            True if the rebuild was started (or succeeded, when wait=True)
+        """
+        shard = self.get_shard(mount_point)
+        if shard is None:
+            return False
+
+        future = self._build_executor.submit(shard.build, self._cancel_event)
+        return future.result() if wait else True
+
+    def iter_search(
+        self,
+        predicate: QuerySpec,
+        sort_by: str = "name",
+        ascending: bool = True,
+        max_results: Optional[int] = None,
+    ) -> Iterator[IndexRecord]:
+        """
+        Query all online shards in parallel and stream merged results.
+
+        Shards that fail or exceed shard_timeout are skipped and reported in
+        last_report instead of delaying the whole query. A shard whose query
+        from an earlier call is still running is reported as timed out
+        without being queried again.
+
+        Args:
+            predicate: Record predicate, or a QueryPlan to use secondary indexes
+            sort_by: Sort field (name, path, size, modified, created, accessed)
+            ascending: Sort in ascending order
+            max_results: Maximum number of results per shard and overall
+
+        Yields:
+            Matching records in global sort order
+        """
+        report = ShardQueryReport()
+        pending = {}
+
+        for shard in self.shards:
+            if not shard.is_queryable:
+                report.skipped.append(shard.mount_point)
+                continue
+
+            with self._lock:
+                executor = self._query_executors.get(shard.mount_point)
+                if executor is None:  # Removed meanwhile
+                    report.skipped.append(shard.mount_point)
+                    continue
+                previous = self._in_flight.get(shard.mount_point)
+                if previous is not None and not previous.done():
+                    report.timed_out.append(shard.mount_point)
+                    continue
+                future = executor.submit(
+                    self._query_shard, shard, predicate, sort_by, ascending, max_results
+                )
+                self._in_flight[shard.mount_point] = future
+            future.add_done_callback(
+                lambda done, mount_point=shard.mount_point: self._query_done(mount_point, done)
+            )
+            pending[shard.mount_point] = future
+
+        deadline = time.monotonic() + self.shard_timeout
+        shard_results = []
+
+        for mount_point, future in pending.items():
+            try:
+                remaining = max(0.0, deadline - time.monotonic())
+                records = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                report.timed_out.append(mount_point)
+                continue
+            except Exception as e:
+                logger.warning(f"Index shard {mount_point} query failed: {e}")
+                report.failed.append(mount_point)
+                continue
+
+            if records is None:
+                report.skipped.append(mount_point)
+            else:
+                report.answered.append(mount_point)
+                shard_results.append(records)
+
+        self.last_report = report
+
+        key = SORT_KEYS.get(sort_by, SORT_KEYS["name"])
+        merged = heapq.merge(*shard_results, key=key, reverse=not ascending)
+        return islice(merged, max_results) if max_results is not None else merged
+
+    def search(
+        self,
+        predicate: QuerySpec,
+        sort_by: str = "name",
+        ascending: bool = True,
+        max_results: Optional[int] = None,
+    ) -> List[IndexRecord]:
+        """
+        Query all online shards and return merged results.
+
+        Args:
+            predicate: Record predicate, or a QueryPlan to use secondary indexes
+            sort_by: Sort field
+            ascending: Sort in ascending order
+            max_results: Maximum number of results
+
+        Returns:
+            Matching records in global sort order
+        """
+        return list(self.iter_search(predicate, sort_by, ascending, max_results))
+
+    def _query_done(self, mount_point: str, future: Future) -> None:
+        """Forget a finished query, so the shard can be queried again."""
+        with self._lock:
+            if self._in_flight.get(mount_point) is future:
+                del self._in_flight[mount_point]
+
+    @staticmethod
+    def _query_shard(
+        shard: IndexShard,
+        predicate: QuerySpec,
+        sort_by: str,
+        ascending: bool,
+        limit: Optional[int],
+    ) -> Optional[List[IndexRecord]]:
+        """Query one shard, taking it offline if its volume disappeared."""
+        if not shard.is_mounted():
+            shard.mark_offline()
+            return None
+        return shard.query(predicate, sort_by, ascending, limit)
+
+    def get_stats(self) -> dict:
+        """Get per-shard statistics."""
+        return {
+            shard.mount_point: {
+                "state": shard.state.value,
+                "entries": shard.entry_count,
+                "memory_bytes": shard.memory_usage,
+                "last_built": shard.last_built,
+                "last_error": shard.last_error,
+            }
+            for shard in self.shards
+        }
+
+    def shutdown(self) -> None:
+        """Cancel running builds and release worker threads."""
+        self._cancel_event.set()
+        self._build_executor.shutdown(wait=False)
+        with self._lock:
+            executors = list(self._query_executors.values())
+        for executor in executors:
+            executor.shutdown(wait=False)
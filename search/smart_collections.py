@@ -13,6 +13,11 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+try:
+    from .regex_index import compile_name_regex
+except ImportError:  # Imported as a top-level module (ui/collection_editor.py)
+    from regex_index import compile_name_regex
+
 
 class ConditionType(Enum):
     """Types of conditions for rules."""
@@ -106,8 +111,8 @@ class Condition:
             return name.endswith(str(self.value).lower())
 
         elif self.type == ConditionType.NAME_MATCHES:
-            import re
-            return bool(re.search(str(self.value), name, re.IGNORECASE))
+            # Cached compile; names lacking the pattern's literals skip the regex
+            return compile_name_regex(str(self.value)).search(name)
 
         # Extension conditions
         elif self.type == ConditionType.EXTENSION_IS:
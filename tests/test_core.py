@@ -416,6 +416,112 @@ class TestEventBus:
         assert test_eventbus.has_handlers('event2') is True
 
 
+# ============================================================================
+# STAT CACHE TESTS
+# ============================================================================
+
+class TestStatCache:
+    """Tests for StatCache class"""
+
+    def test_stat_is_cached(self, temp_dir):
+        """Test repeated stats are served from the cache"""
+        from core.stat_cache import StatCache
+
+        file_path = os.path.join(temp_dir, "stat.txt")
+        with open(file_path, 'w') as f:
+            f.write("data")
+
+        cache = StatCache(ttl=60)
+        first = cache.stat(file_path)
+        second = cache.stat(file_path)
+
+        assert first.st_size == 4
+        assert second is first
+        assert cache.stats.syscalls == 1
+        assert cache.stats.hits == 1
+
+    def test_missing_file_raises(self, temp_dir):
+        """Test missing files raise OSError and try_stat returns None"""
+        from core.stat_cache import StatCache
+
+        cache = StatCache(ttl=60)
+        missing = os.path.join(temp_dir, "missing.txt")
+
+        with pytest.raises(OSError):
+            cache.stat(missing)
+        assert cache.try_stat(missing) is None
+
+    def test_invalidate_and_generation(self, temp_dir):
+        """Test explicit invalidation and generation bumps"""
+        from core.stat_cache import StatCache
+
+        file_path = os.path.join(temp_dir, "change.txt")
+        with open(file_path, 'w') as f:
+            f.write("a")
+
+        cache = StatCache(ttl=60)
+        assert cache.stat(file_path).st_size == 1
+
+        with open(file_path, 'w') as f:
+            f.write("abc")
+        assert cache.stat(file_path).st_size == 1  # Still cached
+
+        cache.invalidate(file_path)
+        assert cache.stat(file_path).st_size == 3
+
+        with open(file_path, 'w') as f:
+            f.write("abcdef")
+        cache.bump_generation()
+        assert cache.stat(file_path).st_size == 6
+
+    def test_invalidate_tree(self, temp_dir):
+        """Test invalidating a whole directory tree"""
+        from core.stat_cache import StatCache
+
+        file_path = os.path.join(temp_dir, "tree.txt")
+        with open(file_path, 'w') as f:
+            f.write("x")
+
+        cache = StatCache(ttl=60)
+        cache.stat(file_path)
+        cache.invalidate_tree(temp_dir)
+        assert len(cache) == 0
+
+    def test_stat_many_uses_scandir(self, temp_dir):
+        """Test bulk stat over one directory"""
+        from core.stat_cache import StatCache
+
+        paths = []
+        for i in range(10):
+            path = os.path.join(temp_dir, f"bulk_{i}.txt")
+            with open(path, 'w') as f:
+                f.write("x" * i)
+            paths.append(path)
+        missing = os.path.join(temp_dir, "bulk_missing.txt")
+
+        cache = StatCache(ttl=60)
+        results = cache.stat_many(paths + [missing])
+
+        assert cache.stats.scandir_calls == 1
+        assert results[missing] is None
+        assert [results[p].st_size for p in paths] == list(range(10))
+
+        # Second call is fully cached
+        syscalls = cache.stats.syscalls
+        cache.stat_many(paths)
+        assert cache.stats.syscalls == syscalls
+
+    def test_zero_ttl_disables_cache(self, temp_dir):
+        """Test ttl=0 always hits the filesystem"""
+        from core.stat_cache import StatCache
+
+        cache = StatCache(ttl=0)
+        cache.stat(temp_dir)
+        cache.stat(temp_dir)
+        assert cache.stats.syscalls == 2
+        assert len(cache) == 0
+
+
 # ============================================================================
 # CONFIG TESTS
 # ============================================================================
@@ -5,7 +5,9 @@ Tests for duplicates module: Scanner, Hasher, Cache, Groups
 import pytest
 import os
 import hashlib
+import random
 import time
+from pathlib import Path
 
 
 # ============================================================================
@@ -63,6 +65,80 @@ class TestFileHasher:
             assert hasattr(result1, 'quick_hash')
             assert hasattr(result2, 'quick_hash')
 
+    def test_find_identical(self, test_file_hasher, temp_dir):
+        """Test progressive comparison splits candidates on first difference"""
+        base = random.Random(0).randbytes(300 * 1024)
+        paths = []
+        for name, data in [('a.bin', base), ('b.bin', base),
+                           ('c.bin', base[:-1] + b'x'), ('d.bin', b'y' + base[1:])]:
+            path = Path(temp_dir) / name
+            path.write_bytes(data)
+            paths.append(path)
+
+        read = []
+        groups = test_file_hasher.find_identical(paths, bytes_callback=read.append)
+
+        assert len(groups) == 1
+        digest, members = groups[0]
+        assert set(members) == set(paths[:2])
+        assert digest == hashlib.md5(base).hexdigest()
+        assert sum(read) < 4 * len(base)
+
+        # Each round stays within the memory budget
+        rounds = []
+        budget = 256 * 1024
+        assert test_file_hasher.find_identical(
+            paths, max_chunk_size=budget, bytes_callback=rounds.append, memory_budget=budget
+        )
+        assert 0 < max(rounds) <= budget
+
+    def test_read_paths_match_hashlib(self, temp_dir, monkeypatch):
+        """Test readinto and mmap hashing paths give identical digests"""
+        import duplicates.hasher as hasher_module
+        from duplicates.hasher import FileHasher, HashAlgorithm
+        monkeypatch.setattr(hasher_module, "MMAP_THRESHOLD", 64 * 1024)
+        monkeypatch.setattr(hasher_module, "MMAP_WINDOW", 16 * 1024)
+
+        for size in (0, 100, 16 * 1024, 16 * 1024 + 1, 300 * 1024 + 7):
+            data = os.urandom(size)
+            path = Path(temp_dir) / f"file_{size}.bin"
+            path.write_bytes(data)
+            quick = data if size <= 16 * 1024 else data[:8192] + data[-8192:]
+
+            for use_mmap in (False, True):
+                hasher = FileHasher(HashAlgorithm.SHA256, io_block_size=4096, use_mmap=use_mmap)
+                assert hasher.compute_full_hash(path) == hashlib.sha256(data).hexdigest()
+                assert hasher.compute_quick_hash(path) == hashlib.sha256(quick).hexdigest()
+
+    def test_chunk_size_sets_full_hash_reads(self, temp_dir):
+        """Test an explicit chunk_size is the full hash read size unless io_block_size is set"""
+        from duplicates.hasher import FileHasher, DEFAULT_IO_BLOCK_SIZE
+
+        st = os.stat(temp_dir)
+        assert FileHasher(chunk_size=8192).io_block_size_for(st) == 8192
+        assert FileHasher(chunk_size=8192, io_block_size=4096).io_block_size_for(st) == 4096
+        assert FileHasher().io_block_size_for(st) >= DEFAULT_IO_BLOCK_SIZE
+        assert FileHasher().chunk_size == FileHasher.DEFAULT_CHUNK_SIZE
+
+    def test_content_defined_chunks(self, test_file_hasher, temp_dir):
+        """Test chunk boundaries survive an insertion near the start"""
+        pytest.importorskip("numpy")
+        from duplicates.hasher import ContentDefinedChunker
+
+        data = random.Random(0).randbytes(512 * 1024)
+        original = Path(temp_dir) / "original.bin"
+        shifted = Path(temp_dir) / "shifted.bin"
+        original.write_bytes(data)
+        shifted.write_bytes(data[:100] + b"inserted" + data[100:])
+
+        chunker = ContentDefinedChunker(avg_size=4096)
+        a = test_file_hasher.compute_chunks(original, chunker)
+        b = test_file_hasher.compute_chunks(shifted, chunker)
+
+        assert a.total_size == len(data)
+        assert all(size <= chunker.max_size for size in a.sizes)
+        assert len(set(a.digests) & set(b.digests)) >= a.chunk_count - 2
+
 
 # ============================================================================
 # HASH CACHE TESTS
@@ -121,6 +197,68 @@ class TestHashCache:
             result = test_hash_cache.clear()
             assert result is True or result is None  # clear() returns bool
 
+    def test_cache_get_set_many(self, test_hash_cache, sample_files):
+        """Test batched writes keep quick and full hashes of the same version"""
+        items = [(path, os.stat(path)) for path in sample_files[:3]]
+
+        test_hash_cache.set_many([(p, st, f"quick-{i}", None) for i, (p, st) in enumerate(items)])
+        test_hash_cache.set_many([(p, st, None, f"full-{i}") for i, (p, st) in enumerate(items)])
+
+        cached = test_hash_cache.get_many(items)
+        assert len(cached) == len(items)
+        for i, (path, _) in enumerate(items):
+            assert cached[path]['quick_hash'] == f"quick-{i}"
+            assert cached[path]['full_hash'] == f"full-{i}"
+
+    def test_cache_signatures(self, test_hash_cache, sample_files):
+        """Test similarity signatures are cached per kind and validated by mtime"""
+        path = sample_files[0]
+        st = os.stat(path)
+
+        assert test_hash_cache.set_signatures([(path, st, b"\x01\x02")], "minhash-test") == 1
+        assert test_hash_cache.get_signatures([(path, st)], "minhash-test") == {path: b"\x01\x02"}
+        assert test_hash_cache.get_signatures([(path, st)], "phash") == {}
+
+        changed = os.stat_result((st.st_mode, st.st_ino, st.st_dev, st.st_nlink, st.st_uid,
+                                  st.st_gid, st.st_size + 1, st.st_atime, st.st_mtime, st.st_ctime))
+        assert test_hash_cache.get_signatures([(path, changed)], "minhash-test") == {}
+
+    def test_cache_write_behind_persists(self, temp_db, sample_files):
+        """Test queued writes are readable at once and committed on close"""
+        from duplicates.cache import HashCache
+
+        cache = HashCache(temp_db)
+        cache.set_hash(sample_files[0], quick_hash="q1")
+        assert cache.get_hash(sample_files[0])['quick_hash'] == "q1"
+        cache.set_hash(sample_files[1], full_hash="f2")
+        cache.close()
+
+        reopened = HashCache(temp_db)
+        assert reopened.get_stats().total_entries == 2
+        assert reopened.get_hash(sample_files[1])['full_hash'] == "f2"
+        reopened.close()
+
+    def test_cache_flush_keeps_writes_on_error(self, temp_db, sample_files):
+        """Test writes queued for a failed commit are retried by the next flush"""
+        import sqlite3
+        from duplicates.cache import HashCache
+
+        cache = HashCache(temp_db)
+        cache.set_hash(sample_files[0], quick_hash="q1")
+
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        cache._connection = locked
+        cache.flush()
+        assert cache._has_queued()
+
+        del cache._connection
+        cache.close()
+        reopened = HashCache(temp_db)
+        assert reopened.get_hash(sample_files[0])['quick_hash'] == "q1"
+        reopened.close()
+
 
 # ============================================================================
 # DUPLICATE SCANNER TESTS
@@ -193,6 +331,228 @@ class TestDuplicateScanner:
             assert stats.total_files_scanned >= 0
             assert stats.scan_duration >= 0
 
+    def test_pipelined_scan_reuses_cache(self, test_duplicate_scanner, duplicate_files):
+        """Test a rescan finds the same groups from cached hashes"""
+        scan_path = os.path.dirname(duplicate_files['original'])
+
+        first = test_duplicate_scanner.scan([scan_path])
+        hits_before = test_duplicate_scanner.cache.stats.cache_hits
+        second = test_duplicate_scanner.scan([scan_path])
+
+        assert len(first.groups) == len(second.groups) >= 1
+        assert first.groups[0].file_count == 4
+        assert test_duplicate_scanner.cache.stats.cache_hits > hits_before
+
+    def test_progressive_scan_matches_full_hash(self, temp_dir, temp_db):
+        """Test progressive comparison finds the same groups as full hashing"""
+        from duplicates.scanner import ComparisonMode, DuplicateScanner
+
+        base = random.Random(0).randbytes(2 * 1024 * 1024)
+        for name, data in [('a.bin', base), ('b.bin', base), ('c.bin', base),
+                           ('d.bin', base[:-1] + b'x'), ('e.bin', base[:-1] + b'x'),
+                           ('f.bin', base[:-1] + b'z')]:
+            (Path(temp_dir) / name).write_bytes(data)
+
+        def scan(**kwargs):
+            manager = DuplicateScanner(max_workers=2, **kwargs).scan([temp_dir])
+            return {g.hash_value: sorted(f.path.name for f in g.files) for g in manager.groups}
+
+        expected = scan(use_cache=False, comparison_mode=ComparisonMode.FULL_HASH)
+        assert sorted(expected.values()) == [['a.bin', 'b.bin', 'c.bin'], ['d.bin', 'e.bin']]
+
+        # Second progressive scan resolves the groups from cached full hashes
+        for _ in range(2):
+            assert scan(cache_path=temp_db, comparison_mode=ComparisonMode.PROGRESSIVE) == expected
+
+    def test_scan_resumes_from_checkpoint(self, temp_dir):
+        """Test a cancelled scan resumes without rehashing finished files"""
+        from duplicates.scanner import DuplicateScanner
+
+        data_dir = Path(temp_dir) / "data"
+        data_dir.mkdir()
+        for i in range(6):
+            content = os.urandom(4096)
+            for copy in range(2):
+                (data_dir / f"file_{i}_{copy}.bin").write_bytes(content)
+        checkpoint = Path(temp_dir) / "scan.ckpt"
+
+        scanner = DuplicateScanner(use_cache=False, max_workers=2)
+        hashed = []
+        compute_full_hash = scanner.hasher.compute_full_hash
+
+        def counting_full_hash(path, progress_callback=None):
+            hashed.append(path)
+            if len(hashed) == 4 and not manager_done:
+                scanner.cancel()
+            return compute_full_hash(path, progress_callback)
+
+        scanner.hasher.compute_full_hash = counting_full_hash
+
+        manager_done = False
+        scanner.scan([data_dir], checkpoint_path=checkpoint)
+        assert checkpoint.exists()
+        first_run = len(hashed)
+        assert 0 < first_run < 12
+
+        hashed.clear()
+        manager_done = True
+        manager = scanner.scan([data_dir], checkpoint_path=checkpoint)
+
+        assert len(manager.groups) == 6
+        # Hashes still in flight when the scan was cancelled are redone
+        assert 12 - first_run <= len(hashed) < 12
+        assert not checkpoint.exists()
+
+    def test_index_applies_change_sets(self, temp_dir):
+        """Test the duplicate index follows changes without rehashing everything"""
+        from duplicates.index import DuplicateIndex
+
+        data_dir = Path(temp_dir) / "data"
+        data_dir.mkdir()
+        for i in range(5):
+            content = os.urandom(20000)
+            for copy in range(2):
+                (data_dir / f"file_{i}_{copy}.bin").write_bytes(content)
+        (data_dir / "unique.bin").write_bytes(os.urandom(1000))
+
+        with DuplicateIndex(Path(temp_dir) / "index.db", max_workers=2) as index:
+            built = index.rebuild([data_dir])
+            assert built.files_added == 11
+            assert len(index.get_groups().groups) == 5
+
+            # New copy of an indexed file: only it is hashed (quick + full)
+            copy = data_dir / "file_0_2.bin"
+            copy.write_bytes((data_dir / "file_0_0.bin").read_bytes())
+            update = index.apply_changes(changed=[copy])
+            assert (update.files_added, update.files_hashed) == (1, 2)
+            assert max(g.file_count for g in index.get_groups().groups) == 3
+
+            # Deleting one copy dissolves its group; unchanged paths are skipped
+            (data_dir / "file_1_1.bin").unlink()
+            update = index.apply_changes(
+                changed=[data_dir / "file_2_0.bin"], deleted=[data_dir / "file_1_1.bin"]
+            )
+            assert (update.files_removed, update.files_modified, update.files_hashed) == (1, 0, 0)
+            assert len(index.get_groups().groups) == 4
+
+            # A modified copy leaves its group
+            (data_dir / "file_3_1.bin").write_bytes(os.urandom(20000))
+            update = index.apply_changes(changed=[data_dir])
+            assert update.files_modified == 1
+            assert len(index.get_groups().groups) == 3
+
+    def test_index_resets_hardlinks_of_changed_files(self, temp_dir):
+        """Test that hardlinks of a changed path are re-stat'ed and rehashed"""
+        from duplicates.index import DuplicateIndex
+
+        data_dir = Path(temp_dir) / "data"
+        data_dir.mkdir()
+        content = os.urandom(20000)
+        (data_dir / "a.bin").write_bytes(content)
+        os.link(data_dir / "a.bin", data_dir / "b.bin")
+        (data_dir / "c.bin").write_bytes(content)
+
+        with DuplicateIndex(Path(temp_dir) / "index.db", max_workers=2) as index:
+            index.rebuild([data_dir])
+            assert len(index.get_groups().groups) == 1
+
+            # Rewriting a.bin in place rewrites b.bin too: c.bin is now unique,
+            # and links of one inode are a hardlink set, not a group
+            with open(data_dir / "a.bin", "r+b") as f:
+                f.write(os.urandom(20000))
+            index.apply_changes(changed=[data_dir / "a.bin"])
+            manager = index.get_groups()
+            assert manager.groups == []
+            assert [sorted(p.name for p in h.paths) for h in manager.hardlink_sets] == [["a.bin", "b.bin"]]
+
+            # Deleting a.bin keeps b.bin (same content); a copy of it pairs up
+            (data_dir / "d.bin").write_bytes((data_dir / "b.bin").read_bytes())
+            (data_dir / "a.bin").unlink()
+            index.apply_changes(changed=[data_dir / "d.bin"], deleted=[data_dir / "a.bin"])
+            groups = index.get_groups().groups
+            assert [sorted(f.path.name for f in g.files) for g in groups] == [["b.bin", "d.bin"]]
+
+    def test_index_matches_scanner_on_hardlinks(self, temp_dir):
+        """Test the index reports hardlink-only inodes like the scanner does"""
+        from duplicates.index import DuplicateIndex
+        from duplicates.scanner import DuplicateScanner
+
+        data_dir = Path(temp_dir) / "data"
+        data_dir.mkdir()
+        (data_dir / "a.bin").write_bytes(b"a" * 8192)
+        os.link(data_dir / "a.bin", data_dir / "b.bin")
+        (data_dir / "c.bin").write_bytes(b"c" * 4096)
+        os.link(data_dir / "c.bin", data_dir / "d.bin")
+        (data_dir / "e.bin").write_bytes(b"c" * 4096)
+
+        def summary(manager):
+            return (
+                sorted(sorted(f.path.name for f in g.files) for g in manager.groups),
+                sorted(g.wasted_space for g in manager.groups),
+                sorted(sorted(p.name for p in h.paths) for h in manager.hardlink_sets)
+            )
+
+        scanned = DuplicateScanner(use_cache=False, max_workers=2).scan([data_dir])
+        with DuplicateIndex(Path(temp_dir) / "index.db", max_workers=2) as index:
+            update = index.rebuild([data_dir])
+            indexed = index.get_groups()
+
+        assert summary(indexed) == summary(scanned) == (
+            [["c.bin", "d.bin", "e.bin"]], [4096], [["a.bin", "b.bin"], ["c.bin", "d.bin"]]
+        )
+        # The lone hardlinked inode is never read
+        assert update.files_hashed == 2
+
+    def test_pipeline_per_device_limit(self):
+        """Test the hash pipeline caps concurrent work per device"""
+        import threading
+        from duplicates.pipeline import HashPipeline
+
+        lock = threading.Lock()
+        active = {0: 0, 1: 0}
+        peak = {0: 0, 1: 0}
+
+        def work(item):
+            device, value = item
+            with lock:
+                active[device] += 1
+                peak[device] = max(peak[device], active[device])
+            time.sleep(0.005)
+            with lock:
+                active[device] -= 1
+            return value * 2
+
+        items = [(i % 2, i) for i in range(40)]
+        pipeline = HashPipeline(max_workers=6, per_device_limit=2)
+        results = dict(pipeline.run(items, device_of=lambda item: item[0], work=work))
+
+        assert len(results) == 40
+        assert all(results[item] == item[1] * 2 for item in items)
+        assert max(peak.values()) <= 2
+
+    @pytest.mark.skipif(not hasattr(os, 'link'), reason="Hardlinks not supported")
+    def test_scan_collapses_hardlinks(self, test_duplicate_scanner, temp_dir):
+        """Test hardlinks are hashed once and do not count as wasted space"""
+        original = Path(temp_dir) / "original.bin"
+        original.write_bytes(b"h" * 4096)
+        os.link(original, Path(temp_dir) / "link.bin")
+        (Path(temp_dir) / "copy.bin").write_bytes(b"h" * 4096)
+
+        # A hardlink pair without a real copy is not a duplicate group
+        (Path(temp_dir) / "solo.bin").write_bytes(b"s" * 2048)
+        os.link(Path(temp_dir) / "solo.bin", Path(temp_dir) / "solo_link.bin")
+
+        manager = test_duplicate_scanner.scan([temp_dir, temp_dir])
+
+        assert len(manager.groups) == 1
+        group = manager.groups[0]
+        assert group.file_count == 3
+        assert group.inode_count == 2
+        assert group.wasted_space == 4096
+
+        assert len(manager.hardlink_sets) == 2
+        assert test_duplicate_scanner.stats.hardlinked_files == 2
+
 
 # ============================================================================
 # DUPLICATE GROUP TESTS
@@ -250,6 +610,27 @@ class TestDuplicateGroup:
         expected_wasted = 2 * 1024
         assert group.wasted_space == expected_wasted
 
+    def test_hardlink_accounting(self):
+        """Test hardlinked paths share storage in space and selection"""
+        from duplicates.groups import DuplicateGroup, SelectionStrategy
+
+        group = DuplicateGroup(hash_value="abc123", hash_type="full")
+        group.add_file("/a/original", 1000, 100.0, inode=(1, 10), link_count=2)
+        group.add_file("/b/link", 1000, 200.0, inode=(1, 10), link_count=2)
+        group.add_file("/c/copy", 1000, 300.0, inode=(1, 20))
+
+        assert group.wasted_space == 1000
+
+        # Keeping the oldest keeps its hardlink too
+        group.select_by_strategy(SelectionStrategy.KEEP_OLDEST)
+        assert [f.path.name for f in group.selected_for_deletion] == ["copy"]
+        assert group.recoverable_space == 1000
+
+        # Deleting only one link of an inode frees nothing
+        group.clear_selection()
+        group.manual_select("/b/link")
+        assert group.recoverable_space == 0
+
 
 # ============================================================================
 # DUPLICATE GROUP MANAGER TESTS
@@ -284,6 +665,159 @@ class TestDuplicateGroupManager:
         assert len(manager.groups) == 1
 
 
+# ============================================================================
+# SIMILARITY TESTS
+# ============================================================================
+
+class TestSimilarImages:
+    """Tests for perceptual hashing and near-duplicate clustering"""
+
+    def test_similar_pairs_matches_brute_force(self):
+        """Test multi-index pair search finds exactly the pairs within threshold"""
+        pytest.importorskip("numpy")
+        import random
+        from duplicates.similar_images import MultiIndexHash, hamming_distance, similar_pairs
+
+        rng = random.Random(7)
+        hashes = [rng.getrandbits(64) for _ in range(200)]
+        hashes += [h ^ (0b1011 << rng.randrange(60)) for h in hashes[:80]]
+
+        for threshold in (0, 4, 10):
+            expected = {
+                (i, j) for i in range(len(hashes)) for j in range(i + 1, len(hashes))
+                if hamming_distance(hashes[i], hashes[j]) <= threshold
+            }
+            assert set(map(tuple, similar_pairs(hashes, threshold).tolist())) == expected
+
+            index = MultiIndexHash(threshold)
+            for i, h in enumerate(hashes):
+                index.add(h, i)
+            assert {j for _, j in index.search(hashes[0])} == {
+                j for j, h in enumerate(hashes) if hamming_distance(hashes[0], h) <= threshold
+            }
+
+    def test_scan_similar_images(self, temp_dir):
+        """Test resized and recompressed copies are grouped together"""
+        np = pytest.importorskip("numpy")
+        Image = pytest.importorskip("PIL.Image")
+        from duplicates.scanner import DuplicateScanner
+
+        def scene(seed):
+            rng = np.random.default_rng(seed)
+            y, x = np.mgrid[0:300, 0:400]
+            pixels = np.zeros((300, 400, 3), dtype=np.uint8)
+            for _ in range(10):
+                cx, cy, radius = rng.uniform(0, 400), rng.uniform(0, 300), rng.uniform(20, 120)
+                pixels[(x - cx) ** 2 + (y - cy) ** 2 < radius ** 2] = rng.integers(0, 256, 3)
+            return Image.fromarray(pixels)
+
+        folder = Path(temp_dir)
+        original = scene(1)
+        original.save(folder / "photo.jpg", quality=95)
+        original.resize((200, 150)).save(folder / "photo_small.jpg", quality=60)
+        original.save(folder / "photo.png")
+        scene(2).save(folder / "other.jpg")
+        (folder / "broken.jpg").write_bytes(b"not an image")
+
+        scanner = DuplicateScanner(use_cache=False, max_workers=2)
+        manager = scanner.scan_similar_images([temp_dir], threshold=6)
+
+        assert len(manager.groups) == 1
+        group = manager.groups[0]
+        assert group.hash_type == "phash"
+        assert sorted(f.path.name for f in group.files) == [
+            "photo.jpg", "photo.png", "photo_small.jpg"
+        ]
+
+
+class TestSimilarText:
+    """Tests for MinHash/LSH near-duplicate text detection"""
+
+    def test_scan_similar_text(self, temp_dir, temp_db):
+        """Test edited copies are grouped and signatures are cached"""
+        pytest.importorskip("numpy")
+        import random
+        from duplicates.scanner import DuplicateScanner
+
+        rng = random.Random(3)
+        words = [f"word{i}" for i in range(2000)]
+        text = " ".join(rng.choice(words) for _ in range(2000))
+        folder = Path(temp_dir)
+        (folder / "report.txt").write_text(text)
+        (folder / "report_v2.md").write_text(text.replace(words[5], "edited", 3))
+        (folder / "run.log").write_text("started 2024-05-01 12:00\n" + text)
+        (folder / "other.txt").write_text(" ".join(rng.choice(words) for _ in range(2000)))
+
+        scanner = DuplicateScanner(cache_path=temp_db, max_workers=2)
+        manager = scanner.scan_similar_text([temp_dir], threshold=0.8)
+
+        assert len(manager.groups) == 1
+        assert manager.groups[0].hash_type == "minhash"
+        assert sorted(f.path.name for f in manager.groups[0].files) == [
+            "report.txt", "report_v2.md", "run.log"
+        ]
+        # Signatures are committed when the scan returns
+        assert not scanner.cache._has_queued()
+
+        hits_before = scanner.cache.stats.cache_hits
+        rescan = scanner.scan_similar_text([temp_dir], threshold=0.8)
+        assert len(rescan.groups) == 1
+        assert scanner.cache.stats.cache_hits - hits_before == 4
+
+
+class TestDedupeAnalyzer:
+    """Tests for block-level deduplication estimates"""
+
+    def test_analyze_shared_chunks(self, temp_dir):
+        """Test shared bytes are reported per pair and for the whole set"""
+        pytest.importorskip("numpy")
+        from duplicates.dedupe import DedupeAnalyzer
+        from duplicates.hasher import ContentDefinedChunker
+
+        folder = Path(temp_dir)
+        rng = random.Random(0)
+        base = rng.randbytes(256 * 1024)
+        (folder / "a.img").write_bytes(base)
+        (folder / "b.img").write_bytes(base[:128 * 1024] + rng.randbytes(64) + base[128 * 1024:])
+        (folder / "c.img").write_bytes(rng.randbytes(64 * 1024))
+
+        analyzer = DedupeAnalyzer(chunker=ContentDefinedChunker(avg_size=4096), max_workers=2)
+        report = analyzer.analyze(sorted(folder.iterdir()))
+
+        assert report.file_count == 3
+        assert report.total_bytes == 2 * len(base) + 64 + 64 * 1024
+        assert 0.9 * len(base) < report.reclaimable_bytes < len(base)
+
+        assert len(report.pairs) == 1
+        pair = report.pairs[0]
+        assert {pair.file_a.name, pair.file_b.name} == {"a.img", "b.img"}
+        assert pair.shared_bytes == report.reclaimable_bytes
+        assert pair.similarity > 0.9
+
+    def test_widely_shared_chunks_are_summarized(self):
+        """Test a chunk in thousands of files is not expanded into every pair"""
+        pytest.importorskip("numpy")
+        from array import array
+        from duplicates.dedupe import DedupeAnalyzer
+        from duplicates.hasher import ChunkList
+
+        # Every file holds one zero block (digest 1) and a chunk of its own;
+        # only the first two also share digest 2
+        chunk_lists = []
+        for i in range(3000):
+            digests = array('Q', [1, 1000 + i] + ([2] if i < 2 else []))
+            sizes = array('I', [4096, 500] + ([100] if i < 2 else []))
+            chunk_lists.append(ChunkList(Path(f"/data/file_{i}"), digests, sizes))
+
+        report = DedupeAnalyzer.analyze_chunks(chunk_lists, max_fanout=64)
+
+        assert report.unique_bytes == 4096 + 3000 * 500 + 100
+        assert report.widely_shared_bytes == 4096
+        assert len(report.pairs) == 1
+        assert report.pairs[0].shared_bytes == 100
+        assert {report.pairs[0].file_a.name, report.pairs[0].file_b.name} == {"file_0", "file_1"}
+
+
 # ============================================================================
 # INTEGRATION TESTS
 # ============================================================================
@@ -80,6 +80,177 @@ class TestFileCopier:
             # Check basic metadata
             assert os.path.exists(dest)
 
+    def test_kernel_copy_reports_chunk_progress(self, temp_dir, monkeypatch):
+        """Test the Linux kernel copy engine copies in chunks with progress"""
+        import operations.copier as copier_module
+        from operations.copier import FileCopier
+
+        if not FileCopier().zero_copy:
+            pytest.skip("Kernel copy engine is Linux-only")
+        monkeypatch.setattr(copier_module, "ZERO_COPY_CHUNK_SIZE", 64 * 1024)
+        monkeypatch.setattr(copier_module, "fcntl", None)  # Skip the reflink attempt
+
+        data = os.urandom(300 * 1024)
+        source = os.path.join(temp_dir, "kernel_source.bin")
+        with open(source, 'wb') as f:
+            f.write(data)
+
+        for name, content in [("kernel_dest.bin", data), ("empty_dest.bin", b"")]:
+            if not content:
+                open(source, 'wb').close()
+            dest = os.path.join(temp_dir, name)
+            progress_calls = []
+            copier = FileCopier(max_workers=1)
+            assert copier.copy_file(source, dest, progress_callback=lambda c, t: progress_calls.append(c))
+            with open(dest, 'rb') as f:
+                assert f.read() == content
+            assert progress_calls[-1] == len(content)
+            if content:
+                assert len(progress_calls) == 5
+
+    def test_verified_copy_hashes_source_inline(self, temp_dir, monkeypatch):
+        """Test verified copies hash the source while copying and re-read only the destination"""
+        import operations.copier as copier_module
+        from operations.copier import FileCopier
+
+        monkeypatch.setattr(copier_module, "PIPELINE_MIN_SIZE", 64 * 1024)
+        monkeypatch.setattr(copier_module, "PIPELINE_SLOT_SIZE", 16 * 1024)
+        monkeypatch.setattr(copier_module, "fcntl", None)  # Force a real copy
+
+        for algorithm in ('md5', 'crc32'):
+            copier = FileCopier(max_workers=1, verify_after_copy=True, verify_algorithm=algorithm)
+            monkeypatch.setattr(copier._verifier, "verify_copy", None)  # Must not be used
+            read_back = []
+            verify_hash = copier._verifier.verify_hash
+            monkeypatch.setattr(
+                copier._verifier, "verify_hash",
+                lambda path, digest, size: read_back.append(path) or verify_hash(path, digest, size)
+            )
+
+            for size in (1000, 300 * 1024 + 5):
+                data = os.urandom(size)
+                source = os.path.join(temp_dir, f"verify_source_{size}.bin")
+                dest = os.path.join(temp_dir, f"verify_dest_{algorithm}_{size}.bin")
+                with open(source, 'wb') as f:
+                    f.write(data)
+
+                assert copier.copy_file(source, dest) is True
+                with open(dest, 'rb') as f:
+                    assert f.read() == data
+            assert len(read_back) == 2
+
+        is_valid, error = verify_hash(dest, "00000000")
+        assert is_valid is False and "Hash mismatch" in error
+
+    def test_copy_directory_batches_small_files(self, test_file_copier, temp_dir):
+        """Test directory copies batch small files and keep per-file results"""
+        source_dir = os.path.join(temp_dir, "tree")
+        expected = {}
+        for sub in ("", "a", os.path.join("a", "b")):
+            os.makedirs(os.path.join(source_dir, sub), exist_ok=True)
+            for i in range(40):
+                rel = os.path.join(sub, f"small_{i}.txt")
+                expected[rel] = os.urandom(i * 10)
+        expected["large.bin"] = os.urandom(600 * 1024)
+        for rel, data in expected.items():
+            with open(os.path.join(source_dir, rel), 'wb') as f:
+                f.write(data)
+        os.utime(os.path.join(source_dir, "a", "small_3.txt"), (1000000000, 1000000000))
+
+        dest_dir = os.path.join(temp_dir, "tree_copy")
+        progress = []
+        results = test_file_copier.copy_directory(
+            source_dir, dest_dir, progress_callback=lambda *args: progress.append(args)
+        )
+
+        assert len(results) == len(expected)
+        assert all(success for success, _ in results.values())
+        for rel, data in expected.items():
+            with open(os.path.join(dest_dir, rel), 'rb') as f:
+                assert f.read() == data
+        assert os.path.getmtime(os.path.join(dest_dir, "a", "small_3.txt")) == 1000000000
+        # One report per small-file batch (one per directory here) plus the large file
+        batch_reports = [args for args in progress if os.path.isdir(args[0])]
+        assert len(batch_reports) == 3
+
+    def test_journaled_copy_resumes_from_last_good_block(self, temp_dir):
+        """Test interrupted large copies resume from the journal's verified offset"""
+        from operations.copier import FileCopier
+        from operations.journal import CopyJournal
+
+        block = 64 * 1024
+        data = os.urandom(10 * block + 123)
+        source = os.path.join(temp_dir, "journal_source.bin")
+        dest = os.path.join(temp_dir, "journal_dest.bin")
+        with open(source, 'wb') as f:
+            f.write(data)
+
+        copier = FileCopier(max_workers=1, verify_after_copy=True, zero_copy=False,
+                            journal_min_size=block)
+        copier.journal_block_size = block
+
+        def cancel_after_six_blocks(copied, total):
+            if copied >= 6 * block:
+                copier.cancel()
+
+        assert copier.copy_file(source, dest, cancel_after_six_blocks) is False
+        assert CopyJournal.resumable_bytes(source, dest) == 6 * block
+        copier.reset_cancel()
+
+        # A damaged last block is detected and copied again
+        with open(dest, 'r+b') as f:
+            f.seek(5 * block + 10)
+            f.write(b"\0" * 8)
+
+        progress = []
+        assert copier.copy_file(source, dest, lambda copied, total: progress.append(copied)) is True
+        assert progress[0] == 5 * block
+        with open(dest, 'rb') as f:
+            assert f.read() == data
+        assert not os.path.exists(CopyJournal.journal_path(dest))
+
+    @pytest.mark.skipif(not hasattr(os, 'copy_file_range') and not hasattr(os, 'sendfile'),
+                        reason="No kernel copy methods")
+    def test_journaled_kernel_copy_resumes_after_comparing_source(self, temp_dir):
+        """Test journaled copies stay in the kernel and resume by comparing with the source"""
+        from operations.copier import FileCopier
+        from operations.journal import CopyJournal, UNHASHED
+
+        block = 64 * 1024
+        data = os.urandom(10 * block + 123)
+        source = os.path.join(temp_dir, "kernel_source.bin")
+        dest = os.path.join(temp_dir, "kernel_dest.bin")
+        with open(source, 'wb') as f:
+            f.write(data)
+
+        copier = FileCopier(max_workers=1, zero_copy=True, journal_min_size=block)
+        if not copier.zero_copy:
+            pytest.skip("Kernel copies are Linux only")
+        copier.journal_block_size = block
+        copier._reflink_copy = lambda *args: False
+
+        def cancel_after_six_blocks(copied, total):
+            if copied >= 6 * block:
+                copier.cancel()
+
+        assert copier.copy_file(source, dest, cancel_after_six_blocks) is False
+        assert CopyJournal.resumable_bytes(source, dest) == 6 * block
+        with open(CopyJournal.journal_path(dest)) as f:
+            assert all(line.split()[2] == UNHASHED for line in f.read().splitlines()[1:])
+        copier.reset_cancel()
+
+        # A damaged last block is detected and copied again
+        with open(dest, 'r+b') as f:
+            f.seek(5 * block + 10)
+            f.write(b"\0" * 8)
+
+        progress = []
+        assert copier.copy_file(source, dest, lambda copied, total: progress.append(copied)) is True
+        assert progress[0] == 5 * block
+        with open(dest, 'rb') as f:
+            assert f.read() == data
+        assert not os.path.exists(CopyJournal.journal_path(dest))
+
     def test_pause_resume(self, test_file_copier):
         """Test pause and resume functionality"""
         test_file_copier.pause()
@@ -223,6 +394,121 @@ class TestOperationsManager:
             operations = test_operation_manager.get_all_operations()
             assert isinstance(operations, list)
 
+    def test_load_history_requeues_interrupted_copies(self, sample_files, temp_dir):
+        """Test interrupted copies in the saved history are queued again on load"""
+        import json
+        import time
+        from operations.manager import OperationsManager, OperationStatus
+
+        history = os.path.join(temp_dir, "interrupted_ops.json")
+        dest = os.path.join(temp_dir, "resumed_copy.txt")
+        manager = OperationsManager(history_file=history)
+        manager.shutdown()
+        op_id = manager.queue_copy([sample_files[0]], [dest])
+
+        with open(history, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert [op['status'] for op in saved['operations']] == ['queued']
+        saved['operations'][0]['status'] = 'in_progress'
+        with open(history, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+
+        restarted = OperationsManager(history_file=history)
+        try:
+            for _ in range(50):
+                if restarted.get_operation(op_id).status == OperationStatus.COMPLETED:
+                    break
+                time.sleep(0.1)
+            assert restarted.get_operation(op_id).status == OperationStatus.COMPLETED
+            assert os.path.exists(dest)
+        finally:
+            restarted.shutdown()
+
+    def test_throttle_limits_and_live_changes(self):
+        """Test token-bucket limits, live limit changes and adaptive backoff"""
+        import threading
+        import time
+        from operations.throttle import BandwidthThrottle
+
+        throttle = BandwidthThrottle(global_rate=1024 * 1024)
+        throttle.begin("op", priority=2, devices=[1])
+        start = time.monotonic()
+        for copied in (100 * 1024, 200 * 1024, 300 * 1024):
+            throttle.transfer("op", "file", copied)
+        assert 0.25 <= time.monotonic() - start < 1.0
+
+        # A transfer deep in debt returns as soon as the limit is lifted
+        waiter = threading.Thread(target=throttle.transfer, args=("op", "big", 50 * 1024 * 1024))
+        waiter.start()
+        time.sleep(0.1)
+        assert waiter.is_alive()
+        throttle.set_global_rate(None)
+        waiter.join(timeout=1.0)
+        assert not waiter.is_alive()
+
+        # Per-priority limits apply to running operations; critical ones
+        # are not delayed by shared limits
+        throttle.set_priority_rate(2, 512 * 1024)
+        start = time.monotonic()
+        throttle.transfer("op", "other", 256 * 1024)
+        assert time.monotonic() - start >= 0.4
+        throttle.set_device_rate(None, 1024)
+        throttle.begin("critical", priority=0, devices=[1])
+        start = time.monotonic()
+        throttle.transfer("critical", "file", 1024 * 1024)
+        assert time.monotonic() - start < 0.2
+
+        # Slow foreground I/O backs lower priorities off harder
+        throttle.set_adaptive(True, target_latency=0.01)
+        throttle.observe_latency(0.5)
+        assert throttle.backoff_factor == 0.5
+        assert throttle._share(3) < throttle._share(2) < throttle._share(1) < throttle._share(0) == 1.0
+        throttle.observe_latency(0.001)
+        assert throttle.backoff_factor == 0.6
+        # Without further reports the factor recovers on its own
+        throttle.backoff.recovery_interval = 0.01
+        time.sleep(0.05)
+        assert throttle.backoff_factor == 1.0
+        throttle.close()
+
+    def test_scheduler_dispatches_by_priority_across_devices(self, temp_dir):
+        """Test device limits, priority order, and reservation of busy devices"""
+        from operations.scheduler import IOScheduler, DeviceClass, DeviceInfo
+
+        hdd = DeviceInfo(1, DeviceClass.HDD)
+        ssd = DeviceInfo(2, DeviceClass.SSD)
+        devices = {"hdd": hdd, "ssd": ssd}
+        scheduler = IOScheduler({DeviceClass.SSD: 2})
+        scheduler.devices_of = lambda paths: tuple(devices[p] for p in paths)
+
+        scheduler.submit("hdd-low", 3, ["hdd"])
+        scheduler.submit("hdd-high", 1, ["hdd", "ssd"])
+        assert scheduler.acquire(timeout=0) == "hdd-high"
+        assert scheduler.concurrency_for("hdd-high") == 1
+
+        # The HDD is busy: SSD-only work still runs, HDD work waits
+        scheduler.submit("ssd-only", 2, ["ssd"])
+        assert scheduler.acquire(timeout=0) == "ssd-only"
+        assert scheduler.acquire(timeout=0.05) is None
+
+        scheduler.release("hdd-high")
+        assert scheduler.acquire(timeout=0) == "hdd-low"
+        assert scheduler.pending_count == 0
+
+        # Real paths resolve to the device of their nearest existing parent
+        info = scheduler.device_of(os.path.join(temp_dir, "missing", "file.txt"))
+        assert info.device == os.stat(temp_dir).st_dev
+
+        # Many files are resolved once per distinct directory
+        resolved = []
+        real_device_of = IOScheduler.device_of
+        scheduler = IOScheduler()
+        scheduler.device_of = lambda path: resolved.append(path) or real_device_of(scheduler, path)
+        paths = [os.path.join(temp_dir, f"file_{i}.txt") for i in range(100)]
+        paths.append(os.path.join(temp_dir, "sub", "other.txt"))
+        assert [d.device for d in scheduler.devices_of(paths)] == [os.stat(temp_dir).st_dev]
+        assert len(resolved) == 2
+
 
 # ============================================================================
 # CONFLICT RESOLUTION TESTS
@@ -196,6 +196,283 @@ class TestSearchEngine:
         assert isinstance(suggestions, list)
 
 
+# ============================================================================
+# COMPACT INDEX TESTS
+# ============================================================================
+
+class TestCompactIndex:
+    """Tests for front-coded names and the compact file table"""
+
+    def test_front_coded_round_trip(self):
+        """Test names survive front coding and ids follow sorted order"""
+        from search.compact_index import FrontCodedNames
+
+        names = sorted({f"report_{i:04d}.pdf".encode() for i in range(100)}
+                       | {b"a", b"\xc3\xa9t\xc3\xa9.txt"})
+        table = FrontCodedNames(names)
+
+        assert len(table) == len(names)
+        assert table.decode_all() == [n.decode() for n in names]
+        assert table.get(table.find("report_0042.pdf")) == "report_0042.pdf"
+        assert table.find("été.txt") is not None
+        assert table.find("missing.txt") is None
+        assert table.nbytes < sum(len(n) for n in names)
+
+    def test_table_reconstructs_paths_lazily(self):
+        """Test records rebuild full paths from the directory table"""
+        import os
+        from search.compact_index import CompactFileTableBuilder, ROOT_DIR_ID
+
+        builder = CompactFileTableBuilder("/data")
+        docs = builder.add(ROOT_DIR_ID, "docs", 0, 1.0, 1.0, 1.0, is_dir=True)
+        year = builder.add(docs, "2024", 0, 1.0, 1.0, 1.0, is_dir=True)
+        builder.add(year, "report.pdf", 2048, 5.0, 4.0, 3.0, is_dir=False)
+        table = builder.build()
+
+        records = {r.name: r for r in table.iter_records()}
+        report = records["report.pdf"]
+
+        assert report._path is None
+        assert report.path == os.path.join("/data", "docs", "2024", "report.pdf")
+        assert report.size == 2048
+        assert report.extension == "pdf"
+        assert records["docs"].is_folder
+        assert table.directory_count == 3
+
+
+# ============================================================================
+# SHARDED INDEX TESTS
+# ============================================================================
+
+@pytest.fixture
+def shard_dirs(temp_dir):
+    """Create two directory trees acting as separate volumes"""
+    import os
+
+    volumes = []
+    for volume, names in (("vol_a", ["alpha.txt", "report_a.pdf"]),
+                          ("vol_b", ["beta.txt", "report_b.pdf"])):
+        root = os.path.join(temp_dir, volume)
+        os.makedirs(os.path.join(root, "sub"))
+        for i, name in enumerate(names):
+            with open(os.path.join(root, "sub", name), 'w') as f:
+                f.write("x" * (i + 1) * 10)
+        volumes.append(root)
+    return volumes
+
+
+class TestShardedIndex:
+    """Tests for ShardedIndex class"""
+
+    def test_build_and_merged_search(self, shard_dirs):
+        """Test parallel fan-out returns globally sorted results"""
+        from search.sharded_index import ShardedIndex, ShardState
+
+        index = ShardedIndex(shard_dirs)
+        index.build_all()
+
+        assert all(s.state == ShardState.ONLINE for s in index.shards)
+
+        records = index.search(lambda r: r.name.endswith(".txt"), sort_by="name")
+        assert [r.name for r in records] == ["alpha.txt", "beta.txt"]
+        assert index.last_report.is_complete
+
+        records = index.search(lambda r: not r.is_dir, sort_by="size",
+                               ascending=False, max_results=2)
+        assert [r.size for r in records] == [20, 20]
+        index.shutdown()
+
+    def test_offline_shard_is_skipped(self, shard_dirs):
+        """Test an unmounted volume does not break queries on the others"""
+        import shutil
+        from search.sharded_index import ShardedIndex, ShardState
+
+        index = ShardedIndex(shard_dirs)
+        index.build_all()
+        shutil.rmtree(shard_dirs[1])
+
+        records = index.search(lambda r: "report" in r.name)
+        assert [r.name for r in records] == ["report_a.pdf"]
+        assert index.get_shard(shard_dirs[1]).state == ShardState.OFFLINE
+        assert shard_dirs[1] in index.last_report.skipped
+        index.shutdown()
+
+    def test_nested_mount_points_are_disjoint(self, shard_dirs):
+        """Test nested shards do not index each other's entries"""
+        import os
+        from search.sharded_index import ShardedIndex
+
+        parent = os.path.dirname(shard_dirs[0])
+        index = ShardedIndex([parent] + shard_dirs)
+        index.build_all()
+
+        records = index.search(lambda r: r.name == "alpha.txt")
+        assert len(records) == 1
+        assert index.shard_for_path(records[0].path).mount_point == shard_dirs[0]
+        index.shutdown()
+
+    def test_rebuild_single_shard(self, shard_dirs):
+        """Test rebuilding one shard picks up new files"""
+        import os
+        from search.sharded_index import ShardedIndex
+
+        index = ShardedIndex(shard_dirs)
+        index.build_all()
+        with open(os.path.join(shard_dirs[0], "gamma.txt"), 'w') as f:
+            f.write("new")
+
+        assert index.rebuild_shard(shard_dirs[0], wait=True)
+        assert [r.name for r in index.search(lambda r: r.name == "gamma.txt")] == ["gamma.txt"]
+        index.shutdown()
+
+    def test_hung_shard_does_not_starve_queries(self, shard_dirs):
+        """Test a hung volume holds one query worker and no build blocks queries"""
+        import os
+        import threading
+        from search.sharded_index import ShardedIndex
+
+        volumes = list(shard_dirs)
+        for name in ("vol_c", "vol_d", "vol_e"):
+            os.makedirs(os.path.join(os.path.dirname(shard_dirs[0]), name))
+            volumes.append(os.path.join(os.path.dirname(shard_dirs[0]), name))
+
+        index = ShardedIndex(volumes, max_workers=4, shard_timeout=0.05)
+        index.build_all()
+
+        # Every volume but vol_a hangs on stat() (a dead network mount)
+        release = threading.Event()
+        for shard in index.shards[1:]:
+            shard.is_mounted = lambda: release.wait() or True
+        index.build_all(wait=False)
+
+        try:
+            for _ in range(6):
+                records = index.search(lambda r: "report" in r.name)
+                assert [r.name for r in records] == ["report_a.pdf"]
+                assert index.last_report.answered == [shard_dirs[0]]
+                assert index.last_report.timed_out == volumes[1:]
+        finally:
+            release.set()
+            index.shutdown()
+
+    @patch('search.engine.EverythingSDK')
+    def test_search_engine_uses_index(self, mock_sdk, shard_dirs):
+        """Test SearchEngine falls back to the native index"""
+        from search.engine import SearchEngine
+        from search.sharded_index import ShardedIndex
+
+        mock_sdk.return_value.is_available = False
+        index = ShardedIndex(shard_dirs)
+        index.build_all()
+
+        engine = SearchEngine(index=index)
+        assert engine.use_index
+
+        results = engine.search("report ext:pdf", sort_by="name")
+        assert [r.filename for r in results] == ["report_a.pdf", "report_b.pdf"]
+        assert results[0].extension == "pdf"
+        engine.shutdown()
+
+
+class TestQueryCompiler:
+    """Tests for the native index query compiler"""
+
+    @pytest.fixture
+    def table(self):
+        """Table with many small logs, a few PDFs and one large ISO"""
+        import time
+        from search.compact_index import ROOT_DIR_ID, CompactFileTableBuilder
+
+        now = time.time()
+        builder = CompactFileTableBuilder('/data')
+        logs = builder.add(ROOT_DIR_ID, 'logs', 0, now, now, now, is_dir=True)
+        for i in range(200):
+            builder.add(logs, f'app_{i}.log', 100 + i, now - 400 * 86400, now, now, is_dir=False)
+        builder.add(ROOT_DIR_ID, 'report_2024.pdf', 5000, now, now, now, is_dir=False)
+        builder.add(ROOT_DIR_ID, 'summary.pdf', 7000, now - 400 * 86400, now, now, is_dir=False)
+        builder.add(ROOT_DIR_ID, 'ubuntu.iso', 3 * 1024 ** 3, now - 400 * 86400, now, now, is_dir=False)
+        return builder.build()
+
+    def _run(self, table, query):
+        from search.query_compiler import QueryCompiler
+        from search.query_parser import QueryParser
+
+        plan = QueryCompiler().compile(QueryParser().parse(query))
+        names = sorted(r.name for r in plan.run(table))
+        full_scan = sorted(r.name for r in table.iter_records() if plan(r))
+        assert names == full_scan
+        return plan.choose(table).kind, names
+
+    def test_parses_everything_aliases(self):
+        """Test dm:/dc:/da: aliases and ;-separated extensions"""
+        from search.query_parser import QueryParser
+
+        parsed = QueryParser().parse("ext:pdf;docx dm:today dc:2024 da:lastweek")
+        assert parsed.extensions == {"pdf", "docx"}
+        assert [f.field for f in parsed.date_filters] == ["modified", "created", "accessed"]
+
+    def test_chooses_cheapest_index(self, table):
+        """Test access path choice follows the cost estimates"""
+        assert self._run(table, "ext:pdf") == ("extension", ["report_2024.pdf", "summary.pdf"])
+        assert self._run(table, "size:>1gb") == ("size", ["logs", "ubuntu.iso"])
+        assert self._run(table, "report") == ("trigram", ["report_2024.pdf"])
+        assert self._run(table, "dm:today ext:log")[0] == "date"
+        assert self._run(table, "ap")[0] == "scan"
+
+    def test_residuals_apply_to_candidates(self, table):
+        """Test conditions not answered by the index are still checked"""
+        kind, names = self._run(table, "ext:pdf dm:today")
+        assert names == ["report_2024.pdf"]
+        kind, names = self._run(table, "app_1 size:<105 path:/data/logs")
+        assert names == ["app_1.log"]
+
+
+class TestRegexIndex:
+    """Tests for regex literal-factor extraction and indexed regex search"""
+
+    def test_extract_requirement(self):
+        """Test required literals are extracted from the parsed pattern"""
+        from search.regex_index import extract_requirement
+
+        assert extract_requirement(r"^Report_\d{4}\.pdf$") == ("and", ("report_", ".pdf"))
+        kind, literals = extract_requirement(r"(draft|final)_v[12]")
+        assert kind == "or"
+        assert set(literals) == {"draft_v1", "draft_v2", "final_v1", "final_v2"}
+        assert extract_requirement(r"a|bcd") is None
+        assert extract_requirement(r".*\d+") is None
+
+    def test_name_regex_prefilter(self):
+        """Test NameRegex agrees with re.search"""
+        import re
+        from search.regex_index import NameRegex
+
+        regex = NameRegex(r"(foo|bar)baz\d+")
+        for name in ["FooBaz12.txt", "barbaz", "bazfoo1", "xbarbaz7"]:
+            assert regex.search(name) == bool(re.search(regex.pattern, name, re.IGNORECASE))
+
+    def test_regex_plan_uses_literals(self):
+        """Test regex queries use the literal index or a name scan"""
+        from search.compact_index import ROOT_DIR_ID, CompactFileTableBuilder
+        from search.query_compiler import QueryCompiler
+        from search.query_parser import QueryParser
+
+        builder = CompactFileTableBuilder('/data')
+        for i in range(300):
+            builder.add(ROOT_DIR_ID, f'photo_{i}.jpg', i, 0.0, 0.0, 0.0, is_dir=False)
+        builder.add(ROOT_DIR_ID, 'invoice_2024.pdf', 1, 0.0, 0.0, 0.0, is_dir=False)
+        table = builder.build()
+        compiler = QueryCompiler()
+
+        plan = compiler.compile(QueryParser().parse(r"regex:^invoice_\d+\.pdf$"))
+        assert plan.choose(table).kind == "regex-index"
+        assert [r.name for r in plan.run(table)] == ["invoice_2024.pdf"]
+
+        plan = compiler.compile(QueryParser().parse(r"regex:_\d9\."))
+        assert plan.choose(table).kind == "regex-scan"
+        expected = sorted(r.name for r in table.iter_records() if plan(r))
+        assert sorted(r.name for r in plan.run(table)) == expected
+
+
 # ============================================================================
 # INTEGRATION TESTS
 # ============================================================================
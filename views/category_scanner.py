@@ -13,6 +13,7 @@ import threading
 from collections import defaultdict
 
 from categories import FileCategory, classify_by_extension
+from core.stat_cache import get_stat_cache
 from utils import format_file_size
 
 
@@ -168,7 +169,11 @@ class CategoryScanner:
                      categories: Dict[FileCategory, CategoryData]):
         """Process a single file"""
         try:
-            stat = entry.stat()
+            # Stat through the shared cache so previews and duplicate scans
+            # of the same files reuse the result
+            stat = get_stat_cache().prime_entry(entry)
+            if stat is None:
+                return
             ext = Path(entry.name).suffix
 
             # Classify by extension first